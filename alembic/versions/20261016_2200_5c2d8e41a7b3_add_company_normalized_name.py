@@ -0,0 +1,82 @@
+"""add_company_normalized_name
+
+Revision ID: 5c2d8e41a7b3
+Revises: 275658513cef
+Create Date: 2026-10-16 22:00:00.000000+00:00
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2d8e41a7b3'
+down_revision: Union[str, None] = '275658513cef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_ROWS = 5000
+
+# Company name suffixes dropped by normalization
+COMPANY_SUFFIX = r'\s+(inc\.?|incorporated|corp\.?|corporation|ltd\.?|limited|llc|llp|lp|co\.?|company)\s*$'
+
+
+def _normalize_company_name(company: str) -> str:
+    """
+    Company name normalization as ingestion did it at this revision
+    (JobDeduplicationService._normalize_company_name). Frozen here so that
+    later changes to the service do not change what this migration writes.
+    """
+    if not company:
+        return ""
+    normalized = re.sub(r'\s+', ' ', company.lower().strip())
+    normalized = re.sub(COMPANY_SUFFIX, '', normalized, flags=re.IGNORECASE)
+    return normalized.strip()
+
+
+def upgrade() -> None:
+    """
+    Add companies.normalized_name with a unique index, so ingestion can match
+    companies by equality (and upsert them with ON CONFLICT) instead of a
+    LIKE scan over companies.name.
+
+    The column is backfilled with the normalization ingestion uses at this
+    revision. When several existing companies normalize to the same name, only
+    the oldest one gets it; the others keep NULL and are no longer matched by
+    ingestion.
+    """
+    op.add_column('companies', sa.Column('normalized_name', sa.String(length=255), nullable=True))
+
+    connection = op.get_bind()
+    seen = set()
+    last_id = 0
+    while True:
+        companies = connection.execute(
+            text("SELECT id, name FROM companies WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_ROWS}
+        ).fetchall()
+        if not companies:
+            break
+        updates = []
+        for company_id, name in companies:
+            normalized_name = _normalize_company_name(name or '')
+            if normalized_name and normalized_name not in seen:
+                seen.add(normalized_name)
+                updates.append({"id": company_id, "normalized_name": normalized_name})
+        if updates:
+            connection.execute(
+                text("UPDATE companies SET normalized_name = :normalized_name WHERE id = :id"),
+                updates
+            )
+        last_id = companies[-1][0]
+
+    op.create_index(op.f('ix_companies_normalized_name'), 'companies', ['normalized_name'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_companies_normalized_name'), table_name='companies')
+    op.drop_column('companies', 'normalized_name')
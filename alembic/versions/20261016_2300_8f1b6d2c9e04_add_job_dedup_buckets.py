@@ -0,0 +1,44 @@
+"""add_job_dedup_buckets
+
+Revision ID: 8f1b6d2c9e04
+Revises: 5c2d8e41a7b3
+Create Date: 2026-10-16 23:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f1b6d2c9e04'
+down_revision: Union[str, None] = '5c2d8e41a7b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Add the MinHash-LSH index deduplication finds candidate duplicates in,
+    replacing the LIKE scan over job titles and company names.
+
+    The table starts empty; index the existing postings with
+    scripts/build_dedup_index.py.
+    """
+    op.create_table(
+        'job_dedup_buckets',
+        sa.Column('band', sa.SmallInteger(), nullable=False),
+        sa.Column('bucket', sa.BigInteger(), nullable=False),
+        sa.Column('job_posting_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['job_posting_id'], ['job_postings.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('band', 'bucket', 'job_posting_id')
+    )
+    op.create_index(
+        op.f('ix_job_dedup_buckets_job_posting_id'), 'job_dedup_buckets', ['job_posting_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_job_dedup_buckets_job_posting_id'), table_name='job_dedup_buckets')
+    op.drop_table('job_dedup_buckets')
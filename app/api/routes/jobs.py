@@ -12,6 +12,7 @@ from app.pydantic_models import PaginatedJobResponse
 from app.models.tracking_models import JobPosting, Company, Location, JobCategory, JobSource, JobMetrics
 from app.services.job_tracking_service import job_tracking_service
 from app.cache import cache
+from app.core.fingerprint import fingerprint
 from app.core.config import settings
 
 router = APIRouter()
@@ -74,13 +75,21 @@ async def search_jobs(
         )
     
     # Build cache key
-    cache_key = f"job_search:{hash(str(sorted([
-        ('search_term', search_term), ('location', location), ('job_type', job_type),
-        ('company', company), ('salary_min', salary_min), ('salary_max', salary_max),
-        ('experience_level', experience_level), ('is_remote', is_remote),
-        ('days_old', days_old), ('sort_by', sort_by), ('sort_order', sort_order),
-        ('page', page), ('page_size', page_size)
-    ])))}"
+    cache_key = fingerprint({
+        'search_term': search_term,
+        'location': location,
+        'job_type': job_type,
+        'company': company,
+        'salary_min': salary_min,
+        'salary_max': salary_max,
+        'experience_level': experience_level,
+        'is_remote': is_remote,
+        'days_old': days_old,
+        'sort_by': sort_by,
+        'sort_order': sort_order,
+        'page': page,
+        'page_size': page_size
+    }, namespace="job_search")
     
     # Try cache first
     if settings.ENABLE_CACHE:
@@ -12,7 +12,9 @@ from app.pydantic_models import PaginatedJobResponse
 from app.models.tracking_models import JobPosting, Company, Location, JobCategory, JobSource, JobMetrics
 from app.services.job_tracking_service import job_tracking_service
 from app.cache import cache
+from app.core.fingerprint import fingerprint
 from app.core.config import settings
+from app.utils.columnar import COLUMNAR_FORMATS, columnar_response, records_to_table, require_columnar
 
 router = APIRouter()
 
@@ -33,7 +35,7 @@ async def search_jobs(
     sort_order: str = Query("desc", description="Sort order: asc or desc"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Number of results per page"),
-    format: str = Query("json", description="Response format: json or csv"),
+    format: str = Query("json", description="Response format: json, csv, arrow (Arrow IPC stream) or parquet"),
     api_key: str = Depends(get_api_key),
     db: Session = Depends(get_db)
 ):
@@ -50,7 +52,7 @@ async def search_jobs(
     - Source site filtering (filter by where job was found)
     - Sorting by multiple fields
     - Pagination
-    - CSV export
+    - CSV, Arrow and Parquet export
     
     The tracking database includes deduplication, so each unique job appears only once
     even if it was found on multiple sites.
@@ -77,16 +79,27 @@ async def search_jobs(
             status_code=400,
             detail="Invalid sort_order. Valid options: asc, desc"
         )
+
+    if format in COLUMNAR_FORMATS:
+        require_columnar(format)
     
     # Build cache key
-    cache_key = f"job_search_tracking:{hash(str(sorted([
-        ('search_term', search_term), ('location', location), ('job_type', job_type),
-        ('company', company), ('salary_min', salary_min), ('salary_max', salary_max),
-        ('experience_level', experience_level), ('is_remote', is_remote),
-        ('days_old', days_old), ('source_site', source_site),
-        ('sort_by', sort_by), ('sort_order', sort_order),
-        ('page', page), ('page_size', page_size)
-    ])))}"
+    cache_key = fingerprint({
+        'search_term': search_term,
+        'location': location,
+        'job_type': job_type,
+        'company': company,
+        'salary_min': salary_min,
+        'salary_max': salary_max,
+        'experience_level': experience_level,
+        'is_remote': is_remote,
+        'days_old': days_old,
+        'source_site': source_site,
+        'sort_by': sort_by,
+        'sort_order': sort_order,
+        'page': page,
+        'page_size': page_size
+    }, namespace="job_search_tracking")
     
     # Try cache first
     if settings.ENABLE_CACHE:
@@ -94,6 +107,8 @@ async def search_jobs(
         if cached_result:
             if format == "csv":
                 return _create_csv_response(cached_result['jobs'])
+            if format in COLUMNAR_FORMATS:
+                return columnar_response(records_to_table(cached_result['jobs']), format, "job_search_results")
             return PaginatedJobResponse(**cached_result, cached=True)
     
     # Build query with eager loading to prevent N+1 queries
@@ -255,6 +270,9 @@ async def search_jobs(
     # Return CSV if requested
     if format == "csv":
         return _create_csv_response(jobs_data)
+
+    if format in COLUMNAR_FORMATS:
+        return columnar_response(records_to_table(jobs_data), format, "job_search_results")
     
     return PaginatedJobResponse(**result)
 
@@ -1,71 +1,433 @@
+import asyncio
+import logging
+import sys
 import time
+from collections import OrderedDict
 from typing import Dict, Any, Optional, Tuple
-import hashlib
 import json
 import pandas as pd
+from app.core.cache_metrics import CacheMetrics
 from app.core.config import settings
+from app.core.fingerprint import search_fingerprint
+from app.core.shared_cache import SharedCacheTier
+
+logger = logging.getLogger(__name__)
+
+# Parameters that only narrow a search's result window. Searches that differ only
+# in these belong to the same family, and a cached member can answer a smaller one.
+WINDOW_PARAMS = ('results_wanted', 'offset', 'hours_old')
+
+# JobSpy's default when results_wanted is not given
+JOBSPY_DEFAULT_RESULTS_WANTED = 15
+
+
+def _window(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the result window a search asks for."""
+    return {
+        'results_wanted': params.get('results_wanted') or JOBSPY_DEFAULT_RESULTS_WANTED,
+        'offset': params.get('offset') or 0,
+        'hours_old': params.get('hours_old'),
+    }
+
+
+def _slice_window(data: pd.DataFrame, stored: Dict[str, Any], wanted: Dict[str, Any], age: float) -> Optional[pd.DataFrame]:
+    """
+    Answer a result window from a cached scrape of a larger window.
+    
+    Args:
+        data: Cached jobs for the stored window
+        stored: Window the cached scrape covered, plus the number of rows it returned
+        wanted: Window being requested
+        age: Seconds since the cached scrape ran
+        
+    Returns:
+        The requested rows, or None if the cached scrape does not cover them
+    """
+    # A scrape that returned fewer rows than asked for has no more results
+    exhausted = stored['rows'] < stored['results_wanted']
+    
+    if wanted['hours_old'] != stored['hours_old']:
+        if wanted['hours_old'] is None:
+            return None
+        # The cached window must reach back as far as the request does
+        if stored['hours_old'] is not None and wanted['hours_old'] + age / 3600 > stored['hours_old']:
+            return None
+        # Rows are only a prefix of the narrower result list if the scrape started at the top
+        if stored['offset'] != 0:
+            return None
+        if 'date_posted' not in data.columns:
+            return None
+        
+        posted = pd.to_datetime(data['date_posted'], errors='coerce')
+        cutoff = pd.Timestamp.now() - pd.Timedelta(hours=wanted['hours_old'])
+        # date_posted is day-precision, so keep everything posted on the cutoff day
+        data = data[posted.isna() | (posted >= cutoff.normalize())].reset_index(drop=True)
+        start = wanted['offset']
+    else:
+        if wanted['offset'] < stored['offset']:
+            return None
+        start = wanted['offset'] - stored['offset']
+    
+    end = start + wanted['results_wanted']
+    if end > len(data) and not exhausted:
+        return None
+    return data.iloc[start:end].reset_index(drop=True)
+
+
+def estimate_size(data: Any) -> int:
+    """Estimate the memory held by a cached value, in bytes."""
+    if isinstance(data, pd.DataFrame):
+        return int(data.memory_usage(deep=True).sum())
+    if isinstance(data, (dict, list, tuple)):
+        try:
+            return len(json.dumps(data, default=str))
+        except (TypeError, ValueError):
+            pass
+    return sys.getsizeof(data)
+
 
 class JobSearchCache:
+    """
+    In-process LRU cache for search results and other API data.
+    
+    When Redis is configured this is the L1 in front of a SharedCacheTier L2:
+    reads fall through to Redis on a miss, writes go to both tiers, and other
+    workers' writes invalidate the local copy.
+    
+    Entries are bounded by CACHE_MAX_ENTRIES and by a CACHE_MAX_BYTES budget
+    measured with estimate_size(); the least recently used entries are evicted
+    first. Expired entries are removed by a periodic sweeper (see sweep_periodically).
+    """
+    
     def __init__(self):
-        self.cache: Dict[str, Tuple[float, pd.DataFrame]] = {}
+        # key -> (timestamp, data), ordered from least to most recently used
+        self.cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.sizes: Dict[str, int] = {}
+        # Per-entry expiry for entries set with an explicit `expire`
+        self.ttls: Dict[str, int] = {}
+        self.total_bytes = 0
+        # family key -> {cache key: result window stored under that key}
+        self.families: Dict[str, Dict[str, Dict[str, Any]]] = {}
         self.enabled = settings.ENABLE_CACHE
         self.expiry = settings.CACHE_EXPIRY
+        # Entries past expiry but within the stale window can still be served
+        # by get_with_staleness() while a refresh runs
+        self.stale_ttl = settings.CACHE_STALE_TTL
+        self.max_entries = settings.CACHE_MAX_ENTRIES
+        self.max_bytes = settings.CACHE_MAX_BYTES
+        
+        # Counters for monitoring
+        self.evictions = 0
+        self.expirations = 0
+        self.rejected = 0
+        self.invalidations = 0
+        # Per-namespace hit/miss/eviction counters and latency histograms
+        self.metrics = CacheMetrics()
+        
+        # Shared L2 tier (Redis/Valkey) used by all API and Celery workers
+        self.l2: Optional[SharedCacheTier] = None
+        if self.enabled and settings.CACHE_L2_ENABLED and settings.REDIS_URL:
+            self.l2 = SharedCacheTier()
     
     def _generate_key(self, params: Dict[str, Any]) -> str:
         """Generate a cache key from the search parameters"""
-        # Sort the dictionary to ensure consistent keys
-        sorted_params = {k: params[k] for k in sorted(params.keys())}
-        param_str = json.dumps(sorted_params, sort_keys=True)
-        return hashlib.md5(param_str.encode()).hexdigest()
+        # Canonical fingerprint, so equivalent searches share a key in every worker
+        return search_fingerprint(params)
     
-    async def get(self, params_or_key) -> Optional[Any]:
-        """Get cached results if they exist and are not expired"""
+    def site_key(self, params: Dict[str, Any], site: str) -> str:
+        """Generate the cache key for a single site's slice of a search.
+        
+        Multi-site searches are cached one site at a time, so a search for
+        [indeed, linkedin] and a later search for [indeed] share the indeed slice.
+        """
+        site_params = dict(params)
+        site_params['site_name'] = [site]
+        return self._generate_key(site_params)
+    
+    def site_family_key(self, params: Dict[str, Any], site: str) -> str:
+        """Generate the key shared by a site's searches that differ only in their result window."""
+        family_params = {k: v for k, v in params.items() if k not in WINDOW_PARAMS}
+        return self.site_key(family_params, site)
+    
+    async def index_site_slice(self, params: Dict[str, Any], site: str, data: pd.DataFrame) -> None:
+        """Record the result window a cached site slice covers, for superset lookups."""
         if not self.enabled:
+            return
+        
+        stored = _window(params)
+        stored['rows'] = len(data)
+        family_key = self.site_family_key(params, site)
+        key = self.site_key(params, site)
+        self.families.setdefault(family_key, {})[key] = stored
+        if self.l2 is not None:
+            await self.l2.add_to_family(family_key, key, stored, self.expiry + self.stale_ttl)
+    
+    async def get_covering_slice(self, params: Dict[str, Any], site: str) -> Optional[pd.DataFrame]:
+        """
+        Answer a site's search from a fresh cached scrape of a larger result window.
+        
+        A cached search with the same parameters but a larger results_wanted, an
+        earlier offset or a wider hours_old is sliced/filtered down to the request.
+        
+        Returns:
+            The requested rows, or None if no cached superset covers the request
+        """
+        if not self.enabled:
+            return None
+        
+        family_key = self.site_family_key(params, site)
+        family = self.families.get(family_key, {})
+        if self.l2 is not None:
+            # Include supersets scraped by other workers
+            for key, stored in (await self.l2.get_family(family_key)).items():
+                family.setdefault(key, stored)
+            if family:
+                self.families[family_key] = family
+        if not family:
             return None
         
+        wanted = _window(params)
+        for key, stored in list(family.items()):
+            if key not in self.cache:
+                await self._read_through(key)
+            if key not in self.cache:
+                # Entry was evicted or expired
+                del family[key]
+                continue
+            entry = self._lookup(key)
+            if entry is None or entry[1]:
+                continue
+            
+            age = time.time() - self.cache[key][0]
+            data = _slice_window(entry[0], stored, wanted, age)
+            if data is not None:
+                self.metrics.incr(key, "superset_hits")
+                return data
+        return None
+    
+    def _resolve_key(self, params_or_key) -> str:
         # Handle both dict params and string keys
         if isinstance(params_or_key, dict):
-            key = self._generate_key(params_or_key)
-        else:
-            key = params_or_key
-            
+            return self._generate_key(params_or_key)
+        return params_or_key
+    
+    def _lookup(self, key: str) -> Optional[Tuple[Any, bool]]:
+        """Return (data, is_stale) for a key, dropping entries past the stale window."""
         if key not in self.cache:
             return None
             
         timestamp, data = self.cache[key]
-        if time.time() - timestamp > self.expiry:
+        age = time.time() - timestamp
+        expiry = self.ttls.get(key, self.expiry)
+        if age > expiry + self.stale_ttl:
             # Cache expired
-            del self.cache[key]
+            self._remove(key)
+            self.expirations += 1
+            self.metrics.incr(key, "expirations")
             return None
-            
-        return data
+        
+        self.cache.move_to_end(key)
+        return data, age > expiry
+    
+    async def get(self, params_or_key) -> Optional[Any]:
+        """Get cached results if they exist and are not expired"""
+        if not self.enabled:
+            return None
+        
+        key = self._resolve_key(params_or_key)
+        start = time.perf_counter()
+        if key not in self.cache:
+            await self._read_through(key)
+        entry = self._lookup(key)
+        self.metrics.observe(key, "get", time.perf_counter() - start)
+        if entry is None or entry[1]:
+            self.metrics.incr(key, "misses")
+            return None
+        self.metrics.incr(key, "hits")
+        return entry[0]
+    
+    async def get_with_staleness(self, params_or_key, record: bool = True) -> Optional[Tuple[Any, bool]]:
+        """Get cached results along with whether they are stale.
+        
+        Stale entries are past CACHE_EXPIRY but within CACHE_STALE_TTL; callers
+        may serve them while refreshing the entry in the background.
+        
+        Args:
+            params_or_key: Search parameters or cache key
+            record: Count the outcome in the hit/miss metrics; callers that try
+                other sources afterwards pass False and call record_lookup()
+        
+        Returns:
+            Tuple of (data, is_stale), or None if nothing usable is cached
+        """
+        if not self.enabled:
+            return None
+        
+        key = self._resolve_key(params_or_key)
+        start = time.perf_counter()
+        if key not in self.cache:
+            await self._read_through(key)
+        entry = self._lookup(key)
+        self.metrics.observe(key, "get", time.perf_counter() - start)
+        if record:
+            self.record_lookup(key, "misses" if entry is None else "stale_hits" if entry[1] else "hits")
+        return entry
+    
+    def record_lookup(self, params_or_key, outcome: str) -> None:
+        """Count the outcome ("hits", "stale_hits" or "misses") of one logical lookup."""
+        if self.enabled:
+            self.metrics.incr(self._resolve_key(params_or_key), outcome)
+    
+    async def time_to_expiry(self, params_or_key) -> Optional[float]:
+        """Get the seconds until a cached entry expires.
+        
+        Negative values mean the entry is already stale. Unlike get(), this does
+        not count as a cache lookup or refresh the entry's LRU position.
+        
+        Returns:
+            Seconds until expiry, or None if the key is not cached
+        """
+        if not self.enabled:
+            return None
+        
+        key = self._resolve_key(params_or_key)
+        if key not in self.cache:
+            await self._read_through(key)
+        if key not in self.cache:
+            return None
+        timestamp, _ = self.cache[key]
+        return timestamp + self.ttls.get(key, self.expiry) - time.time()
+    
+    async def _read_through(self, key: str) -> None:
+        """Populate L1 from the shared tier, keeping the entry's original timestamp."""
+        if self.l2 is None:
+            return
+        entry = await self.l2.get(key)
+        if entry is not None:
+            timestamp, data, expire = entry
+            self.metrics.incr(key, "l2_hits")
+            self._store(key, timestamp, data, expire)
     
     async def set(self, params_or_key, data, expire: Optional[int] = None) -> None:
         """Cache search results"""
         if not self.enabled:
             return
         
-        # Handle both dict params and string keys
-        if isinstance(params_or_key, dict):
-            key = self._generate_key(params_or_key)
-        else:
-            key = params_or_key
-            
-        self.cache[key] = (time.time(), data)
+        key = self._resolve_key(params_or_key)
+        start = time.perf_counter()
+        timestamp = time.time()
+        self._store(key, timestamp, data, expire)
+        if self.l2 is not None:
+            await self.l2.set(key, timestamp, data, expire, (expire or self.expiry) + self.stale_ttl)
+        self.metrics.observe(key, "set", time.perf_counter() - start)
+        self.metrics.incr(key, "sets")
+        self.metrics.incr(key, "bytes_written", self.sizes.get(key, 0))
+    
+    def _store(self, key: str, timestamp: float, data: Any, expire: Optional[int]) -> None:
+        """Store an entry in L1, evicting least recently used entries to fit."""
+        size = estimate_size(data)
+        if key in self.cache:
+            self._remove(key)
+        if size > self.max_bytes:
+            logger.warning(f"Not caching {key}: {size} bytes exceeds CACHE_MAX_BYTES ({self.max_bytes})")
+            self.rejected += 1
+            self.metrics.incr(key, "rejected")
+            return
+        
+        self.cache[key] = (timestamp, data)
+        if expire is not None:
+            self.ttls[key] = expire
+        self.sizes[key] = size
+        self.total_bytes += size
+        self.metrics.stored(key, size)
+        self._evict()
+    
+    async def delete(self, params_or_key) -> bool:
+        """Remove a cached entry"""
+        key = self._resolve_key(params_or_key)
+        found = key in self.cache
+        if found:
+            self._remove(key)
+        if self.l2 is not None:
+            await self.l2.delete(key)
+            found = True
+        return found
+    
+    def invalidate_local(self, key: str) -> None:
+        """Drop a key from L1 after another worker changed it in the shared tier."""
+        if key in self.cache:
+            self._remove(key)
+            self.invalidations += 1
+            self.metrics.incr(key, "invalidations")
+    
+    def _remove(self, key: str) -> None:
+        del self.cache[key]
+        self.ttls.pop(key, None)
+        size = self.sizes.pop(key, 0)
+        self.total_bytes -= size
+        self.metrics.removed(key, size)
+    
+    def _evict(self) -> None:
+        """Evict least recently used entries until the cache fits its limits."""
+        while self.cache and (len(self.cache) > self.max_entries or self.total_bytes > self.max_bytes):
+            key = next(iter(self.cache))
+            self._remove(key)
+            self.evictions += 1
+            self.metrics.incr(key, "evictions")
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size, eviction counters and per-namespace metrics for monitoring."""
+        return {
+            "enabled": self.enabled,
+            "entries": len(self.cache),
+            "max_entries": self.max_entries,
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "rejected": self.rejected,
+            "invalidations": self.invalidations,
+            "shared_tier": self.l2 is not None and self.l2.client is not None,
+            "hit_rate": round(self.metrics.hit_rate(), 4),
+            "namespaces": self.metrics.snapshot(),
+        }
     
     def clear(self) -> None:
         """Clear all cached data"""
+        for key, size in self.sizes.items():
+            self.metrics.removed(key, size)
         self.cache.clear()
+        self.sizes.clear()
+        self.ttls.clear()
+        self.total_bytes = 0
+        self.families.clear()
     
     def cleanup_expired(self) -> None:
         """Remove expired cache entries"""
         current_time = time.time()
         expired_keys = [
             key for key, (timestamp, _) in self.cache.items() 
-            if current_time - timestamp > self.expiry
+            if current_time - timestamp > self.ttls.get(key, self.expiry) + self.stale_ttl
         ]
         for key in expired_keys:
-            del self.cache[key]
+            self._remove(key)
+            self.metrics.incr(key, "expirations")
+        self.expirations += len(expired_keys)
+        
+        for family_key, family in list(self.families.items()):
+            for key in [key for key in family if key not in self.cache]:
+                del family[key]
+            if not family:
+                del self.families[family_key]
+
+    async def sweep_periodically(self, interval: int) -> None:
+        """Remove expired entries every `interval` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.cleanup_expired()
+            except Exception as e:
+                logger.error(f"Cache sweep failed: {e}")
 
 # Initialize global cache
 cache = JobSearchCache()
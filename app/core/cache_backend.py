@@ -5,8 +5,9 @@ Provides a unified interface that can easily switch between Redis implementation
 import json
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, Optional, Union
 import redis
+from app.core.cache_codecs import CacheCodec, CodecError
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -52,22 +53,25 @@ class RedisCompatibleBackend(CacheBackend):
     Works with Redis, Valkey, KeyDB, and other Redis-compatible implementations.
     """
     
-    def __init__(self, redis_url: Optional[str] = None, **kwargs):
+    def __init__(self, redis_url: Optional[str] = None, codec: Optional[CacheCodec] = None, **kwargs):
         """
         Initialize Redis-compatible backend.
         
         Args:
             redis_url: Redis connection URL (redis://host:port/db)
+            codec: Binary codec for stored values; values are stored as JSON text if omitted
             **kwargs: Additional Redis connection parameters
         """
         self.redis_url = redis_url or settings.REDIS_URL or "redis://localhost:6379/0"
-        self.default_ttl = kwargs.get('default_ttl', settings.CACHE_EXPIRY)
+        self.default_ttl = kwargs.pop('default_ttl', settings.CACHE_EXPIRY)
+        self.codec = codec
         
         try:
-            # Create Redis connection with connection pooling
+            # Create Redis connection with connection pooling. Binary codecs
+            # need raw bytes back from Redis.
             self.client = redis.from_url(
                 self.redis_url,
-                decode_responses=True,
+                decode_responses=codec is None,
                 socket_connect_timeout=5,
                 socket_timeout=5,
                 retry_on_timeout=True,
@@ -82,14 +86,22 @@ class RedisCompatibleBackend(CacheBackend):
             logger.error(f"Failed to connect to Redis cache: {e}")
             raise
     
-    def _serialize(self, value: Any) -> str:
+    def _serialize(self, value: Any) -> Union[str, bytes]:
         """Serialize value for storage."""
+        if self.codec is not None:
+            return self.codec.encode(value)
         if isinstance(value, (str, int, float, bool)):
             return json.dumps(value)
         return json.dumps(value, default=str)
     
-    def _deserialize(self, value: str) -> Any:
+    def _deserialize(self, value: Union[str, bytes]) -> Any:
         """Deserialize value from storage."""
+        if self.codec is not None:
+            try:
+                return self.codec.decode(value)
+            except CodecError as e:
+                logger.warning(f"Discarding undecodable cache value: {e}")
+                return None
         try:
             return json.loads(value)
         except (json.JSONDecodeError, TypeError):
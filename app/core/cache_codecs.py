@@ -0,0 +1,204 @@
+"""
+Binary codecs for values stored in Redis.
+
+Every encoded value starts with a one-byte header: the low bits identify the
+format and the high bit marks zstd compression. Decoding always dispatches on
+the header, so entries written with a different codec configuration (or by a
+worker missing an optional dependency) are still read correctly, and unknown
+data is rejected instead of being misinterpreted.
+
+DataFrames are stored as Arrow IPC or Parquet when pyarrow is installed, other
+values as msgpack when msgpack is installed; JSON is the fallback for both.
+"""
+import io
+import json
+import logging
+from datetime import date, datetime
+from typing import Any, Optional
+
+import pandas as pd
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+FORMAT_JSON = 0x01
+FORMAT_MSGPACK = 0x02
+FORMAT_ARROW = 0x03
+FORMAT_PARQUET = 0x04
+FORMAT_DATAFRAME_JSON = 0x05
+
+COMPRESSED_ZSTD = 0x80
+FORMAT_MASK = 0x7F
+
+FORMAT_NAMES = {
+    FORMAT_JSON: "json",
+    FORMAT_MSGPACK: "msgpack",
+    FORMAT_ARROW: "arrow",
+    FORMAT_PARQUET: "parquet",
+    FORMAT_DATAFRAME_JSON: "dataframe_json",
+}
+
+
+class CodecError(ValueError):
+    """Raised when a stored value cannot be decoded."""
+
+
+def _to_plain(value: Any) -> Any:
+    """Convert values msgpack/JSON cannot represent natively."""
+    if isinstance(value, (datetime, date, pd.Timestamp)):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        # numpy scalars
+        return value.item()
+    return str(value)
+
+
+class CacheCodec:
+    """Encode and decode cached values with a format header byte."""
+
+    def __init__(
+        self,
+        dataframe_format: Optional[str] = None,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        min_compress_bytes: Optional[int] = None,
+    ):
+        """
+        Initialize the codec.
+
+        Args:
+            dataframe_format: "arrow", "parquet" or "json" (defaults to CACHE_DATAFRAME_FORMAT)
+            compression: "zstd" or "none" (defaults to CACHE_COMPRESSION)
+            compression_level: zstd level (defaults to CACHE_COMPRESSION_LEVEL)
+            min_compress_bytes: Payloads smaller than this are stored uncompressed
+        """
+        self.dataframe_format = (dataframe_format or settings.CACHE_DATAFRAME_FORMAT).lower()
+        compression = (compression or settings.CACHE_COMPRESSION).lower()
+        self.compression_level = compression_level or settings.CACHE_COMPRESSION_LEVEL
+        self.min_compress_bytes = (
+            settings.CACHE_COMPRESSION_MIN_BYTES if min_compress_bytes is None else min_compress_bytes
+        )
+
+        if self.dataframe_format in ("arrow", "parquet") and pa is None:
+            logger.warning(f"pyarrow not installed, caching DataFrames as JSON instead of {self.dataframe_format}")
+            self.dataframe_format = "json"
+
+        self.compress = compression == "zstd"
+        if self.compress and zstandard is None:
+            logger.warning("zstandard not installed, cached values will not be compressed")
+            self.compress = False
+
+    def encode(self, value: Any) -> bytes:
+        """Encode a value, prefixed with its format header byte."""
+        if isinstance(value, pd.DataFrame):
+            fmt, payload = self._encode_dataframe(value)
+        elif msgpack is not None:
+            fmt, payload = FORMAT_MSGPACK, msgpack.packb(value, default=_to_plain, use_bin_type=True)
+        else:
+            fmt, payload = FORMAT_JSON, json.dumps(value, default=_to_plain).encode()
+
+        if self.compress and len(payload) >= self.min_compress_bytes:
+            compressed = zstandard.ZstdCompressor(level=self.compression_level).compress(payload)
+            if len(compressed) < len(payload):
+                return bytes([fmt | COMPRESSED_ZSTD]) + compressed
+        return bytes([fmt]) + payload
+
+    def _encode_dataframe(self, df: pd.DataFrame):
+        if self.dataframe_format in ("arrow", "parquet"):
+            try:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                sink = io.BytesIO()
+                if self.dataframe_format == "parquet":
+                    # Compression is applied to the whole payload below
+                    pq.write_table(table, sink, compression="none")
+                    return FORMAT_PARQUET, sink.getvalue()
+                with pa.ipc.new_stream(sink, table.schema) as writer:
+                    writer.write_table(table)
+                return FORMAT_ARROW, sink.getvalue()
+            except (pa.ArrowException, TypeError, ValueError) as e:
+                # Mixed-type object columns cannot always be mapped to Arrow
+                logger.debug(f"Falling back to JSON for DataFrame with unsupported types: {e}")
+        return FORMAT_DATAFRAME_JSON, df.to_json(orient="split", date_format="iso").encode()
+
+    def decode(self, data: bytes) -> Any:
+        """Decode a value produced by encode()."""
+        if not data:
+            raise CodecError("Empty cache value")
+        if isinstance(data, str):
+            data = data.encode()
+
+        header = data[0]
+        fmt = header & FORMAT_MASK
+        if fmt not in FORMAT_NAMES:
+            return self._decode_legacy(data)
+
+        payload = data[1:]
+        if header & COMPRESSED_ZSTD:
+            if zstandard is None:
+                raise CodecError("Cache value is zstd-compressed but zstandard is not installed")
+            try:
+                payload = zstandard.ZstdDecompressor().decompress(payload)
+            except zstandard.ZstdError as e:
+                raise CodecError(f"Corrupt compressed cache value: {e}") from e
+
+        try:
+            if fmt == FORMAT_ARROW:
+                self._require_pyarrow(fmt)
+                return pa.ipc.open_stream(payload).read_all().to_pandas()
+            if fmt == FORMAT_PARQUET:
+                self._require_pyarrow(fmt)
+                return pq.read_table(io.BytesIO(payload)).to_pandas()
+            if fmt == FORMAT_DATAFRAME_JSON:
+                return pd.read_json(io.StringIO(payload.decode()), orient="split")
+            if fmt == FORMAT_MSGPACK:
+                if msgpack is None:
+                    raise CodecError("Cache value is msgpack but msgpack is not installed")
+                return msgpack.unpackb(payload, raw=False)
+            return json.loads(payload)
+        except CodecError:
+            raise
+        except Exception as e:
+            raise CodecError(f"Could not decode {FORMAT_NAMES[fmt]} cache value: {e}") from e
+
+    @staticmethod
+    def _require_pyarrow(fmt: int) -> None:
+        if pa is None:
+            raise CodecError(f"Cache value is {FORMAT_NAMES[fmt]} but pyarrow is not installed")
+
+    @staticmethod
+    def _decode_legacy(data: bytes) -> Any:
+        """Decode values written as plain JSON text before codecs were introduced."""
+        try:
+            return json.loads(data)
+        except (ValueError, UnicodeDecodeError) as e:
+            raise CodecError(f"Unknown cache value format 0x{data[0]:02x}") from e
+
+
+def describe(data: bytes) -> str:
+    """Describe an encoded value's format, e.g. "arrow+zstd", for logging."""
+    if not data or (data[0] & FORMAT_MASK) not in FORMAT_NAMES:
+        return "legacy"
+    name = FORMAT_NAMES[data[0] & FORMAT_MASK]
+    return f"{name}+zstd" if data[0] & COMPRESSED_ZSTD else name
+
+
+# Global codec instance
+cache_codec = CacheCodec()
@@ -0,0 +1,214 @@
+"""
+Instrumentation for the search cache.
+
+Counters and latency histograms are kept per key namespace (the part of a cache
+key before the first ":", e.g. "search" or "job_search"), so the hit rate of
+each kind of cached data can be told apart when sizing CACHE_EXPIRY and the
+cache budget. Metrics are per process; render_prometheus() exposes them in the
+Prometheus text format for scraping.
+"""
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+
+# Namespace for keys without a "<namespace>:" prefix
+DEFAULT_NAMESPACE = "default"
+
+COUNTERS = (
+    "hits",
+    "misses",
+    "stale_hits",
+    "superset_hits",
+    "l2_hits",
+    "sets",
+    "evictions",
+    "expirations",
+    "rejected",
+    "invalidations",
+    "bytes_written",
+)
+
+
+def namespace_of(key: str) -> str:
+    """Get the namespace of a cache key."""
+    namespace, sep, _ = key.partition(":")
+    return namespace if sep and namespace else DEFAULT_NAMESPACE
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # One count per bucket plus the +Inf bucket
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one observation."""
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Get (upper bound, cumulative count) pairs, ending with +Inf."""
+        pairs = []
+        running = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket containing it."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        for bound, running in self.cumulative():
+            if running >= target:
+                return bound if bound != float("inf") else self.buckets[-1]
+        return self.buckets[-1]
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum_seconds": round(self.sum, 6),
+            "avg_ms": round(self.sum / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": self.quantile(0.5) * 1000,
+            "p95_ms": self.quantile(0.95) * 1000,
+            "p99_ms": self.quantile(0.99) * 1000,
+        }
+
+
+@dataclass
+class NamespaceMetrics:
+    """Counters, stored bytes and latencies for one key namespace."""
+
+    counters: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(COUNTERS, 0))
+    entries: int = 0
+    bytes_stored: int = 0
+    get_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    set_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    @property
+    def hit_rate(self) -> float:
+        served = self.counters["hits"] + self.counters["stale_hits"] + self.counters["superset_hits"]
+        lookups = served + self.counters["misses"]
+        return served / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            **self.counters,
+            "entries": self.entries,
+            "bytes_stored": self.bytes_stored,
+            "hit_rate": round(self.hit_rate, 4),
+            "get_latency": self.get_latency.to_dict(),
+            "set_latency": self.set_latency.to_dict(),
+        }
+
+
+class CacheMetrics:
+    """Per-namespace cache metrics."""
+
+    def __init__(self):
+        self.namespaces: Dict[str, NamespaceMetrics] = {}
+        # The sweeper and pub/sub callbacks run alongside request handlers
+        self._lock = threading.Lock()
+
+    def _namespace(self, key: str) -> NamespaceMetrics:
+        name = namespace_of(key)
+        metrics = self.namespaces.get(name)
+        if metrics is None:
+            metrics = self.namespaces.setdefault(name, NamespaceMetrics())
+        return metrics
+
+    def incr(self, key: str, counter: str, amount: int = 1) -> None:
+        """Increment a counter for the namespace of `key`."""
+        with self._lock:
+            self._namespace(key).counters[counter] += amount
+
+    def stored(self, key: str, size: int) -> None:
+        """Record an entry of `size` bytes added to the cache."""
+        with self._lock:
+            metrics = self._namespace(key)
+            metrics.entries += 1
+            metrics.bytes_stored += size
+
+    def removed(self, key: str, size: int) -> None:
+        """Record an entry of `size` bytes leaving the cache."""
+        with self._lock:
+            metrics = self._namespace(key)
+            metrics.entries -= 1
+            metrics.bytes_stored -= size
+
+    def observe(self, key: str, operation: str, seconds: float) -> None:
+        """Record the latency of a "get" or "set" operation."""
+        with self._lock:
+            metrics = self._namespace(key)
+            histogram = metrics.get_latency if operation == "get" else metrics.set_latency
+            histogram.observe(seconds)
+
+    def hit_rate(self) -> float:
+        """Fraction of lookups across all namespaces that were served from cache."""
+        with self._lock:
+            served = lookups = 0
+            for metrics in self.namespaces.values():
+                hits = (
+                    metrics.counters["hits"]
+                    + metrics.counters["stale_hits"]
+                    + metrics.counters["superset_hits"]
+                )
+                served += hits
+                lookups += hits + metrics.counters["misses"]
+        return served / lookups if lookups else 0.0
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """Get all metrics by namespace."""
+        with self._lock:
+            return {name: metrics.to_dict() for name, metrics in sorted(self.namespaces.items())}
+
+    def reset(self) -> None:
+        """Drop all recorded metrics."""
+        with self._lock:
+            self.namespaces.clear()
+
+    def render_prometheus(self, prefix: str = "jobspy_cache") -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            namespaces = sorted(self.namespaces.items())
+
+            for counter in COUNTERS:
+                name = f"{prefix}_{counter}_total"
+                lines.append(f"# TYPE {name} counter")
+                for ns, metrics in namespaces:
+                    lines.append(f'{name}{{namespace="{ns}"}} {metrics.counters[counter]}')
+
+            for gauge in ("entries", "bytes_stored"):
+                name = f"{prefix}_{gauge}"
+                lines.append(f"# TYPE {name} gauge")
+                for ns, metrics in namespaces:
+                    lines.append(f'{name}{{namespace="{ns}"}} {getattr(metrics, gauge)}')
+
+            for operation in ("get", "set"):
+                name = f"{prefix}_{operation}_duration_seconds"
+                lines.append(f"# TYPE {name} histogram")
+                for ns, metrics in namespaces:
+                    histogram = metrics.get_latency if operation == "get" else metrics.set_latency
+                    for bound, running in histogram.cumulative():
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f'{name}_bucket{{namespace="{ns}",le="{le}"}} {running}')
+                    lines.append(f'{name}_sum{{namespace="{ns}"}} {histogram.sum}')
+                    lines.append(f'{name}_count{{namespace="{ns}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional, List
+from typing import Optional, List, Dict
 import os
 
 def parse_list(value: str) -> List[str]:
@@ -53,10 +53,90 @@ class Settings(BaseSettings):
     DEFAULT_DISTANCE: int = 50
     DEFAULT_DESCRIPTION_FORMAT: str = "markdown"
     DEFAULT_COUNTRY_INDEED: Optional[str] = None
-    
+
+    # Scrape Executor
+    SCRAPE_EXECUTOR_TYPE: str = "thread"  # thread or process
+    SCRAPE_MAX_WORKERS: int = 8
+    SCRAPE_SITE_CONCURRENCY: int = 2
+    SCRAPE_SITE_CONCURRENCY_OVERRIDES: str = ""  # e.g. "linkedin:1,glassdoor:1"
+
+    # Failing Job Sites
+    SCRAPE_FAILURE_CACHE_TTL: int = 60  # Skip an identical site search this long after it failed (0 disables)
+    SCRAPE_BREAKER_ENABLED: bool = True
+    SCRAPE_BREAKER_WINDOW: int = 300  # Seconds of recent scrapes used to compute a site's failure rate
+    SCRAPE_BREAKER_MIN_REQUESTS: int = 4  # Scrapes needed in the window before a site's circuit can open
+    SCRAPE_BREAKER_FAILURE_RATE: float = 0.5
+    SCRAPE_BREAKER_COOLDOWN: int = 120  # Seconds a site is skipped before a probe scrape is allowed
+
+    # Search Coalescing
+    SEARCH_COALESCE_ENABLED: bool = True
+    SEARCH_COALESCE_DISTRIBUTED: bool = True  # Coordinate across workers via Redis when REDIS_URL is set
+    SEARCH_COALESCE_LOCK_TTL: int = 300
+    SEARCH_COALESCE_RESULT_TTL: int = 60
+
+    # Search Deadlines (timeout_ms)
+    SEARCH_TIMEOUT_MS: int = 0  # Default search deadline; sites still scraping are returned later (0 = wait for all)
+
+    # Search Jobs (POST /api/v1/searches)
+    SEARCH_JOBS_USE_WORKERS: bool = True  # Run search jobs on the Celery workers when Redis is available
+    SEARCH_JOB_PREFIX: str = "jobspy:search_job:"
+    SEARCH_JOB_TTL: int = 86400  # Seconds search job status and results are kept
+    SEARCH_JOB_CHUNK_ROWS: int = 100  # Jobs per stored result chunk
+    SEARCH_JOB_POLL_INTERVAL: float = 0.5  # Seconds between status checks while long-polling
+    SEARCH_JOB_MAX_WAIT: int = 30  # Longest long-poll wait in seconds
+
+    # Batch Searches (POST /api/v1/search_jobs/batch)
+    BATCH_SEARCH_MAX_QUERIES: int = 100  # Most searches accepted in one batch
+    BATCH_SEARCH_CONCURRENCY: int = 4  # Searches of a batch running at once; the scrape executor's site limits still apply
+
+    # Result Refinement (GET /api/v1/search_jobs/refine)
+    REFINE_MAX_RESULTS: int = 16  # Prepared result sets kept in memory per worker
+
+    # Columnar Output (format=arrow|parquet)
+    COLUMNAR_BATCH_ROWS: int = 5000  # Rows per Arrow record batch and Parquet row group
+
+    # Ingest Queue (scraped jobs saved by app.workers.data_processor)
+    INGEST_QUEUE_ENABLED: bool = True  # Queue scraped jobs in a Redis stream when REDIS_URL is set, instead of saving them in the API worker
+    INGEST_STREAM: str = "jobspy:ingest"
+    INGEST_CONSUMER_GROUP: str = "data_processor"
+    INGEST_STREAM_MAXLEN: int = 100000  # Approximate cap on queued entries
+    INGEST_BATCH_SIZE: int = 20  # Stream entries (one site's jobs each) saved per database session
+    INGEST_BLOCK_MS: int = 2000  # How long an idle consumer waits for new entries per read
+    INGEST_CLAIM_IDLE_MS: int = 300000  # Entries unacknowledged this long are retried by another consumer
+    INGEST_MAX_DELIVERIES: int = 5  # Attempts before an entry is moved to the dead-letter stream
+    INGEST_TASK_MAX_BATCHES: int = 50  # Stream reads per drain_ingest_queue Celery task
+    INGEST_BULK_ENABLED: bool = True  # Save each batch with set-based upserts and one commit, instead of job by job
+    INGEST_RESOLVE_PREFIX: str = "jobspy:resolve:"  # Redis hashes of company, location and category IDs shared by ingest workers
+    INGEST_RESOLVE_REFRESH: int = 3600  # Seconds between reloads of the ID cache from the database
+    INGEST_RESOLVE_PRELOAD_LIMIT: int = 200000  # Most recent companies and locations preloaded per worker
+
+    # Deduplication (MinHash-LSH index of job postings, app.services.dedup_index)
+    DEDUP_LSH_PERMUTATIONS: int = 64  # MinHash signature length (rebuild the index after changing it)
+    DEDUP_LSH_BANDS: int = 16  # Signature bands; more bands also find less similar jobs (rebuild the index after changing it)
+    DEDUP_MAX_CANDIDATES: int = 100  # Candidates scored per job, most shared bands first
+
     # Caching
     ENABLE_CACHE: bool = True
     CACHE_EXPIRY: int = 3600
+    CACHE_STALE_TTL: int = 0  # Serve expired search results this much longer while refreshing
+    CACHE_MAX_ENTRIES: int = 1000
+    CACHE_MAX_BYTES: int = 268435456  # 256 MB
+    CACHE_SWEEP_INTERVAL: int = 300
+    CACHE_L2_ENABLED: bool = True  # Share cached results across workers via Redis when REDIS_URL is set
+    CACHE_L2_PREFIX: str = "jobspy:cache:"
+    CACHE_INVALIDATION_CHANNEL: str = "jobspy:cache:invalidate"
+    CACHE_DATAFRAME_FORMAT: str = "arrow"  # arrow, parquet or json
+    CACHE_COMPRESSION: str = "zstd"  # zstd or none
+    CACHE_COMPRESSION_LEVEL: int = 3
+    CACHE_COMPRESSION_MIN_BYTES: int = 1024
+
+    # Cache Warming
+    CACHE_WARM_ENABLED: bool = False
+    CACHE_WARM_SEARCHES_FILE: str = "recurring_searches.json"  # Searches to keep warm, besides admin templates
+    CACHE_WARM_LEAD_TIME: int = 120  # Re-scrape this many seconds before a cached search expires
+    CACHE_WARM_INTERVAL: int = 300  # Longest wait between warming checks
+    CACHE_WARM_CONCURRENCY: int = 2
+    CACHE_WARM_MAX_SCRAPES_PER_HOUR: int = 60  # Outbound site scrapes the warmer may run per hour
     
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -97,7 +177,19 @@ class Settings(BaseSettings):
     def default_site_names_list(self) -> List[str]:
         """Parse DEFAULT_SITE_NAMES string into list."""
         return parse_list(self.DEFAULT_SITE_NAMES)
-    
+
+    @property
+    def scrape_site_concurrency_map(self) -> Dict[str, int]:
+        """Parse SCRAPE_SITE_CONCURRENCY_OVERRIDES ("site:limit,...") into a dict."""
+        overrides = {}
+        for item in parse_list(self.SCRAPE_SITE_CONCURRENCY_OVERRIDES):
+            site, _, limit = item.partition(':')
+            try:
+                overrides[site.strip().lower()] = int(limit)
+            except ValueError:
+                continue
+        return overrides
+
     @property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS_ORIGINS string into list."""
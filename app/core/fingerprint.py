@@ -0,0 +1,104 @@
+"""
+Canonical query fingerprints for cache keys.
+
+Equivalent searches must map to the same cache entry in every worker and across
+restarts, so fingerprints never use Python's per-process randomized hash().
+Parameters are normalized first: strings are trimmed, whitespace-collapsed and
+lower-cased, lists are de-duplicated and sorted, unset values and values equal
+to their defaults are dropped, and parameters that do not change the results
+(proxies, verbosity, ...) are ignored. The canonical form is then hashed with
+SHA-256.
+"""
+import hashlib
+import json
+import re
+from typing import Any, Dict, Iterable, Optional
+
+# JobSpy's own defaults for scrape_jobs(); a parameter set to its default is the
+# same query as leaving it out
+JOBSPY_DEFAULTS: Dict[str, Any] = {
+    "distance": 50,
+    "is_remote": False,
+    "results_wanted": 15,
+    "country_indeed": "usa",
+    "description_format": "markdown",
+    "linkedin_fetch_description": False,
+    "offset": 0,
+    "enforce_annual_salary": False,
+}
+
+# Parameters that affect how a search is executed but not what it returns
+NON_QUERY_PARAMS = frozenset({"proxies", "ca_cert", "verbose", "user_agent"})
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize_value(value: Any) -> Any:
+    if isinstance(value, str):
+        return _WHITESPACE.sub(" ", value.strip()).lower()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = {json.dumps(_normalize_value(item), sort_keys=True, default=str) for item in value}
+        return [json.loads(item) for item in sorted(items)]
+    if isinstance(value, dict):
+        return {str(k): _normalize_value(v) for k, v in value.items()}
+    return value
+
+
+def canonicalize(
+    params: Dict[str, Any],
+    defaults: Optional[Dict[str, Any]] = None,
+    ignore: Iterable[str] = NON_QUERY_PARAMS,
+) -> Dict[str, Any]:
+    """
+    Normalize query parameters into their canonical form.
+
+    Args:
+        params: Query parameters
+        defaults: Default values; parameters equal to their default are dropped
+        ignore: Parameter names excluded from the canonical form
+
+    Returns:
+        Canonical parameters, sorted by name
+    """
+    defaults = defaults or {}
+    ignore = set(ignore)
+    canonical = {}
+    for name in sorted(params):
+        if name in ignore:
+            continue
+        value = _normalize_value(params[name])
+        if value is None or value == "" or value == []:
+            continue
+        if name in defaults and value == _normalize_value(defaults[name]):
+            continue
+        canonical[name] = value
+    return canonical
+
+
+def fingerprint(
+    params: Dict[str, Any],
+    namespace: Optional[str] = None,
+    defaults: Optional[Dict[str, Any]] = None,
+    ignore: Iterable[str] = NON_QUERY_PARAMS,
+) -> str:
+    """
+    Build a stable fingerprint for a query.
+
+    Args:
+        params: Query parameters
+        namespace: Optional prefix identifying the kind of query, e.g. "search"
+        defaults: Default values; parameters equal to their default are dropped
+        ignore: Parameter names excluded from the fingerprint
+
+    Returns:
+        Hex SHA-256 digest, prefixed with "<namespace>:" when a namespace is given
+    """
+    canonical = canonicalize(params, defaults=defaults, ignore=ignore)
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.sha256(payload.encode()).hexdigest()
+    return f"{namespace}:{digest}" if namespace else digest
+
+
+def search_fingerprint(params: Dict[str, Any], namespace: str = "search") -> str:
+    """Fingerprint JobSpy search parameters, treating JobSpy defaults as unset."""
+    return fingerprint(params, namespace=namespace, defaults=JOBSPY_DEFAULTS)
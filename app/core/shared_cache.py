@@ -0,0 +1,195 @@
+"""
+Shared Redis/Valkey tier for the search cache.
+
+JobSearchCache keeps a small per-process L1. This module provides the L2 that
+all API and Celery workers share: entries are written through to Redis,
+encoded with the binary cache codec and prefixed with their original timestamp.
+They are read through on an L1 miss, and every write or delete is announced on a
+pub/sub channel so other workers drop their L1 copy.
+"""
+import asyncio
+import json
+import logging
+import struct
+import threading
+import uuid
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.cache_codecs import CacheCodec, CodecError, cache_codec
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Entry header: original cache timestamp and per-entry expiry (0 = default)
+ENTRY_HEADER = struct.Struct("!dI")
+
+
+class SharedCacheTier:
+    """Redis-backed L2 cache tier with pub/sub invalidation."""
+
+    def __init__(
+        self,
+        prefix: Optional[str] = None,
+        channel: Optional[str] = None,
+        client: Any = None,
+        codec: Optional[CacheCodec] = None,
+    ):
+        """
+        Initialize the shared tier.
+
+        Args:
+            prefix: Key prefix for cache entries (defaults to CACHE_L2_PREFIX)
+            channel: Pub/sub channel for invalidations (defaults to CACHE_INVALIDATION_CHANNEL)
+            client: Binary Redis client (created lazily from REDIS_URL if omitted)
+            codec: Codec for entry values (defaults to the global cache codec)
+        """
+        self.prefix = prefix or settings.CACHE_L2_PREFIX
+        self.channel = channel or settings.CACHE_INVALIDATION_CHANNEL
+        self.codec = codec or cache_codec
+        # Lets a worker ignore its own invalidation messages
+        self.instance_id = str(uuid.uuid4())
+
+        self._client = client
+        self._client_failed = False
+        self._pubsub = None
+        self._listener: Optional[threading.Thread] = None
+
+    @property
+    def client(self) -> Any:
+        """Resolve the Redis client, or None if Redis is unavailable."""
+        if self._client is None and not self._client_failed:
+            try:
+                from app.core.cache_backend import RedisCompatibleBackend
+                self._client = RedisCompatibleBackend(codec=self.codec).client
+            except Exception as e:
+                logger.warning(f"Redis unavailable, search cache is per-worker only: {e}")
+                self._client_failed = True
+        return self._client
+
+    def _entry_key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def _family_key(self, family_key: str) -> str:
+        return f"{self.prefix}family:{family_key}"
+
+    def _encode(self, timestamp: float, data: Any, expire: Optional[int]) -> bytes:
+        return ENTRY_HEADER.pack(timestamp, expire or 0) + self.codec.encode(data)
+
+    def _decode(self, raw: bytes) -> Optional[Tuple[float, Any, Optional[int]]]:
+        try:
+            timestamp, expire = ENTRY_HEADER.unpack_from(raw)
+            data = self.codec.decode(raw[ENTRY_HEADER.size:])
+        except (struct.error, CodecError, TypeError) as e:
+            logger.warning(f"Discarding undecodable shared cache entry: {e}")
+            return None
+        return timestamp, data, expire or None
+
+    async def get(self, key: str) -> Optional[Tuple[float, Any, Optional[int]]]:
+        """
+        Read an entry from Redis.
+
+        Returns:
+            Tuple of (timestamp, data, expire), or None on a miss
+        """
+        client = self.client
+        if client is None:
+            return None
+        try:
+            raw = await asyncio.to_thread(client.get, self._entry_key(key))
+        except Exception as e:
+            logger.warning(f"Shared cache get error for key '{key}': {e}")
+            return None
+        return self._decode(raw) if raw is not None else None
+
+    async def set(self, key: str, timestamp: float, data: Any, expire: Optional[int], ttl: int) -> None:
+        """Write an entry to Redis and tell other workers to drop their copy."""
+        client = self.client
+        if client is None:
+            return
+        try:
+            value = self._encode(timestamp, data, expire)
+            await asyncio.to_thread(client.set, self._entry_key(key), value, ex=max(1, int(ttl)))
+            await self._publish(key)
+        except Exception as e:
+            logger.warning(f"Shared cache set error for key '{key}': {e}")
+
+    async def delete(self, key: str) -> None:
+        """Delete an entry from Redis and tell other workers to drop their copy."""
+        client = self.client
+        if client is None:
+            return
+        try:
+            await asyncio.to_thread(client.delete, self._entry_key(key))
+            await self._publish(key)
+        except Exception as e:
+            logger.warning(f"Shared cache delete error for key '{key}': {e}")
+
+    async def add_to_family(self, family_key: str, key: str, window: Dict[str, Any], ttl: int) -> None:
+        """Record which result window a shared entry covers, for superset lookups."""
+        client = self.client
+        if client is None:
+            return
+        redis_key = self._family_key(family_key)
+        try:
+            await asyncio.to_thread(client.hset, redis_key, key, json.dumps(window))
+            await asyncio.to_thread(client.expire, redis_key, max(1, int(ttl)))
+        except Exception as e:
+            logger.warning(f"Shared cache family update error for '{family_key}': {e}")
+
+    async def get_family(self, family_key: str) -> Dict[str, Dict[str, Any]]:
+        """Get the result windows of all shared entries in a family."""
+        client = self.client
+        if client is None:
+            return {}
+        try:
+            members = await asyncio.to_thread(client.hgetall, self._family_key(family_key))
+        except Exception as e:
+            logger.warning(f"Shared cache family read error for '{family_key}': {e}")
+            return {}
+        return {
+            key.decode() if isinstance(key, bytes) else key: json.loads(window)
+            for key, window in (members or {}).items()
+        }
+
+    async def _publish(self, key: str) -> None:
+        message = json.dumps({"key": key, "origin": self.instance_id})
+        await asyncio.to_thread(self.client.publish, self.channel, message)
+
+    def start_listener(self, on_invalidate: Callable[[str], None]) -> None:
+        """
+        Subscribe to invalidations from other workers.
+
+        The subscriber runs in a background thread; `on_invalidate` is called on
+        the current event loop with the invalidated key.
+        """
+        client = self.client
+        if client is None or self._listener is not None:
+            return
+
+        loop = asyncio.get_running_loop()
+
+        def handle(message: Dict[str, Any]) -> None:
+            try:
+                payload = json.loads(message["data"])
+            except (ValueError, KeyError, TypeError):
+                return
+            if payload.get("origin") != self.instance_id and payload.get("key"):
+                loop.call_soon_threadsafe(on_invalidate, payload["key"])
+
+        try:
+            self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+            self._pubsub.subscribe(**{self.channel: handle})
+            self._listener = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+            logger.info(f"Listening for search cache invalidations on {self.channel}")
+        except Exception as e:
+            logger.warning(f"Could not subscribe to cache invalidations: {e}")
+            self._pubsub = None
+
+    def stop_listener(self) -> None:
+        """Stop the invalidation subscriber."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        if self._pubsub is not None:
+            self._pubsub.close()
+            self._pubsub = None
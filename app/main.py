@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 import subprocess
@@ -16,7 +17,8 @@ from app.core.config import settings
 from app.core.logging_config import get_logger, setup_logging
 from app.middleware.rate_limiter import RateLimitMiddleware
 from app.middleware.request_logger import RequestLoggerMiddleware
-from app.routes import api, health
+from app.routes import api, health, searches
+from app.services.scrape_executor import scrape_executor
 from app.utils.env_debugger import log_environment_settings
 from app.utils.error_handlers import (
     general_exception_handler,
@@ -81,12 +83,34 @@ async def lifespan(app: FastAPI):
     else:
         logger.warning("API key authentication is disabled. Set ENABLE_API_KEY_AUTH=true to enable.")
     
+    # Periodically drop expired cache entries so memory is reclaimed without a repeat lookup
+    cache_sweeper = None
+    if cache.enabled and settings.CACHE_SWEEP_INTERVAL > 0:
+        cache_sweeper = asyncio.create_task(cache.sweep_periodically(settings.CACHE_SWEEP_INTERVAL))
+    
+    # Drop local cache entries when another worker updates them in Redis
+    if cache.l2 is not None:
+        cache.l2.start_listener(cache.invalidate_local)
+    
+    # Re-scrape recurring and template searches before their cached results expire
+    cache_warming = None
+    if cache.enabled and settings.CACHE_WARM_ENABLED:
+        from app.services.cache_warmer import cache_warmer
+        cache_warming = asyncio.create_task(cache_warmer.run_periodically())
+    
     # Yield control to the application
     yield
     
     # Shutdown: Clean up resources
     logger.info("Shutting down JobSpy Docker API")
+    if cache_sweeper is not None:
+        cache_sweeper.cancel()
+    if cache_warming is not None:
+        cache_warming.cancel()
+    if cache.l2 is not None:
+        cache.l2.stop_listener()
     cache.clear()
+    scrape_executor.shutdown()
 
 # Create FastAPI app with enhanced documentation
 app = FastAPI(
@@ -176,6 +200,7 @@ async def log_requests(request: Request, call_next):
 
 # Include routers
 app.include_router(api.router, prefix="/api/v1", tags=["Jobs"])
+app.include_router(searches.router, prefix="/api/v1/searches", tags=["Search Jobs"])
 app.include_router(health.router, tags=["Health"])
 
 # Include tracking jobs API router with new schema
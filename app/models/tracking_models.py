@@ -2,7 +2,7 @@
 SQLAlchemy models for job tracking system with TimescaleDB optimization.
 """
 from sqlalchemy import (
-    Column, Integer, String, Text, Boolean, DECIMAL, DateTime, Date,
+    Column, Integer, BigInteger, SmallInteger, String, Text, Boolean, DECIMAL, DateTime, Date,
     ForeignKey, Index, UniqueConstraint, CheckConstraint, ARRAY
 )
 from sqlalchemy.dialects.postgresql import JSONB
@@ -19,6 +19,8 @@ class Company(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
+    # Lower-cased name without legal suffixes (JobDeduplicationService._normalize_company_name)
+    normalized_name = Column(String(255), unique=True, index=True)
     domain = Column(String(255), index=True)
     industry = Column(String(100), index=True)
     company_size = Column(String(50))  # e.g., "1-10", "11-50", "51-200", etc.
@@ -152,6 +154,20 @@ class JobPosting(Base):
     )
 
 
+class JobDedupBucket(Base):
+    """
+    MinHash-LSH index over job postings for fuzzy deduplication.
+    One row per band of a posting's MinHash signature (see app.services.dedup_index).
+    """
+    __tablename__ = "job_dedup_buckets"
+    
+    band = Column(SmallInteger, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)
+    job_posting_id = Column(
+        Integer, ForeignKey('job_postings.id', ondelete='CASCADE'), primary_key=True, index=True
+    )
+
+
 class JobSource(Base):
     """
     Track where jobs are posted across different platforms.
@@ -30,6 +30,10 @@ class JobResponse(BaseModel):
     count: int
     jobs: List[Dict[str, Any]]
     cached: bool = False
+    stale: bool = False
+    skipped_sites: Dict[str, str] = {}
+    partial: bool = False
+    timed_out_sites: List[str] = []
 
 class PaginatedJobResponse(BaseModel):
     count: int
@@ -38,6 +42,40 @@ class PaginatedJobResponse(BaseModel):
     page_size: int
     jobs: List[Dict[str, Any]]
     cached: bool = False
+    stale: bool = False
+    skipped_sites: Dict[str, str] = {}
+    partial: bool = False
+    timed_out_sites: List[str] = []
+    result_id: Optional[str] = None
+    next_page: Optional[str] = None
+    previous_page: Optional[str] = None
+
+class SearchJobResponse(BaseModel):
+    id: str
+    status: str
+    version: int
+    params: Dict[str, Any] = {}
+    created_at: str
+    started_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    count: Optional[int] = None
+    error: Optional[str] = None
+    cached: bool = False
+    stale: bool = False
+    skipped_sites: Dict[str, str] = {}
+    partial: bool = False
+    timed_out_sites: List[str] = []
+    status_url: str
+    results_url: str
+    events_url: str
+
+class SearchJobResultsResponse(BaseModel):
+    id: str
+    count: int
+    total_pages: int
+    current_page: int
+    page_size: int
+    jobs: List[Dict[str, Any]]
     next_page: Optional[str] = None
     previous_page: Optional[str] = None
 
@@ -17,6 +17,7 @@ from app.services.admin_service import AdminService
 logger = logging.getLogger(__name__)
 from app.services.job_service import JobService
 from app.services.celery_scheduler import get_celery_scheduler
+from app.utils.columnar import COLUMNAR_FORMATS, columnar_response, cursor_to_table, require_columnar
 
 router = APIRouter()
 
@@ -50,7 +51,7 @@ async def execute_scheduled_search(search_id: str, search_params: dict, db: Sess
         db.commit()
         
         # Execute the actual job search
-        jobs_df, _ = JobService.search_jobs({
+        jobs_df, _ = await JobService.search_jobs({
             "site_name": search_params.get("site_names", ["indeed"]),
             "search_term": search_params.get("search_term"),
             "location": search_params.get("location"),
@@ -4144,6 +4145,205 @@ async def get_jobs_stats(
             "error": str(e)
         }
 
+@router.get("/jobs/export")
+async def export_jobs(
+    format: str = Query("csv", regex="^(csv|json|arrow|parquet)$"),
+    search: Optional[str] = Query(None),
+    company: Optional[str] = Query(None),
+    location: Optional[str] = Query(None),
+    platform: Optional[str] = Query(None),
+    job_type: Optional[str] = Query(None),
+    is_remote: Optional[bool] = Query(None),
+    salary_min: Optional[int] = Query(None),
+    salary_max: Optional[int] = Query(None),
+    days_ago: Optional[int] = Query(None),
+    db: Session = Depends(get_db),
+    admin_user: dict = Depends(get_admin_user)
+):
+    """Export jobs data in CSV, JSON, Arrow (IPC stream) or Parquet format"""
+    if format in COLUMNAR_FORMATS:
+        require_columnar(format)
+    try:
+        from fastapi.responses import StreamingResponse
+        import csv
+        import json
+        from io import StringIO
+        from datetime import datetime, timedelta
+        
+        # Build WHERE conditions based on filters
+        where_conditions = ["jp.status = 'active'"]
+        params = {}
+        
+        if search:
+            where_conditions.append("(jp.title ILIKE :search OR c.name ILIKE :search OR jp.description ILIKE :search)")
+            params["search"] = f"%{search}%"
+        
+        if company:
+            where_conditions.append("c.name ILIKE :company")
+            params["company"] = f"%{company}%"
+        
+        if location:
+            where_conditions.append("l.city ILIKE :location OR l.state ILIKE :location OR l.country ILIKE :location")
+            params["location"] = f"%{location}%"
+        
+        if platform:
+            where_conditions.append("js.source_site = :platform")
+            params["platform"] = platform
+        
+        if job_type:
+            where_conditions.append("jp.job_type = :job_type")
+            params["job_type"] = job_type
+        
+        if is_remote is not None:
+            where_conditions.append("jp.is_remote = :is_remote")
+            params["is_remote"] = is_remote
+        
+        if salary_min:
+            where_conditions.append("jp.salary_min >= :salary_min")
+            params["salary_min"] = salary_min
+        
+        if salary_max:
+            where_conditions.append("jp.salary_max <= :salary_max")
+            params["salary_max"] = salary_max
+        
+        if days_ago:
+            date_cutoff = datetime.now() - timedelta(days=days_ago)
+            where_conditions.append("jp.date_posted >= :date_cutoff")
+            params["date_cutoff"] = date_cutoff
+        
+        where_clause = " AND ".join(where_conditions)
+        
+        export_sql = f"""
+            SELECT 
+                jp.id, jp.external_id, jp.title, jp.description, jp.requirements,
+                jp.job_type, jp.experience_level, jp.salary_min, jp.salary_max, 
+                jp.salary_currency, jp.salary_interval, jp.is_remote, jp.easy_apply,
+                jp.job_url, jp.application_url, jp.source_platform,
+                jp.created_at, jp.last_seen_at,
+                c.name as company_name, c.domain as company_domain,
+                c.industry, c.company_size, c.headquarters_location,
+                CONCAT_WS(', ', l.city, l.state, l.country) as location
+            FROM job_postings jp
+            LEFT JOIN companies c ON jp.company_id = c.id
+            LEFT JOIN locations l ON jp.location_id = l.id
+            LEFT JOIN job_sources js ON jp.id = js.job_posting_id
+            WHERE {where_clause}
+            ORDER BY jp.date_posted DESC
+            LIMIT 10000
+        """
+        
+        result = db.execute(text(export_sql), params)
+        
+        if format in COLUMNAR_FORMATS:
+            # Read the cursor in batches straight into Arrow columns
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            return columnar_response(cursor_to_table(result), format, f"jobs_export_{timestamp}")
+        
+        rows = result.fetchall()
+        
+        if format == "csv":
+            output = StringIO()
+            writer = csv.writer(output)
+            
+            # Write header
+            writer.writerow([
+                'ID', 'External ID', 'Title', 'Company Name', 'Location', 'Job Type',
+                'Experience Level', 'Salary Min', 'Salary Max', 'Currency', 'Salary Interval',
+                'Remote', 'Easy Apply', 'Platform', 'Date Posted', 'Date Scraped',
+                'Job URL', 'Application URL', 'Company Domain', 'Industry', 
+                'Company Size', 'Headquarters', 'Skills', 'Description', 'Requirements'
+            ])
+            
+            # Write data
+            for row in rows:
+                writer.writerow([
+                    row.id, row.external_id, row.title, row.company_name, row.location,
+                    row.job_type, row.experience_level, row.salary_min, row.salary_max,
+                    row.salary_currency, row.salary_interval, row.is_remote, row.easy_apply,
+                    row.created_at, row.last_seen_at,
+                    row.job_url, row.application_url, row.company_domain, row.industry,
+                    row.company_size, row.headquarters_location, row.skills,
+                    row.description, row.requirements
+                ])
+            
+            output.seek(0)
+            
+            def generate():
+                yield output.getvalue()
+            
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"jobs_export_{timestamp}.csv"
+            
+            return StreamingResponse(
+                generate(),
+                media_type="text/csv",
+                headers={"Content-Disposition": f"attachment; filename={filename}"}
+            )
+        
+        elif format == "json":
+            jobs_data = []
+            for row in rows:
+                jobs_data.append({
+                    "id": row.id,
+                    "external_id": row.job_hash,
+                    "title": row.title,
+                    "company_name": row.company_name,
+                    "company_domain": row.company_domain,
+                    "company_industry": row.industry,
+                    "company_size": row.company_size,
+                    "company_headquarters": row.headquarters_location,
+                    "location": row.location,
+                    "description": row.description,
+                    "requirements": row.requirements,
+                    "job_type": row.job_type,
+                    "experience_level": row.experience_level,
+                    "salary_min": float(row.salary_min) if row.salary_min else None,
+                    "salary_max": float(row.salary_max) if row.salary_max else None,
+                    "salary_currency": row.salary_currency,
+                    "salary_interval": row.salary_interval,
+                    "is_remote": row.is_remote,
+                    "easy_apply": row.easy_apply,
+                    "job_url": row.job_url,
+                    "application_url": row.apply_url,
+                    "source_platform": row.source_site,
+                    "date_posted": row.post_date.strftime('%Y-%m-%d') if row.post_date else None,
+                    "date_scraped": row.created_at.strftime('%Y-%m-%d %H:%M:%S') if row.created_at else None,
+                    "last_seen": row.last_seen.strftime('%Y-%m-%d %H:%M:%S') if row.last_seen else None,
+                    "skills": row.skills
+                })
+            
+            def generate():
+                yield json.dumps({
+                    "export_info": {
+                        "timestamp": datetime.now().isoformat(),
+                        "total_jobs": len(jobs_data),
+                        "filters_applied": {
+                            "search": search,
+                            "company": company,
+                            "location": location,
+                            "platform": platform,
+                            "job_type": job_type,
+                            "is_remote": is_remote,
+                            "salary_min": salary_min,
+                            "salary_max": salary_max,
+                            "days_ago": days_ago
+                        }
+                    },
+                    "jobs": jobs_data
+                }, indent=2)
+            
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"jobs_export_{timestamp}.json"
+            
+            return StreamingResponse(
+                generate(),
+                media_type="application/json",
+                headers={"Content-Disposition": f"attachment; filename={filename}"}
+            )
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+
 @router.get("/jobs")
 async def get_jobs(
     page: int = Query(1, ge=1),
@@ -4353,197 +4553,6 @@ async def get_job_details(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/jobs/export")
-async def export_jobs(
-    format: str = Query("csv", regex="^(csv|json)$"),
-    search: Optional[str] = Query(None),
-    company: Optional[str] = Query(None),
-    location: Optional[str] = Query(None),
-    platform: Optional[str] = Query(None),
-    job_type: Optional[str] = Query(None),
-    is_remote: Optional[bool] = Query(None),
-    salary_min: Optional[int] = Query(None),
-    salary_max: Optional[int] = Query(None),
-    days_ago: Optional[int] = Query(None),
-    db: Session = Depends(get_db),
-    admin_user: dict = Depends(get_admin_user)
-):
-    """Export jobs data in CSV or JSON format"""
-    try:
-        from fastapi.responses import StreamingResponse
-        import csv
-        import json
-        from io import StringIO
-        from datetime import datetime, timedelta
-        
-        # Build WHERE conditions based on filters
-        where_conditions = ["jp.status = 'active'"]
-        params = {}
-        
-        if search:
-            where_conditions.append("(jp.title ILIKE :search OR c.name ILIKE :search OR jp.description ILIKE :search)")
-            params["search"] = f"%{search}%"
-        
-        if company:
-            where_conditions.append("c.name ILIKE :company")
-            params["company"] = f"%{company}%"
-        
-        if location:
-            where_conditions.append("l.city ILIKE :location OR l.state ILIKE :location OR l.country ILIKE :location")
-            params["location"] = f"%{location}%"
-        
-        if platform:
-            where_conditions.append("js.source_site = :platform")
-            params["platform"] = platform
-        
-        if job_type:
-            where_conditions.append("jp.job_type = :job_type")
-            params["job_type"] = job_type
-        
-        if is_remote is not None:
-            where_conditions.append("jp.is_remote = :is_remote")
-            params["is_remote"] = is_remote
-        
-        if salary_min:
-            where_conditions.append("jp.salary_min >= :salary_min")
-            params["salary_min"] = salary_min
-        
-        if salary_max:
-            where_conditions.append("jp.salary_max <= :salary_max")
-            params["salary_max"] = salary_max
-        
-        if days_ago:
-            date_cutoff = datetime.now() - timedelta(days=days_ago)
-            where_conditions.append("jp.date_posted >= :date_cutoff")
-            params["date_cutoff"] = date_cutoff
-        
-        where_clause = " AND ".join(where_conditions)
-        
-        export_sql = f"""
-            SELECT 
-                jp.id, jp.external_id, jp.title, jp.description, jp.requirements,
-                jp.job_type, jp.experience_level, jp.salary_min, jp.salary_max, 
-                jp.salary_currency, jp.salary_interval, jp.is_remote, jp.easy_apply,
-                jp.job_url, jp.application_url, jp.source_platform,
-                jp.created_at, jp.last_seen_at,
-                c.name as company_name, c.domain as company_domain,
-                c.industry, c.company_size, c.headquarters_location,
-                CONCAT_WS(', ', l.city, l.state, l.country) as location
-            FROM job_postings jp
-            LEFT JOIN companies c ON jp.company_id = c.id
-            LEFT JOIN locations l ON jp.location_id = l.id
-            LEFT JOIN job_sources js ON jp.id = js.job_posting_id
-            WHERE {where_clause}
-            ORDER BY jp.date_posted DESC
-            LIMIT 10000
-        """
-        
-        result = db.execute(text(export_sql), params)
-        rows = result.fetchall()
-        
-        if format == "csv":
-            output = StringIO()
-            writer = csv.writer(output)
-            
-            # Write header
-            writer.writerow([
-                'ID', 'External ID', 'Title', 'Company Name', 'Location', 'Job Type',
-                'Experience Level', 'Salary Min', 'Salary Max', 'Currency', 'Salary Interval',
-                'Remote', 'Easy Apply', 'Platform', 'Date Posted', 'Date Scraped',
-                'Job URL', 'Application URL', 'Company Domain', 'Industry', 
-                'Company Size', 'Headquarters', 'Skills', 'Description', 'Requirements'
-            ])
-            
-            # Write data
-            for row in rows:
-                writer.writerow([
-                    row.id, row.external_id, row.title, row.company_name, row.location,
-                    row.job_type, row.experience_level, row.salary_min, row.salary_max,
-                    row.salary_currency, row.salary_interval, row.is_remote, row.easy_apply,
-                    row.created_at, row.last_seen_at,
-                    row.job_url, row.application_url, row.company_domain, row.industry,
-                    row.company_size, row.headquarters_location, row.skills,
-                    row.description, row.requirements
-                ])
-            
-            output.seek(0)
-            
-            def generate():
-                yield output.getvalue()
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"jobs_export_{timestamp}.csv"
-            
-            return StreamingResponse(
-                generate(),
-                media_type="text/csv",
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
-            )
-        
-        elif format == "json":
-            jobs_data = []
-            for row in rows:
-                jobs_data.append({
-                    "id": row.id,
-                    "external_id": row.job_hash,
-                    "title": row.title,
-                    "company_name": row.company_name,
-                    "company_domain": row.company_domain,
-                    "company_industry": row.industry,
-                    "company_size": row.company_size,
-                    "company_headquarters": row.headquarters_location,
-                    "location": row.location,
-                    "description": row.description,
-                    "requirements": row.requirements,
-                    "job_type": row.job_type,
-                    "experience_level": row.experience_level,
-                    "salary_min": float(row.salary_min) if row.salary_min else None,
-                    "salary_max": float(row.salary_max) if row.salary_max else None,
-                    "salary_currency": row.salary_currency,
-                    "salary_interval": row.salary_interval,
-                    "is_remote": row.is_remote,
-                    "easy_apply": row.easy_apply,
-                    "job_url": row.job_url,
-                    "application_url": row.apply_url,
-                    "source_platform": row.source_site,
-                    "date_posted": row.post_date.strftime('%Y-%m-%d') if row.post_date else None,
-                    "date_scraped": row.created_at.strftime('%Y-%m-%d %H:%M:%S') if row.created_at else None,
-                    "last_seen": row.last_seen.strftime('%Y-%m-%d %H:%M:%S') if row.last_seen else None,
-                    "skills": row.skills
-                })
-            
-            def generate():
-                yield json.dumps({
-                    "export_info": {
-                        "timestamp": datetime.now().isoformat(),
-                        "total_jobs": len(jobs_data),
-                        "filters_applied": {
-                            "search": search,
-                            "company": company,
-                            "location": location,
-                            "platform": platform,
-                            "job_type": job_type,
-                            "is_remote": is_remote,
-                            "salary_min": salary_min,
-                            "salary_max": salary_max,
-                            "days_ago": days_ago
-                        }
-                    },
-                    "jobs": jobs_data
-                }, indent=2)
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"jobs_export_{timestamp}.json"
-            
-            return StreamingResponse(
-                generate(),
-                media_type="application/json",
-                headers={"Content-Disposition": f"attachment; filename={filename}"}
-            )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
-
 @router.get("/scheduler/stats")
 async def get_scheduler_stats(
     db: Session = Depends(get_db),
@@ -4563,6 +4572,33 @@ async def get_scheduler_stats(
             "error": str(e)
         }
 
+@router.get("/cache/stats")
+async def get_cache_stats(
+    admin_user: dict = Depends(get_admin_user)
+):
+    """Get search cache size, memory usage, eviction counters and per-namespace hit/latency metrics"""
+    from app.cache import cache
+    from app.services.cache_warmer import cache_warmer
+    return {**cache.stats(), "warmer": cache_warmer.stats()}
+
+@router.get("/scrapers/circuits")
+async def get_scraper_circuits(
+    admin_user: dict = Depends(get_admin_user)
+):
+    """Get the circuit breaker state of every job site"""
+    from app.services.circuit_breaker import circuit_breaker
+    return {"enabled": circuit_breaker.enabled, "sites": circuit_breaker.stats()}
+
+@router.post("/scrapers/circuits/reset")
+async def reset_scraper_circuits(
+    site: Optional[str] = Query(None, description="Reset only this site's circuit"),
+    admin_user: dict = Depends(get_admin_user)
+):
+    """Close a job site's circuit (or all circuits) so it is scraped again"""
+    from app.services.circuit_breaker import circuit_breaker
+    circuit_breaker.reset(site)
+    return {"success": True, "message": f"Circuit reset for {site}" if site else "All circuits reset"}
+
 @router.post("/cache/clear")
 async def clear_cache(
     pattern: Optional[str] = Query(None, description="Clear specific cache pattern"),
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from typing import List, Optional, Union
 import logging
 import time
@@ -9,13 +10,17 @@ from app.pydantic_models import JobSearchParams, JobResponse, PaginatedJobRespon
 from app.core.config import settings
 from app.api.deps import get_api_key
 from app.services.job_service import JobService
+from app.services.circuit_breaker import SiteUnavailableError
+from app.services.batch_search_service import batch_search_service
+from app.services.ingest_queue import ingest_queue
+from app.services.refinement_service import refinement_service
+from app.services.search_job_store import SearchJobStatus, search_job_store
 from sqlalchemy import text
 from datetime import datetime
 import json
-from app.db.database import get_db
 from app.utils.validation_helpers import VALID_PARAMETERS, get_parameter_suggestion
-from sqlalchemy.orm import Session
-from app.routes.api_helpers import parse_date_posted
+from app.routes.api_helpers import parse_date_posted, encode_jobs_frame, encode_site_frame, format_stream_frame, JobsJSONResponse
+from app.utils.columnar import COLUMNAR_FORMATS, columnar_response, dataframe_to_table, require_columnar
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -144,14 +149,227 @@ def validate_job_search_params(
             }
         )
 
-@router.get("/search_jobs", response_model=Union[JobResponse, PaginatedJobResponse], dependencies=[Depends(get_api_key)])
+STREAM_FORMATS = {"ndjson", "sse"}
+
+
+async def _queue_scraped_jobs(jobs_df, scraped_sites: List[str], search_params: dict) -> None:
+    """
+    Queue freshly scraped sites' jobs for the data processor workers to save.
+    
+    Sites served from cached slices were ingested when first scraped.
+    """
+    await ingest_queue.publish_sites(jobs_df, search_params, scraped_sites)
+
+
+def _search_params_dict(params: JobSearchParams) -> dict:
+    """Validate a search body and convert it to search parameters, applying the default country."""
+    # Use default country for Indeed/Glassdoor if not provided
+    country_indeed = params.country_indeed
+    if params.site_name and country_indeed is None:
+        site_names = params.site_name if isinstance(params.site_name, list) else [params.site_name]
+        if any(site.lower() in ['indeed', 'glassdoor'] for site in site_names):
+            country_indeed = settings.DEFAULT_COUNTRY_INDEED
+    
+    validate_job_search_params(
+        site_name=params.site_name if isinstance(params.site_name, list) else [params.site_name],
+        country_indeed=country_indeed,
+        hours_old=params.hours_old,
+        job_type=params.job_type,
+        is_remote=params.is_remote,
+        easy_apply=params.easy_apply,
+        description_format=params.description_format,
+        verbose=params.verbose,
+        page=getattr(params, "page", None),
+        page_size=getattr(params, "page_size", None),
+        paginate=getattr(params, "paginate", None),
+    )
+    
+    # Create modified params dict with correct country_indeed
+    params_dict = params.dict(exclude_none=True)
+    if country_indeed is not None:
+        params_dict['country_indeed'] = country_indeed
+    return params_dict
+
+def _validate_response_format(response_format: str) -> str:
+    response_format = (response_format or "json").lower()
+    if response_format not in ("json", "csv", *COLUMNAR_FORMATS) and response_format not in STREAM_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "Invalid response format",
+                "invalid_value": response_format,
+                "valid_formats": ["json", "csv", *COLUMNAR_FORMATS, *sorted(STREAM_FORMATS)],
+                "suggestion": "Use format=ndjson or format=sse to stream results per site as they complete"
+            }
+        )
+    if response_format in COLUMNAR_FORMATS:
+        require_columnar(response_format)
+    return response_format
+
+
+def _site_unavailable_exception(request_id: str, error: SiteUnavailableError) -> HTTPException:
+    """Build the 503 response for a search whose only sites are currently being skipped."""
+    logger.warning(f"Request {request_id}: {error}")
+    retry_after = max(1, int(error.retry_after or 0))
+    return HTTPException(
+        status_code=503,
+        detail={
+            "error": "Job site temporarily unavailable",
+            "message": str(error),
+            "skipped_sites": {error.site: error.reason},
+            "suggestion": f"{error.site} has been failing recently. Retry after {retry_after} seconds or search other job sites"
+        },
+        headers={"Retry-After": str(retry_after)}
+    )
+
+
+def _page_count(total_items: int, page: int, page_size: int) -> int:
+    """Count the pages of a result, rejecting page numbers past the end."""
+    total_pages = (total_items + page_size - 1) // page_size if total_items > 0 else 1
+    if page > total_pages:
+        raise HTTPException(
+            status_code=404, 
+            detail={
+                "error": f"Page {page} not found",
+                "total_pages": total_pages,
+                "suggestion": f"Use a page number between 1 and {total_pages}"
+            }
+        )
+    return total_pages
+
+async def _stored_result(result_id: str) -> dict:
+    """Get the record of a completed, stored search result."""
+    record = await search_job_store.get(result_id)
+    if record is None or record["status"] != SearchJobStatus.COMPLETED.value:
+        raise HTTPException(
+            status_code=410,
+            detail={
+                "error": "Result has expired",
+                "result_id": result_id,
+                "suggestion": "Repeat the search without result_id to get a new result handle"
+            }
+        )
+    return record
+
+async def _result_page(request: Request, record: dict, page: int, page_size: int, request_id: str, start_time: float) -> JobsJSONResponse:
+    """
+    Build one page of a stored search result.
+    
+    Only the stored chunks overlapping the page are read, and the next/previous
+    links reference the result handle instead of repeating the search parameters.
+    """
+    total_items = record["count"]
+    total_pages = _page_count(total_items, page, page_size)
+    
+    page_df = await search_job_store.get_page(record, (page - 1) * page_size, page_size)
+    if page_df is None:
+        raise HTTPException(
+            status_code=410,
+            detail={
+                "error": "Result has expired",
+                "result_id": record["id"],
+                "suggestion": "Repeat the search without result_id to get a new result handle"
+            }
+        )
+    
+    def page_url(number: int) -> str:
+        return str(request.url.replace_query_params(paginate="true", result_id=record["id"], page=number, page_size=page_size))
+    
+    logger.info(f"Request {request_id}: Completed in {time.time() - start_time:.2f} seconds. Found {total_items} jobs, returning page {page}/{total_pages}")
+    
+    return JobsJSONResponse({
+        "count": total_items,
+        "total_pages": total_pages,
+        "current_page": page,
+        "page_size": page_size,
+        "jobs": page_df,
+        "cached": record.get("cached", False),
+        "stale": record.get("stale", False),
+        "skipped_sites": record.get("skipped_sites", {}),
+        "partial": record.get("partial", False),
+        "timed_out_sites": record.get("timed_out_sites", []),
+        "result_id": record["id"],
+        "next_page": page_url(page + 1) if page < total_pages else None,
+        "previous_page": page_url(page - 1) if page > 1 else None
+    })
+
+def _stream_search_response(search_params: dict, stream_format: str, request_id: str, start_time: float, timeout_ms: Optional[int] = None) -> StreamingResponse:
+    """
+    Stream search results one frame per site as each site finishes.
+    
+    Each frame carries a site's jobs; the final "summary" frame carries the totals.
+    NDJSON writes one JSON object per line, SSE writes one event per frame.
+    """
+    async def frames():
+        total_jobs = 0
+        cached_sites, scraped_sites, stale_sites, failed_sites, skipped_sites = [], [], [], {}, {}
+        timed_out_sites = []
+        
+        try:
+            async for result in JobService.stream_search(search_params, timeout_ms):
+                if result.timed_out:
+                    timed_out_sites.append(result.site)
+                    event = "timeout"
+                elif result.skipped:
+                    skipped_sites[result.site] = result.error
+                    event = "skipped"
+                elif result.error:
+                    failed_sites[result.site] = result.error
+                    event = "error"
+                else:
+                    total_jobs += len(result.jobs)
+                    (cached_sites if result.cached else scraped_sites).append(result.site)
+                    if result.stale:
+                        stale_sites.append(result.site)
+                    event = "site"
+                
+                frame = encode_site_frame(result.site, result.jobs, result.cached, result.error, result.stale, event)
+                yield format_stream_frame(frame, event, stream_format)
+                
+                # Queue freshly scraped jobs for saving after the client already has them
+                if not result.cached and not result.error:
+                    await _queue_scraped_jobs(result.jobs, [result.site], search_params)
+        except Exception as e:
+            logger.error(f"Request {request_id}: Error streaming jobs: {str(e)}")
+            logger.debug(traceback.format_exc())
+            error_frame = json.dumps({"type": "error", "site": None, "message": str(e)})
+            yield format_stream_frame(error_frame, "error", stream_format)
+        
+        elapsed = time.time() - start_time
+        logger.info(f"Request {request_id}: Streamed {total_jobs} jobs in {elapsed:.2f} seconds")
+        summary = {
+            "type": "summary",
+            "count": total_jobs,
+            "cached": not scraped_sites,
+            "stale": bool(stale_sites),
+            "cached_sites": cached_sites,
+            "stale_sites": stale_sites,
+            "scraped_sites": scraped_sites,
+            "failed_sites": failed_sites,
+            "skipped_sites": skipped_sites,
+            "partial": bool(timed_out_sites),
+            "timed_out_sites": timed_out_sites,
+            "elapsed_seconds": round(elapsed, 3),
+        }
+        yield format_stream_frame(json.dumps(summary), "summary", stream_format)
+    
+    if stream_format == "sse":
+        return StreamingResponse(
+            frames(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    return StreamingResponse(frames(), media_type="application/x-ndjson")
+
+
+@router.get("/search_jobs", response_model=Union[JobResponse, PaginatedJobResponse], response_class=JobsJSONResponse, dependencies=[Depends(get_api_key)])
 async def search_jobs(
     request: Request,
-    db: Session = Depends(get_db),
     # Pagination parameters
     paginate: bool = Query(False, description="Enable pagination"),
     page: int = Query(1, ge=1, description="Page number (if pagination enabled)"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page (if pagination enabled)"),
+    result_id: Optional[str] = Query(None, description="Result handle from a paginated response; reads the page from the stored results instead of searching again"),
     
     # Basic search parameters
     site_name: List[str] = Query(default=None, description="Job sites to search on"),
@@ -175,21 +393,32 @@ async def search_jobs(
     linkedin_company_ids: Optional[List[int]] = Query(None, description="LinkedIn company IDs to filter by"),
     country_indeed: Optional[str] = Query(None, description="Country filter for Indeed & Glassdoor"),
     enforce_annual_salary: bool = Query(None, description="Convert wages to annual salary"),
+    
+    # Response format
+    format: str = Query("json", description="Response format: json, csv, arrow (Arrow IPC stream), parquet, or ndjson/sse to stream results per site as they complete"),
+    timeout_ms: Optional[int] = Query(None, ge=1, description="Deadline in milliseconds; sites still scraping are left out and listed in timed_out_sites"),
 ):
     """
     Search for jobs across multiple platforms with optional pagination.
     
     If paginate=True, returns paginated results with next/previous page links.
+    If format=ndjson or format=sse, streams one frame per site followed by a summary frame.
     Otherwise, returns all results in a single response.
     """
     request_id = str(uuid.uuid4())
     start_time = time.time()
     
+    if result_id:
+        record = await _stored_result(result_id)
+        return await _result_page(request, record, page, page_size, request_id, start_time)
+    
     # Use default country for Indeed/Glassdoor if not provided
     if site_name and country_indeed is None:
         if any(site.lower() in ['indeed', 'glassdoor'] for site in site_name):
             country_indeed = settings.DEFAULT_COUNTRY_INDEED
     
+    response_format = _validate_response_format(format)
+    
     validate_job_search_params(
         site_name=site_name,
         country_indeed=country_indeed,
@@ -270,107 +499,61 @@ async def search_jobs(
     
     logger.info(f"Request {request_id}: Starting job search with parameters: {params.dict(exclude_none=True)}")
     
+    if response_format in STREAM_FORMATS:
+        return _stream_search_response(params.dict(exclude_none=True), response_format, request_id, start_time, timeout_ms)
+    
     try:
         # Execute the search
-        jobs_df, is_cached = await JobService.search_jobs(params.dict(exclude_none=True))
+        outcome = await JobService.run_search(params.dict(exclude_none=True), timeout_ms)
+        jobs_df, is_cached = outcome.jobs, outcome.cached
         
-        # Save jobs to database if we got results and it's not cached
-        if not jobs_df.empty and not is_cached:
-            try:
-                # Use JobTrackingService for proper job processing and deduplication
-                from app.services.job_tracking_service import job_tracking_service
-                jobs_data = jobs_df.to_dict('records')
-                
-                # Process each site separately for better tracking
-                total_new_jobs = 0
-                total_updated_jobs = 0
-                
-                for site_name in params.site_name:
-                    site_jobs = [job for job in jobs_data if job.get('site') == site_name]
-                    if site_jobs:
-                        site_stats = job_tracking_service.process_scraped_jobs(
-                            jobs_data=site_jobs,
-                            source_site=site_name,
-                            search_params=params.dict(exclude_none=True),
-                            db=db
-                        )
-                        total_new_jobs += site_stats['new_jobs']
-                        total_updated_jobs += site_stats['updated_jobs']
-                        logger.info(f"Processed {len(site_jobs)} jobs from {site_name}: {site_stats['new_jobs']} new, {site_stats['updated_jobs']} updated")
-                
-                logger.info(f"Total: {total_new_jobs} new jobs, {total_updated_jobs} updated jobs from {','.join(params.site_name)}")
-                        
-            except Exception as e:
-                logger.error(f"Error saving jobs to database: {e}")
-                # Continue with the response even if database save fails
+        # Saving to the tracking database happens in the data processor workers
+        if not is_cached:
+            await _queue_scraped_jobs(jobs_df, outcome.scraped_sites, params.dict(exclude_none=True))
         
         # Return results - either paginated or all at once
         if paginate:
-            # Calculate pagination
-            total_items = len(jobs_df)
-            total_pages = (total_items + page_size - 1) // page_size if total_items > 0 else 1
-            
-            # Validate page number
-            if page > total_pages and total_pages > 0:
-                raise HTTPException(
-                    status_code=404, 
-                    detail={
-                        "error": f"Page {page} not found",
-                        "total_pages": total_pages,
-                        "suggestion": f"Use a page number between 1 and {total_pages}"
-                    }
-                )
-            
-            # Apply pagination
-            start_idx = (page - 1) * page_size
-            end_idx = min(start_idx + page_size, total_items)
-            paginated_df = jobs_df.iloc[start_idx:end_idx] if total_items > 0 else jobs_df
-            
-            # Generate next/previous page URLs
-            base_url = str(request.url).split("?")[0]
-            query_params = dict(request.query_params)
-            
-            next_page = None
-            if page < total_pages:
-                query_params["page"] = str(page + 1)
-                next_page = f"{base_url}?{'&'.join([f'{k}={v}' for k, v in query_params.items()])}"
-            
-            previous_page = None
-            if page > 1:
-                query_params["page"] = str(page - 1)
-                previous_page = f"{base_url}?{'&'.join([f'{k}={v}' for k, v in query_params.items()])}"
-            
-            # Convert DataFrame to dictionary format
-            jobs_list = paginated_df.to_dict('records') if not paginated_df.empty else []
-            
-            end_time = time.time()
-            logger.info(f"Request {request_id}: Completed in {end_time - start_time:.2f} seconds. Found {total_items} jobs, returning page {page}/{total_pages}")
-            
-            return {
-                "count": total_items,
-                "total_pages": total_pages,
-                "current_page": page,
-                "page_size": page_size,
-                "jobs": jobs_list,
-                "cached": is_cached,
-                "next_page": next_page,
-                "previous_page": previous_page
-            }
+            # Store the results once; later pages are read by handle
+            _page_count(len(jobs_df), page, page_size)
+            record = await search_job_store.save_search(
+                params.dict(exclude_none=True),
+                jobs_df,
+                cached=is_cached,
+                stale=outcome.stale,
+                skipped_sites=outcome.skipped_sites,
+                partial=outcome.partial,
+                timed_out_sites=outcome.timed_out_sites,
+            )
+            return await _result_page(request, record, page, page_size, request_id, start_time)
+        elif response_format == "csv":
+            logger.info(f"Request {request_id}: Completed in {time.time() - start_time:.2f} seconds. Found {len(jobs_df)} jobs")
+            return StreamingResponse(
+                iter([jobs_df.to_csv(index=False)]),
+                media_type="text/csv",
+                headers={"Content-Disposition": "attachment; filename=jobs.csv"}
+            )
+        elif response_format in COLUMNAR_FORMATS:
+            logger.info(f"Request {request_id}: Completed in {time.time() - start_time:.2f} seconds. Found {len(jobs_df)} jobs")
+            return columnar_response(dataframe_to_table(jobs_df), response_format, "jobs")
         else:
             # Return all results without pagination
-            jobs_list = jobs_df.to_dict('records') if not jobs_df.empty else []
-            
             end_time = time.time()
-            logger.info(f"Request {request_id}: Completed in {end_time - start_time:.2f} seconds. Found {len(jobs_list)} jobs")
+            logger.info(f"Request {request_id}: Completed in {end_time - start_time:.2f} seconds. Found {len(jobs_df)} jobs")
             
-            return {
-                "count": len(jobs_list),
-                "jobs": jobs_list,
-                "cached": is_cached
-            }
+            return JobsJSONResponse({
+                "count": len(jobs_df),
+                "jobs": jobs_df,
+                "cached": is_cached,
+                "stale": outcome.stale,
+                "skipped_sites": outcome.skipped_sites,
+                "partial": outcome.partial,
+                "timed_out_sites": outcome.timed_out_sites
+            })
     except Exception as e:
         if isinstance(e, HTTPException):
             raise e
+        if isinstance(e, SiteUnavailableError):
+            raise _site_unavailable_exception(request_id, e)
         
         logger.error(f"Request {request_id}: Error scraping jobs: {str(e)}")
         logger.debug(traceback.format_exc())
@@ -395,6 +578,185 @@ async def search_jobs(
             }
         )
 
+@router.get("/search_jobs/refine", response_model=PaginatedJobResponse, response_class=JobsJSONResponse, dependencies=[Depends(get_api_key)])
+async def refine_search_jobs(
+    request: Request,
+    result_id: str = Query(..., description="Result handle from a paginated search, or the ID of a completed search job"),
+    min_salary: Optional[float] = Query(None, description="Minimum of the job's salary range"),
+    max_salary: Optional[float] = Query(None, description="Maximum of the job's salary range"),
+    company: Optional[str] = Query(None, description="Company name contains"),
+    job_type: Optional[str] = Query(None, description="Job type (fulltime, parttime, internship, contract)"),
+    city: Optional[str] = Query(None, description="City contains"),
+    state: Optional[str] = Query(None, description="State contains"),
+    title_keywords: Optional[str] = Query(None, description="Job title contains"),
+    keyword: Optional[str] = Query(None, description="Job title, company or description contains"),
+    sort_by: Optional[str] = Query(None, description="Field to sort by, e.g. min_amount, max_amount, date_posted, company, title"),
+    sort_order: str = Query("desc", description="Sort order: asc or desc"),
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(10, ge=1, le=100, description="Items per page"),
+):
+    """
+    Narrow a stored search result without searching again.
+    
+    Filters and sorting run in memory over the stored results of a paginated
+    search or search job; no job site or database is queried. Text filters are
+    case-insensitive substring matches, except job_type which must match exactly.
+    """
+    request_id = str(uuid.uuid4())
+    start_time = time.time()
+    
+    if sort_order.lower() not in ("asc", "desc"):
+        raise HTTPException(
+            status_code=400,
+            detail={"error": "Invalid sort_order", "invalid_value": sort_order, "valid_values": ["asc", "desc"]}
+        )
+    
+    record = await _stored_result(result_id)
+    jobs_df = await refinement_service.load(record)
+    if jobs_df is None:
+        raise HTTPException(
+            status_code=410,
+            detail={
+                "error": "Result has expired",
+                "result_id": result_id,
+                "suggestion": "Repeat the search without result_id to get a new result handle"
+            }
+        )
+    
+    filters = {
+        "min_salary": min_salary,
+        "max_salary": max_salary,
+        "company": company,
+        "job_type": job_type,
+        "city": city,
+        "state": state,
+        "title_keywords": title_keywords,
+        "keyword": keyword,
+    }
+    refined_df = refinement_service.refine(jobs_df, filters, sort_by, sort_order)
+    
+    total_items = len(refined_df)
+    total_pages = _page_count(total_items, page, page_size)
+    start_idx = (page - 1) * page_size
+    
+    def page_url(number: int) -> str:
+        return str(request.url.include_query_params(page=number, page_size=page_size))
+    
+    logger.info(f"Request {request_id}: Refined result {result_id} to {total_items} of {len(jobs_df)} jobs in {time.time() - start_time:.3f} seconds")
+    
+    return JobsJSONResponse({
+        "count": total_items,
+        "total_pages": total_pages,
+        "current_page": page,
+        "page_size": page_size,
+        "jobs": refined_df.iloc[start_idx:start_idx + page_size],
+        "cached": True,
+        "stale": record.get("stale", False),
+        "skipped_sites": record.get("skipped_sites", {}),
+        "partial": record.get("partial", False),
+        "timed_out_sites": record.get("timed_out_sites", []),
+        "result_id": result_id,
+        "next_page": page_url(page + 1) if page < total_pages else None,
+        "previous_page": page_url(page - 1) if page > 1 else None
+    })
+
+@router.post("/search_jobs/batch", dependencies=[Depends(get_api_key)])
+async def search_jobs_batch(
+    searches: List[JobSearchParams],
+    format: str = Query("ndjson", description="Stream format: ndjson or sse"),
+    timeout_ms: Optional[int] = Query(None, ge=1, description="Deadline for each search in milliseconds; sites still scraping are left out and listed in timed_out_sites"),
+):
+    """
+    Run many searches in one request and stream each search's results as it completes.
+    
+    Identical searches run once, searches answered by the cache are returned
+    first, and the others share a budget of BATCH_SEARCH_CONCURRENCY searches
+    in flight. Each "result" frame lists the positions in the request it
+    answers in "indexes"; a final "summary" frame carries the totals.
+    """
+    request_id = str(uuid.uuid4())
+    start_time = time.time()
+    
+    stream_format = (format or "ndjson").lower()
+    if stream_format not in STREAM_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail={"error": "Invalid response format", "invalid_value": format, "valid_formats": sorted(STREAM_FORMATS)}
+        )
+    if not searches:
+        raise HTTPException(status_code=400, detail={"error": "No searches given"})
+    if len(searches) > settings.BATCH_SEARCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "Too many searches",
+                "count": len(searches),
+                "max_searches": settings.BATCH_SEARCH_MAX_QUERIES,
+                "suggestion": "Split the searches over several batches"
+            }
+        )
+    
+    search_params = []
+    for index, params in enumerate(searches):
+        try:
+            search_params.append(_search_params_dict(params))
+        except HTTPException as e:
+            detail = e.detail if isinstance(e.detail, dict) else {"error": e.detail}
+            raise HTTPException(status_code=e.status_code, detail={**detail, "index": index})
+    
+    queries = batch_search_service.plan(search_params)
+    logger.info(f"Request {request_id}: Batch of {len(searches)} searches, {len(queries)} distinct")
+    
+    async def frames():
+        total_jobs = 0
+        cached_queries, failed_queries = 0, 0
+        
+        async for result in batch_search_service.run(queries, timeout_ms):
+            query = result.query
+            header = {"type": "result", "indexes": query.indexes, "params": query.params}
+            if result.error is not None:
+                failed_queries += 1
+                error_frame = json.dumps({**header, "type": "error", "message": result.error}, default=str)
+                yield format_stream_frame(error_frame, "error", stream_format)
+                continue
+            
+            outcome = result.outcome
+            total_jobs += len(outcome.jobs)
+            cached_queries += outcome.cached
+            header.update({
+                "count": len(outcome.jobs),
+                "cached": outcome.cached,
+                "stale": outcome.stale,
+                "skipped_sites": outcome.skipped_sites,
+                "partial": outcome.partial,
+                "timed_out_sites": outcome.timed_out_sites,
+            })
+            yield format_stream_frame(encode_jobs_frame(header, outcome.jobs), "result", stream_format)
+            
+            # Queue freshly scraped jobs for saving after the client already has them
+            await _queue_scraped_jobs(outcome.jobs, outcome.scraped_sites, query.params)
+        
+        elapsed = time.time() - start_time
+        logger.info(f"Request {request_id}: Batch returned {total_jobs} jobs for {len(queries)} searches in {elapsed:.2f} seconds")
+        summary = {
+            "type": "summary",
+            "searches": len(searches),
+            "distinct_searches": len(queries),
+            "cached_searches": cached_queries,
+            "failed_searches": failed_queries,
+            "count": total_jobs,
+            "elapsed_seconds": round(elapsed, 3),
+        }
+        yield format_stream_frame(json.dumps(summary), "summary", stream_format)
+    
+    if stream_format == "sse":
+        return StreamingResponse(
+            frames(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    return StreamingResponse(frames(), media_type="application/x-ndjson")
+
 @router.post("/debug/create-tables")
 async def create_database_tables():
     """Debug endpoint to create database tables."""
@@ -407,93 +769,69 @@ async def create_database_tables():
         logger.error(f"Error creating tables: {e}")
         return {"status": "error", "message": f"Failed to create tables: {str(e)}"}
 
-@router.post("/search_jobs", response_model=Union[JobResponse, PaginatedJobResponse], dependencies=[Depends(get_api_key)])
+@router.post("/search_jobs", response_model=Union[JobResponse, PaginatedJobResponse], response_class=JobsJSONResponse, dependencies=[Depends(get_api_key)])
 async def search_jobs_post(
     params: JobSearchParams,
     request: Request,
-    db: Session = Depends(get_db),
+    format: str = Query("json", description="Response format: json, csv, arrow (Arrow IPC stream), parquet, or ndjson/sse to stream results per site as they complete"),
+    timeout_ms: Optional[int] = Query(None, ge=1, description="Deadline in milliseconds; sites still scraping are left out and listed in timed_out_sites"),
 ):
     """
     Search for jobs across multiple platforms using POST method.
+    
+    If format=ndjson or format=sse, streams one frame per site followed by a summary frame.
     """
     request_id = str(uuid.uuid4())
     start_time = time.time()
     
-    # Use default country for Indeed/Glassdoor if not provided
-    country_indeed = params.country_indeed
-    if params.site_name and country_indeed is None:
-        site_names = params.site_name if isinstance(params.site_name, list) else [params.site_name]
-        if any(site.lower() in ['indeed', 'glassdoor'] for site in site_names):
-            country_indeed = settings.DEFAULT_COUNTRY_INDEED
-    
-    validate_job_search_params(
-        site_name=params.site_name if isinstance(params.site_name, list) else [params.site_name],
-        country_indeed=country_indeed,
-        hours_old=params.hours_old,
-        job_type=params.job_type,
-        is_remote=params.is_remote,
-        easy_apply=params.easy_apply,
-        description_format=params.description_format,
-        verbose=params.verbose,
-        page=getattr(params, "page", None),
-        page_size=getattr(params, "page_size", None),
-        paginate=getattr(params, "paginate", None),
-    )
+    response_format = _validate_response_format(format)
     
-    # Create modified params dict with correct country_indeed
-    params_dict = params.dict(exclude_none=True)
-    if country_indeed is not None:
-        params_dict['country_indeed'] = country_indeed
+    params_dict = _search_params_dict(params)
     
     logger.info(f"Request {request_id}: Starting job search with parameters: {params_dict}")
     
+    if response_format in STREAM_FORMATS:
+        return _stream_search_response(params_dict, response_format, request_id, start_time, timeout_ms)
+    
     try:
         # Execute the search
-        jobs_df, is_cached = await JobService.search_jobs(params_dict)
+        outcome = await JobService.run_search(params_dict, timeout_ms)
+        jobs_df, is_cached = outcome.jobs, outcome.cached
         
-        # Save jobs to database if we got results and it's not cached
-        if not jobs_df.empty and not is_cached:
-            try:
-                from app.services.job_tracking_service import job_tracking_service
-                jobs_data = jobs_df.to_dict('records')
-                
-                # Process each site separately for better tracking
-                total_new_jobs = 0
-                total_updated_jobs = 0
-                
-                for site_name in params.site_name:
-                    site_jobs = [job for job in jobs_data if job.get('site') == site_name]
-                    if site_jobs:
-                        site_stats = job_tracking_service.process_scraped_jobs(
-                            jobs_data=site_jobs,
-                            source_site=site_name,
-                            search_params=params.dict(exclude_none=True),
-                            db=db
-                        )
-                        total_new_jobs += site_stats['new_jobs']
-                        total_updated_jobs += site_stats['updated_jobs']
-                        logger.info(f"Processed {len(site_jobs)} jobs from {site_name}: {site_stats['new_jobs']} new, {site_stats['updated_jobs']} updated")
-                
-                logger.info(f"Total: {total_new_jobs} new jobs, {total_updated_jobs} updated jobs from {','.join(params.site_name)}")
-                        
-            except Exception as e:
-                logger.error(f"Error saving jobs to database: {e}")
-                # Continue with the response even if database save fails
+        # Saving to the tracking database happens in the data processor workers
+        if not is_cached:
+            await _queue_scraped_jobs(jobs_df, outcome.scraped_sites, params.dict(exclude_none=True))
         
-        # Return all results without pagination
-        jobs_list = jobs_df.to_dict('records') if not jobs_df.empty else []
+        if response_format == "csv":
+            logger.info(f"Request {request_id}: Completed in {time.time() - start_time:.2f} seconds. Found {len(jobs_df)} jobs")
+            return StreamingResponse(
+                iter([jobs_df.to_csv(index=False)]),
+                media_type="text/csv",
+                headers={"Content-Disposition": "attachment; filename=jobs.csv"}
+            )
+        
+        if response_format in COLUMNAR_FORMATS:
+            logger.info(f"Request {request_id}: Completed in {time.time() - start_time:.2f} seconds. Found {len(jobs_df)} jobs")
+            return columnar_response(dataframe_to_table(jobs_df), response_format, "jobs")
         
+        # Return all results without pagination
         end_time = time.time()
-        logger.info(f"Request {request_id}: Completed in {end_time - start_time:.2f} seconds. Found {len(jobs_list)} jobs")
+        logger.info(f"Request {request_id}: Completed in {end_time - start_time:.2f} seconds. Found {len(jobs_df)} jobs")
         
-        return {
-            "count": len(jobs_list),
-            "jobs": jobs_list,
-            "cached": is_cached
-        }
+        return JobsJSONResponse({
+            "count": len(jobs_df),
+            "jobs": jobs_df,
+            "cached": is_cached,
+            "stale": outcome.stale,
+            "skipped_sites": outcome.skipped_sites,
+            "partial": outcome.partial,
+            "timed_out_sites": outcome.timed_out_sites
+        })
     except Exception as e:
         if isinstance(e, HTTPException):
             raise e
+        if isinstance(e, SiteUnavailableError):
+            raise _site_unavailable_exception(request_id, e)
         
         logger.error(f"Request {request_id}: Error scraping jobs: {str(e)}")
         logger.debug(traceback.format_exc())
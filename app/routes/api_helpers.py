@@ -1,5 +1,10 @@
 """Helper functions for API routes."""
-from datetime import datetime
+import json
+from datetime import date, datetime
+
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 
 def parse_date_posted(date_value):
     """Parse date_posted field which can be string or date object."""
@@ -14,4 +19,75 @@ def parse_date_posted(date_value):
     try:
         return datetime.strptime(str(date_value), '%Y-%m-%d').date()
     except (ValueError, TypeError):
-        return None
\ No newline at end of file
+        return None
+
+def _date_columns(jobs_df):
+    """Find object columns holding datetime.date values, such as JobSpy's date_posted."""
+    columns = []
+    for column in jobs_df.select_dtypes(include="object").columns:
+        first = jobs_df[column].first_valid_index()
+        if first is None:
+            continue
+        value = jobs_df[column].loc[first]
+        if isinstance(value, date) and not isinstance(value, datetime):
+            columns.append(column)
+    return columns
+
+def jobs_to_json(jobs_df):
+    """Serialize a jobs DataFrame to a JSON array string.
+
+    pandas writes the whole frame in C without building a dict per job: NaN and
+    NaT become null, numpy scalars become plain numbers and timestamps become
+    ISO strings. Date-only columns are formatted as YYYY-MM-DD, column by column.
+    """
+    if jobs_df.empty:
+        return "[]"
+    date_columns = _date_columns(jobs_df)
+    if date_columns:
+        jobs_df = jobs_df.assign(**{
+            column: pd.to_datetime(jobs_df[column], errors="coerce").dt.strftime("%Y-%m-%d")
+            for column in date_columns
+        })
+    return jobs_df.to_json(orient="records", date_format="iso", date_unit="s", default_handler=str)
+
+class JobsJSONResponse(JSONResponse):
+    """JSON response for job endpoints that serializes a jobs DataFrame directly.
+
+    Return it with the DataFrame itself under "jobs"; the other fields go
+    through FastAPI's usual encoder. Returning the response from an endpoint
+    also skips response_model validation of every job.
+    """
+
+    def render(self, content):
+        if not isinstance(content, dict) or not isinstance(content.get("jobs"), pd.DataFrame):
+            return super().render(content)
+        header = jsonable_encoder({key: value for key, value in content.items() if key != "jobs"})
+        head = json.dumps(header, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+        separator = "," if header else ""
+        return f'{head[:-1]}{separator}"jobs":{jobs_to_json(content["jobs"])}}}'.encode("utf-8")
+
+def encode_site_frame(site, jobs_df, cached, error=None, stale=False, frame_type=None):
+    """Encode one site's results as a JSON object string for streaming responses.
+
+    The jobs array is produced by pandas directly so large result sets are not
+    round-tripped through Python dicts, and NaN/dates serialize as valid JSON.
+    The frame type defaults to "error" or "site"; callers pass "skipped" or
+    "timeout" for sites that were not scraped or missed the deadline.
+    """
+    frame_type = frame_type or ("error" if error else "site")
+    header = {"type": frame_type, "site": site, "cached": cached, "stale": stale, "count": len(jobs_df)}
+    if error:
+        header["message"] = error
+    return encode_jobs_frame(header, jobs_df)
+
+
+def encode_jobs_frame(header, jobs_df):
+    """Encode a frame header with a "jobs" array as one JSON object string."""
+    return json.dumps(header, default=str)[:-1] + f', "jobs": {jobs_to_json(jobs_df)}}}'
+
+
+def format_stream_frame(frame, event, stream_format):
+    """Wrap an encoded frame as an NDJSON line or a Server-Sent Event."""
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {frame}\n\n"
+    return f"{frame}\n"
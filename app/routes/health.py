@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Request, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
 from app.pydantic_models import HealthCheck
 from app.core.config import settings
 import logging
@@ -69,6 +70,17 @@ async def ping():
     """
     return {"status": "ok"}
 
+@router.get("/metrics", response_class=PlainTextResponse, tags=["Health"], dependencies=[Depends(verify_health_enabled)])
+async def metrics():
+    """
+    Search cache metrics in the Prometheus text exposition format
+    """
+    from app.cache import cache
+    return PlainTextResponse(
+        cache.metrics.render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
 @router.get("/auth-status", tags=["Health"], dependencies=[Depends(verify_health_enabled)])
 async def auth_status(request: Request):
     """
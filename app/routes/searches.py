@@ -0,0 +1,209 @@
+"""
+Asynchronous search jobs.
+
+POST /api/v1/searches starts a search and returns its job ID right away; the
+scrape runs in the background (see background_service). Clients then poll
+GET /api/v1/searches/{id}, long-poll it with ?wait=, or subscribe to
+/api/v1/searches/{id}/events, and read the results a page at a time.
+"""
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import get_api_key
+from app.core.config import settings
+from app.pydantic_models import JobSearchParams, SearchJobResponse, SearchJobResultsResponse
+from app.routes.api import validate_job_search_params
+from app.routes.api_helpers import JobsJSONResponse, format_stream_frame
+from app.services.background_service import background_service
+from app.services.search_job_store import SearchJobStatus, is_terminal, search_job_store
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+def _job_response(record: Dict[str, Any], request: Request) -> Dict[str, Any]:
+    """Add the job's links to its status record."""
+    job_id = record["id"]
+    return {
+        **record,
+        "status_url": str(request.url_for("get_search", job_id=job_id)),
+        "results_url": str(request.url_for("get_search_results", job_id=job_id)),
+        "events_url": str(request.url_for("search_events", job_id=job_id)),
+    }
+
+
+async def _get_record(job_id: str) -> Dict[str, Any]:
+    record = await search_job_store.get(job_id)
+    if record is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "Search not found",
+                "id": job_id,
+                "suggestion": f"Searches and their results are kept for {settings.SEARCH_JOB_TTL} seconds",
+            }
+        )
+    return record
+
+
+@router.post("", status_code=202, response_model=SearchJobResponse, dependencies=[Depends(get_api_key)])
+async def create_search(
+    params: JobSearchParams,
+    request: Request,
+    timeout_ms: Optional[int] = Query(None, ge=1, description="Deadline in milliseconds; sites still scraping are left out and listed in timed_out_sites"),
+):
+    """
+    Start a job search in the background and return its ID immediately.
+    """
+    # Use default country for Indeed/Glassdoor if not provided
+    site_names = params.site_name if isinstance(params.site_name, list) else [params.site_name]
+    country_indeed = params.country_indeed
+    if country_indeed is None and any(site.lower() in ['indeed', 'glassdoor'] for site in site_names):
+        country_indeed = settings.DEFAULT_COUNTRY_INDEED
+
+    validate_job_search_params(
+        site_name=site_names,
+        country_indeed=country_indeed,
+        hours_old=params.hours_old,
+        job_type=params.job_type,
+        is_remote=params.is_remote,
+        easy_apply=params.easy_apply,
+        description_format=params.description_format,
+        verbose=params.verbose,
+        endpoint="searches",
+    )
+
+    params_dict = params.dict(exclude_none=True)
+    if country_indeed is not None:
+        params_dict['country_indeed'] = country_indeed
+
+    record = await background_service.submit(params_dict, timeout_ms)
+    logger.info(f"Search {record['id']} submitted with parameters: {params_dict}")
+    return _job_response(record, request)
+
+
+@router.get("/{job_id}", response_model=SearchJobResponse, dependencies=[Depends(get_api_key)])
+async def get_search(
+    job_id: str,
+    request: Request,
+    wait: float = Query(0, ge=0, description="Long-poll: seconds to wait for the search to change or finish"),
+    since: Optional[int] = Query(None, ge=0, description="Long-poll: return once the search's version is above this (defaults to its current version)"),
+):
+    """
+    Get the status of a search, optionally waiting for it to change.
+    """
+    record = await _get_record(job_id)
+    if wait and not is_terminal(record):
+        since_version = record["version"] if since is None else since
+        record = await search_job_store.wait(job_id, since_version, min(wait, settings.SEARCH_JOB_MAX_WAIT))
+        if record is None:
+            record = await _get_record(job_id)
+    return _job_response(record, request)
+
+
+@router.get("/{job_id}/results", response_model=SearchJobResultsResponse, response_class=JobsJSONResponse, dependencies=[Depends(get_api_key)])
+async def get_search_results(
+    job_id: str,
+    request: Request,
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(20, ge=1, le=100, description="Jobs per page"),
+):
+    """
+    Get one page of a completed search's results.
+    """
+    record = await _get_record(job_id)
+    if record["status"] != SearchJobStatus.COMPLETED.value:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "error": f"Search is {record['status']}",
+                "status": record["status"],
+                "message": record.get("error"),
+                "suggestion": "Wait for the search to complete; poll its status_url or subscribe to its events_url",
+            }
+        )
+
+    total_items = record["count"]
+    total_pages = (total_items + page_size - 1) // page_size if total_items > 0 else 1
+    if page > total_pages:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": f"Page {page} not found",
+                "total_pages": total_pages,
+                "suggestion": f"Use a page number between 1 and {total_pages}"
+            }
+        )
+
+    jobs_df = await search_job_store.get_page(record, (page - 1) * page_size, page_size)
+    if jobs_df is None:
+        raise HTTPException(status_code=410, detail={"error": "Search results have expired", "id": job_id})
+
+    results_url = request.url_for("get_search_results", job_id=job_id)
+    next_page = str(results_url.include_query_params(page=page + 1, page_size=page_size)) if page < total_pages else None
+    previous_page = str(results_url.include_query_params(page=page - 1, page_size=page_size)) if page > 1 else None
+
+    return JobsJSONResponse({
+        "id": job_id,
+        "count": total_items,
+        "total_pages": total_pages,
+        "current_page": page,
+        "page_size": page_size,
+        "jobs": jobs_df,
+        "next_page": next_page,
+        "previous_page": previous_page,
+    })
+
+
+@router.get("/{job_id}/events", dependencies=[Depends(get_api_key)])
+async def search_events(job_id: str, request: Request):
+    """
+    Subscribe to a search's status changes as Server-Sent Events.
+
+    Sends a "status" event with the current status, then one per change, and
+    closes after the search finishes.
+    """
+    record = await _get_record(job_id)
+
+    async def events():
+        current = record
+        while True:
+            frame = json.dumps(_job_response(current, request), default=str)
+            yield format_stream_frame(frame, "status", "sse")
+            if is_terminal(current):
+                return
+            version = current["version"]
+            while current is not None and current["version"] == version and not is_terminal(current):
+                if await request.is_disconnected():
+                    return
+                current = await search_job_store.wait(job_id, version, settings.SEARCH_JOB_MAX_WAIT)
+                if current is not None and current["version"] == version:
+                    # Keep proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+            if current is None:
+                return
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.delete("/{job_id}", response_model=SearchJobResponse, dependencies=[Depends(get_api_key)])
+async def cancel_search(job_id: str, request: Request):
+    """
+    Cancel a pending or running search.
+    """
+    record = await _get_record(job_id)
+    if is_terminal(record):
+        raise HTTPException(
+            status_code=409,
+            detail={"error": f"Search is already {record['status']}", "status": record["status"]}
+        )
+    await background_service.cancel_search(job_id)
+    return _job_response(await _get_record(job_id), request)
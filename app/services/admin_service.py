@@ -572,22 +572,10 @@ class AdminService:
         }
     
     async def _get_cache_hit_rate(self) -> float:
-        """Get actual cache hit rate from Redis"""
+        """Get the search cache hit rate recorded by the cache's metrics"""
         try:
             from app.cache import cache
-            # Check if we can get cache statistics
-            # For now, we'll simulate by testing cache operations
-            test_operations = 10
-            hits = 0
-            
-            for i in range(test_operations):
-                test_key = f"hit_rate_test_{i}"
-                await cache.set(test_key, "test", expire=60)
-                result = await cache.get(test_key)
-                if result == "test":
-                    hits += 1
-            
-            return hits / test_operations
+            return cache.metrics.hit_rate()
         except Exception as e:
             self.logger.error(f"Failed to calculate cache hit rate: {e}")
             return 0.0
@@ -1,149 +1,122 @@
-"""Background job processing for JobSpy Docker API."""
+"""Background job processing for JobSpy Docker API.
+
+Searches submitted through POST /api/v1/searches run here, detached from the
+HTTP request that created them. When Redis is available (and
+SEARCH_JOBS_USE_WORKERS is on) they are queued to the Celery workers;
+otherwise they run as tasks in the API process. Either way their status and
+results are kept in the search job store.
+"""
 import asyncio
-from typing import Dict, Any, Optional
-import uuid
 import logging
 from datetime import datetime
+from typing import Any, Dict, List, Optional
 
-from jobspy import scrape_jobs
+from app.core.config import settings
+from app.services.ingest_queue import ingest_queue
+from app.services.job_service import JobService
+from app.services.search_job_store import SearchJobStatus, search_job_store
 
 logger = logging.getLogger(__name__)
 
-# Simple in-memory job storage (would use a database in production)
-jobs = {}
 
 class BackgroundService:
     def __init__(self):
-        self.running_searches = set()
+        # Searches running in this process, by job ID
+        self.running_searches: Dict[str, asyncio.Task] = {}
+
+    async def submit(self, search_params: Dict[str, Any], timeout_ms: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Create a search job and start it in the background.
+
+        Returns:
+            The new job's status record
+        """
+        record = await search_job_store.create(search_params, timeout_ms)
+        job_id = record["id"]
+
+        if settings.SEARCH_JOBS_USE_WORKERS and search_job_store.shared:
+            try:
+                from app.tasks import run_search_job
+                # The worker task shares the job's ID so a cancellation can revoke it
+                await asyncio.to_thread(
+                    run_search_job.apply_async, args=[job_id, search_params, timeout_ms], task_id=job_id
+                )
+                logger.info(f"Queued search {job_id} on the workers")
+                return record
+            except Exception as e:
+                logger.warning(f"Could not queue search {job_id} on the workers, running it in this process: {e}")
 
-    async def execute_search(self, search_id: str, search_params: Dict[str, Any]):
-        """Execute a job search in the background"""
-        if search_id in self.running_searches:
-            logger.warning(f"Search {search_id} is already running")
+        task = asyncio.create_task(self.execute_search(job_id, search_params, timeout_ms))
+        self.running_searches[job_id] = task
+        task.add_done_callback(lambda _: self.running_searches.pop(job_id, None))
+        return record
+
+    async def execute_search(self, search_id: str, search_params: Dict[str, Any], timeout_ms: Optional[int] = None):
+        """Execute a job search and store its status and results"""
+        record = await search_job_store.transition(
+            search_id, SearchJobStatus.RUNNING, started_at=datetime.now().isoformat()
+        )
+        if record is None:
+            logger.info(f"Search {search_id} was cancelled or has expired, not running it")
             return
 
-        self.running_searches.add(search_id)
-        
+        logger.info(f"Starting background search {search_id}")
         try:
-            logger.info(f"Starting background search {search_id}")
-            
-            # Update job status
-            if search_id not in jobs:
-                jobs[search_id] = {
-                    "id": search_id,
-                    "status": "running",
-                    "created_at": datetime.now().isoformat(),
-                    "params": search_params,
-                }
-            else:
-                jobs[search_id]["status"] = "running"
-                jobs[search_id]["started_at"] = datetime.now().isoformat()
-            
-            # Prepare JobSpy parameters
-            jobspy_params = {
-                'site_name': search_params.get('site_names', ['indeed']),
-                'search_term': search_params.get('search_term'),
-                'location': search_params.get('location'),
-                'country_indeed': search_params.get('country_indeed', 'USA'),
-                'results_wanted': search_params.get('results_wanted', 50),
-                'job_type': search_params.get('job_type'),
-                'is_remote': search_params.get('is_remote'),
-                'distance': search_params.get('distance', 50),
-                'description_format': 'markdown',
-                'verbose': 1  # Reduce verbosity for background tasks
-            }
-            
-            # Remove None values
-            jobspy_params = {k: v for k, v in jobspy_params.items() if v is not None}
-            
-            logger.info(f"Executing search with parameters: {jobspy_params}")
-            
-            # Execute the search (run in thread pool to avoid blocking)
-            loop = asyncio.get_event_loop()
-            jobs_df = await loop.run_in_executor(None, scrape_jobs, **jobspy_params)
-            
-            jobs_found = len(jobs_df) if jobs_df is not None else 0
-            
-            logger.info(f"Search {search_id} completed successfully. Found {jobs_found} jobs")
-            
-            # Update job status
-            jobs[search_id].update({
-                "status": "completed",
-                "completed_at": datetime.now().isoformat(),
-                "jobs_found": jobs_found,
-                "result": jobs_df.to_dict('records') if jobs_df is not None else []
-            })
-            
+            outcome = await JobService.run_search(dict(search_params), timeout_ms)
+            count = await search_job_store.save_results(search_id, outcome.jobs)
+        except asyncio.CancelledError:
+            logger.info(f"Search {search_id} cancelled")
+            raise
         except Exception as e:
-            error_msg = f"Search failed: {str(e)}"
             logger.error(f"Search {search_id} failed: {e}", exc_info=True)
-            
-            # Update job status to failed
-            jobs[search_id].update({
-                "status": "failed",
-                "completed_at": datetime.now().isoformat(),
-                "error": error_msg
-            })
-            
-        finally:
-            self.running_searches.discard(search_id)
-
-    async def get_running_searches(self):
-        """Get list of currently running search IDs"""
+            await search_job_store.transition(search_id, SearchJobStatus.FAILED, error=f"Search failed: {str(e)}")
+            return
+
+        await search_job_store.transition(
+            search_id,
+            SearchJobStatus.COMPLETED,
+            count=count,
+            cached=outcome.cached,
+            stale=outcome.stale,
+            skipped_sites=outcome.skipped_sites,
+            partial=outcome.partial,
+            timed_out_sites=outcome.timed_out_sites,
+        )
+        logger.info(f"Search {search_id} completed successfully. Found {count} jobs")
+
+        # Sites served from cache were saved when they were first scraped
+        if not outcome.cached:
+            await ingest_queue.publish_sites(outcome.jobs, search_params, outcome.scraped_sites)
+
+    async def get_running_searches(self) -> List[str]:
+        """Get list of search IDs running in this process"""
         return list(self.running_searches)
 
     async def cancel_search(self, search_id: str) -> bool:
-        """Cancel a running search"""
-        if search_id in self.running_searches:
-            self.running_searches.discard(search_id)
-            if search_id in jobs:
-                jobs[search_id].update({
-                    "status": "cancelled",
-                    "completed_at": datetime.now().isoformat()
-                })
-            logger.info(f"Search {search_id} cancelled")
-            return True
-        return False
+        """
+        Cancel a pending or running search.
+
+        Returns:
+            True if the search was cancelled, False if it is unknown or already finished
+        """
+        record = await search_job_store.transition(search_id, SearchJobStatus.CANCELLED)
+        if record is None:
+            return False
+
+        task = self.running_searches.get(search_id)
+        if task is not None:
+            task.cancel()
+        elif search_job_store.shared:
+            try:
+                from app.celery_app import celery_app
+                await asyncio.to_thread(celery_app.control.revoke, search_id)
+            except Exception as e:
+                # A search that already started finishes, but keeps its cancelled status
+                logger.warning(f"Could not revoke worker task for search {search_id}: {e}")
+
+        logger.info(f"Search {search_id} cancelled")
+        return True
+
 
 # Global instance
 background_service = BackgroundService()
-
-async def process_job_async(job_id: str, search_function, params: Dict[str, Any]):
-    """Process a job asynchronously."""
-    try:
-        logger.info(f"Starting background job {job_id}")
-        jobs[job_id]["status"] = "running"
-        
-        # Execute the search
-        result, is_cached = await asyncio.to_thread(search_function, params)
-        
-        # Store result
-        jobs[job_id]["status"] = "completed"
-        jobs[job_id]["result"] = result
-        jobs[job_id]["is_cached"] = is_cached
-        jobs[job_id]["completed_at"] = datetime.now().isoformat()
-        
-        logger.info(f"Completed background job {job_id}")
-    except Exception as e:
-        logger.error(f"Error processing job {job_id}: {str(e)}")
-        jobs[job_id]["status"] = "failed"
-        jobs[job_id]["error"] = str(e)
-
-def create_background_job(search_function, params: Dict[str, Any]) -> str:
-    """Create a new background job."""
-    job_id = str(uuid.uuid4())
-    jobs[job_id] = {
-        "id": job_id,
-        "status": "pending",
-        "created_at": datetime.now().isoformat(),
-        "params": params,
-    }
-    
-    # Start the background task
-    asyncio.create_task(process_job_async(job_id, search_function, params))
-    
-    return job_id
-
-def get_job_status(job_id: str) -> Optional[Dict[str, Any]]:
-    """Get the status of a job."""
-    return jobs.get(job_id)
@@ -0,0 +1,151 @@
+"""
+Batch execution of many job searches.
+
+A batch (e.g. every search_term x location combination of a nightly job) is
+planned as a whole: identical searches are run once, searches the cache can
+answer are returned first without using any scrape capacity, and the rest are
+run under a shared budget of BATCH_SEARCH_CONCURRENCY searches in flight. Each
+search still fans out per site through the scrape executor, whose per-site
+limits apply across the whole batch, and concurrent scrapes of the same site
+slice are coalesced.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from app.cache import cache
+from app.core.config import settings
+from app.services.ingest_queue import ingest_queue
+from app.services.job_service import JobService, SearchOutcome
+
+logger = logging.getLogger(__name__)
+
+# Searches left running by a client that went away, saved once they finish
+_late_saves: Set[asyncio.Task] = set()
+
+
+@dataclass
+class BatchQuery:
+    """One distinct search of a batch and the positions it was requested at."""
+    key: str
+    params: Dict[str, Any]
+    indexes: List[int] = field(default_factory=list)
+
+
+@dataclass
+class BatchResult:
+    """The outcome of one distinct search of a batch."""
+    query: BatchQuery
+    outcome: Optional[SearchOutcome] = None
+    error: Optional[str] = None
+
+
+class BatchSearchService:
+    """Plans and runs batches of job searches."""
+
+    def __init__(self, concurrency: Optional[int] = None):
+        self.concurrency = concurrency or settings.BATCH_SEARCH_CONCURRENCY
+
+    @staticmethod
+    def plan(searches: List[Dict[str, Any]]) -> List[BatchQuery]:
+        """
+        Group identical searches, keeping the order they were first requested in.
+
+        Args:
+            searches: Search parameter dicts in request order
+
+        Returns:
+            One BatchQuery per distinct search
+        """
+        queries: Dict[str, BatchQuery] = {}
+        for index, params in enumerate(searches):
+            key = cache._generate_key(params)
+            if key not in queries:
+                queries[key] = BatchQuery(key=key, params=dict(params))
+            queries[key].indexes.append(index)
+        return list(queries.values())
+
+    async def run(self, queries: List[BatchQuery], timeout_ms: Optional[int] = None) -> AsyncIterator[BatchResult]:
+        """
+        Run a planned batch, yielding each search's result as soon as it is ready.
+
+        Cached searches are yielded first, then the others in completion order.
+        A failing search yields a BatchResult with its error instead of
+        aborting the batch. If the consumer stops early, searches still waiting
+        for the budget are dropped; searches already running finish in the
+        background and their scraped jobs are queued for saving.
+
+        Args:
+            queries: Distinct searches from plan()
+            timeout_ms: Deadline for each search once it starts, in milliseconds
+
+        Yields:
+            BatchResult for every query
+        """
+        misses = []
+        for query in queries:
+            try:
+                outcome = await JobService.cached_search(dict(query.params))
+            except Exception as e:
+                logger.warning(f"Cache lookup for batch search {query.key} failed: {e}")
+                outcome = None
+            if outcome is not None:
+                yield BatchResult(query=query, outcome=outcome)
+            else:
+                misses.append(query)
+
+        if not misses:
+            return
+        logger.info(f"Batch: {len(queries) - len(misses)} searches cached, running {len(misses)} with concurrency {self.concurrency}")
+
+        budget = asyncio.Semaphore(self.concurrency)
+        started: Set[str] = set()
+
+        async def run_query(query: BatchQuery) -> BatchResult:
+            async with budget:
+                started.add(query.key)
+                try:
+                    outcome = await JobService.run_search(dict(query.params), timeout_ms)
+                except Exception as e:
+                    logger.error(f"Batch search {query.key} failed: {e}")
+                    return BatchResult(query=query, error=str(e))
+            return BatchResult(query=query, outcome=outcome)
+
+        tasks = {asyncio.ensure_future(run_query(query)): query for query in misses}
+        pending = set(tasks)
+        # Results the consumer has not taken over yet; a result counts as taken
+        # over once the consumer asks for the next one
+        unreported = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+                    unreported.discard(task)
+        finally:
+            # The client went away; searches not yet started are not worth running,
+            # the scrapes of running ones are saved when they finish
+            for task in unreported:
+                if tasks[task].key in started:
+                    self._save_when_done(task)
+                else:
+                    task.cancel()
+
+    @staticmethod
+    def _save_when_done(task: asyncio.Future) -> None:
+        """Queue a search's freshly scraped jobs for saving once it finishes."""
+        async def save() -> None:
+            result = await task
+            if result.outcome is not None and not result.outcome.cached:
+                await ingest_queue.publish_sites(
+                    result.outcome.jobs, dict(result.query.params), result.outcome.scraped_sites
+                )
+
+        late_save = asyncio.ensure_future(save())
+        _late_saves.add(late_save)
+        late_save.add_done_callback(_late_saves.discard)
+
+
+# Global batch search service instance
+batch_search_service = BatchSearchService()
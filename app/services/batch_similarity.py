@@ -0,0 +1,133 @@
+"""
+Vectorized similarity scoring of job pairs for deduplication.
+
+JobDeduplicationService scores a job against a stored posting with a weighted
+sum of text similarities of their normalized features (see FEATURE_WEIGHTS).
+Scoring a scrape batch against its candidates pair by pair spends most of its
+time in Python. Here every (job, candidate) pair of a batch is scored at once:
+each text feature is compared for all pairs in one call to rapidfuzz's C
+implementation, and the weighted sums, thresholds and best matches are computed
+with NumPy.
+
+Text similarity is the normalized Indel similarity 2 * LCS / (len(a) + len(b)),
+which is what difflib.SequenceMatcher.ratio approximates. Without rapidfuzz
+installed, SequenceMatcher is used, once per distinct pair of strings.
+"""
+import logging
+from difflib import SequenceMatcher
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = None
+    process = None
+
+logger = logging.getLogger(__name__)
+
+# Weight of each normalized feature in the similarity score
+FEATURE_WEIGHTS = {
+    'title': 0.4,
+    'company': 0.3,
+    'location': 0.15,
+    'job_type': 0.1,
+    'description_snippet': 0.05,
+}
+
+# Features compared by equality rather than text similarity
+EXACT_FEATURES = ('job_type',)
+
+
+def text_similarity(text1: str, text2: str) -> float:
+    """Similarity of two strings from 0.0 to 1.0; 0.0 if either is empty."""
+    if not text1 or not text2:
+        return 0.0
+    if fuzz is not None:
+        return fuzz.ratio(text1, text2) / 100.0
+    return SequenceMatcher(None, text1, text2).ratio()
+
+
+def paired_text_similarity(left: Sequence[str], right: Sequence[str]) -> np.ndarray:
+    """Similarity of left[i] and right[i] for every i, as text_similarity computes it."""
+    if not len(left):
+        return np.zeros(0, dtype=np.float64)
+    if process is not None:
+        scores = process.cpdist(left, right, scorer=fuzz.ratio, dtype=np.float64, workers=-1) / 100.0
+    else:
+        cache: Dict[Tuple[str, str], float] = {}
+        scores = np.fromiter(
+            (cache[pair] if pair in cache else cache.setdefault(pair, SequenceMatcher(None, *pair).ratio())
+             for pair in zip(left, right)),
+            dtype=np.float64, count=len(left)
+        )
+    empty = (np.fromiter(map(len, left), dtype=np.int64, count=len(left)) == 0) | \
+            (np.fromiter(map(len, right), dtype=np.int64, count=len(right)) == 0)
+    scores[empty] = 0.0
+    return scores
+
+
+def pair_scores(
+    new: List[Dict[str, str]],
+    existing: List[Dict[str, str]],
+    rows: np.ndarray,
+    cols: np.ndarray
+) -> np.ndarray:
+    """
+    Weighted similarity of the pairs (new[rows[k]], existing[cols[k]]).
+
+    Args:
+        new: Normalized features of the scraped jobs
+        existing: Normalized features of the candidates
+        rows: Index into new of each pair
+        cols: Index into existing of each pair
+
+    Returns:
+        Similarity score of each pair
+    """
+    total = np.zeros(len(rows), dtype=np.float64)
+    if not len(rows):
+        return total
+    for feature, weight in FEATURE_WEIGHTS.items():
+        new_values = np.array([features[feature] for features in new], dtype=object)
+        existing_values = np.array([features[feature] for features in existing], dtype=object)
+        left, right = new_values[rows], existing_values[cols]
+        if feature in EXACT_FEATURES:
+            total += (left == right).astype(np.float64) * weight
+        else:
+            total += paired_text_similarity(left.tolist(), right.tolist()) * weight
+    return total
+
+
+def best_matches(
+    new: List[Dict[str, str]],
+    existing: List[Dict[str, str]],
+    rows: np.ndarray,
+    cols: np.ndarray,
+    threshold: float
+) -> List[List[Tuple[int, float]]]:
+    """
+    Score candidate pairs and keep those at or above the threshold.
+
+    Args:
+        new: Normalized features of the scraped jobs
+        existing: Normalized features of the candidates
+        rows: Index into new of each candidate pair
+        cols: Index into existing of each candidate pair
+        threshold: Minimum score of a match
+
+    Returns:
+        Per scraped job, (index into existing, score) of its matches, best first
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    scores = pair_scores(new, existing, rows, cols)
+    matches: List[List[Tuple[int, float]]] = [[] for _ in new]
+
+    keep = scores >= threshold
+    rows, cols, scores = rows[keep], cols[keep], scores[keep]
+    # By job, then by score descending; stable, so equal scores keep candidate order
+    for k in np.lexsort((-scores, rows)):
+        matches[rows[k]].append((int(cols[k]), float(scores[k])))
+    return matches
@@ -0,0 +1,613 @@
+"""
+Set-based ingestion of scraped jobs into the tracking database.
+
+JobTrackingService.process_scraped_jobs saves one job at a time: a hash lookup,
+company, location and category lookups and a commit for every job, and another
+commit for every merged duplicate. BulkIngestService saves a whole batch with a
+fixed number of statements instead. Existing hashes are resolved with one IN
+query; companies, locations, job categories, postings, sources and metrics are
+written with multi-row INSERT ... ON CONFLICT; and the batch is committed once.
+Company, location and job category IDs come from the resolution cache
+(app.services.resolution_cache) where it knows them.
+
+Deduplication matches the per-job path. A job is merged into a stored posting
+with the same hash or one JobDeduplicationService scores as a duplicate. Within
+the batch, repeats of a job are merged into its first occurrence. Candidates
+for the jobs without an exact match are looked up in the MinHash-LSH index
+(app.services.dedup_index) for the whole batch at once, and new postings are
+added to it in the same transaction. All pairs are scored at once with
+app.services.batch_similarity.
+"""
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, date
+from decimal import Decimal
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, literal_column, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.tracking_models import (
+    JobPosting, Company, Location, JobCategory, JobSource,
+    JobMetrics, ScrapingRun
+)
+from app.services.batch_similarity import pair_scores
+from app.services.job_tracking_service import JobTrackingService, job_tracking_service
+from app.services.resolution_cache import (
+    CATEGORIES, COMPANIES, LOCATIONS, ResolutionCache, resolution_cache as default_resolution_cache
+)
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT statement, well below PostgreSQL's 65535 bind parameter limit
+INSERT_CHUNK_ROWS = 1000
+
+# Largest absolute value a DECIMAL(12, 2) salary column holds
+_MAX_SALARY = Decimal('9999999999.99')
+
+# True in RETURNING for rows an INSERT ... ON CONFLICT DO UPDATE inserted rather than updated
+_INSERTED = literal_column('xmax = 0').label('inserted')
+
+
+@dataclass
+class _IngestRow:
+    """One scraped job on its way into the database."""
+    job_data: Dict[str, Any]
+    features: Dict[str, str]
+    job_hash: str
+    posting: Dict[str, Any]
+    company_name: str
+    normalized_company: str
+    # Stored posting this job is merged into, once known
+    posting_id: Optional[int] = None
+    # Earlier job of the batch this one repeats
+    primary: Optional['_IngestRow'] = None
+    similarity_score: Optional[float] = None
+
+    @property
+    def is_new(self) -> bool:
+        return self.primary is None and self.similarity_score is None
+
+
+def _column_overflow(model, values: Dict[str, Any]) -> Optional[str]:
+    """Name the first string value too long for its column, if any."""
+    for column in model.__table__.columns:
+        length = getattr(column.type, 'length', None)
+        value = values.get(column.name)
+        if length and isinstance(value, str) and len(value) > length:
+            return f"{model.__tablename__}.{column.name} is longer than {length} characters"
+    return None
+
+
+class BulkIngestService:
+    """Saves batches of scraped jobs with set-based upserts and one commit per batch."""
+
+    def __init__(
+        self,
+        tracking_service: Optional[JobTrackingService] = None,
+        resolution_cache: Optional[ResolutionCache] = None
+    ):
+        """
+        Initialize the bulk ingest service.
+
+        Args:
+            tracking_service: Service whose field extraction and deduplication rules are applied
+            resolution_cache: Cache of company, location and category IDs (defaults to the global one)
+        """
+        self.tracking = tracking_service or job_tracking_service
+        self.dedup_service = self.tracking.dedup_service
+        self.resolution_cache = resolution_cache or default_resolution_cache
+
+    def process_scraped_jobs(
+        self,
+        jobs_data: List[Dict],
+        source_site: str,
+        search_params: Dict,
+        db: Session
+    ) -> Dict[str, Any]:
+        """
+        Save a batch of scraped jobs in one transaction.
+
+        Takes the same arguments and returns the same statistics as
+        JobTrackingService.process_scraped_jobs. Jobs that cannot be stored
+        (for example a title longer than its column) are counted as errors and
+        skipped. A database error rolls the whole batch back, records a failed
+        scraping run and is raised, so the caller can retry the batch.
+
+        Args:
+            jobs_data: List of job dictionaries from scraper
+            source_site: Source site name (e.g., 'indeed', 'linkedin')
+            search_params: Search parameters used for scraping
+            db: Database session
+
+        Returns:
+            Dictionary with processing statistics
+        """
+        stats = {
+            'total_jobs': len(jobs_data),
+            'new_jobs': 0,
+            'duplicate_jobs': 0,
+            'updated_jobs': 0,
+            'errors': 0,
+            'new_companies': 0,
+            'processed_jobs': []
+        }
+        started_at = datetime.utcnow()
+
+        created: Dict[str, Dict[Hashable, int]] = {}
+
+        try:
+            self.resolution_cache.warm(db)
+            rows = self._prepare_rows(jobs_data, stats)
+            self._match_existing(rows, db)
+            self._match_within_batch(rows)
+
+            new_rows = [row for row in rows if row.is_new]
+            company_ids = self._upsert_companies(new_rows, db, created)
+            location_ids = self._upsert_locations(new_rows, db, created)
+            category_ids = self._upsert_categories(new_rows, db, created)
+            stats['new_companies'] = len(created.get(COMPANIES, {}))
+            raced = self._insert_postings(new_rows, company_ids, location_ids, category_ids, db)
+
+            for row in rows:
+                if row.primary is not None:
+                    row.posting_id = row.primary.posting_id
+            merged_ids = {row.posting_id for row in rows if not row.is_new} | raced
+            self._touch_postings(merged_ids, db)
+            self._upsert_sources(rows, source_site, db)
+            self._upsert_metrics(rows, db)
+
+            for row in rows:
+                inserted = row.is_new and row.posting_id not in raced
+                stats['new_jobs' if inserted else 'duplicate_jobs'] += 1
+                stats['processed_jobs'].append({
+                    'job_id': row.posting_id,
+                    'title': row.posting['title'],
+                    'company': row.company_name,
+                    'action': 'created' if inserted else 'merged',
+                    'similarity_score': None if inserted else (row.similarity_score or 1.0)
+                })
+
+            db.add(ScrapingRun(
+                source_site=source_site,
+                search_params=search_params,
+                status='completed',
+                jobs_found=len(jobs_data),
+                jobs_new=stats['new_jobs'],
+                jobs_updated=stats['updated_jobs'],
+                started_at=started_at,
+                completed_at=datetime.utcnow()
+            ))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Bulk ingest of {len(jobs_data)} jobs from {source_site} failed: {e}")
+            if isinstance(e, IntegrityError):
+                # Possibly a cached ID of a row that no longer exists
+                self.resolution_cache.invalidate()
+            try:
+                db.add(ScrapingRun(
+                    source_site=source_site,
+                    search_params=search_params,
+                    status='failed',
+                    jobs_found=len(jobs_data),
+                    started_at=started_at,
+                    error_message=str(e)
+                ))
+                db.commit()
+            except Exception as record_error:
+                db.rollback()
+                logger.error(f"Could not record the failed scraping run: {record_error}")
+            raise
+
+        for kind, ids in created.items():
+            self.resolution_cache.remember(kind, ids)
+        logger.info(f"Bulk ingested {stats['total_jobs']} jobs from {source_site}: "
+                    f"{stats['new_jobs']} new, {stats['duplicate_jobs']} duplicates, "
+                    f"{stats['errors']} errors")
+        return stats
+
+    def _prepare_rows(self, jobs_data: List[Dict], stats: Dict[str, Any]) -> List[_IngestRow]:
+        """Normalize every job once; jobs that could not be stored are counted as errors."""
+        rows = []
+        for job_data in jobs_data:
+            try:
+                features = self.dedup_service.job_features(job_data)
+                posting = self.tracking._posting_fields(job_data)
+                company_name = self.tracking._company_name(job_data)
+                location_key = self.tracking._location_key(job_data) or (None, None, None)
+                problem = (
+                    _column_overflow(JobPosting, posting)
+                    or self._salary_problem(posting)
+                    or _column_overflow(Company, {'name': company_name})
+                    or _column_overflow(Location, dict(zip(('city', 'state', 'country'), location_key)))
+                    or _column_overflow(JobSource, self.tracking._source_fields(job_data))
+                )
+                if problem:
+                    raise ValueError(problem)
+                rows.append(_IngestRow(
+                    job_data=job_data,
+                    features=features,
+                    job_hash=self.dedup_service.hash_features(features),
+                    posting=posting,
+                    company_name=company_name,
+                    normalized_company=self.dedup_service._normalize_company_name(company_name)
+                ))
+            except Exception as e:
+                logger.error(f"Error processing job '{job_data.get('title', 'Unknown')}': {e}")
+                stats['errors'] += 1
+        return rows
+
+    @staticmethod
+    def _salary_problem(posting: Dict[str, Any]) -> Optional[str]:
+        salary_min, salary_max = posting['salary_min'], posting['salary_max']
+        for salary in (salary_min, salary_max):
+            if salary is not None and abs(Decimal(str(salary))) > _MAX_SALARY:
+                return f"salary {salary} does not fit the salary columns"
+        if salary_min is not None and salary_max is not None and salary_min > salary_max:
+            return f"salary_min {salary_min} is above salary_max {salary_max}"
+        return None
+
+    def _match_existing(self, rows: List[_IngestRow], db: Session) -> None:
+        """Find stored postings by hash with one query, then fuzzy-match the rest through the index."""
+        hashes = list({row.job_hash for row in rows})
+        existing = {}
+        for chunk in _chunks(hashes):
+            existing.update(
+                (job_hash, posting_id) for posting_id, job_hash in
+                db.query(JobPosting.id, JobPosting.job_hash).filter(JobPosting.job_hash.in_(chunk))
+            )
+
+        unmatched: Dict[str, _IngestRow] = {}
+        for row in rows:
+            if row.job_hash not in existing:
+                unmatched.setdefault(row.job_hash, row)
+        if unmatched:
+            fuzzy_rows = list(unmatched.values())
+            similar = self.dedup_service.find_similar_jobs_many([row.features for row in fuzzy_rows], db)
+            for row, duplicates in zip(fuzzy_rows, similar):
+                if duplicates:
+                    # Repeats of this job merge into the same posting
+                    existing[row.job_hash] = duplicates[0][0].id
+                    row.similarity_score = duplicates[0][1]
+
+        for row in rows:
+            if row.job_hash in existing:
+                row.posting_id = existing[row.job_hash]
+                row.similarity_score = row.similarity_score or 1.0
+
+    def _match_within_batch(self, rows: List[_IngestRow]) -> None:
+        """Point repeats and near-duplicates of an earlier new job in the batch at it."""
+        first_by_hash: Dict[str, _IngestRow] = {}
+        distinct_by_company: Dict[str, List[_IngestRow]] = {}
+        for row in rows:
+            if not row.is_new:
+                continue
+            if row.job_hash in first_by_hash:
+                row.primary = first_by_hash[row.job_hash]
+            else:
+                first_by_hash[row.job_hash] = row
+                distinct_by_company.setdefault(row.normalized_company, []).append(row)
+
+        threshold = self.dedup_service.similarity_threshold
+        for group in distinct_by_company.values():
+            if len(group) < 2:
+                continue
+            # Score every job against every earlier job of its company at once
+            later, earlier = np.tril_indices(len(group), -1)
+            features = [row.features for row in group]
+            similarity = np.zeros((len(group), len(group)))
+            similarity[later, earlier] = pair_scores(features, features, later, earlier)
+
+            peers: List[int] = []
+            for position, row in enumerate(group):
+                matching = np.flatnonzero(similarity[position, peers] >= threshold) if peers else []
+                if len(matching):
+                    row.primary = group[peers[matching[0]]]
+                else:
+                    peers.append(position)
+
+        # Repeats of a job merged into an earlier one follow it
+        for row in rows:
+            if row.primary is not None and row.primary.primary is not None:
+                row.primary = row.primary.primary
+
+    def _resolve(
+        self,
+        kind: str,
+        keys: List[Hashable],
+        lookup: Callable[[List[Hashable]], Iterable[Tuple]],
+        values_for: Callable[[Hashable], Dict[str, Any]],
+        statement: Callable[[List[Dict[str, Any]]], Any],
+        db: Session,
+        created: Dict[str, Dict[Hashable, int]]
+    ) -> Dict[Hashable, int]:
+        """
+        Resolve entity IDs through the resolution cache, then the database.
+
+        Keys the cache does not know are looked up with one query per chunk,
+        and keys the database does not know are inserted with INSERT ... ON
+        CONFLICT. IDs of rows that already existed are cached right away; IDs
+        of rows inserted here are collected in created, to be cached once the
+        batch is committed.
+
+        Args:
+            kind: Resolution cache kind
+            keys: Distinct keys to resolve
+            lookup: Query for a chunk of keys, returning rows of (*key, id)
+            values_for: Column values of a new row for a key
+            statement: Upsert for a chunk of values, returning rows of (*key, id, inserted)
+            db: Database session
+            created: Inserted IDs per kind, filled in here
+
+        Returns:
+            ID per key
+        """
+        ids = self.resolution_cache.get_many(kind, keys)
+        missing = [key for key in keys if key not in ids]
+
+        stored = {}
+        for chunk in _chunks(missing):
+            stored.update((_row_key(row[:-1]), row[-1]) for row in lookup(chunk))
+        ids.update(stored)
+        missing = [key for key in missing if key not in stored]
+
+        # Rows another worker committed before our insert come back with inserted = false
+        for row in _execute_chunked(db, [values_for(key) for key in missing], statement):
+            key, entity_id, inserted = _row_key(row[:-2]), row[-2], row[-1]
+            ids[key] = entity_id
+            (created.setdefault(kind, {}) if inserted else stored)[key] = entity_id
+
+        self.resolution_cache.remember(kind, stored)
+        return ids
+
+    def _upsert_companies(
+        self, rows: List[_IngestRow], db: Session, created: Dict[str, Dict[Hashable, int]]
+    ) -> Dict[str, int]:
+        """Resolve company IDs by normalized name, creating missing companies."""
+        by_name: Dict[str, _IngestRow] = {}
+        for row in rows:
+            by_name.setdefault(row.normalized_company, row)
+
+        def values_for(normalized_name):
+            row = by_name[normalized_name]
+            return {
+                'name': row.company_name,
+                'normalized_name': normalized_name,
+                'description': row.job_data.get('company_description'),
+                'logo_url': row.job_data.get('company_logo'),
+                'industry': self.tracking._extract_industry(row.job_data.get('description', '')),
+            }
+
+        def statement(chunk):
+            stmt = pg_insert(Company).values(chunk)
+            # A no-op update makes RETURNING include companies that already existed
+            return stmt.on_conflict_do_update(
+                index_elements=['normalized_name'], set_={'normalized_name': stmt.excluded.normalized_name}
+            ).returning(Company.normalized_name, Company.id, _INSERTED)
+
+        company_ids = self._resolve(
+            COMPANIES, sorted(by_name),
+            lambda chunk: db.query(Company.normalized_name, Company.id).filter(Company.normalized_name.in_(chunk)),
+            values_for, statement, db, created
+        )
+        if created.get(COMPANIES):
+            logger.info(f"Created {len(created[COMPANIES])} new companies")
+        return company_ids
+
+    def _upsert_locations(
+        self, rows: List[_IngestRow], db: Session, created: Dict[str, Dict[Hashable, int]]
+    ) -> Dict[Tuple[str, str, str], int]:
+        """Resolve location IDs by (city, state, country), creating missing locations."""
+        keys = {key for key in (self.tracking._location_key(row.job_data) for row in rows) if key}
+
+        def values_for(key):
+            city, state, country = key
+            return {
+                'city': city,
+                'state': state,
+                'country': country,
+                'region': self.tracking._get_region_for_country(country),
+            }
+
+        def statement(chunk):
+            stmt = pg_insert(Location).values(chunk)
+            return stmt.on_conflict_do_update(
+                constraint='uq_location', set_={'city': stmt.excluded.city}
+            ).returning(Location.city, Location.state, Location.country, Location.id, _INSERTED)
+
+        columns = (Location.city, Location.state, Location.country)
+        return self._resolve(
+            LOCATIONS, sorted(keys),
+            lambda chunk: db.query(*columns, Location.id).filter(tuple_(*columns).in_(chunk)),
+            values_for, statement, db, created
+        )
+
+    def _upsert_categories(
+        self, rows: List[_IngestRow], db: Session, created: Dict[str, Dict[Hashable, int]]
+    ) -> Dict[str, int]:
+        """Resolve job category IDs by name, creating missing categories."""
+        names = {name for name in (self.tracking._category_name(row.job_data) for row in rows) if name}
+
+        def statement(chunk):
+            stmt = pg_insert(JobCategory).values(chunk)
+            return stmt.on_conflict_do_update(
+                index_elements=['name'], set_={'name': stmt.excluded.name}
+            ).returning(JobCategory.name, JobCategory.id, _INSERTED)
+
+        return self._resolve(
+            CATEGORIES, sorted(names),
+            lambda chunk: db.query(JobCategory.name, JobCategory.id).filter(JobCategory.name.in_(chunk)),
+            lambda name: {'name': name}, statement, db, created
+        )
+
+    def _insert_postings(
+        self,
+        rows: List[_IngestRow],
+        company_ids: Dict[str, int],
+        location_ids: Dict[Tuple[str, str, str], int],
+        category_ids: Dict[str, int],
+        db: Session
+    ) -> set:
+        """
+        Insert new job postings and set their IDs on the rows.
+
+        Returns:
+            IDs of postings another worker stored first; those count as merged
+        """
+        now = datetime.utcnow()
+        values = []
+        for row in rows:
+            location_key = self.tracking._location_key(row.job_data)
+            category_name = self.tracking._category_name(row.job_data)
+            values.append({
+                'job_hash': row.job_hash,
+                'company_id': company_ids[row.normalized_company],
+                'location_id': location_ids.get(location_key) if location_key else None,
+                'job_category_id': category_ids.get(category_name) if category_name else None,
+                'first_seen_at': now,
+                'last_seen_at': now,
+                'status': 'active',
+                **row.posting
+            })
+
+        def statement(chunk):
+            stmt = pg_insert(JobPosting).values(chunk)
+            return stmt.on_conflict_do_update(
+                index_elements=['job_hash'],
+                set_={'last_seen_at': stmt.excluded.last_seen_at, 'updated_at': func.now()}
+            ).returning(JobPosting.id, JobPosting.job_hash, _INSERTED)
+
+        posting_ids = {}
+        raced = set()
+        for posting_id, job_hash, inserted in _execute_chunked(db, values, statement):
+            posting_ids[job_hash] = posting_id
+            if not inserted:
+                raced.add(posting_id)
+        for row in rows:
+            row.posting_id = posting_ids[row.job_hash]
+        self.dedup_service.index.add(
+            db, {row.posting_id: row.features for row in rows if row.posting_id not in raced}
+        )
+        return raced
+
+    @staticmethod
+    def _touch_postings(posting_ids: set, db: Session) -> None:
+        """Mark merged postings as seen now."""
+        now = datetime.utcnow()
+        for chunk in _chunks(sorted(posting_ids)):
+            db.query(JobPosting).filter(JobPosting.id.in_(chunk)).update(
+                {JobPosting.last_seen_at: now, JobPosting.updated_at: now},
+                synchronize_session=False
+            )
+
+    def _upsert_sources(self, rows: List[_IngestRow], source_site: str, db: Session) -> None:
+        """Insert or refresh one source row per posting for this site."""
+        sources: Dict[int, Dict[str, Any]] = {}
+        for row in rows:
+            values = {
+                'job_posting_id': row.posting_id,
+                'source_site': source_site,
+                **self.tracking._source_fields(row.job_data)
+            }
+            if row.posting_id in sources:
+                # A later sighting refreshes the URLs, as merge_job_sources does
+                previous = sources[row.posting_id]
+                values['external_job_id'] = previous['external_job_id']
+                values['post_date'] = values['post_date'] or previous['post_date']
+                values['apply_url'] = values['apply_url'] or previous['apply_url']
+            sources[row.posting_id] = values
+
+        # An external ID already stored for another posting would violate
+        # uq_source_external_id and fail the batch; keep the source without it
+        external_ids = {values['external_job_id'] for values in sources.values() if values['external_job_id']}
+        owners: Dict[Any, int] = {}
+        for chunk in _chunks(sorted(external_ids, key=str)):
+            owners.update(db.query(JobSource.external_job_id, JobSource.job_posting_id).filter(
+                JobSource.source_site == source_site,
+                JobSource.external_job_id.in_(chunk)
+            ))
+        for posting_id, values in sources.items():
+            external_id = values['external_job_id']
+            if external_id and owners.setdefault(external_id, posting_id) != posting_id:
+                logger.debug(f"{source_site} job {external_id} is already stored for posting {owners[external_id]}")
+                values['external_job_id'] = None
+
+        def statement(chunk):
+            stmt = pg_insert(JobSource).values(chunk)
+            return stmt.on_conflict_do_update(
+                constraint='uq_job_source_site',
+                set_={
+                    'job_url': stmt.excluded.job_url,
+                    'post_date': func.coalesce(stmt.excluded.post_date, JobSource.post_date),
+                    'apply_url': func.coalesce(stmt.excluded.apply_url, JobSource.apply_url),
+                    'updated_at': func.now(),
+                }
+            )
+
+        _execute_chunked(db, list(sources.values()), statement, returns_rows=False)
+
+    @staticmethod
+    def _upsert_metrics(rows: List[_IngestRow], db: Session) -> None:
+        """Create metrics for new postings and add this batch's sightings to existing ones."""
+        sightings = Counter(row.posting_id for row in rows)
+        today = date.today()
+        values = [{
+            'job_posting_id': posting_id,
+            'total_seen_count': count,
+            'sites_posted_count': 1,
+            'days_active': 0,
+            'last_activity_date': today,
+        } for posting_id, count in sorted(sightings.items())]
+
+        def statement(chunk):
+            stmt = pg_insert(JobMetrics).values(chunk)
+            return stmt.on_conflict_do_update(
+                index_elements=['job_posting_id'],
+                set_={
+                    'total_seen_count': JobMetrics.total_seen_count + stmt.excluded.total_seen_count,
+                    'last_activity_date': stmt.excluded.last_activity_date,
+                    'updated_at': func.now(),
+                }
+            )
+
+        _execute_chunked(db, values, statement, returns_rows=False)
+
+
+def _chunks(items: List[Any], size: int = INSERT_CHUNK_ROWS):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _row_key(parts: Tuple) -> Hashable:
+    """Key of a returned row: its single key column, or a tuple of several."""
+    return parts[0] if len(parts) == 1 else tuple(parts)
+
+
+def _execute_chunked(
+    db: Session,
+    values: List[Dict[str, Any]],
+    statement: Callable[[List[Dict[str, Any]]], Any],
+    returns_rows: bool = True
+) -> List[Any]:
+    """Run a multi-row statement over values in chunks of INSERT_CHUNK_ROWS, collecting returned rows."""
+    results = []
+    for chunk in _chunks(values):
+        result = db.execute(statement(chunk))
+        if returns_rows:
+            results.extend(result.all())
+    return results
+
+
+# Global service instance
+bulk_ingest_service = BulkIngestService()
+
+
+def tracking_ingester():
+    """Service that saves scraped jobs: set-based unless INGEST_BULK_ENABLED is off."""
+    return bulk_ingest_service if settings.INGEST_BULK_ENABLED else job_tracking_service
@@ -0,0 +1,228 @@
+"""
+Cache warming for frequently repeated searches.
+
+The searches in CACHE_WARM_SEARCHES_FILE (recurring_searches.json) and the admin
+search templates are re-scraped shortly before their cached site slices expire,
+so the first caller after expiry does not wait for a cold scrape. The warmer
+wakes up just before the next slice is due, refreshes due slices soonest-expiring
+first, and limits itself to CACHE_WARM_CONCURRENCY concurrent scrapes and
+CACHE_WARM_MAX_SCRAPES_PER_HOUR outbound site scrapes.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+from pydantic import ValidationError
+
+from app.cache import cache
+from app.core.config import settings
+from app.pydantic_models import JobSearchParams
+from app.services.ingest_queue import ingest_queue
+from app.services.job_service import JobService
+from app.services.scrape_executor import scrape_executor
+from app.services.search_coalescer import search_coalescer
+
+logger = logging.getLogger(__name__)
+
+# Never check more often than this, even when many slices expire close together
+MIN_WAKE_INTERVAL = 5
+
+
+@dataclass
+class WarmTarget:
+    """One site slice of a search to keep warm."""
+    key: str
+    site: str
+    params: Dict[str, Any]
+    # Seconds until the cached slice expires, or None if it is not cached
+    expires_in: Optional[float]
+
+
+class CacheWarmer:
+    """Pre-scrape template and recurring searches before their cache entries expire."""
+
+    def __init__(
+        self,
+        searches_file: Optional[str] = None,
+        lead_time: Optional[int] = None,
+        interval: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        max_scrapes_per_hour: Optional[int] = None,
+    ):
+        """
+        Initialize the cache warmer.
+
+        Args:
+            searches_file: JSON file of searches to keep warm (defaults to CACHE_WARM_SEARCHES_FILE)
+            lead_time: Seconds before expiry at which a slice is re-scraped
+            interval: Longest wait between warming checks
+            concurrency: Maximum concurrent warming scrapes
+            max_scrapes_per_hour: Outbound site scrapes allowed per rolling hour
+        """
+        self.searches_file = searches_file or settings.CACHE_WARM_SEARCHES_FILE
+        self.lead_time = settings.CACHE_WARM_LEAD_TIME if lead_time is None else lead_time
+        self.interval = interval or settings.CACHE_WARM_INTERVAL
+        self.concurrency = concurrency or settings.CACHE_WARM_CONCURRENCY
+        self.max_scrapes_per_hour = (
+            settings.CACHE_WARM_MAX_SCRAPES_PER_HOUR if max_scrapes_per_hour is None else max_scrapes_per_hour
+        )
+
+        # Start times of scrapes in the last hour, for the outbound budget
+        self._scrape_times: Deque[float] = deque()
+
+        # Counters for monitoring
+        self.warmed = 0
+        self.failed = 0
+        self.deferred = 0
+        self.last_run: Optional[float] = None
+
+    def load_recurring_searches(self) -> List[Dict[str, Any]]:
+        """Load search definitions from the searches file."""
+        if not self.searches_file or not os.path.exists(self.searches_file):
+            return []
+        try:
+            with open(self.searches_file) as f:
+                definitions = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read cache warming searches from {self.searches_file}: {e}")
+            return []
+        if not isinstance(definitions, list):
+            logger.warning(f"Expected a list of searches in {self.searches_file}")
+            return []
+        return [definition for definition in definitions if isinstance(definition, dict)]
+
+    async def load_templates(self) -> List[Dict[str, Any]]:
+        """Load the search parameters of the admin search templates."""
+        templates = []
+        for template_id in await cache.get("template_keys") or []:
+            template = await cache.get(f"template:{template_id}")
+            if template and template.get("search_params"):
+                templates.append(template["search_params"])
+        return templates
+
+    @staticmethod
+    def to_search_params(definition: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Convert a template or recurring search definition to search parameters.
+
+        Parameters are built like the search endpoint builds them, so warmed
+        slices have the same cache keys as the searches users run.
+
+        Returns:
+            Search parameters, or None if the definition is not a valid search
+        """
+        fields = {k: v for k, v in definition.items() if k in JobSearchParams.model_fields and v is not None}
+        site_names = definition.get("site_name") or definition.get("site_names")
+        fields["site_name"] = site_names or settings.default_site_names_list
+        try:
+            params = JobSearchParams(**fields).dict(exclude_none=True)
+        except ValidationError as e:
+            logger.warning(f"Skipping invalid cache warming search {definition.get('name', '')}: {e}")
+            return None
+        JobService._apply_defaults(params)
+        return params
+
+    async def plan(self) -> List[WarmTarget]:
+        """List the site slices of all warmed searches, soonest-expiring first."""
+        definitions = self.load_recurring_searches() + await self.load_templates()
+        targets: Dict[str, WarmTarget] = {}
+        for definition in definitions:
+            params = self.to_search_params(definition)
+            if params is None:
+                continue
+            for site in scrape_executor.normalize_sites(params.get("site_name")):
+                key = cache.site_key(params, site)
+                if key not in targets:
+                    targets[key] = WarmTarget(key, site, params, await cache.time_to_expiry(key))
+        return sorted(
+            targets.values(),
+            key=lambda target: target.expires_in if target.expires_in is not None else float("-inf"),
+        )
+
+    def _budget_left(self) -> int:
+        cutoff = time.time() - 3600
+        while self._scrape_times and self._scrape_times[0] < cutoff:
+            self._scrape_times.popleft()
+        return self.max_scrapes_per_hour - len(self._scrape_times)
+
+    async def run_cycle(self) -> float:
+        """
+        Re-scrape the slices that expire within the lead time.
+
+        Returns:
+            Seconds until the next slice is due, capped at the warming interval
+        """
+        self.last_run = time.time()
+        targets = await self.plan()
+        due = [t for t in targets if t.expires_in is None or t.expires_in <= self.lead_time]
+
+        next_due = min(
+            (t.expires_in - self.lead_time for t in targets[len(due):] if t.expires_in is not None),
+            default=self.interval,
+        )
+
+        budget = max(0, self._budget_left())
+        if len(due) > budget:
+            self.deferred += len(due) - budget
+            logger.info(f"Cache warming budget reached, deferring {len(due) - budget} of {len(due)} searches")
+            due = due[:budget]
+            # Retry once the oldest scrape in the budget window is an hour old
+            next_due = min(next_due, self._scrape_times[0] + 3600 - time.time() if self._scrape_times else 0)
+
+        if due:
+            semaphore = asyncio.Semaphore(self.concurrency)
+            await asyncio.gather(*(self._warm(target, semaphore) for target in due))
+
+        # Scrapes may have taken a while; measure the wait from the start of the cycle
+        next_due -= time.time() - self.last_run
+        return min(self.interval, max(MIN_WAKE_INTERVAL, next_due))
+
+    async def _warm(self, target: WarmTarget, semaphore: asyncio.Semaphore) -> None:
+        """Scrape and cache one slice, queueing its jobs for saving like a background refresh."""
+        async with semaphore:
+            self._scrape_times.append(time.time())
+            producer = JobService._slice_producer(target.params, target.site, target.key)
+            try:
+                jobs_df, coalesced = await search_coalescer.run(target.key, producer)
+            except Exception as e:
+                self.failed += 1
+                logger.warning(f"Cache warming scrape of {target.site} failed: {e}")
+                return
+
+        self.warmed += 1
+        logger.info(f"Warmed {target.site} search {target.key} with {len(jobs_df)} jobs")
+        if not coalesced and not jobs_df.empty:
+            site_params = dict(target.params)
+            site_params["site_name"] = [target.site]
+            await ingest_queue.publish(jobs_df, target.site, site_params)
+
+    async def run_periodically(self) -> None:
+        """Keep warming until cancelled."""
+        while True:
+            try:
+                delay = await self.run_cycle()
+            except Exception as e:
+                logger.error(f"Cache warming cycle failed: {e}")
+                delay = self.interval
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get warming counters for monitoring."""
+        return {
+            "enabled": settings.CACHE_WARM_ENABLED,
+            "warmed": self.warmed,
+            "failed": self.failed,
+            "deferred": self.deferred,
+            "scrapes_last_hour": self.max_scrapes_per_hour - self._budget_left(),
+            "max_scrapes_per_hour": self.max_scrapes_per_hour,
+            "last_run": self.last_run,
+        }
+
+
+# Global cache warmer instance
+cache_warmer = CacheWarmer()
@@ -0,0 +1,197 @@
+"""
+Per-site circuit breaker for job board scrapes.
+
+When a job board starts failing (captchas, 403s, timeouts), every search that
+includes it would keep paying for the failing scrape. Each site has a circuit:
+
+- closed: scrapes run normally and their outcomes are recorded
+- open: the site failed too often within SCRAPE_BREAKER_WINDOW seconds, so
+  scrapes are skipped for SCRAPE_BREAKER_COOLDOWN seconds
+- half-open: after the cooldown a single probe scrape is let through; success
+  closes the circuit, failure opens it again
+
+Circuits are kept per worker process.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class SiteUnavailableError(Exception):
+    """Raised instead of scraping a site whose circuit is open or whose last scrape failed."""
+
+    def __init__(self, site: str, reason: str, retry_after: Optional[float] = None):
+        self.site = site
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(f"{site} skipped: {reason}")
+
+
+class SiteCircuit:
+    """Failure tracking and state for one site."""
+
+    def __init__(self):
+        self.state = CircuitState.CLOSED
+        # (timestamp, succeeded) for recent scrapes
+        self.outcomes: Deque[Tuple[float, bool]] = deque()
+        self.opened_at: Optional[float] = None
+        self.probe_started_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.times_opened = 0
+
+
+class CircuitBreaker:
+    """Track scrape failures per site and short-circuit failing sites."""
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        window: Optional[int] = None,
+        min_requests: Optional[int] = None,
+        failure_rate: Optional[float] = None,
+        cooldown: Optional[int] = None,
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            enabled: Enable short-circuiting (defaults to SCRAPE_BREAKER_ENABLED)
+            window: Seconds of recent scrape outcomes considered
+            min_requests: Scrapes needed within the window before a circuit can open
+            failure_rate: Fraction of failed scrapes that opens a circuit
+            cooldown: Seconds a circuit stays open before a probe scrape is allowed
+        """
+        self.enabled = settings.SCRAPE_BREAKER_ENABLED if enabled is None else enabled
+        self.window = window or settings.SCRAPE_BREAKER_WINDOW
+        self.min_requests = min_requests or settings.SCRAPE_BREAKER_MIN_REQUESTS
+        self.failure_rate = failure_rate or settings.SCRAPE_BREAKER_FAILURE_RATE
+        self.cooldown = cooldown or settings.SCRAPE_BREAKER_COOLDOWN
+
+        self._circuits: Dict[str, SiteCircuit] = {}
+        # Celery and the API share this module; scrapes complete on executor threads
+        self._lock = threading.Lock()
+
+    def _circuit(self, site: str) -> SiteCircuit:
+        return self._circuits.setdefault(site.lower(), SiteCircuit())
+
+    def _prune(self, circuit: SiteCircuit, now: float) -> None:
+        while circuit.outcomes and circuit.outcomes[0][0] < now - self.window:
+            circuit.outcomes.popleft()
+
+    def before_scrape(self, site: str) -> None:
+        """
+        Check whether a site may be scraped.
+
+        Raises:
+            SiteUnavailableError: If the site's circuit is open, or half-open with
+                its probe scrape already running
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            circuit = self._circuit(site)
+            now = time.time()
+            if circuit.state == CircuitState.OPEN:
+                remaining = circuit.opened_at + self.cooldown - now
+                if remaining > 0:
+                    raise SiteUnavailableError(site, f"circuit open after repeated failures: {circuit.last_error}", remaining)
+                circuit.state = CircuitState.HALF_OPEN
+                circuit.probe_started_at = None
+                logger.info(f"Circuit for {site} is half-open, allowing a probe scrape")
+            if circuit.state == CircuitState.HALF_OPEN:
+                # A probe that never reported back (e.g. cancelled) is replaced after the cooldown
+                if circuit.probe_started_at is not None and now - circuit.probe_started_at < self.cooldown:
+                    raise SiteUnavailableError(
+                        site, "circuit half-open, probe scrape in progress",
+                        circuit.probe_started_at + self.cooldown - now,
+                    )
+                circuit.probe_started_at = now
+
+    def record_success(self, site: str) -> None:
+        """Record a successful scrape, closing a half-open circuit."""
+        with self._lock:
+            circuit = self._circuit(site)
+            now = time.time()
+            if circuit.state != CircuitState.CLOSED:
+                logger.info(f"Circuit for {site} closed after a successful scrape")
+                circuit.outcomes.clear()
+            circuit.state = CircuitState.CLOSED
+            circuit.probe_started_at = None
+            circuit.outcomes.append((now, True))
+            self._prune(circuit, now)
+
+    def record_failure(self, site: str, error: Any) -> None:
+        """Record a failed scrape, opening the circuit if the site fails too often."""
+        with self._lock:
+            circuit = self._circuit(site)
+            now = time.time()
+            circuit.last_error = str(error)
+            circuit.outcomes.append((now, False))
+            self._prune(circuit, now)
+
+            if circuit.state == CircuitState.HALF_OPEN:
+                self._open(site, circuit, now)
+                return
+
+            failures = sum(1 for _, succeeded in circuit.outcomes if not succeeded)
+            total = len(circuit.outcomes)
+            if circuit.state == CircuitState.CLOSED and total >= self.min_requests and failures / total >= self.failure_rate:
+                self._open(site, circuit, now)
+
+    def _open(self, site: str, circuit: SiteCircuit, now: float) -> None:
+        circuit.state = CircuitState.OPEN
+        circuit.opened_at = now
+        circuit.probe_started_at = None
+        circuit.times_opened += 1
+        logger.warning(f"Circuit for {site} opened for {self.cooldown}s: {circuit.last_error}")
+
+    def state(self, site: str) -> CircuitState:
+        """Get the current state of a site's circuit."""
+        with self._lock:
+            circuit = self._circuits.get(site.lower())
+            return circuit.state if circuit else CircuitState.CLOSED
+
+    def reset(self, site: Optional[str] = None) -> None:
+        """Close one site's circuit, or all circuits."""
+        with self._lock:
+            if site is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(site.lower(), None)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get the state and recent failure counts of every site's circuit."""
+        with self._lock:
+            now = time.time()
+            stats = {}
+            for site, circuit in sorted(self._circuits.items()):
+                self._prune(circuit, now)
+                stats[site] = {
+                    "state": circuit.state.value,
+                    "recent_requests": len(circuit.outcomes),
+                    "recent_failures": sum(1 for _, succeeded in circuit.outcomes if not succeeded),
+                    "times_opened": circuit.times_opened,
+                    "last_error": circuit.last_error,
+                    "retry_after": (
+                        max(0.0, round(circuit.opened_at + self.cooldown - now, 1))
+                        if circuit.state == CircuitState.OPEN else None
+                    ),
+                }
+            return stats
+
+
+# Global circuit breaker instance
+circuit_breaker = CircuitBreaker()
@@ -0,0 +1,185 @@
+"""
+MinHash-LSH index of job postings for fuzzy deduplication.
+
+A posting's normalized title, company and location are cut into shingles
+(character 3-grams of title and company, words of the location) and summarized
+by a MinHash signature of DEDUP_LSH_PERMUTATIONS values. Two postings agree on
+any one signature value with a probability equal to the Jaccard similarity of
+their shingle sets. The signature is split into DEDUP_LSH_BANDS bands, and each
+band is hashed into a bucket stored in job_dedup_buckets, keyed by
+(band, bucket). Postings sharing at least one bucket with a job are its
+candidate duplicates; with the defaults (16 bands of 4 values), postings with a
+shingle similarity of 0.7 share a bucket 99% of the time, and of 0.3 about 12%.
+
+Finding candidates is a primary key lookup per band, so its cost does not grow
+with the number of stored postings. Postings are added to the index when they
+are inserted; scripts/build_dedup_index.py indexes postings stored before.
+"""
+import hashlib
+import logging
+import re
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.config import settings
+from app.models.tracking_models import JobDedupBucket, JobPosting
+
+logger = logging.getLogger(__name__)
+
+# Prime modulus of the permutations (a * x + b) % p; keeps a * x within 64 bits
+_PRIME = np.uint64((1 << 31) - 1)
+
+# Seed of the permutations; changing it invalidates every stored bucket
+_SEED = 1
+
+# (band, bucket) pairs per candidate query
+QUERY_CHUNK_KEYS = 1000
+
+# Rows per INSERT of index entries
+INSERT_CHUNK_ROWS = 1000
+
+
+class MinHashLSHIndex:
+    """Persistent MinHash-LSH index over normalized job features."""
+
+    def __init__(
+        self,
+        num_perm: Optional[int] = None,
+        bands: Optional[int] = None,
+        max_candidates: Optional[int] = None
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            num_perm: MinHash signature length (defaults to DEDUP_LSH_PERMUTATIONS)
+            bands: Bands the signature is split into (defaults to DEDUP_LSH_BANDS)
+            max_candidates: Candidates returned per job, most shared bands first (defaults to DEDUP_MAX_CANDIDATES)
+        """
+        self.num_perm = num_perm or settings.DEDUP_LSH_PERMUTATIONS
+        self.bands = bands or settings.DEDUP_LSH_BANDS
+        self.max_candidates = max_candidates or settings.DEDUP_MAX_CANDIDATES
+        if self.num_perm % self.bands:
+            raise ValueError(f"{self.num_perm} permutations cannot be split into {self.bands} bands")
+        self.rows_per_band = self.num_perm // self.bands
+
+        rng = np.random.RandomState(_SEED)
+        self._a = rng.randint(1, int(_PRIME), size=self.num_perm).astype(np.uint64)
+        self._b = rng.randint(0, int(_PRIME), size=self.num_perm).astype(np.uint64)
+
+    @staticmethod
+    def shingles(features: Dict[str, str]) -> Set[str]:
+        """Tagged shingles of normalized title, company and location (see JobDeduplicationService.job_features)."""
+        shingles = set()
+        for tag in ('title', 'company'):
+            text = features.get(tag) or ''
+            if len(text) < 3:
+                if text:
+                    shingles.add(f"{tag[0]}:{text}")
+                continue
+            shingles.update(f"{tag[0]}:{text[i:i + 3]}" for i in range(len(text) - 2))
+        shingles.update(f"l:{word}" for word in re.findall(r'\w+', features.get('location') or ''))
+        return shingles
+
+    def signature(self, features: Dict[str, str]) -> Optional[np.ndarray]:
+        """MinHash signature of the features, or None if they have no shingles."""
+        shingles = self.shingles(features)
+        if not shingles:
+            return None
+        values = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'big') for s in shingles),
+            dtype=np.uint64, count=len(shingles)
+        ) % _PRIME
+        return ((np.outer(values, self._a) + self._b) % _PRIME).min(axis=0)
+
+    def band_keys(self, features: Dict[str, str]) -> List[Tuple[int, int]]:
+        """(band, bucket) of each band of the features' signature."""
+        signature = self.signature(features)
+        if signature is None:
+            return []
+        keys = []
+        for band in range(self.bands):
+            values = signature[band * self.rows_per_band:(band + 1) * self.rows_per_band]
+            digest = hashlib.blake2b(values.tobytes(), digest_size=8).digest()
+            keys.append((band, int.from_bytes(digest, 'big', signed=True)))
+        return keys
+
+    def add(self, db: Session, features_by_posting: Dict[int, Dict[str, str]]) -> None:
+        """
+        Index postings in the caller's transaction.
+
+        Args:
+            db: Database session
+            features_by_posting: Normalized features per job posting ID
+        """
+        values = [
+            {'band': band, 'bucket': bucket, 'job_posting_id': posting_id}
+            for posting_id, features in features_by_posting.items()
+            for band, bucket in self.band_keys(features)
+        ]
+        for start in range(0, len(values), INSERT_CHUNK_ROWS):
+            db.execute(
+                pg_insert(JobDedupBucket).values(values[start:start + INSERT_CHUNK_ROWS]).on_conflict_do_nothing()
+            )
+
+    def candidates_many(
+        self,
+        features_list: List[Dict[str, str]],
+        db: Session,
+        max_age_days: int = 90
+    ) -> List[List[JobPosting]]:
+        """
+        Find candidate duplicates of several jobs with one bucket query and one posting query.
+
+        Args:
+            features_list: Normalized features of each job
+            db: Database session
+            max_age_days: Maximum age of postings to consider
+
+        Returns:
+            Candidate postings per job (company and location loaded), most shared bands first
+        """
+        keys_list = [self.band_keys(features) for features in features_list]
+        pairs = sorted({key for keys in keys_list for key in keys})
+        if not pairs:
+            return [[] for _ in features_list]
+
+        cutoff_date = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        cutoff_date = cutoff_date - timedelta(days=max_age_days)
+
+        members = defaultdict(list)
+        for start in range(0, len(pairs), QUERY_CHUNK_KEYS):
+            chunk = pairs[start:start + QUERY_CHUNK_KEYS]
+            members_query = db.query(
+                JobDedupBucket.band, JobDedupBucket.bucket, JobDedupBucket.job_posting_id
+            ).join(JobPosting, JobPosting.id == JobDedupBucket.job_posting_id).filter(
+                tuple_(JobDedupBucket.band, JobDedupBucket.bucket).in_(chunk),
+                JobPosting.first_seen_at >= cutoff_date
+            )
+            for band, bucket, posting_id in members_query:
+                members[(band, bucket)].append(posting_id)
+
+        ranked = []
+        for keys in keys_list:
+            shared_bands = Counter(posting_id for key in keys for posting_id in members.get(key, ()))
+            ranked.append([posting_id for posting_id, _ in shared_bands.most_common(self.max_candidates)])
+
+        posting_ids = sorted({posting_id for candidate_ids in ranked for posting_id in candidate_ids})
+        postings = {}
+        for start in range(0, len(posting_ids), QUERY_CHUNK_KEYS):
+            postings.update(
+                (posting.id, posting) for posting in
+                db.query(JobPosting)
+                .options(joinedload(JobPosting.company), joinedload(JobPosting.location))
+                .filter(JobPosting.id.in_(posting_ids[start:start + QUERY_CHUNK_KEYS]))
+            )
+
+        logger.debug(f"Found {len(postings)} candidate jobs for {len(features_list)} jobs in the LSH index")
+        return [[postings[posting_id] for posting_id in candidate_ids if posting_id in postings]
+                for candidate_ids in ranked]
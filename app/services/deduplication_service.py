@@ -3,21 +3,22 @@ Job deduplication service for preventing duplicate job postings.
 
 This service implements intelligent job deduplication using:
 1. Content hashing for exact matches
-2. Fuzzy matching for similar jobs
+2. Fuzzy matching for similar jobs, with candidates from a MinHash-LSH index
 3. Company + title normalization
 4. Location-based similarity scoring
 """
 import hashlib
 import re
-from typing import Dict, List, Optional, Tuple, Set
-from datetime import datetime, date, timedelta
-from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, date
 import logging
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_
 
-from app.models.tracking_models import JobPosting, Company, JobSource
+from app.models.tracking_models import JobPosting, JobSource
+from app.services.batch_similarity import EXACT_FEATURES, FEATURE_WEIGHTS, best_matches, text_similarity
+from app.services.dedup_index import MinHashLSHIndex
 
 logger = logging.getLogger(__name__)
 
@@ -25,20 +26,16 @@ logger = logging.getLogger(__name__)
 class JobDeduplicationService:
     """Service for detecting and handling duplicate job postings."""
     
-    def __init__(self, similarity_threshold: float = 0.85):
+    def __init__(self, similarity_threshold: float = 0.85, index: Optional[MinHashLSHIndex] = None):
         """
         Initialize deduplication service.
         
         Args:
             similarity_threshold: Minimum similarity score to consider jobs as duplicates (0.0-1.0)
+            index: Index candidate duplicates are looked up in
         """
         self.similarity_threshold = similarity_threshold
-        self.stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 
-            'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'be', 
-            'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 
-            'would', 'should', 'could', 'can', 'may', 'might', 'must'
-        }
+        self.index = index or MinHashLSHIndex()
     
     def generate_job_hash(self, job_data: Dict) -> str:
         """
@@ -50,8 +47,19 @@ class JobDeduplicationService:
         Returns:
             SHA-256 hash string for the job
         """
-        # Normalize and combine key fields for hashing
-        normalized_data = {
+        return self.hash_features(self.job_features(job_data))
+    
+    def job_features(self, job_data: Dict) -> Dict[str, str]:
+        """
+        Normalize the fields of scraped job data that hashing and similarity scoring compare.
+        
+        Args:
+            job_data: Dictionary containing job posting data
+            
+        Returns:
+            Dictionary of normalized title, company, location, job_type and description snippet
+        """
+        return {
             'title': self._normalize_title(self._safe_str(job_data.get('title', ''))),
             'company': self._normalize_company_name(self._safe_str(job_data.get('company', ''))),
             'location': self._normalize_location(self._safe_str(job_data.get('location', ''))),
@@ -60,17 +68,29 @@ class JobDeduplicationService:
                 self._safe_str(job_data.get('description', ''))
             )
         }
-        
-        # Create hash input string
+    
+    def posting_features(self, job_posting: JobPosting) -> Dict[str, str]:
+        """Normalize the fields of a stored job posting the way job_features does for scraped data."""
+        return {
+            'title': self._normalize_title(self._safe_str(job_posting.title)),
+            'company': self._normalize_company_name(self._safe_str(job_posting.company.name)),
+            'location': self._normalize_location(
+                f"{job_posting.location.city}, {job_posting.location.state}"
+                if job_posting.location else ""
+            ),
+            'job_type': self._safe_str(job_posting.job_type).lower() if job_posting.job_type else '',
+            'description_snippet': self._extract_description_snippet(self._safe_str(job_posting.description or ''))
+        }
+    
+    def hash_features(self, features: Dict[str, str]) -> str:
+        """SHA-256 hash of normalized job features, as returned by job_features."""
         hash_input = '|'.join([
-            normalized_data['title'],
-            normalized_data['company'],
-            normalized_data['location'],
-            normalized_data['job_type'],
-            normalized_data['description_snippet']
+            features['title'],
+            features['company'],
+            features['location'],
+            features['job_type'],
+            features['description_snippet']
         ])
-        
-        # Generate SHA-256 hash
         return hashlib.sha256(hash_input.encode('utf-8')).hexdigest()
     
     def find_duplicate_jobs(
@@ -90,8 +110,6 @@ class JobDeduplicationService:
         Returns:
             List of tuples containing (JobPosting, similarity_score)
         """
-        duplicates = []
-        
         # 1. Check for exact hash matches first
         job_hash = self.generate_job_hash(job_data)
         exact_match = db.query(JobPosting).filter(
@@ -101,20 +119,63 @@ class JobDeduplicationService:
         if exact_match:
             return [(exact_match, 1.0)]
         
-        # 2. Find candidate jobs using fuzzy matching
-        candidates = self._get_candidate_jobs(job_data, db, max_age_days)
+        return self.find_similar_jobs(job_data, db, max_age_days)
+    
+    def find_similar_jobs(
+        self, 
+        job_data: Dict, 
+        db: Session,
+        max_age_days: int = 90
+    ) -> List[Tuple[JobPosting, float]]:
+        """
+        Find stored jobs similar enough to count as duplicates, ignoring exact hash matches.
         
-        # 3. Calculate similarity scores for candidates
-        for candidate in candidates:
-            similarity_score = self._calculate_similarity_score(job_data, candidate)
+        Args:
+            job_data: Job data to check for duplicates
+            db: Database session
+            max_age_days: Maximum age of jobs to consider for duplicates
             
-            if similarity_score >= self.similarity_threshold:
-                duplicates.append((candidate, similarity_score))
-        
-        # Sort by similarity score (highest first)
-        duplicates.sort(key=lambda x: x[1], reverse=True)
+        Returns:
+            List of tuples containing (JobPosting, similarity_score), best match first
+        """
+        return self.find_similar_jobs_many([self.job_features(job_data)], db, max_age_days)[0]
+    
+    def find_similar_jobs_many(
+        self, 
+        features_list: List[Dict[str, str]], 
+        db: Session,
+        max_age_days: int = 90
+    ) -> List[List[Tuple[JobPosting, float]]]:
+        """
+        Find stored jobs similar to each of several jobs, with one index lookup for all of them.
         
-        return duplicates
+        Args:
+            features_list: Normalized features of each job, as returned by job_features
+            db: Database session
+            max_age_days: Maximum age of jobs to consider for duplicates
+            
+        Returns:
+            Per job, a list of tuples containing (JobPosting, similarity_score), best match first
+        """
+        candidates_list = self.index.candidates_many(features_list, db, max_age_days)
+        
+        # Score every (job, candidate) pair of the batch at once
+        existing: List[JobPosting] = []
+        columns: Dict[int, int] = {}
+        rows, cols = [], []
+        for row, candidates in enumerate(candidates_list):
+            for candidate in candidates:
+                if candidate.id not in columns:
+                    columns[candidate.id] = len(existing)
+                    existing.append(candidate)
+                rows.append(row)
+                cols.append(columns[candidate.id])
+        
+        matches = best_matches(
+            features_list, [self.posting_features(posting) for posting in existing],
+            rows, cols, self.similarity_threshold
+        )
+        return [[(existing[col], score) for col, score in job_matches] for job_matches in matches]
     
     def is_duplicate_job(self, job_data: Dict, db: Session) -> Tuple[bool, Optional[JobPosting]]:
         """
@@ -197,59 +258,9 @@ class JobDeduplicationService:
         
         return existing_job
     
-    def _get_candidate_jobs(
-        self, 
-        job_data: Dict, 
-        db: Session, 
-        max_age_days: int
-    ) -> List[JobPosting]:
+    def feature_similarity(self, new: Dict[str, str], existing: Dict[str, str]) -> float:
         """
-        Get candidate jobs for similarity comparison.
-        
-        Uses database queries to narrow down potential matches before expensive similarity calculations.
-        """
-        # Get normalized search terms
-        normalized_title = self._normalize_title(self._safe_str(job_data.get('title', '')))
-        normalized_company = self._normalize_company_name(self._safe_str(job_data.get('company', '')))
-        
-        # Extract key terms from title for broader matching
-        title_terms = self._extract_key_terms(normalized_title)
-        
-        # Build query for candidates
-        query = db.query(JobPosting).join(Company)
-        
-        # Date filter
-        cutoff_date = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        cutoff_date = cutoff_date - timedelta(days=max_age_days)
-        query = query.filter(JobPosting.first_seen_at >= cutoff_date)
-        
-        # Company name similarity (exact or partial match)
-        if normalized_company:
-            query = query.filter(
-                or_(
-                    func.lower(Company.name).contains(normalized_company.lower()),
-                    func.lower(Company.name).like(f'%{normalized_company.lower()}%')
-                )
-            )
-        
-        # Title term matching (at least one term must match)
-        if title_terms:
-            title_conditions = []
-            for term in title_terms:
-                title_conditions.append(
-                    func.lower(JobPosting.title).contains(term.lower())
-                )
-            query = query.filter(or_(*title_conditions))
-        
-        # Limit results to prevent performance issues
-        candidates = query.limit(100).all()
-        
-        logger.debug(f"Found {len(candidates)} candidate jobs for similarity comparison")
-        return candidates
-    
-    def _calculate_similarity_score(self, job_data: Dict, existing_job: JobPosting) -> float:
-        """
-        Calculate similarity score between new job data and existing job posting.
+        Weighted similarity of two sets of normalized job features.
         
         Uses weighted scoring across multiple dimensions:
         - Title similarity (40%)
@@ -258,35 +269,13 @@ class JobDeduplicationService:
         - Job type similarity (10%)
         - Description similarity (5%)
         """
-        scores = {}
-        
-        # Title similarity (40%)
-        new_title = self._normalize_title(self._safe_str(job_data.get('title', '')))
-        existing_title = self._normalize_title(self._safe_str(existing_job.title))
-        scores['title'] = self._text_similarity(new_title, existing_title) * 0.4
-        
-        # Company similarity (30%)
-        new_company = self._normalize_company_name(self._safe_str(job_data.get('company', '')))
-        existing_company = self._normalize_company_name(self._safe_str(existing_job.company.name))
-        scores['company'] = self._text_similarity(new_company, existing_company) * 0.3
-        
-        # Location similarity (15%)
-        new_location = self._normalize_location(self._safe_str(job_data.get('location', '')))
-        existing_location = self._normalize_location(
-            f"{existing_job.location.city}, {existing_job.location.state}" 
-            if existing_job.location else ""
-        )
-        scores['location'] = self._text_similarity(new_location, existing_location) * 0.15
-        
-        # Job type similarity (10%)
-        new_job_type = self._safe_str(job_data.get('job_type', '')).lower().strip()
-        existing_job_type = self._safe_str(existing_job.job_type).lower() if existing_job.job_type else ''
-        scores['job_type'] = (1.0 if new_job_type == existing_job_type else 0.0) * 0.1
-        
-        # Description similarity (5%)
-        new_desc_snippet = self._extract_description_snippet(self._safe_str(job_data.get('description', '')))
-        existing_desc_snippet = self._extract_description_snippet(self._safe_str(existing_job.description or ''))
-        scores['description'] = self._text_similarity(new_desc_snippet, existing_desc_snippet) * 0.05
+        scores = {
+            feature: (
+                float(new[feature] == existing[feature]) if feature in EXACT_FEATURES
+                else self._text_similarity(new[feature], existing[feature])
+            ) * weight
+            for feature, weight in FEATURE_WEIGHTS.items()
+        }
         
         total_score = sum(scores.values())
         
@@ -382,23 +371,9 @@ class JobDeduplicationService:
         
         return snippet.lower().strip()
     
-    def _extract_key_terms(self, text: str) -> Set[str]:
-        """Extract key terms from text for matching."""
-        if not text:
-            return set()
-        
-        # Split into words and remove stop words
-        words = re.findall(r'\b\w+\b', text.lower())
-        key_terms = {word for word in words if len(word) > 2 and word not in self.stop_words}
-        
-        return key_terms
-    
     def _text_similarity(self, text1: str, text2: str) -> float:
-        """Calculate text similarity using sequence matching."""
-        if not text1 or not text2:
-            return 0.0
-        
-        return SequenceMatcher(None, text1, text2).ratio()
+        """Calculate text similarity (normalized Indel similarity, see batch_similarity)."""
+        return text_similarity(text1, text2)
     
     def _parse_date(self, date_str: Optional[str]) -> Optional[date]:
         """Parse date string to date object."""
@@ -13,6 +13,7 @@ from app.services.job_service import JobService
 from app.workers.orchestrator import orchestrator
 from app.workers.message_protocol import ScraperType
 from app.core.config import settings
+from app.core.fingerprint import search_fingerprint
 from app.cache import cache
 
 logger = logging.getLogger(__name__)
@@ -248,13 +249,8 @@ class HybridJobService:
             jobspy_params = params.copy()
             jobspy_params['site_name'] = sites
             
-            # Execute search in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            jobs_df, _ = await loop.run_in_executor(
-                None, 
-                JobService.search_jobs, 
-                jobspy_params
-            )
+            # JobService runs the scrape in the shared scrape executor pool
+            jobs_df, _ = await JobService.search_jobs(jobspy_params)
             
             logger.info(f"Python JobSpy found {len(jobs_df)} jobs for sites: {sites}")
             return jobs_df
@@ -335,11 +331,8 @@ class HybridJobService:
     
     def _generate_cache_key(self, params: Dict[str, Any]) -> str:
         """Generate cache key for parameters."""
-        # Create a stable cache key from parameters
-        cache_params = {k: v for k, v in params.items() if v is not None}
-        # Sort to ensure consistent key
-        sorted_params = sorted(cache_params.items())
-        return f"hybrid_search:{hash(str(sorted_params))}"
+        # Stable across workers and restarts, unlike hash()
+        return search_fingerprint(params, namespace="hybrid_search")
     
     async def get_scraper_status(self) -> Dict[str, Any]:
         """
@@ -0,0 +1,305 @@
+"""
+Queue of scraped jobs waiting to be saved to the tracking database.
+
+Saving scraped jobs (deduplication, company matching, several commits per job)
+takes longer than the scrape response should wait for. Everything that scrapes
+(request handlers, late per-site scrapes, stale refreshes, the cache warmer and
+async search jobs) publishes each site's jobs to a Redis stream instead, and
+the data processor workers (app.workers.data_processor) read it through a
+consumer group in batches, so ingestion throughput scales with the number of
+workers. An entry is acknowledged only after it was saved; entries left
+pending by a worker that died are claimed by another one after
+INGEST_CLAIM_IDLE_MS, and entries that keep failing are moved to a dead-letter
+stream after INGEST_MAX_DELIVERIES attempts.
+
+Without Redis, published jobs are saved in a background thread of the
+publishing worker, still off the request path.
+"""
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+import pandas as pd
+
+from app.core.cache_codecs import CacheCodec, CodecError, cache_codec
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Background saves started when no stream is available
+_local_saves: Set[asyncio.Task] = set()
+
+
+@dataclass
+class IngestBatch:
+    """One site's scraped jobs read from the ingest stream."""
+    entry_id: str
+    source_site: str
+    search_params: Dict[str, Any]
+    jobs: pd.DataFrame
+    queued_at: float
+    deliveries: int = 1
+
+
+def _text(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+class IngestQueue:
+    """Redis stream of scraped jobs for the data processor workers."""
+
+    def __init__(
+        self,
+        stream: Optional[str] = None,
+        group: Optional[str] = None,
+        maxlen: Optional[int] = None,
+        client: Any = None,
+        codec: Optional[CacheCodec] = None,
+    ):
+        """
+        Initialize the ingest queue.
+
+        Args:
+            stream: Stream key (defaults to INGEST_STREAM)
+            group: Consumer group the workers read through (defaults to INGEST_CONSUMER_GROUP)
+            maxlen: Approximate cap on the stream length (defaults to INGEST_STREAM_MAXLEN)
+            client: Binary Redis client (created lazily from REDIS_URL if omitted)
+            codec: Codec for the jobs of an entry (defaults to the global cache codec)
+        """
+        self.stream = stream or settings.INGEST_STREAM
+        self.group = group or settings.INGEST_CONSUMER_GROUP
+        self.maxlen = maxlen or settings.INGEST_STREAM_MAXLEN
+        self.codec = codec or cache_codec
+
+        self._client = client
+        self._client_failed = client is None and (not settings.REDIS_URL or not settings.INGEST_QUEUE_ENABLED)
+        self._group_ready = False
+
+    @property
+    def client(self) -> Any:
+        """Resolve the Redis client, or None if Redis is unavailable."""
+        if self._client is None and not self._client_failed:
+            try:
+                from app.core.cache_backend import RedisCompatibleBackend
+                self._client = RedisCompatibleBackend(codec=self.codec).client
+            except Exception as e:
+                logger.warning(f"Redis unavailable, scraped jobs are saved by the worker that scraped them: {e}")
+                self._client_failed = True
+        return self._client
+
+    @property
+    def dead_letter_stream(self) -> str:
+        return f"{self.stream}:dead"
+
+    async def publish(self, jobs_df: pd.DataFrame, source_site: str, search_params: Dict[str, Any]) -> Optional[str]:
+        """
+        Queue one site's scraped jobs for saving.
+
+        Returns:
+            The stream entry ID, or None if the jobs are saved in this worker instead
+        """
+        if jobs_df.empty:
+            return None
+        client = self.client
+        if client is None:
+            self._save_locally(jobs_df, source_site, search_params)
+            return None
+
+        fields = self._fields(jobs_df, source_site, search_params, time.time())
+        try:
+            entry_id = await asyncio.to_thread(client.xadd, self.stream, fields, maxlen=self.maxlen, approximate=True)
+        except Exception as e:
+            logger.error(f"Could not queue {len(jobs_df)} jobs from {source_site} for ingestion: {e}")
+            self._save_locally(jobs_df, source_site, search_params)
+            return None
+        logger.info(f"Queued {len(jobs_df)} jobs from {source_site} for ingestion")
+        return _text(entry_id)
+
+    async def publish_sites(
+        self, jobs_df: pd.DataFrame, search_params: Dict[str, Any], sites: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        Queue a result set's jobs for saving, one entry per site.
+
+        Args:
+            jobs_df: Scraped jobs with a 'site' column
+            search_params: Search parameters used for scraping
+            sites: Sites to queue (defaults to every site in jobs_df)
+
+        Returns:
+            The stream entry IDs
+        """
+        if jobs_df.empty or 'site' not in jobs_df.columns:
+            return []
+        if sites is None:
+            sites = [str(site) for site in jobs_df['site'].dropna().unique()]
+        entry_ids = []
+        for site in sites:
+            site_jobs = jobs_df[jobs_df['site'] == site]
+            if site_jobs.empty:
+                continue
+            try:
+                entry_id = await self.publish(site_jobs, site, search_params)
+            except Exception as e:
+                logger.error(f"Error queueing {site} jobs for ingestion: {e}")
+                continue
+            if entry_id is not None:
+                entry_ids.append(entry_id)
+        return entry_ids
+
+    def _fields(self, jobs_df: pd.DataFrame, source_site: str, search_params: Dict[str, Any], queued_at: float) -> Dict[str, Any]:
+        return {
+            "site": source_site,
+            "params": json.dumps(search_params, default=str),
+            "jobs": self.codec.encode(jobs_df.reset_index(drop=True)),
+            "queued_at": str(queued_at),
+        }
+
+    @staticmethod
+    def _save_locally(jobs_df: pd.DataFrame, source_site: str, search_params: Dict[str, Any]) -> None:
+        batch = IngestBatch(
+            entry_id="local",
+            source_site=source_site,
+            search_params={**search_params, "site_name": [source_site]},
+            jobs=jobs_df.reset_index(drop=True),
+            queued_at=time.time(),
+        )
+        task = asyncio.ensure_future(asyncio.to_thread(_save_batch_now, batch))
+        _local_saves.add(task)
+        task.add_done_callback(_local_saves.discard)
+
+    # Worker side. The data processor workers are synchronous, so these call Redis directly.
+
+    def ensure_group(self) -> None:
+        """Create the stream and its consumer group if they do not exist yet."""
+        if self._group_ready:
+            return
+        try:
+            self.client.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    def read(self, consumer: str, count: int, block_ms: int = 0) -> List[IngestBatch]:
+        """
+        Read up to `count` entries for a consumer.
+
+        Entries that another consumer left unacknowledged for longer than
+        INGEST_CLAIM_IDLE_MS are claimed first; new entries fill the rest.
+        """
+        self.ensure_group()
+        client = self.client
+        entries = []
+        claimed = client.xautoclaim(
+            self.stream, self.group, consumer, min_idle_time=settings.INGEST_CLAIM_IDLE_MS, start_id="0-0", count=count
+        )
+        if claimed and claimed[1]:
+            entries.extend(claimed[1])
+            logger.info(f"Claimed {len(claimed[1])} stale ingest entries")
+        if len(entries) < count:
+            response = client.xreadgroup(
+                self.group, consumer, {self.stream: ">"}, count=count - len(entries), block=block_ms or None
+            )
+            for _, stream_entries in response or []:
+                entries.extend(stream_entries)
+
+        deliveries = self._delivery_counts([_text(entry_id) for entry_id, _ in claimed[1]]) if claimed and claimed[1] else {}
+        batches = []
+        for entry_id, fields in entries:
+            entry_id = _text(entry_id)
+            if not fields:
+                # Trimmed from the stream while pending
+                self.ack([entry_id])
+                continue
+            fields = {_text(key): value for key, value in fields.items()}
+            try:
+                jobs = self.codec.decode(fields["jobs"])
+                batch = IngestBatch(
+                    entry_id=entry_id,
+                    source_site=_text(fields["site"]),
+                    search_params=json.loads(_text(fields["params"])),
+                    jobs=jobs,
+                    queued_at=float(_text(fields.get("queued_at", 0))),
+                    deliveries=deliveries.get(entry_id, 1),
+                )
+            except (CodecError, KeyError, ValueError) as e:
+                logger.error(f"Unreadable ingest entry {entry_id}: {e}")
+                self.dead_letter(entry_id, fields, str(e))
+                continue
+            batches.append(batch)
+        return batches
+
+    def _delivery_counts(self, entry_ids: List[str]) -> Dict[str, int]:
+        if not entry_ids:
+            return {}
+        pipe = self.client.pipeline()
+        for entry_id in entry_ids:
+            pipe.xpending_range(self.stream, self.group, min=entry_id, max=entry_id, count=1)
+        counts = {}
+        for pending in pipe.execute():
+            for item in pending:
+                counts[_text(item["message_id"])] = int(item["times_delivered"])
+        return counts
+
+    def ack(self, entry_ids: List[str]) -> None:
+        """Acknowledge saved entries and remove them from the stream."""
+        if not entry_ids:
+            return
+        pipe = self.client.pipeline()
+        pipe.xack(self.stream, self.group, *entry_ids)
+        pipe.xdel(self.stream, *entry_ids)
+        pipe.execute()
+
+    def dead_letter(self, entry_id: str, fields: Dict[str, Any], error: str) -> None:
+        """Move an entry that cannot be saved to the dead-letter stream."""
+        self.client.xadd(self.dead_letter_stream, {**fields, "error": error, "entry_id": entry_id}, maxlen=self.maxlen, approximate=True)
+        self.ack([entry_id])
+
+    def dead_letter_batch(self, batch: IngestBatch, error: str) -> None:
+        """Move a batch that keeps failing to the dead-letter stream."""
+        fields = self._fields(batch.jobs, batch.source_site, batch.search_params, batch.queued_at)
+        self.dead_letter(batch.entry_id, fields, error)
+
+    def stats(self) -> Dict[str, Any]:
+        """Stream length and pending entries, for monitoring."""
+        client = self.client
+        if client is None:
+            return {"shared": False, "local_saves": len(_local_saves)}
+        self.ensure_group()
+        pending = client.xpending(self.stream, self.group)
+        return {
+            "shared": True,
+            "stream": self.stream,
+            "length": client.xlen(self.stream),
+            "pending": pending.get("pending", 0) if isinstance(pending, dict) else 0,
+            "dead_letters": client.xlen(self.dead_letter_stream),
+        }
+
+
+def _save_batch_now(batch: IngestBatch) -> None:
+    """Save a batch in this process with a dedicated database session; runs in a worker thread."""
+    from app.workers.data_processor import save_batch
+
+    try:
+        from app.db import database
+        database.init_database()
+        db = database.SessionLocal()
+    except Exception as e:
+        logger.warning(f"Database unavailable, {len(batch.jobs)} jobs from {batch.source_site} not saved: {e}")
+        return
+
+    try:
+        save_batch(batch, db)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error saving {len(batch.jobs)} jobs from {batch.source_site}: {e}")
+    finally:
+        db.close()
+
+
+# Global ingest queue instance
+ingest_queue = IngestQueue()
@@ -1,15 +1,73 @@
 """Job search service layer."""
-from typing import Dict, Any, Tuple, List
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, Any, Tuple, List, Optional, AsyncIterator, Set
+import numpy as np
 import pandas as pd
 from jobspy import scrape_jobs
 import logging
+import time
 
 from app.core.config import settings
 from app.cache import cache
-from app.services.job_tracking_service import job_tracking_service
+from app.services.circuit_breaker import SiteUnavailableError, circuit_breaker
+from app.services.bulk_ingest_service import tracking_ingester
+from app.services.ingest_queue import ingest_queue
+from app.services.scrape_executor import scrape_executor
+from app.services.search_coalescer import search_coalescer
 
 logger = logging.getLogger(__name__)
 
+# Background refreshes of stale cache entries, keyed by cache key
+_refresh_tasks: Dict[str, asyncio.Task] = {}
+
+# Scrapes that missed their request's deadline and are saved once they finish
+_late_tasks: Set[asyncio.Task] = set()
+
+# Fields JobService.prepare_jobs precomputes for filtering and sorting
+REFINE_PREFIX = "_refine_"
+REFINE_TEXT_FIELDS = ('title', 'company', 'job_type', 'city', 'state', 'description')
+REFINE_NUMERIC_FIELDS = ('min_amount', 'max_amount')
+
+
+@dataclass
+class SearchOutcome:
+    """Result of a job search along with where each site's jobs came from."""
+    jobs: pd.DataFrame
+    cached: bool
+    cached_sites: List[str] = field(default_factory=list)
+    scraped_sites: List[str] = field(default_factory=list)
+    stale_sites: List[str] = field(default_factory=list)
+    # Sites left out of the result, with the reason (open circuit, recent failure, error)
+    skipped_sites: Dict[str, str] = field(default_factory=dict)
+    # Sites still scraping when the request's deadline passed
+    timed_out_sites: List[str] = field(default_factory=list)
+    
+    @property
+    def stale(self) -> bool:
+        """True when any site was served from a stale cache entry."""
+        return bool(self.stale_sites)
+    
+    @property
+    def partial(self) -> bool:
+        """True when some sites missed the deadline and are not in the results."""
+        return bool(self.timed_out_sites)
+
+
+@dataclass
+class SiteResult:
+    """One site's slice of a streamed job search."""
+    site: str
+    jobs: pd.DataFrame
+    cached: bool
+    error: Optional[str] = None
+    stale: bool = False
+    # True when the site was not scraped because it is failing
+    skipped: bool = False
+    # True when the site was still scraping at the request's deadline
+    timed_out: bool = False
+
+
 class JobService:
     """Service for interacting with JobSpy library and job tracking."""
     
@@ -24,6 +82,386 @@ class JobService:
         Returns:
             Tuple of (DataFrame containing job results, is_cached boolean)
         """
+        outcome = await JobService.run_search(params)
+        return outcome.jobs, outcome.cached
+    
+    @staticmethod
+    async def run_search(params: Dict[str, Any], timeout_ms: Optional[int] = None) -> SearchOutcome:
+        """
+        Execute a job search, reusing cached per-site result slices.
+        
+        Each requested site is cached as its own slice, so only sites without a
+        cached slice are scraped and the result is assembled in site order.
+        Sites that fail, or are short-circuited because they have been failing,
+        are left out and reported in skipped_sites; the search only fails when
+        no requested site returned results.
+        
+        With a deadline, sites still scraping after timeout_ms are left out and
+        reported in timed_out_sites. Their scrapes keep running, and the results
+        are cached and saved to the database when they arrive.
+        
+        Args:
+            params: Dictionary of search parameters
+            timeout_ms: Deadline for the search in milliseconds (defaults to SEARCH_TIMEOUT_MS)
+            
+        Returns:
+            SearchOutcome with the merged jobs and which sites were scraped
+        """
+        deadline = scrape_executor.deadline(timeout_ms or settings.SEARCH_TIMEOUT_MS)
+        JobService._apply_defaults(params)
+        
+        sites = scrape_executor.normalize_sites(params.get('site_name'))
+        if not sites:
+            # No explicit sites: JobSpy picks them, so cache the search as a whole
+            return await JobService._search_all_sites(params)
+        
+        # Check cache first, one slice per site
+        site_frames, cached_sites, stale_sites = await JobService._get_cached_slices(params, sites)
+        
+        missing_sites = [site for site in sites if site not in site_frames]
+        if not missing_sites:
+            jobs_df = scrape_executor.merge([site_frames[site] for site in sites])
+            logger.info(f"Returning cached results with {len(jobs_df)} jobs")
+            return SearchOutcome(jobs=jobs_df, cached=True, cached_sites=cached_sites, stale_sites=stale_sites)
+        
+        if cached_sites:
+            logger.info(f"Reusing cached results for {', '.join(cached_sites)}; scraping {', '.join(missing_sites)}")
+        
+        tasks = {
+            site: asyncio.ensure_future(JobService._scrape_site_slice(params, site))
+            for site in missing_sites
+        }
+        _, late = await scrape_executor.wait_until(tasks.values(), deadline)
+        
+        scraped_sites: List[str] = []
+        skipped_sites: Dict[str, str] = {}
+        timed_out_sites: List[str] = []
+        errors: List[Exception] = []
+        for site, task in tasks.items():
+            if task in late:
+                timed_out_sites.append(site)
+                JobService._save_when_done(site, task, params)
+                continue
+            
+            error = task.exception()
+            if isinstance(error, SiteUnavailableError):
+                logger.info(f"Skipping {site}: {error.reason}")
+                skipped_sites[site] = error.reason
+                errors.append(error)
+                continue
+            if error is not None:
+                logger.error(f"Error scraping {site}: {error}")
+                skipped_sites[site] = str(error)
+                errors.append(error)
+                continue
+            
+            site_df, coalesced = task.result()
+            site_frames[site] = site_df
+            if coalesced:
+                # Another request scraped this slice and handles its ingestion
+                cached_sites.append(site)
+            else:
+                scraped_sites.append(site)
+        
+        if timed_out_sites:
+            logger.info(f"Deadline passed before {', '.join(timed_out_sites)} finished; returning partial results")
+        elif not site_frames:
+            # Nothing to return; surface a real scrape error over a skipped site
+            raise next((e for e in errors if not isinstance(e, SiteUnavailableError)), errors[0])
+        
+        jobs_df = scrape_executor.merge([site_frames[site] for site in sites if site in site_frames])
+        return SearchOutcome(
+            jobs=jobs_df,
+            cached=not scraped_sites,
+            cached_sites=cached_sites,
+            scraped_sites=scraped_sites,
+            stale_sites=stale_sites,
+            skipped_sites=skipped_sites,
+            timed_out_sites=timed_out_sites,
+        )
+    
+    @staticmethod
+    async def cached_search(params: Dict[str, Any]) -> Optional[SearchOutcome]:
+        """
+        Answer a search from the cache alone, without scraping.
+        
+        Returns:
+            SearchOutcome if every requested site is cached, otherwise None
+        """
+        JobService._apply_defaults(params)
+        sites = scrape_executor.normalize_sites(params.get('site_name'))
+        if not sites:
+            cached_results = await cache.get(params)
+            if cached_results is None:
+                return None
+            return SearchOutcome(jobs=cached_results, cached=True, cached_sites=JobService._sites_in(cached_results))
+        
+        site_frames, cached_sites, stale_sites = await JobService._get_cached_slices(params, sites)
+        if len(site_frames) < len(sites):
+            return None
+        jobs_df = scrape_executor.merge([site_frames[site] for site in sites])
+        return SearchOutcome(jobs=jobs_df, cached=True, cached_sites=cached_sites, stale_sites=stale_sites)
+    
+    @staticmethod
+    async def _get_cached_slices(params: Dict[str, Any], sites: List[str]) -> Tuple[Dict[str, pd.DataFrame], List[str], List[str]]:
+        """
+        Look up the cached slice of each site.
+        
+        Returns:
+            Tuple of (DataFrames of the cached sites, cached sites, stale sites)
+        """
+        site_frames: Dict[str, pd.DataFrame] = {}
+        cached_sites: List[str] = []
+        stale_sites: List[str] = []
+        for site in sites:
+            cached_slice = await JobService._get_cached_slice(params, site)
+            if cached_slice is not None:
+                site_frames[site], is_stale = cached_slice
+                cached_sites.append(site)
+                if is_stale:
+                    stale_sites.append(site)
+        return site_frames, cached_sites, stale_sites
+    
+    @staticmethod
+    async def stream_search(params: Dict[str, Any], timeout_ms: Optional[int] = None) -> AsyncIterator[SiteResult]:
+        """
+        Execute a job search, yielding each site's results as soon as they are ready.
+        
+        Cached slices are yielded first, then scraped sites in completion order.
+        A failing site yields a SiteResult with its error instead of aborting the
+        other sites. Sites still scraping at the deadline yield a timed-out
+        SiteResult. In both cases, and for every site not yet handed to a consumer
+        that stops early, the scrapes keep running; their results are cached and
+        queued for saving when they arrive.
+        
+        Args:
+            params: Dictionary of search parameters
+            timeout_ms: Deadline for the search in milliseconds (defaults to SEARCH_TIMEOUT_MS)
+            
+        Yields:
+            SiteResult for every requested site
+        """
+        deadline = scrape_executor.deadline(timeout_ms or settings.SEARCH_TIMEOUT_MS)
+        JobService._apply_defaults(params)
+        
+        sites = scrape_executor.normalize_sites(params.get('site_name'))
+        if not sites:
+            outcome = await JobService._search_all_sites(params)
+            for site in outcome.cached_sites + outcome.scraped_sites:
+                site_df = outcome.jobs[outcome.jobs['site'] == site].reset_index(drop=True)
+                yield SiteResult(site=site, jobs=site_df, cached=outcome.cached, stale=outcome.stale)
+            return
+        
+        cached_slices: Dict[str, Tuple[pd.DataFrame, bool]] = {}
+        for site in sites:
+            cached_slice = await JobService._get_cached_slice(params, site)
+            if cached_slice is not None:
+                cached_slices[site] = cached_slice
+        
+        # Start the missing scrapes before handing out cached slices
+        tasks = {
+            asyncio.ensure_future(JobService._scrape_site_slice(params, site)): site
+            for site in sites if site not in cached_slices
+        }
+        pending = set(tasks)
+        # Scrapes whose jobs the consumer has not taken over yet; a result counts
+        # as taken over once the consumer asks for the next one
+        unreported = set(tasks)
+        try:
+            for site, (site_df, is_stale) in cached_slices.items():
+                yield SiteResult(site=site, jobs=site_df, cached=True, stale=is_stale)
+            while pending:
+                done, pending = await scrape_executor.wait_until(pending, deadline, asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                for task in done:
+                    yield JobService._site_result(tasks[task], task)
+                    unreported.discard(task)
+            
+            for task in list(pending):
+                unreported.discard(task)
+                JobService._save_when_done(tasks[task], task, params)
+                yield SiteResult(site=tasks[task], jobs=pd.DataFrame(), cached=False, timed_out=True)
+        finally:
+            # The consumer stopped early; finish and save the rest in the background
+            for task in unreported:
+                JobService._save_when_done(tasks[task], task, params)
+    
+    @staticmethod
+    def _site_result(site: str, task: asyncio.Future) -> SiteResult:
+        """Convert a finished site scrape into a SiteResult, capturing its error."""
+        error = task.exception()
+        if isinstance(error, SiteUnavailableError):
+            return SiteResult(site=site, jobs=pd.DataFrame(), cached=False, error=error.reason, skipped=True)
+        if error is not None:
+            logger.error(f"Error scraping {site}: {error}")
+            return SiteResult(site=site, jobs=pd.DataFrame(), cached=False, error=str(error))
+        site_df, coalesced = task.result()
+        return SiteResult(site=site, jobs=site_df, cached=coalesced)
+    
+    @staticmethod
+    def _save_when_done(site: str, task: asyncio.Future, search_params: Dict[str, Any]) -> None:
+        """Save a site's jobs once a scrape the request stopped waiting for finishes."""
+        async def save() -> None:
+            try:
+                site_df, coalesced = await task
+            except Exception as e:
+                logger.warning(f"Late scrape of {site} failed: {e}")
+                return
+            logger.info(f"Late scrape of {site} finished with {len(site_df)} jobs")
+            if not coalesced and not site_df.empty:
+                # The slice is already cached by the scrape; queue its jobs for saving here
+                site_params = dict(search_params)
+                site_params['site_name'] = [site]
+                await ingest_queue.publish(site_df, site, site_params)
+        
+        late_task = asyncio.ensure_future(save())
+        _late_tasks.add(late_task)
+        late_task.add_done_callback(_late_tasks.discard)
+    
+    @staticmethod
+    async def _get_cached_slice(params: Dict[str, Any], site: str) -> Optional[Tuple[pd.DataFrame, bool]]:
+        """
+        Look up a site's cached slice.
+        
+        Falls back to slicing a cached scrape of a larger result window. A stale
+        slice (past CACHE_EXPIRY but within CACHE_STALE_TTL) is still returned,
+        and a background refresh is started for it.
+        
+        Returns:
+            Tuple of (DataFrame, is_stale), or None on a cache miss
+        """
+        # One lookup counts once in the cache metrics: as a hit, a superset hit
+        # (counted by get_covering_slice), a stale hit or a miss
+        slice_key = cache.site_key(params, site)
+        stale_entry = await cache.get_with_staleness(slice_key, record=False)
+        if stale_entry is not None and not stale_entry[1]:
+            cache.record_lookup(slice_key, "hits")
+            return stale_entry[0], False
+        
+        # A cached scrape of a larger result window can answer this one
+        covering_slice = await cache.get_covering_slice(params, site)
+        if covering_slice is not None:
+            logger.info(f"Answering {site} search from a cached superset with {len(covering_slice)} jobs")
+            return covering_slice, False
+        
+        cache.record_lookup(slice_key, "misses" if stale_entry is None else "stale_hits")
+        if stale_entry is None:
+            return None
+        
+        site_params = dict(params)
+        site_params['site_name'] = [site]
+        JobService._refresh_in_background(
+            slice_key, JobService._slice_producer(params, site, slice_key), site_params
+        )
+        return stale_entry
+    
+    @staticmethod
+    def _refresh_in_background(key: str, producer, search_params: Dict[str, Any]) -> None:
+        """Refresh a stale cache entry without blocking the caller, once per key."""
+        if key in _refresh_tasks:
+            return
+        
+        async def refresh() -> None:
+            try:
+                jobs_df, coalesced = await search_coalescer.run(key, producer)
+            except Exception as e:
+                logger.warning(f"Background refresh of stale search {key} failed: {e}")
+                return
+            logger.info(f"Refreshed stale search {key} with {len(jobs_df)} jobs")
+            if not coalesced and not jobs_df.empty:
+                # Nobody is waiting on this scrape, so queue its jobs for saving here
+                await ingest_queue.publish_sites(jobs_df, search_params)
+        
+        task = asyncio.ensure_future(refresh())
+        _refresh_tasks[key] = task
+        task.add_done_callback(lambda _: _refresh_tasks.pop(key, None))
+    
+    @staticmethod
+    def _slice_producer(params: Dict[str, Any], site: str, slice_key: str):
+        """Build the coroutine factory that scrapes and caches one site's slice."""
+        async def scrape_and_cache() -> pd.DataFrame:
+            # Skip sites whose circuit is open
+            circuit_breaker.before_scrape(site)
+            
+            # Execute search off the event loop
+            try:
+                site_df = await scrape_executor.scrape_site(site, params, scrape_jobs)
+            except Exception as e:
+                circuit_breaker.record_failure(site, e)
+                await JobService._cache_failure(slice_key, e)
+                raise
+            circuit_breaker.record_success(site)
+            
+            # Cache the results
+            await cache.set(slice_key, site_df)
+            await cache.index_site_slice(params, site, site_df)
+            return site_df
+        
+        return scrape_and_cache
+    
+    @staticmethod
+    async def _scrape_site_slice(params: Dict[str, Any], site: str) -> Tuple[pd.DataFrame, bool]:
+        """Scrape and cache one site's slice, coalescing identical in-flight scrapes.
+        
+        Raises:
+            SiteUnavailableError: If the same slice failed within SCRAPE_FAILURE_CACHE_TTL
+                or the site's circuit is open
+        """
+        slice_key = cache.site_key(params, site)
+        if settings.SCRAPE_FAILURE_CACHE_TTL > 0:
+            failure = await cache.get(JobService._failure_key(slice_key))
+            if failure is not None:
+                retry_after = failure['failed_at'] + settings.SCRAPE_FAILURE_CACHE_TTL - time.time()
+                raise SiteUnavailableError(site, f"recent scrape failed: {failure['error']}", retry_after)
+        return await search_coalescer.run(slice_key, JobService._slice_producer(params, site, slice_key))
+    
+    @staticmethod
+    def _failure_key(slice_key: str) -> str:
+        """Cache key for a slice's recent scrape failure."""
+        return f"scrape_error:{slice_key}"
+    
+    @staticmethod
+    async def _cache_failure(slice_key: str, error: Exception) -> None:
+        """Negatively cache a failed scrape so identical searches skip it for a while."""
+        if settings.SCRAPE_FAILURE_CACHE_TTL <= 0:
+            return
+        failure = {'error': str(error), 'failed_at': time.time()}
+        await cache.set(JobService._failure_key(slice_key), failure, expire=settings.SCRAPE_FAILURE_CACHE_TTL)
+    
+    @staticmethod
+    async def _search_all_sites(params: Dict[str, Any]) -> SearchOutcome:
+        """Run a search without explicit sites as a single cached unit."""
+        key = cache._generate_key(params)
+        
+        async def scrape_and_cache() -> pd.DataFrame:
+            jobs_df = await scrape_executor.scrape(params, scrape_jobs)
+            await cache.set(params, jobs_df)
+            return jobs_df
+        
+        stale_entry = await cache.get_with_staleness(key)
+        if stale_entry is not None and not stale_entry[1]:
+            cached_results = stale_entry[0]
+            logger.info(f"Returning cached results with {len(cached_results)} jobs")
+            return SearchOutcome(jobs=cached_results, cached=True, cached_sites=JobService._sites_in(cached_results))
+        
+        if stale_entry is not None:
+            stale_results = stale_entry[0]
+            JobService._refresh_in_background(key, scrape_and_cache, params)
+            sites = JobService._sites_in(stale_results)
+            return SearchOutcome(jobs=stale_results, cached=True, cached_sites=sites, stale_sites=sites)
+        
+        # Identical concurrent searches share a single scrape. Coalesced callers
+        # are reported as cached since the leader's request handles ingestion.
+        jobs_df, coalesced = await search_coalescer.run(key, scrape_and_cache)
+        sites = JobService._sites_in(jobs_df)
+        if coalesced:
+            return SearchOutcome(jobs=jobs_df, cached=True, cached_sites=sites)
+        return SearchOutcome(jobs=jobs_df, cached=False, scraped_sites=sites)
+    
+    @staticmethod
+    def _apply_defaults(params: Dict[str, Any]) -> None:
+        """Fill in proxy, CA cert and country defaults from settings."""
         # Apply default proxies from env if none provided
         if params.get('proxies') is None and settings.default_proxies_list:
             params['proxies'] = settings.default_proxies_list
@@ -35,21 +473,14 @@ class JobService:
         # Apply default country_indeed if none provided
         if params.get('country_indeed') is None and settings.DEFAULT_COUNTRY_INDEED:
             params['country_indeed'] = settings.DEFAULT_COUNTRY_INDEED
-        
-        # Check cache first
-        cached_results = await cache.get(params)
-        if cached_results is not None:
-            logger.info(f"Returning cached results with {len(cached_results)} jobs")
-            return cached_results, True
-        
-        # Execute search
-        jobs_df = scrape_jobs(**params)
-        
-        # Cache the results
-        await cache.set(params, jobs_df)
-        
-        return jobs_df, False
-
+    
+    @staticmethod
+    def _sites_in(jobs_df: pd.DataFrame) -> List[str]:
+        """List the sites present in a result set."""
+        if jobs_df.empty or 'site' not in jobs_df.columns:
+            return []
+        return [str(site) for site in jobs_df['site'].dropna().unique()]
+    
     @staticmethod
     async def save_jobs_to_database(jobs_df: pd.DataFrame, search_params: Dict[str, Any], db) -> Dict[str, Any]:
         """
@@ -75,6 +506,7 @@ class JobService:
         
         # Convert DataFrame to list of dictionaries for processing
         jobs_data = jobs_df.to_dict('records')
+        ingester = tracking_ingester()
         
         # Extract source site from search params
         site_names = search_params.get("site_name", search_params.get("site_names", ["indeed"]))
@@ -92,11 +524,11 @@ class JobService:
             
             for site in site_names:
                 # Filter jobs for this site
-                site_jobs = [job for job in jobs_data if self._safe_str(job.get('site', '')).lower() == site.lower()]
+                site_jobs = [job for job in jobs_data if JobService._safe_str(job.get('site', '')).lower() == site.lower()]
                 
                 if site_jobs:
                     # Process jobs through the tracking service
-                    stats = job_tracking_service.process_scraped_jobs(
+                    stats = ingester.process_scraped_jobs(
                         jobs_data=site_jobs,
                         source_site=site,
                         search_params=search_params,
@@ -115,55 +547,150 @@ class JobService:
             return all_stats
         else:
             # Single site processing
-            return job_tracking_service.process_scraped_jobs(
+            return ingester.process_scraped_jobs(
                 jobs_data=jobs_data,
                 source_site=str(site_names),
                 search_params=search_params,
                 db=db
             )
 
+    @staticmethod
+    def prepare_jobs(jobs_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add the precomputed columns filter_jobs and sort_jobs match against.
+        
+        Text fields get a lower-cased copy, salaries a numeric one, and city and
+        state are split out of JobSpy's "City, ST, Country" location when the
+        result has no columns for them. Prepare a result set once and refine it
+        as often as needed; call public_columns to drop the extra columns.
+        """
+        prepared = jobs_df.copy()
+        for field_name in REFINE_TEXT_FIELDS + REFINE_NUMERIC_FIELDS:
+            values = JobService._refine_values(jobs_df, field_name)
+            if values is not None:
+                prepared[REFINE_PREFIX + field_name] = values
+        return prepared
+    
+    @staticmethod
+    def public_columns(jobs_df: pd.DataFrame) -> pd.DataFrame:
+        """Drop the columns added by prepare_jobs."""
+        return jobs_df.loc[:, [c for c in jobs_df.columns if not str(c).startswith(REFINE_PREFIX)]]
+    
+    @staticmethod
+    def _find_column(jobs_df: pd.DataFrame, name: str) -> Optional[str]:
+        """Find a column by name regardless of case (JobSpy uses lower case, older callers upper case)."""
+        for candidate in (name, name.lower(), name.upper()):
+            if candidate in jobs_df.columns:
+                return candidate
+        return None
+    
+    @staticmethod
+    def _refine_values(jobs_df: pd.DataFrame, field_name: str) -> Optional[pd.Series]:
+        """
+        Build the normalized values of a field: lower-cased text or floats.
+        
+        Returns:
+            The values, or None if the result set has no such field
+        """
+        prepared = REFINE_PREFIX + field_name
+        if prepared in jobs_df.columns:
+            return jobs_df[prepared]
+        
+        column = JobService._find_column(jobs_df, field_name)
+        if column is None and field_name in ('city', 'state'):
+            location = JobService._find_column(jobs_df, 'location')
+            if location is None:
+                return None
+            parts = jobs_df[location].astype('string').str.split(',', n=2, expand=True)
+            position = 0 if field_name == 'city' else 1
+            if position not in parts.columns:
+                return pd.Series(pd.NA, index=jobs_df.index, dtype='string')
+            return parts[position].str.strip().str.lower()
+        if column is None:
+            return None
+        
+        if field_name in REFINE_NUMERIC_FIELDS:
+            return pd.to_numeric(jobs_df[column], errors='coerce').astype(float)
+        return jobs_df[column].astype('string').str.lower()
+    
     @staticmethod
     def filter_jobs(jobs_df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
-        """Filter job results based on criteria."""
-        filtered_df = jobs_df.copy()
+        """
+        Filter job results based on criteria.
+        
+        Supported filters are min_salary, max_salary, company, job_type, city,
+        state, title_keywords (matched against the title) and keyword (matched
+        against the title, company and description). Text filters are
+        case-insensitive substring matches, except job_type which must match
+        exactly. All filters are combined into one boolean mask, using the
+        columns added by prepare_jobs when present. A filter on a field the
+        results do not have matches nothing.
+        """
+        mask = np.ones(len(jobs_df), dtype=bool)
+        
+        def matches(field_name: str, condition) -> np.ndarray:
+            values = JobService._refine_values(jobs_df, field_name)
+            if values is None:
+                return np.zeros(len(jobs_df), dtype=bool)
+            return condition(values).fillna(False).to_numpy(dtype=bool)
+        
+        def contains(text: Any):
+            needle = str(text).lower()
+            return lambda values: values.str.contains(needle, regex=False)
         
         # Filter by salary range
-        if 'min_salary' in filters and filters['min_salary'] is not None:
-            # Convert to numeric first to handle comparison properly
-            filtered_df = filtered_df[filtered_df['MIN_AMOUNT'].astype(float) >= float(filters['min_salary'])]
-            
-        if 'max_salary' in filters and filters['max_salary'] is not None:
-            filtered_df = filtered_df[filtered_df['MAX_AMOUNT'].astype(float) <= float(filters['max_salary'])]
-            
-        # Filter by company
-        if 'company' in filters and filters['company']:
-            filtered_df = filtered_df[filtered_df['COMPANY'].str.contains(filters['company'], case=False, na=False)]
-            
-        # Filter by job type
-        if 'job_type' in filters and filters['job_type']:
-            filtered_df = filtered_df[filtered_df['JOB_TYPE'] == filters['job_type']]
-            
+        if filters.get('min_salary') is not None:
+            mask &= matches('min_amount', lambda values: values >= float(filters['min_salary']))
+        if filters.get('max_salary') is not None:
+            mask &= matches('max_amount', lambda values: values <= float(filters['max_salary']))
+        
+        # Filter by company and job type
+        if filters.get('company'):
+            mask &= matches('company', contains(filters['company']))
+        if filters.get('job_type'):
+            job_type = str(filters['job_type']).lower()
+            mask &= matches('job_type', lambda values: values == job_type)
+        
         # Filter by location
-        if 'city' in filters and filters['city']:
-            filtered_df = filtered_df[filtered_df['CITY'].str.contains(filters['city'], case=False, na=False)]
-            
-        if 'state' in filters and filters['state']:
-            filtered_df = filtered_df[filtered_df['STATE'].str.contains(filters['state'], case=False, na=False)]
-            
-        # Filter by keyword in title
-        if 'title_keywords' in filters and filters['title_keywords']:
-            filtered_df = filtered_df[filtered_df['TITLE'].str.contains(filters['title_keywords'], case=False, na=False)]
-            
-        return filtered_df
+        if filters.get('city'):
+            mask &= matches('city', contains(filters['city']))
+        if filters.get('state'):
+            mask &= matches('state', contains(filters['state']))
+        
+        # Filter by keyword
+        if filters.get('title_keywords'):
+            mask &= matches('title', contains(filters['title_keywords']))
+        if filters.get('keyword'):
+            keyword_mask = np.zeros(len(jobs_df), dtype=bool)
+            for field_name in ('title', 'company', 'description'):
+                keyword_mask |= matches(field_name, contains(filters['keyword']))
+            mask &= keyword_mask
+        
+        return jobs_df[mask]
     
     @staticmethod
     def sort_jobs(jobs_df: pd.DataFrame, sort_by: str, sort_order: str = 'desc') -> pd.DataFrame:
-        """Sort job results by specified field."""
-        if not sort_by or sort_by not in jobs_df.columns:
+        """
+        Sort job results by specified field.
+        
+        Text fields sort case-insensitively and salaries numerically; jobs
+        without a value come last and ties keep their order.
+        """
+        if not sort_by:
             return jobs_df
-            
+        column = JobService._find_column(jobs_df, sort_by)
+        if column is None:
+            return jobs_df
+        
+        field_name = column.lower()
+        if field_name in REFINE_TEXT_FIELDS + REFINE_NUMERIC_FIELDS:
+            values = JobService._refine_values(jobs_df, field_name)
+        else:
+            values = jobs_df[column]
+        
         ascending = sort_order.lower() != 'desc'
-        return jobs_df.sort_values(by=sort_by, ascending=ascending)
+        order = values.reset_index(drop=True).sort_values(ascending=ascending, kind='stable', na_position='last').index
+        return jobs_df.iloc[order]
     
     @staticmethod
     def _safe_str(value: Any) -> str:
@@ -11,7 +11,7 @@ import logging
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime, date
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import and_
 
 from app.services.deduplication_service import deduplication_service
 from app.models.tracking_models import (
@@ -182,41 +182,32 @@ class JobTrackingService:
         job_category = self._get_or_create_job_category(job_data, db)
         
         # Generate job hash
-        job_hash = self.dedup_service.generate_job_hash(job_data)
+        features = self.dedup_service.job_features(job_data)
+        job_hash = self.dedup_service.hash_features(features)
         
         # Create job posting
         job_posting = JobPosting(
             job_hash=job_hash,
-            title=self._safe_str(job_data.get('title', '')).strip(),
             company_id=company.id,
             location_id=location.id if location else None,
             job_category_id=job_category.id if job_category else None,
-            job_type=self._safe_str(job_data.get('job_type', '')).lower(),
-            experience_level=self._extract_experience_level(self._safe_str(job_data.get('title', ''))),
-            is_remote='remote' in self._safe_str(job_data.get('location', '')).lower(),
-            description=self._safe_str(job_data.get('description', '')),
-            requirements=self._extract_requirements(self._safe_str(job_data.get('description', ''))),
-            salary_min=self._parse_salary(job_data.get('min_amount')),
-            salary_max=self._parse_salary(job_data.get('max_amount')),
-            salary_currency=self._safe_str(job_data.get('currency')) or 'USD',
-            salary_interval=self._safe_str(job_data.get('interval')) or 'yearly',
             first_seen_at=datetime.utcnow(),
             last_seen_at=datetime.utcnow(),
-            status='active'
+            status='active',
+            **self._posting_fields(job_data)
         )
         
         db.add(job_posting)
         db.flush()  # Get the ID
         
+        # Make it a fuzzy deduplication candidate for later jobs
+        self.dedup_service.index.add(db, {job_posting.id: features})
+        
         # Create job source
         job_source = JobSource(
             job_posting_id=job_posting.id,
             source_site=source_site,
-            external_job_id=job_data.get('job_id'),
-            job_url=job_data.get('job_url', ''),
-            post_date=self._parse_date(job_data.get('date_posted')),
-            apply_url=job_data.get('job_url_direct'),
-            easy_apply=job_data.get('easy_apply', False)
+            **self._source_fields(job_data)
         )
         
         # Create job metrics
@@ -238,17 +229,14 @@ class JobTrackingService:
     
     def _get_or_create_company(self, job_data: Dict, db: Session) -> Company:
         """Get existing company or create new one."""
-        company_name = self._safe_str(job_data.get('company', '')).strip()
-        if not company_name:
-            # Create a placeholder company
-            company_name = "Unknown Company"
+        company_name = self._company_name(job_data)
         
         # Normalize company name for lookup
         normalized_name = self.dedup_service._normalize_company_name(company_name)
         
         # Try to find existing company
         existing_company = db.query(Company).filter(
-            func.lower(Company.name).like(f'%{normalized_name}%')
+            Company.normalized_name == normalized_name
         ).first()
         
         if existing_company:
@@ -257,6 +245,7 @@ class JobTrackingService:
         # Create new company
         company = Company(
             name=company_name,
+            normalized_name=normalized_name,
             description=job_data.get('company_description'),
             logo_url=job_data.get('company_logo'),
             # These could be enhanced with external data enrichment
@@ -271,15 +260,10 @@ class JobTrackingService:
     
     def _get_or_create_location(self, job_data: Dict, db: Session) -> Optional[Location]:
         """Get existing location or create new one."""
-        location_str = str(job_data.get('location', '')).strip()
-        if not location_str or self._safe_str(location_str).lower() in ['remote', 'work from home']:
-            return None
-        
-        # Parse location components
-        city, state, country = self._parse_location_components(location_str)
-        
-        if not country:
+        location_key = self._location_key(job_data)
+        if not location_key:
             return None
+        city, state, country = location_key
         
         # Try to find existing location
         existing_location = db.query(Location).filter(
@@ -308,38 +292,9 @@ class JobTrackingService:
     
     def _get_or_create_job_category(self, job_data: Dict, db: Session) -> Optional[JobCategory]:
         """Get existing job category or create new one based on title."""
-        title = self._safe_str(job_data.get('title', '')).strip().lower()
-        if not title:
-            return None
-        
-        # Map common job titles to categories
-        category_mapping = {
-            'software': 'Software Engineering',
-            'developer': 'Software Engineering',
-            'engineer': 'Engineering',
-            'data': 'Data Science',
-            'analyst': 'Data Analysis',
-            'marketing': 'Marketing',
-            'sales': 'Sales',
-            'manager': 'Management',
-            'designer': 'Design',
-            'product': 'Product Management',
-            'devops': 'DevOps',
-            'qa': 'Quality Assurance',
-            'hr': 'Human Resources',
-            'finance': 'Finance',
-            'accounting': 'Finance'
-        }
-        
-        # Find matching category
-        category_name = None
-        for keyword, category in category_mapping.items():
-            if keyword in title:
-                category_name = category
-                break
-        
+        category_name = self._category_name(job_data)
         if not category_name:
-            category_name = 'Other'
+            return None
         
         # Try to find existing category
         existing_category = db.query(JobCategory).filter(
@@ -447,6 +402,83 @@ class JobTrackingService:
         }
     
     # Helper methods
+    def _posting_fields(self, job_data: Dict) -> Dict[str, Any]:
+        """Job posting column values taken from scraped job data."""
+        title = self._safe_str(job_data.get('title', ''))
+        description = self._safe_str(job_data.get('description', ''))
+        return {
+            'title': title.strip(),
+            'job_type': self._safe_str(job_data.get('job_type', '')).lower(),
+            'experience_level': self._extract_experience_level(title),
+            'is_remote': 'remote' in self._safe_str(job_data.get('location', '')).lower(),
+            'description': description,
+            'requirements': self._extract_requirements(description),
+            'salary_min': self._parse_salary(job_data.get('min_amount')),
+            'salary_max': self._parse_salary(job_data.get('max_amount')),
+            'salary_currency': self._safe_str(job_data.get('currency')) or 'USD',
+            'salary_interval': self._safe_str(job_data.get('interval')) or 'yearly',
+        }
+    
+    def _source_fields(self, job_data: Dict) -> Dict[str, Any]:
+        """Job source column values taken from scraped job data."""
+        return {
+            'external_job_id': job_data.get('job_id'),
+            'job_url': job_data.get('job_url', ''),
+            'post_date': self._parse_date(job_data.get('date_posted')),
+            'apply_url': job_data.get('job_url_direct'),
+            'easy_apply': job_data.get('easy_apply', False),
+        }
+    
+    def _company_name(self, job_data: Dict) -> str:
+        """Company name of a scraped job, with a placeholder when it has none."""
+        company_name = self._safe_str(job_data.get('company', '')).strip()
+        return company_name or "Unknown Company"
+    
+    def _location_key(self, job_data: Dict) -> Optional[Tuple[str, str, str]]:
+        """(city, state, country) of a scraped job, or None for remote and unknown locations."""
+        location_str = str(job_data.get('location', '')).strip()
+        if not location_str or self._safe_str(location_str).lower() in ['remote', 'work from home']:
+            return None
+        
+        # Parse location components
+        city, state, country = self._parse_location_components(location_str)
+        
+        if not country:
+            return None
+        return city, state, country
+    
+    def _category_name(self, job_data: Dict) -> Optional[str]:
+        """Job category name for a scraped job, derived from its title."""
+        title = self._safe_str(job_data.get('title', '')).strip().lower()
+        if not title:
+            return None
+        
+        # Map common job titles to categories
+        category_mapping = {
+            'software': 'Software Engineering',
+            'developer': 'Software Engineering',
+            'engineer': 'Engineering',
+            'data': 'Data Science',
+            'analyst': 'Data Analysis',
+            'marketing': 'Marketing',
+            'sales': 'Sales',
+            'manager': 'Management',
+            'designer': 'Design',
+            'product': 'Product Management',
+            'devops': 'DevOps',
+            'qa': 'Quality Assurance',
+            'hr': 'Human Resources',
+            'finance': 'Finance',
+            'accounting': 'Finance'
+        }
+        
+        # Find matching category
+        for keyword, category in category_mapping.items():
+            if keyword in title:
+                return category
+        
+        return 'Other'
+    
     def _extract_experience_level(self, title: str) -> str:
         """Extract experience level from job title."""
         title_lower = self._safe_str(title).lower()
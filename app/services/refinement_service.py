@@ -0,0 +1,83 @@
+"""
+In-memory refinement of stored search results.
+
+A completed search (a result handle from paginate=true or an asynchronous
+search job) is loaded from the search job store once, prepared with
+JobService.prepare_jobs and kept in process memory, so each refinement
+request only runs vectorized filters and a sort over it - no scrape and no
+database round trip. The REFINE_MAX_RESULTS most recently refined result sets
+are kept per worker.
+"""
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from app.core.config import settings
+from app.services.job_service import JobService
+from app.services.search_job_store import SearchJobStatus, search_job_store
+
+logger = logging.getLogger(__name__)
+
+
+class RefinementService:
+    """Filters and sorts stored search results in memory."""
+
+    def __init__(self, max_results: Optional[int] = None):
+        self.max_results = settings.REFINE_MAX_RESULTS if max_results is None else max_results
+        self._results: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+
+    async def load(self, record: Dict[str, Any]) -> Optional[pd.DataFrame]:
+        """
+        Get a completed search's results, prepared for refinement.
+
+        Args:
+            record: The search job store record of a completed search
+
+        Returns:
+            The prepared results, or None if they have expired
+        """
+        result_id = record["id"]
+        prepared = self._results.get(result_id)
+        if prepared is not None:
+            self._results.move_to_end(result_id)
+            return prepared
+
+        jobs_df = await search_job_store.get_page(record, 0, record.get("count") or 0)
+        if jobs_df is None:
+            return None
+        prepared = JobService.prepare_jobs(jobs_df)
+        logger.info(f"Prepared {len(prepared)} jobs of result {result_id} for refinement")
+
+        if self.max_results > 0:
+            self._results[result_id] = prepared
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+        return prepared
+
+    async def get_record(self, result_id: str) -> Optional[Dict[str, Any]]:
+        """Get the record of a completed search, or None if it is unknown or not completed."""
+        record = await search_job_store.get(result_id)
+        if record is None or record["status"] != SearchJobStatus.COMPLETED.value:
+            return None
+        return record
+
+    @staticmethod
+    def refine(jobs_df: pd.DataFrame, filters: Dict[str, Any], sort_by: Optional[str] = None, sort_order: str = "desc") -> pd.DataFrame:
+        """
+        Filter and sort prepared results.
+
+        Returns:
+            The matching jobs with the preparation columns removed
+        """
+        refined = JobService.filter_jobs(jobs_df, filters)
+        refined = JobService.sort_jobs(refined, sort_by, sort_order)
+        return JobService.public_columns(refined).reset_index(drop=True)
+
+    def clear(self) -> None:
+        self._results.clear()
+
+
+# Global refinement service instance
+refinement_service = RefinementService()
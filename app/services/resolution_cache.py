@@ -0,0 +1,196 @@
+"""
+Cache of company, location and job category IDs for ingestion.
+
+Every saved job needs the IDs of its company, location and job category. Looking
+them up per job is most of the queries ingestion sends, so BulkIngestService
+resolves them through this cache first:
+
+- companies by normalized name (companies.normalized_name)
+- locations by (city, state, country)
+- job categories by name
+
+Each worker keeps the IDs in process memory. They are preloaded from the
+database (the INGEST_RESOLVE_PRELOAD_LIMIT most recent rows of each table) and
+reloaded every INGEST_RESOLVE_REFRESH seconds, so the cache stays warm across
+batches. IDs a worker learns are also written to Redis hashes, where the other
+ingest workers find entities created since their last preload without a
+database query.
+
+Only IDs of committed rows may be cached: callers remember rows they inserted
+after their transaction commits.
+"""
+import logging
+import threading
+import time
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.tracking_models import Company, JobCategory, Location
+
+logger = logging.getLogger(__name__)
+
+COMPANIES = "companies"
+LOCATIONS = "locations"
+CATEGORIES = "categories"
+KINDS = (COMPANIES, LOCATIONS, CATEGORIES)
+
+# Joins (city, state, country) into one Redis hash field
+_FIELD_SEPARATOR = "\x1f"
+
+
+class ResolutionCache:
+    """In-process ID cache for ingestion, shared between workers through Redis."""
+
+    def __init__(
+        self,
+        prefix: Optional[str] = None,
+        refresh: Optional[int] = None,
+        preload_limit: Optional[int] = None,
+        client: Any = None,
+    ):
+        """
+        Initialize the resolution cache.
+
+        Args:
+            prefix: Prefix of the Redis hashes (defaults to INGEST_RESOLVE_PREFIX)
+            refresh: Seconds between preloads from the database (defaults to INGEST_RESOLVE_REFRESH)
+            preload_limit: Most recent rows of each table preloaded (defaults to INGEST_RESOLVE_PRELOAD_LIMIT)
+            client: Redis client with decoded responses (created lazily from REDIS_URL if omitted)
+        """
+        self.prefix = prefix or settings.INGEST_RESOLVE_PREFIX
+        self.refresh = refresh if refresh is not None else settings.INGEST_RESOLVE_REFRESH
+        self.preload_limit = preload_limit if preload_limit is not None else settings.INGEST_RESOLVE_PRELOAD_LIMIT
+
+        self._ids: Dict[str, Dict[Hashable, int]] = {kind: {} for kind in KINDS}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._client = client
+        self._client_failed = client is None and not settings.REDIS_URL
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @property
+    def client(self) -> Any:
+        """Resolve the Redis client, or None if Redis is unavailable."""
+        if self._client is None and not self._client_failed:
+            try:
+                from app.core.cache_backend import RedisCompatibleBackend
+                self._client = RedisCompatibleBackend().client
+            except Exception as e:
+                logger.warning(f"Redis unavailable, resolved IDs are cached per worker only: {e}")
+                self._client_failed = True
+        return self._client
+
+    def _redis_key(self, kind: str) -> str:
+        return f"{self.prefix}{kind}"
+
+    @staticmethod
+    def _field(kind: str, key: Hashable) -> str:
+        return _FIELD_SEPARATOR.join(key) if kind == LOCATIONS else str(key)
+
+    def warm(self, db: Session) -> None:
+        """Preload from the database unless the last preload is recent enough."""
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh:
+            return
+        self.preload(db)
+
+    def preload(self, db: Session) -> None:
+        """Replace the cached IDs with the most recent rows of each table."""
+        start = time.perf_counter()
+        ids = {
+            COMPANIES: {
+                normalized_name: company_id for company_id, normalized_name in
+                db.query(Company.id, Company.normalized_name)
+                .filter(Company.normalized_name.isnot(None))
+                .order_by(Company.id.desc()).limit(self.preload_limit)
+            },
+            LOCATIONS: {
+                (city, state, country): location_id for location_id, city, state, country in
+                db.query(Location.id, Location.city, Location.state, Location.country)
+                .order_by(Location.id.desc()).limit(self.preload_limit)
+            },
+            CATEGORIES: {
+                name: category_id for category_id, name in
+                db.query(JobCategory.id, JobCategory.name)
+            },
+        }
+        with self._lock:
+            self._ids = ids
+            self._loaded_at = time.monotonic()
+        logger.info(
+            f"Preloaded {len(ids[COMPANIES])} companies, {len(ids[LOCATIONS])} locations and "
+            f"{len(ids[CATEGORIES])} job categories in {time.perf_counter() - start:.2f}s"
+        )
+
+    def get_many(self, kind: str, keys: Iterable[Hashable]) -> Dict[Hashable, int]:
+        """
+        Look up cached IDs, first in process memory, then in Redis.
+
+        Returns:
+            IDs of the keys found; missing keys have to be resolved in the database
+        """
+        keys = list(dict.fromkeys(keys))
+        local = self._ids[kind]
+        found = {key: local[key] for key in keys if key in local}
+        self.hits += len(found)
+        missing = [key for key in keys if key not in found]
+
+        client = self.client if missing else None
+        if client is not None:
+            try:
+                values = client.hmget(self._redis_key(kind), [self._field(kind, key) for key in missing])
+            except Exception as e:
+                logger.warning(f"Could not read resolved {kind} from Redis: {e}")
+                values = [None] * len(missing)
+            shared = {key: int(value) for key, value in zip(missing, values) if value is not None}
+            with self._lock:
+                self._ids[kind].update(shared)
+            found.update(shared)
+            self.shared_hits += len(shared)
+
+        self.misses += len(keys) - len(found)
+        return found
+
+    def remember(self, kind: str, ids: Dict[Hashable, int]) -> None:
+        """Cache IDs of committed rows in this worker and in Redis."""
+        if not ids:
+            return
+        with self._lock:
+            self._ids[kind].update(ids)
+        client = self.client
+        if client is None:
+            return
+        try:
+            client.hset(self._redis_key(kind), mapping={self._field(kind, key): value for key, value in ids.items()})
+        except Exception as e:
+            logger.warning(f"Could not share resolved {kind} through Redis: {e}")
+
+    def invalidate(self) -> None:
+        """Forget every cached ID, here and in Redis; the next warm() preloads again."""
+        with self._lock:
+            self._ids = {kind: {} for kind in KINDS}
+            self._loaded_at = None
+        client = self.client
+        if client is not None:
+            try:
+                client.delete(*[self._redis_key(kind) for kind in KINDS])
+            except Exception as e:
+                logger.warning(f"Could not clear resolved IDs in Redis: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache sizes and hit counts, for monitoring."""
+        return {
+            "shared": self.client is not None,
+            "entries": {kind: len(ids) for kind, ids in self._ids.items()},
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "loaded_seconds_ago": None if self._loaded_at is None else round(time.monotonic() - self._loaded_at, 1),
+        }
+
+
+# Global resolution cache instance
+resolution_cache = ResolutionCache()
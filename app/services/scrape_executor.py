@@ -0,0 +1,208 @@
+"""
+Scrape executor for running JobSpy searches off the event loop.
+
+``jobspy.scrape_jobs`` is synchronous and can take tens of seconds for a
+multi-site search. This module runs one ``scrape_jobs`` call per requested site
+inside a bounded thread (or process) pool, limits how many scrapes may hit the
+same job board at once, waits for the per-site scrapes up to a request's
+deadline and merges the per-site DataFrames.
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import pandas as pd
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ScrapeFunction = Callable[..., pd.DataFrame]
+
+
+class ScrapeExecutor:
+    """
+    Bounded executor pool that fans JobSpy scrapes out per site.
+
+    - Each site is scraped by its own ``scrape_jobs`` call so slow boards do not
+      serialize the others.
+    - A per-site semaphore caps concurrent scrapes against a single board.
+    - The pool itself caps the total number of scrapes in flight.
+    """
+
+    def __init__(
+        self,
+        executor_type: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        site_concurrency: Optional[int] = None,
+        site_overrides: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Initialize the scrape executor.
+
+        Args:
+            executor_type: "thread" or "process" (defaults to SCRAPE_EXECUTOR_TYPE)
+            max_workers: Pool size (defaults to SCRAPE_MAX_WORKERS)
+            site_concurrency: Default concurrent scrapes per site
+            site_overrides: Per-site concurrency limits, e.g. {"linkedin": 1}
+        """
+        self.executor_type = (executor_type or settings.SCRAPE_EXECUTOR_TYPE).lower()
+        self.max_workers = max_workers or settings.SCRAPE_MAX_WORKERS
+        self.default_site_concurrency = site_concurrency or settings.SCRAPE_SITE_CONCURRENCY
+        self.site_overrides = (
+            site_overrides if site_overrides is not None
+            else settings.scrape_site_concurrency_map
+        )
+
+        self._pool: Optional[Executor] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def pool(self) -> Executor:
+        """Lazily create the underlying executor pool."""
+        if self._pool is None:
+            self._pool = self._create_pool()
+        return self._pool
+
+    def _create_pool(self) -> Executor:
+        if self.executor_type == "process":
+            logger.info(f"Starting process scrape pool with {self.max_workers} workers")
+            return ProcessPoolExecutor(max_workers=self.max_workers)
+
+        if self.executor_type != "thread":
+            logger.warning(f"Unknown scrape executor type '{self.executor_type}', using threads")
+        logger.info(f"Starting thread scrape pool with {self.max_workers} workers")
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="jobspy-scrape")
+
+    def site_limit(self, site: str) -> int:
+        """Get the maximum number of concurrent scrapes for a site."""
+        return max(1, self.site_overrides.get(site.lower(), self.default_site_concurrency))
+
+    def _get_semaphore(self, site: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop is not self._semaphore_loop:
+            # Semaphores bind to the loop they are awaited on, and Celery tasks
+            # run each search under a fresh asyncio.run() loop.
+            self._semaphores = {}
+            self._semaphore_loop = loop
+
+        site_key = site.lower()
+        if site_key not in self._semaphores:
+            self._semaphores[site_key] = asyncio.Semaphore(self.site_limit(site_key))
+        return self._semaphores[site_key]
+
+    @staticmethod
+    def normalize_sites(site_name: Union[str, List[str], None]) -> List[str]:
+        """Normalize a site_name parameter to a list of site names."""
+        if not site_name:
+            return []
+        if isinstance(site_name, str):
+            return [site_name]
+        return list(dict.fromkeys(site_name))
+
+    async def scrape_site(
+        self,
+        site: str,
+        params: Dict[str, Any],
+        scrape_fn: ScrapeFunction,
+    ) -> pd.DataFrame:
+        """
+        Scrape a single site in the executor pool.
+
+        Args:
+            site: Site name to scrape
+            params: JobSpy parameters (site_name is replaced with this site)
+            scrape_fn: Synchronous scrape function, normally ``jobspy.scrape_jobs``
+
+        Returns:
+            DataFrame with the site's jobs
+        """
+        site_params = dict(params)
+        site_params['site_name'] = [site]
+
+        async with self._get_semaphore(site):
+            loop = asyncio.get_running_loop()
+            start_time = time.time()
+            jobs_df = await loop.run_in_executor(self.pool, partial(scrape_fn, **site_params))
+            logger.info(
+                f"Scraped {len(jobs_df) if jobs_df is not None else 0} jobs from {site} "
+                f"in {time.time() - start_time:.2f}s"
+            )
+
+        return jobs_df if jobs_df is not None else pd.DataFrame()
+
+    async def scrape(self, params: Dict[str, Any], scrape_fn: ScrapeFunction) -> pd.DataFrame:
+        """
+        Scrape all requested sites in parallel and merge the results.
+
+        Args:
+            params: JobSpy parameters
+            scrape_fn: Synchronous scrape function, normally ``jobspy.scrape_jobs``
+
+        Returns:
+            Merged DataFrame, ordered by the requested site order
+        """
+        sites = self.normalize_sites(params.get('site_name'))
+
+        if not sites:
+            # Let JobSpy apply its own "all sites" default in a single call
+            loop = asyncio.get_running_loop()
+            jobs_df = await loop.run_in_executor(self.pool, partial(scrape_fn, **params))
+            return jobs_df if jobs_df is not None else pd.DataFrame()
+
+        frames = await asyncio.gather(
+            *(self.scrape_site(site, params, scrape_fn) for site in sites)
+        )
+        return self.merge(frames)
+
+    @staticmethod
+    def deadline(timeout_ms: Optional[int]) -> Optional[float]:
+        """Convert a timeout in milliseconds to an event loop deadline (None for no deadline)."""
+        if not timeout_ms:
+            return None
+        return asyncio.get_running_loop().time() + timeout_ms / 1000
+
+    @staticmethod
+    async def wait_until(
+        tasks: Iterable[asyncio.Future],
+        deadline: Optional[float],
+        return_when: str = asyncio.ALL_COMPLETED,
+    ) -> Tuple[Set[asyncio.Future], Set[asyncio.Future]]:
+        """
+        Wait for per-site scrape tasks until a deadline.
+
+        Tasks still running at the deadline are not cancelled, so their results
+        can still be cached and saved once they arrive.
+
+        Returns:
+            Tuple of (done, pending) task sets
+        """
+        tasks = set(tasks)
+        if not tasks:
+            return set(), set()
+        timeout = None if deadline is None else max(0.0, deadline - asyncio.get_running_loop().time())
+        return await asyncio.wait(tasks, timeout=timeout, return_when=return_when)
+
+    @staticmethod
+    def merge(frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """Merge per-site DataFrames into a single result set."""
+        non_empty = [frame for frame in frames if frame is not None and not frame.empty]
+        if not non_empty:
+            return pd.DataFrame()
+        if len(non_empty) == 1:
+            return non_empty[0]
+        return pd.concat(non_empty, ignore_index=True)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Shut down the executor pool."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+
+# Global scrape executor instance
+scrape_executor = ScrapeExecutor()
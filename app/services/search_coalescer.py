@@ -0,0 +1,225 @@
+"""
+Single-flight coalescing of identical in-flight job searches.
+
+When several requests with the same parameters arrive while the first scrape is
+still running, only the first one (the leader) calls the job boards. Every
+concurrent duplicate awaits the leader's result instead of starting its own
+scrape. Within a worker this uses a shared task per search key; across
+workers the leader holds a Redis lock and publishes its result for followers,
+encoded with the binary cache codec so followers get the same dtypes as the
+leader.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from app.core.cache_codecs import CacheCodec, CodecError, cache_codec
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LOCK_PREFIX = "search:inflight:"
+RESULT_PREFIX = "search:result:"
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+else
+    return 0
+end
+"""
+
+
+class SearchCoalescer:
+    """Coalesce concurrent identical searches into a single scrape."""
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        distributed: Optional[bool] = None,
+        lock_ttl: Optional[int] = None,
+        result_ttl: Optional[int] = None,
+        poll_interval: float = 0.25,
+        backend: Any = None,
+        codec: Optional[CacheCodec] = None,
+    ):
+        """
+        Initialize the coalescer.
+
+        Args:
+            enabled: Enable coalescing (defaults to SEARCH_COALESCE_ENABLED)
+            distributed: Coordinate across workers through Redis
+            lock_ttl: Seconds a leader may hold the cross-worker lock
+            result_ttl: Seconds a published result stays available to followers
+            poll_interval: Seconds between follower checks for a published result
+            backend: Redis-compatible cache backend (resolved lazily if omitted)
+            codec: Codec for published results (defaults to the global cache codec)
+        """
+        self.enabled = settings.SEARCH_COALESCE_ENABLED if enabled is None else enabled
+        self.distributed = (
+            settings.SEARCH_COALESCE_DISTRIBUTED and bool(settings.REDIS_URL)
+            if distributed is None else distributed
+        )
+        self.lock_ttl = lock_ttl or settings.SEARCH_COALESCE_LOCK_TTL
+        self.result_ttl = result_ttl or settings.SEARCH_COALESCE_RESULT_TTL
+        self.poll_interval = poll_interval
+        self.codec = codec or cache_codec
+
+        self._backend = backend
+        self._backend_failed = False
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _get_backend(self) -> Any:
+        """Resolve the Redis backend, disabling distributed mode if unavailable."""
+        if not self.distributed or self._backend_failed:
+            return None
+
+        if self._backend is None:
+            try:
+                from app.core.cache_backend import RedisCompatibleBackend
+                self._backend = RedisCompatibleBackend(codec=self.codec)
+            except Exception as e:
+                logger.warning(f"Redis unavailable, coalescing searches within this worker only: {e}")
+                self._backend_failed = True
+                return None
+
+        if not hasattr(self._backend, 'client'):
+            # In-memory backends cannot coordinate across workers
+            return None
+        return self._backend
+
+    def inflight_count(self) -> int:
+        """Number of searches currently being scraped by this worker."""
+        return len(self._inflight)
+
+    async def run(
+        self,
+        key: str,
+        producer: Callable[[], Awaitable[pd.DataFrame]],
+    ) -> Tuple[pd.DataFrame, bool]:
+        """
+        Run a search, coalescing with any identical search already in flight.
+
+        Args:
+            key: Canonical search fingerprint
+            producer: Coroutine factory that performs the actual scrape
+
+        Returns:
+            Tuple of (DataFrame, coalesced) where coalesced is True if the result
+            came from another request's scrape
+        """
+        if not self.enabled:
+            return await producer(), False
+
+        task = self._inflight.get(key)
+        coalesced = task is not None
+        if coalesced:
+            logger.info(f"Coalescing search {key} with in-flight request")
+        else:
+            # The scrape runs in its own task so a disconnecting leader does not
+            # cancel the work its followers are waiting on
+            task = asyncio.ensure_future(self._run_leader(key, producer))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        result, remote = await asyncio.shield(task)
+        return result, coalesced or remote
+
+    def _forget(self, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when no caller is left waiting
+            task.exception()
+
+    async def _run_leader(
+        self,
+        key: str,
+        producer: Callable[[], Awaitable[pd.DataFrame]],
+    ) -> Tuple[pd.DataFrame, bool]:
+        """Run the search as this worker's leader, coordinating with other workers."""
+        backend = self._get_backend()
+        if backend is None:
+            return await producer(), False
+
+        lock_key = f"{LOCK_PREFIX}{key}"
+        result_key = f"{RESULT_PREFIX}{key}"
+        token = str(uuid.uuid4())
+
+        acquired = await self._acquire_lock(backend, lock_key, token)
+        if not acquired:
+            remote_result = await self._wait_for_remote_result(backend, lock_key, result_key)
+            if remote_result is not None:
+                logger.info(f"Coalesced search {key} with another worker's scrape")
+                return remote_result, True
+            logger.info(f"No result published for search {key}, scraping directly")
+
+        try:
+            result = await producer()
+            await asyncio.to_thread(self._publish_result, backend, result_key, result)
+            return result, False
+        finally:
+            if acquired:
+                await self._release_lock(backend, lock_key, token)
+
+    async def _acquire_lock(self, backend: Any, lock_key: str, token: str) -> bool:
+        try:
+            return bool(await asyncio.to_thread(
+                backend.client.set, lock_key, token, nx=True, ex=self.lock_ttl
+            ))
+        except Exception as e:
+            logger.warning(f"Failed to acquire search lock {lock_key}: {e}")
+            # Without the lock we simply scrape; never block the request on Redis
+            return False
+
+    async def _release_lock(self, backend: Any, lock_key: str, token: str) -> None:
+        try:
+            await asyncio.to_thread(backend.client.eval, RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        except Exception as e:
+            logger.warning(f"Failed to release search lock {lock_key}: {e}")
+
+    async def _wait_for_remote_result(
+        self,
+        backend: Any,
+        lock_key: str,
+        result_key: str,
+    ) -> Optional[pd.DataFrame]:
+        """Wait for another worker to publish its result or give up its lock."""
+        deadline = time.time() + self.lock_ttl
+        while time.time() < deadline:
+            result = await asyncio.to_thread(self._read_result, backend, result_key)
+            if result is not None:
+                return result
+            if not await asyncio.to_thread(backend.exists, lock_key):
+                # Leader finished or died; one last look for its result
+                return await asyncio.to_thread(self._read_result, backend, result_key)
+            await asyncio.sleep(self.poll_interval)
+        return None
+
+    def _publish_result(self, backend: Any, result_key: str, result: pd.DataFrame) -> None:
+        try:
+            backend.client.setex(result_key, self.result_ttl, self.codec.encode(result))
+        except Exception as e:
+            logger.warning(f"Could not publish search result {result_key}: {e}")
+
+    def _read_result(self, backend: Any, result_key: str) -> Optional[pd.DataFrame]:
+        try:
+            raw = backend.client.get(result_key)
+            if raw is None:
+                return None
+            result = self.codec.decode(raw)
+        except (CodecError, TypeError) as e:
+            logger.warning(f"Could not decode published search result {result_key}: {e}")
+            return None
+        except Exception as e:
+            logger.warning(f"Could not read published search result {result_key}: {e}")
+            return None
+        return result if isinstance(result, pd.DataFrame) else None
+
+
+# Global coalescer instance
+search_coalescer = SearchCoalescer()
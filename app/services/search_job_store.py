@@ -0,0 +1,287 @@
+"""
+Durable storage for asynchronous search jobs.
+
+A search job's status record and its results live in Redis, so any API worker
+can answer status and result requests for a search that runs on the Celery
+worker tier, and both survive API restarts. Results are stored as chunks of
+SEARCH_JOB_CHUNK_ROWS rows encoded with the binary cache codec; reading a page
+only fetches the chunks that overlap it. Records and results expire after
+SEARCH_JOB_TTL seconds. Paginated searches store their results here as well
+(see save_search), and the record's ID is the result handle later pages are
+read by.
+
+Without Redis the store keeps the same encoded records and chunks in process
+memory, which is only suitable for a single worker.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from app.core.cache_codecs import CacheCodec, CodecError, cache_codec
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SearchJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+TERMINAL_STATUSES = frozenset({SearchJobStatus.COMPLETED, SearchJobStatus.FAILED, SearchJobStatus.CANCELLED})
+
+
+def is_terminal(record: Dict[str, Any]) -> bool:
+    """True when a search job will not change status again."""
+    return record["status"] in TERMINAL_STATUSES
+
+
+class SearchJobStore:
+    """Redis-backed status records and paged results for search jobs."""
+
+    def __init__(
+        self,
+        prefix: Optional[str] = None,
+        ttl: Optional[int] = None,
+        chunk_rows: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        client: Any = None,
+        codec: Optional[CacheCodec] = None,
+    ):
+        """
+        Initialize the search job store.
+
+        Args:
+            prefix: Key prefix for records and result chunks (defaults to SEARCH_JOB_PREFIX)
+            ttl: Seconds records and results are kept (defaults to SEARCH_JOB_TTL)
+            chunk_rows: Rows per stored result chunk (defaults to SEARCH_JOB_CHUNK_ROWS)
+            poll_interval: Seconds between checks for updates made by other workers
+            client: Binary Redis client (created lazily from REDIS_URL if omitted)
+            codec: Codec for records and result chunks (defaults to the global cache codec)
+        """
+        self.prefix = prefix or settings.SEARCH_JOB_PREFIX
+        self.ttl = ttl or settings.SEARCH_JOB_TTL
+        self.chunk_rows = chunk_rows or settings.SEARCH_JOB_CHUNK_ROWS
+        self.poll_interval = poll_interval or settings.SEARCH_JOB_POLL_INTERVAL
+        self.codec = codec or cache_codec
+
+        self._client = client
+        self._client_failed = client is None and not settings.REDIS_URL
+        # key -> (expires_at, encoded value), used when Redis is unavailable
+        self._memory: Dict[str, Tuple[float, bytes]] = {}
+        # Wakes long-polls in this process as soon as a job is updated here
+        self._updated: Dict[str, asyncio.Event] = {}
+
+    @property
+    def client(self) -> Any:
+        """Resolve the Redis client, or None if Redis is unavailable."""
+        if self._client is None and not self._client_failed:
+            try:
+                from app.core.cache_backend import RedisCompatibleBackend
+                self._client = RedisCompatibleBackend(codec=self.codec).client
+            except Exception as e:
+                logger.warning(f"Redis unavailable, search jobs are kept in this worker only: {e}")
+                self._client_failed = True
+        return self._client
+
+    @property
+    def shared(self) -> bool:
+        """True when jobs are visible to every worker."""
+        return self.client is not None
+
+    def _record_key(self, job_id: str) -> str:
+        return f"{self.prefix}{job_id}"
+
+    def _chunk_key(self, job_id: str, index: int) -> str:
+        return f"{self.prefix}{job_id}:chunk:{index}"
+
+    async def _write(self, items: Dict[str, Any]) -> None:
+        encoded = {key: self.codec.encode(value) for key, value in items.items()}
+        client = self.client
+        if client is None:
+            expires_at = time.time() + self.ttl
+            for key, value in encoded.items():
+                self._memory[key] = (expires_at, value)
+            return
+
+        def write() -> None:
+            pipe = client.pipeline()
+            for key, value in encoded.items():
+                pipe.set(key, value, ex=self.ttl)
+            pipe.execute()
+
+        await asyncio.to_thread(write)
+
+    async def _read(self, keys: List[str]) -> List[Any]:
+        client = self.client
+        if client is None:
+            now = time.time()
+            raw = []
+            for key in keys:
+                entry = self._memory.get(key)
+                if entry is not None and entry[0] <= now:
+                    del self._memory[key]
+                    entry = None
+                raw.append(entry[1] if entry else None)
+        else:
+            raw = await asyncio.to_thread(client.mget, keys)
+
+        values = []
+        for key, value in zip(keys, raw):
+            try:
+                values.append(self.codec.decode(value) if value is not None else None)
+            except CodecError as e:
+                logger.warning(f"Discarding undecodable search job entry '{key}': {e}")
+                values.append(None)
+        return values
+
+    def _notify(self, job_id: str) -> None:
+        event = self._updated.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    def _prune_memory(self) -> None:
+        now = time.time()
+        for key in [key for key, (expires_at, _) in self._memory.items() if expires_at <= now]:
+            del self._memory[key]
+
+    def _new_record(self, params: Dict[str, Any], timeout_ms: Optional[int] = None) -> Dict[str, Any]:
+        return {
+            "id": str(uuid.uuid4()),
+            "status": SearchJobStatus.PENDING.value,
+            "version": 0,
+            "params": params,
+            "timeout_ms": timeout_ms,
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "completed_at": None,
+            "count": None,
+            "error": None,
+        }
+
+    def _chunks(self, job_id: str, jobs_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        jobs_df = jobs_df.reset_index(drop=True)
+        return {
+            self._chunk_key(job_id, index): jobs_df.iloc[start:start + self.chunk_rows]
+            for index, start in enumerate(range(0, len(jobs_df), self.chunk_rows))
+        }
+
+    async def create(self, params: Dict[str, Any], timeout_ms: Optional[int] = None) -> Dict[str, Any]:
+        """Record a new pending search job."""
+        if self.client is None:
+            self._prune_memory()
+        record = self._new_record(params, timeout_ms)
+        await self._write({self._record_key(record["id"]): record})
+        return record
+
+    async def save_search(self, params: Dict[str, Any], jobs_df: pd.DataFrame, **fields: Any) -> Dict[str, Any]:
+        """
+        Store the results of a search that already ran as a completed search job.
+
+        The record and all result chunks are written in one round trip; the
+        returned record's ID is a handle for reading the results page by page.
+        """
+        if self.client is None:
+            self._prune_memory()
+        record = self._new_record(params)
+        now = datetime.now().isoformat()
+        record.update(fields)
+        record.update(status=SearchJobStatus.COMPLETED.value, count=len(jobs_df), started_at=now, completed_at=now)
+        await self._write({self._record_key(record["id"]): record, **self._chunks(record["id"], jobs_df)})
+        return record
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a search job's status record, or None if it is unknown or expired."""
+        record, = await self._read([self._record_key(job_id)])
+        return record
+
+    async def transition(self, job_id: str, status: SearchJobStatus, **fields: Any) -> Optional[Dict[str, Any]]:
+        """
+        Move a search job to a new status.
+
+        Jobs that already finished keep their final status, so a search that
+        completes after being cancelled stays cancelled.
+
+        Returns:
+            The updated record, or None if the job is unknown or already finished
+        """
+        record = await self.get(job_id)
+        if record is None or is_terminal(record):
+            return None
+        record.update(fields)
+        record["status"] = status.value
+        record["version"] += 1
+        if status in TERMINAL_STATUSES:
+            record["completed_at"] = datetime.now().isoformat()
+        await self._write({self._record_key(job_id): record})
+        self._notify(job_id)
+        return record
+
+    async def save_results(self, job_id: str, jobs_df: pd.DataFrame) -> int:
+        """
+        Store a search job's results in chunks.
+
+        Returns:
+            Number of stored jobs
+        """
+        chunks = self._chunks(job_id, jobs_df)
+        if chunks:
+            await self._write(chunks)
+        return len(jobs_df)
+
+    async def get_page(self, record: Dict[str, Any], offset: int, limit: int) -> Optional[pd.DataFrame]:
+        """
+        Read `limit` jobs starting at `offset` from a completed search job.
+
+        Returns:
+            The page of jobs, or None if the stored results have expired
+        """
+        count = record.get("count") or 0
+        end = min(offset + limit, count)
+        if offset >= end:
+            return pd.DataFrame()
+
+        first, last = offset // self.chunk_rows, (end - 1) // self.chunk_rows
+        chunks = await self._read([self._chunk_key(record["id"], index) for index in range(first, last + 1)])
+        if any(chunk is None for chunk in chunks):
+            return None
+        page = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0].reset_index(drop=True)
+        start = offset - first * self.chunk_rows
+        return page.iloc[start:start + (end - offset)].reset_index(drop=True)
+
+    async def wait(self, job_id: str, since_version: int, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Wait until a search job changes after `since_version` or finishes.
+
+        Updates made in this process wake the waiter immediately; updates made
+        by other workers are picked up every poll_interval seconds.
+
+        Returns:
+            The latest record (unchanged if the timeout passed), or None if the job is unknown
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            record = await self.get(job_id)
+            if record is None or record["version"] > since_version or is_terminal(record):
+                return record
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return record
+            event = self._updated.setdefault(job_id, asyncio.Event())
+            try:
+                await asyncio.wait_for(event.wait(), min(self.poll_interval, remaining))
+            except asyncio.TimeoutError:
+                pass
+
+
+# Global search job store instance
+search_job_store = SearchJobStore()
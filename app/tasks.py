@@ -258,4 +258,23 @@ def check_pending_recurring_searches(self):
         print(f"Error in check_pending_recurring_searches: {e}")
         raise e
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+@celery_app.task(bind=True, name="app.tasks.run_search_job")
+def run_search_job(self, job_id: str, search_params: dict, timeout_ms: int = None):
+    """
+    Run an asynchronous search job submitted through POST /api/v1/searches.
+    
+    Status and results are written to the search job store, where the API
+    workers serve them from.
+    
+    Args:
+        job_id: Search job ID
+        search_params: Search parameters
+        timeout_ms: Optional search deadline in milliseconds
+    """
+    import asyncio
+    from app.services.background_service import background_service
+    
+    asyncio.run(background_service.execute_search(job_id, search_params, timeout_ms))
+    return {"job_id": job_id}
@@ -0,0 +1,143 @@
+"""
+Arrow IPC and Parquet responses.
+
+Analytics clients can ask the search and export endpoints for format=arrow
+(an Arrow IPC stream) or format=parquet and load the body straight into a
+DataFrame, without parsing JSON or CSV. Tables are built column by column from
+a DataFrame, a list of job dicts or a database cursor read in batches of
+COLUMNAR_BATCH_ROWS rows, which is also the size of the written record
+batches and row groups.
+
+pyarrow is optional; without it these formats are rejected with 501.
+"""
+import io
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+import pandas as pd
+from fastapi import HTTPException
+from fastapi.responses import Response
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+COLUMNAR_FORMATS = ("arrow", "parquet")
+
+MEDIA_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def require_columnar(response_format: str) -> None:
+    """
+    Check that a columnar format can be produced.
+
+    Raises:
+        HTTPException: 501 if pyarrow is not installed
+    """
+    if pa is None:
+        raise HTTPException(
+            status_code=501,
+            detail={
+                "error": f"format={response_format} is not available",
+                "message": "pyarrow is not installed on this server",
+                "suggestion": "Use format=json or format=csv",
+            }
+        )
+
+
+def _array(values: Sequence[Any]) -> "pa.Array":
+    """Convert one column, falling back to strings for values Arrow cannot type."""
+    try:
+        return pa.array(values, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array([None if value is None else str(value) for value in values], type=pa.string())
+
+
+def _table_from_columns(names: Sequence[str], columns: Sequence[Sequence[Any]]) -> "pa.Table":
+    return pa.Table.from_arrays([_array(column) for column in columns], names=list(names))
+
+
+def dataframe_to_table(df: pd.DataFrame) -> "pa.Table":
+    """Convert a DataFrame to an Arrow table."""
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed-type object columns; convert column by column instead
+        return _table_from_columns([str(c) for c in df.columns], [df[c].tolist() for c in df.columns])
+
+
+def records_to_table(records: List[Dict[str, Any]], batch_rows: Optional[int] = None) -> "pa.Table":
+    """Convert a list of dicts, including nested dicts and lists, to an Arrow table."""
+    batch_rows = batch_rows or settings.COLUMNAR_BATCH_ROWS
+    tables = []
+    for start in range(0, len(records), batch_rows):
+        batch = records[start:start + batch_rows]
+        try:
+            tables.append(pa.Table.from_pylist(batch))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            names = list(dict.fromkeys(key for record in batch for key in record))
+            tables.append(_table_from_columns(names, [[record.get(name) for record in batch] for name in names]))
+    return _concat(tables)
+
+
+def cursor_to_table(result: Any, batch_rows: Optional[int] = None) -> "pa.Table":
+    """
+    Build an Arrow table from a SQLAlchemy result.
+
+    Rows are fetched and converted batch_rows at a time, column by column,
+    without building a dict per row.
+    """
+    batch_rows = batch_rows or settings.COLUMNAR_BATCH_ROWS
+    names = list(result.keys())
+    tables = []
+    while True:
+        rows = result.fetchmany(batch_rows)
+        if not rows:
+            break
+        tables.append(_table_from_columns(names, list(zip(*rows))))
+    if not tables:
+        return pa.table({name: pa.array([], type=pa.null()) for name in names})
+    return _concat(tables)
+
+
+def _concat(tables: List["pa.Table"]) -> "pa.Table":
+    if not tables:
+        return pa.table({})
+    if len(tables) == 1:
+        return tables[0]
+    # A column that was all null in one batch is promoted to the type seen in the others
+    return pa.concat_tables(tables, promote_options="permissive")
+
+
+def encode_table(table: "pa.Table", response_format: str, batch_rows: Optional[int] = None) -> bytes:
+    """Write a table as an Arrow IPC stream or a Parquet file."""
+    batch_rows = batch_rows or settings.COLUMNAR_BATCH_ROWS
+    sink = io.BytesIO()
+    if response_format == "parquet":
+        pq.write_table(table, sink, row_group_size=batch_rows, compression="zstd")
+    else:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=batch_rows)
+    return sink.getvalue()
+
+
+def columnar_response(table: "pa.Table", response_format: str, filename: str) -> Response:
+    """Build a download response for a table in the requested columnar format."""
+    body = encode_table(table, response_format)
+    logger.info(f"Encoded {table.num_rows} rows as {response_format} ({len(body)} bytes)")
+    extension = "arrow" if response_format == "arrow" else "parquet"
+    return Response(
+        content=body,
+        media_type=MEDIA_TYPES[response_format],
+        headers={"Content-Disposition": f"attachment; filename={filename}.{extension}"}
+    )
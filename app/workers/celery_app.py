@@ -93,18 +93,11 @@ celery_app.conf.update(
             'options': {'queue': 'orchestrator'}
         },
         
-        # Data cleanup
-        'cleanup_old_data': {
-            'task': 'app.workers.data_processor.cleanup_old_data',
-            'schedule': crontab(hour=2, minute=0),  # 2 AM daily
-            'options': {'queue': 'data_processor'}
-        },
-        
-        # Analytics updates
-        'update_company_trends': {
-            'task': 'app.workers.data_processor.update_company_trends',
-            'schedule': crontab(hour=1, minute=0),  # 1 AM daily
-            'options': {'queue': 'data_processor'}
+        # Ingest queue; dedicated `python -m app.workers.data_processor` consumers drain it continuously
+        'drain_ingest_queue': {
+            'task': 'app.workers.data_processor.drain_ingest_queue',
+            'schedule': 30.0,  # Every 30 seconds
+            'options': {'queue': 'data_processor', 'expires': 30}
         },
         
         # Queue monitoring
@@ -0,0 +1,132 @@
+"""
+Data processor workers for the tracking database.
+
+Drains the ingest queue (see app.services.ingest_queue) that request handlers
+publish scraped jobs to, saving each site's jobs with JobTrackingService in
+batches of INGEST_BATCH_SIZE stream entries per database session. Run it
+either as a dedicated consumer process:
+
+    python -m app.workers.data_processor
+
+or as the drain_ingest_queue Celery task on the data_processor queue. Every
+process reads through the same consumer group, so adding processes adds
+ingestion throughput.
+"""
+import logging
+import os
+import socket
+import time
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.services.ingest_queue import IngestBatch, IngestQueue, ingest_queue
+from app.workers.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+def consumer_name() -> str:
+    """Name this process reads the ingest stream as."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def save_batch(batch: IngestBatch, db) -> Dict[str, Any]:
+    """Save one site's queued jobs to the tracking database."""
+    from app.services.bulk_ingest_service import tracking_ingester
+
+    stats = tracking_ingester().process_scraped_jobs(
+        jobs_data=batch.jobs.to_dict('records'),
+        source_site=batch.source_site,
+        search_params=batch.search_params,
+        db=db
+    )
+    lag = time.time() - batch.queued_at if batch.queued_at else 0
+    logger.info(
+        f"Ingested {len(batch.jobs)} jobs from {batch.source_site} queued {lag:.1f}s ago: "
+        f"{stats['new_jobs']} new, {stats['updated_jobs']} updated"
+    )
+    return stats
+
+
+def drain(
+    consumer: Optional[str] = None,
+    max_batches: Optional[int] = None,
+    block_ms: int = 0,
+    queue: Optional[IngestQueue] = None,
+) -> Dict[str, int]:
+    """
+    Save queued jobs until the ingest stream is empty or max_batches reads were made.
+
+    Args:
+        consumer: Consumer name within the group (defaults to host and process ID)
+        max_batches: Most stream reads before returning (unlimited if omitted)
+        block_ms: How long a read waits for new entries when the stream is empty
+        queue: Ingest queue to drain (defaults to the global one)
+
+    Returns:
+        Counts of saved, failed and dead-lettered entries, and new jobs
+    """
+    from app.db import database
+
+    queue = queue or ingest_queue
+    if queue.client is None:
+        logger.warning("No ingest stream without Redis; scraped jobs are saved by the API workers")
+        return {"saved": 0, "failed": 0, "dead_letters": 0, "new_jobs": 0}
+
+    consumer = consumer or consumer_name()
+    totals = {"saved": 0, "failed": 0, "dead_letters": 0, "new_jobs": 0}
+    reads = 0
+    while max_batches is None or reads < max_batches:
+        batches = queue.read(consumer, settings.INGEST_BATCH_SIZE, block_ms)
+        reads += 1
+        if not batches:
+            break
+
+        database.init_database()
+        db = database.SessionLocal()
+        try:
+            for batch in batches:
+                try:
+                    stats = save_batch(batch, db)
+                except Exception as e:
+                    db.rollback()
+                    if batch.deliveries >= settings.INGEST_MAX_DELIVERIES:
+                        logger.error(f"Giving up on ingest entry {batch.entry_id} after {batch.deliveries} attempts: {e}")
+                        queue.dead_letter_batch(batch, str(e))
+                        totals["dead_letters"] += 1
+                    else:
+                        # Left pending; claimed and retried after INGEST_CLAIM_IDLE_MS
+                        logger.error(f"Error ingesting entry {batch.entry_id} from {batch.source_site}: {e}")
+                        totals["failed"] += 1
+                    continue
+                queue.ack([batch.entry_id])
+                totals["saved"] += 1
+                totals["new_jobs"] += stats.get("new_jobs", 0)
+        finally:
+            db.close()
+    return totals
+
+
+@celery_app.task(name="app.workers.data_processor.drain_ingest_queue")
+def drain_ingest_queue(max_batches: Optional[int] = None) -> Dict[str, int]:
+    """Celery entry point: save queued jobs until the ingest stream is empty."""
+    return drain(max_batches=max_batches or settings.INGEST_TASK_MAX_BATCHES)
+
+
+def run_forever() -> None:
+    """Consume the ingest stream until interrupted."""
+    if ingest_queue.client is None:
+        logger.error("The ingest queue needs REDIS_URL and INGEST_QUEUE_ENABLED; nothing to consume")
+        return
+    consumer = consumer_name()
+    logger.info(f"Data processor {consumer} reading {ingest_queue.stream} as group {ingest_queue.group}")
+    while True:
+        try:
+            drain(consumer, block_ms=settings.INGEST_BLOCK_MS)
+        except Exception as e:
+            logger.error(f"Data processor {consumer} failed, retrying: {e}")
+            time.sleep(settings.INGEST_BLOCK_MS / 1000)
+
+
+if __name__ == "__main__":
+    run_forever()
@@ -0,0 +1,93 @@
+"""Benchmark similarity scoring of scraped jobs against their dedup candidates.
+
+Compares scoring pair by pair, the way deduplication used to (normalize both
+jobs and run difflib.SequenceMatcher per feature for every candidate), with
+app.services.batch_similarity, which normalizes every job once and scores all
+pairs of the batch at once. No database is needed:
+
+    python scripts/benchmark_dedup_scoring.py --jobs 1000 --candidates 20
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import batch_similarity  # noqa: E402
+from app.services.deduplication_service import deduplication_service  # noqa: E402
+
+TITLES = ["Senior Software Engineer", "Data Scientist II", "Product Manager", "DevOps Engineer (Remote)",
+          "Backend Developer", "Marketing Specialist", "Sales Representative", "QA Analyst", "UX Designer"]
+COMPANIES = ["Acme Inc", "Globex Corporation", "Initech LLC", "Umbrella Co", "Hooli", "Stark Industries Ltd"]
+CITIES = ["San Francisco, CA, USA", "New York, NY, USA", "Seattle, WA", "Austin, TX", "Chicago, IL, USA"]
+
+
+def make_job(rng: random.Random, i: int):
+    return {
+        "title": f"{rng.choice(TITLES)} {rng.choice(['', 'I', 'III', 'Platform', 'Payments'])}",
+        "company": rng.choice(COMPANIES),
+        "location": rng.choice(CITIES),
+        "job_type": rng.choice(["fulltime", "contract"]),
+        "description": f"<p>Job {i % 40}. Build and run services for team {i % 17}.</p> " * 6,
+    }
+
+
+def pairwise_score(job, candidate):
+    """Score one pair the way deduplication did before batch scoring."""
+    service = deduplication_service
+    new, existing = service.job_features(job), service.job_features(candidate)
+
+    def ratio(a, b):
+        return SequenceMatcher(None, a, b).ratio() if a and b else 0.0
+
+    return (
+        ratio(new['title'], existing['title']) * 0.4
+        + ratio(new['company'], existing['company']) * 0.3
+        + ratio(new['location'], existing['location']) * 0.15
+        + (1.0 if new['job_type'] == existing['job_type'] else 0.0) * 0.1
+        + ratio(new['description_snippet'], existing['description_snippet']) * 0.05
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pairwise and batch dedup scoring")
+    parser.add_argument("--jobs", type=int, default=1000, help="Scraped jobs in the batch")
+    parser.add_argument("--candidates", type=int, default=20, help="Candidates scored per job")
+    parser.add_argument("--stored", type=int, default=5000, help="Distinct stored postings candidates come from")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    jobs = [make_job(rng, i) for i in range(args.jobs)]
+    stored = [make_job(rng, i) for i in range(args.stored)]
+    candidates = [rng.sample(range(args.stored), args.candidates) for _ in jobs]
+    threshold = deduplication_service.similarity_threshold
+
+    start = time.perf_counter()
+    pairwise_matches = 0
+    for job, job_candidates in zip(jobs, candidates):
+        scores = [pairwise_score(job, stored[col]) for col in job_candidates]
+        pairwise_matches += sum(score >= threshold for score in scores)
+    pairwise_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new = [deduplication_service.job_features(job) for job in jobs]
+    used = sorted({col for job_candidates in candidates for col in job_candidates})
+    existing = [deduplication_service.job_features(stored[col]) for col in used]
+    column = {col: position for position, col in enumerate(used)}
+    rows = [row for row, job_candidates in enumerate(candidates) for _ in job_candidates]
+    cols = [column[col] for job_candidates in candidates for col in job_candidates]
+    matches = batch_similarity.best_matches(new, existing, rows, cols, threshold)
+    batch_time = time.perf_counter() - start
+
+    backend = "rapidfuzz" if batch_similarity.process is not None else "difflib"
+    print(f"{args.jobs} jobs x {args.candidates} candidates ({len(rows)} pairs), batch backend: {backend}")
+    print(f"pairwise: {pairwise_time:8.3f}s  {pairwise_matches} matches")
+    print(f"batch:    {batch_time:8.3f}s  {sum(map(len, matches))} matches")
+    print(f"speedup:  {pairwise_time / batch_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark serializing job search responses.
+
+Compares the previous response path (to_dict('records'), response_model
+validation and FastAPI's JSON encoder) with JobsJSONResponse, which writes the
+DataFrame straight to JSON. Reports the cost per 1000 jobs.
+
+    python scripts/benchmark_serialization.py --jobs 1000 5000 --repeat 5
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from app.pydantic_models import JobResponse  # noqa: E402
+from app.routes.api_helpers import JobsJSONResponse  # noqa: E402
+
+SITES = ["indeed", "linkedin", "zip_recruiter", "glassdoor", "google"]
+TITLES = ["Software Engineer", "Data Scientist", "Product Manager", "DevOps Engineer", "Backend Developer"]
+CITIES = ["San Francisco, CA", "New York, NY", "Seattle, WA", "Austin, TX", "Remote"]
+
+
+def make_jobs(count: int) -> pd.DataFrame:
+    """Build a DataFrame shaped like JobSpy's output, with missing salaries and emails."""
+    rng = random.Random(42)
+    salaries = np.array([rng.choice([np.nan, 80000.0, 120000.0, 150000.0]) for _ in range(count)])
+    return pd.DataFrame({
+        "id": [f"job-{i}" for i in range(count)],
+        "site": [rng.choice(SITES) for _ in range(count)],
+        "job_url": [f"https://example.com/jobs/{i}" for i in range(count)],
+        "title": [rng.choice(TITLES) for _ in range(count)],
+        "company": [f"Company {i % 300}" for i in range(count)],
+        "location": [rng.choice(CITIES) for _ in range(count)],
+        "date_posted": [date(2025, 6, 1) - timedelta(days=i % 30) for i in range(count)],
+        "job_type": [rng.choice(["fulltime", "contract", None]) for _ in range(count)],
+        "min_amount": salaries,
+        "max_amount": salaries * 1.2,
+        "currency": ["USD"] * count,
+        "is_remote": [rng.random() < 0.3 for _ in range(count)],
+        "emails": [[f"jobs{i}@example.com"] if i % 4 == 0 else None for i in range(count)],
+        "description": ["Build and run services. " * 40] * count,
+    })
+
+
+def previous_path(jobs_df: pd.DataFrame) -> bytes:
+    """Serialize the way the endpoints did before: per-record dicts validated by the response model."""
+    payload = {"count": len(jobs_df), "jobs": jobs_df.to_dict("records"), "cached": False}
+    model = JobResponse.model_validate(payload)
+    # FastAPI's JSONResponse refuses NaN; allow it here so the old path can be timed at all
+    return json.dumps(jsonable_encoder(model), ensure_ascii=False, allow_nan=True, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(jobs_df: pd.DataFrame) -> bytes:
+    return JobsJSONResponse({"count": len(jobs_df), "jobs": jobs_df, "cached": False}).body
+
+
+def measure(serialize, jobs_df: pd.DataFrame, repeat: int) -> float:
+    """Median seconds per call."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        serialize(jobs_df)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark job response serialization")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1000, 10000], help="Result sizes to benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement")
+    args = parser.parse_args()
+
+    print(f"{'jobs':>8} {'previous ms/1k':>15} {'fast ms/1k':>11} {'speedup':>8} {'bytes':>11}")
+    for count in args.jobs:
+        jobs_df = make_jobs(count)
+        before = measure(previous_path, jobs_df, args.repeat)
+        after = measure(fast_path, jobs_df, args.repeat)
+        per_thousand = 1000 / count * 1000
+        print(
+            f"{count:>8} {before * per_thousand:>15.2f} {after * per_thousand:>11.2f} "
+            f"{before / after:>7.1f}x {len(fast_path(jobs_df)):>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
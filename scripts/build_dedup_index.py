@@ -0,0 +1,71 @@
+"""Index stored job postings in the MinHash-LSH deduplication index.
+
+Postings are added to the index (job_dedup_buckets) when they are inserted.
+Run this once after `alembic upgrade head` to index the postings stored before,
+and again after changing DEDUP_LSH_PERMUTATIONS or DEDUP_LSH_BANDS, with
+--rebuild. Only postings recent enough to be deduplication candidates are
+indexed unless --max-age-days says otherwise. Indexing is idempotent and
+commits every --batch-size postings, so it can be interrupted and rerun.
+
+    DATABASE_URL=postgresql://... python scripts/build_dedup_index.py --max-age-days 90
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import joinedload  # noqa: E402
+
+from app.db import database  # noqa: E402
+from app.models.tracking_models import JobDedupBucket, JobPosting  # noqa: E402
+from app.services.deduplication_service import deduplication_service  # noqa: E402
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index stored job postings for fuzzy deduplication")
+    parser.add_argument("--max-age-days", type=int, default=90,
+                        help="Index postings first seen this many days ago or later (0 indexes all)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Postings indexed per commit")
+    parser.add_argument("--rebuild", action="store_true", help="Empty the index first")
+    args = parser.parse_args()
+
+    database.init_database()
+    db = database.SessionLocal()
+    index = deduplication_service.index
+    try:
+        if args.rebuild:
+            db.query(JobDedupBucket).delete(synchronize_session=False)
+            db.commit()
+            logger.info("Emptied the deduplication index")
+
+        query = db.query(JobPosting).options(joinedload(JobPosting.company), joinedload(JobPosting.location))
+        if args.max_age_days:
+            query = query.filter(JobPosting.first_seen_at >= datetime.utcnow() - timedelta(days=args.max_age_days))
+
+        start = time.perf_counter()
+        indexed = 0
+        last_id = 0
+        while True:
+            postings = query.filter(JobPosting.id > last_id).order_by(JobPosting.id).limit(args.batch_size).all()
+            if not postings:
+                break
+            index.add(db, {posting.id: deduplication_service.posting_features(posting) for posting in postings})
+            db.commit()
+            db.expunge_all()
+            indexed += len(postings)
+            last_id = postings[-1].id
+            logger.info(f"Indexed {indexed} postings ({indexed / (time.perf_counter() - start):.0f}/s)")
+        logger.info(f"Indexed {indexed} postings in {time.perf_counter() - start:.1f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@ import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
 import pandas as pd
 
+from app.services.job_service import SearchOutcome
+
 def test_health_endpoint(client):
     """Test the health endpoint."""
     response = client.get("/health")
@@ -38,7 +40,7 @@ def test_api_key_authentication_invalid(authenticated_client):
     assert response.status_code == 403
     assert "Invalid API Key" in response.json()["detail"]
 
-@patch('app.services.job_service.JobService.search_jobs')
+@patch('app.services.job_service.JobService.run_search')
 def test_search_jobs_basic(mock_search_jobs, client):
     """Test the basic search_jobs endpoint."""
     # Setup mock
@@ -53,7 +55,7 @@ def test_search_jobs_basic(mock_search_jobs, client):
         'DESCRIPTION': ['Test description 1', 'Test description 2'],
         'DATE_POSTED': ['2024-01-01', '2024-01-02']
     })
-    mock_search_jobs.return_value = (mock_df, False)
+    mock_search_jobs.return_value = SearchOutcome(jobs=mock_df, cached=False)
     
     response = client.post(
         "/api/v1/search_jobs",
@@ -73,7 +75,7 @@ def test_search_jobs_basic(mock_search_jobs, client):
     assert len(data["jobs"]) == 2
     assert data["jobs"][0]["TITLE"] == "Software Engineer"
 
-@patch('app.services.job_service.JobService.search_jobs')
+@patch('app.services.job_service.JobService.run_search')
 def test_search_jobs_cached(mock_search_jobs, client):
     """Test cached search results."""
     # Setup mock to return cached result
@@ -88,7 +90,7 @@ def test_search_jobs_cached(mock_search_jobs, client):
         'DESCRIPTION': ['Cached description'],
         'DATE_POSTED': ['2024-01-01']
     })
-    mock_search_jobs.return_value = (mock_df, True)
+    mock_search_jobs.return_value = SearchOutcome(jobs=mock_df, cached=True)
     
     response = client.post(
         "/api/v1/search_jobs",
@@ -121,7 +123,7 @@ def test_search_jobs_validation_error(client):
 
 def test_search_jobs_csv_format(client):
     """Test CSV format response."""
-    with patch('app.services.job_service.JobService.search_jobs') as mock_search:
+    with patch('app.services.job_service.JobService.run_search') as mock_search:
         mock_df = pd.DataFrame({
             'SITE': ['indeed'],
             'TITLE': ['Test Job'],
@@ -130,13 +132,13 @@ def test_search_jobs_csv_format(client):
             'JOB_TYPE': ['fulltime'],
             'DESCRIPTION': ['Test description']
         })
-        mock_search.return_value = (mock_df, False)
+        mock_search.return_value = SearchOutcome(jobs=mock_df, cached=False)
         
         response = client.get("/api/v1/search_jobs?format=csv&search_term=test")
         assert response.status_code == 200
         assert response.headers["content-type"] == "text/csv; charset=utf-8"
 
-@patch('app.services.job_service.JobService.search_jobs')
+@patch('app.services.job_service.JobService.run_search')
 def test_search_jobs_error_handling(mock_search_jobs, client):
     """Test error handling in search_jobs endpoint."""
     # Mock the service to raise an exception
@@ -0,0 +1,61 @@
+"""Tests for the job response serializer."""
+import json
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from app.routes.api_helpers import JobsJSONResponse, jobs_to_json
+
+
+class TestJobsToJson:
+    """Test cases for jobs_to_json."""
+
+    def test_missing_values_become_null(self):
+        """NaN, NaT and None serialize as null instead of invalid JSON."""
+        jobs = pd.DataFrame({
+            'title': ['Engineer', None],
+            'min_amount': [100000.0, np.nan],
+            'posted_at': [pd.Timestamp('2025-06-01 09:30:00'), pd.NaT],
+        })
+
+        rows = json.loads(jobs_to_json(jobs))
+
+        assert rows[1] == {'title': None, 'min_amount': None, 'posted_at': None}
+        assert rows[0]['posted_at'] == '2025-06-01T09:30:00'
+
+    def test_date_columns_keep_date_format(self):
+        """Date-only values such as date_posted serialize as YYYY-MM-DD."""
+        jobs = pd.DataFrame({'date_posted': [date(2025, 6, 1), None]})
+
+        assert json.loads(jobs_to_json(jobs)) == [{'date_posted': '2025-06-01'}, {'date_posted': None}]
+
+    def test_numpy_and_list_values(self):
+        jobs = pd.DataFrame({
+            'count': np.array([3], dtype='int64'),
+            'is_remote': np.array([True]),
+            'emails': [['jobs@example.com']],
+        })
+
+        assert json.loads(jobs_to_json(jobs)) == [{'count': 3, 'is_remote': True, 'emails': ['jobs@example.com']}]
+
+    def test_empty_frame(self):
+        assert jobs_to_json(pd.DataFrame()) == "[]"
+
+
+class TestJobsJSONResponse:
+    """Test cases for JobsJSONResponse."""
+
+    def test_renders_dataframe_under_jobs(self):
+        jobs = pd.DataFrame({'title': ['Engineer'], 'min_amount': [np.nan]})
+
+        response = JobsJSONResponse({'count': 1, 'jobs': jobs, 'cached': False, 'next_page': None})
+
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == {
+            'count': 1, 'cached': False, 'next_page': None,
+            'jobs': [{'title': 'Engineer', 'min_amount': None}],
+        }
+
+    def test_plain_content_uses_default_rendering(self):
+        assert json.loads(JobsJSONResponse({'count': 0, 'jobs': []}).body) == {'count': 0, 'jobs': []}
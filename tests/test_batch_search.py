@@ -0,0 +1,147 @@
+"""Tests for batch searches."""
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_api_key
+from app.db.database import get_db
+from app.routes import api
+from app.services import batch_search_service as batch_module
+from app.services.batch_search_service import BatchSearchService
+from app.services.ingest_queue import ingest_queue
+from app.services.job_service import JobService, SearchOutcome
+
+
+def make_jobs(term: str, rows: int = 2) -> pd.DataFrame:
+    return pd.DataFrame({'site': ['indeed'] * rows, 'title': [f'{term} {i}' for i in range(rows)]})
+
+
+class TestBatchSearchService:
+    """Test cases for BatchSearchService."""
+
+    def test_plan_groups_identical_searches(self):
+        queries = BatchSearchService.plan([
+            {'search_term': 'python', 'location': 'Austin'},
+            {'search_term': 'java', 'location': 'Austin'},
+            {'location': 'Austin', 'search_term': 'python'},
+        ])
+
+        assert [query.indexes for query in queries] == [[0, 2], [1]]
+        assert queries[0].params == {'search_term': 'python', 'location': 'Austin'}
+
+    @pytest.mark.asyncio
+    async def test_cached_searches_first_and_misses_within_budget(self):
+        service = BatchSearchService(concurrency=2)
+        running, peak = 0, 0
+
+        async def fake_cached_search(params):
+            if params['search_term'] == 'cached':
+                return SearchOutcome(jobs=make_jobs('cached'), cached=True)
+            return None
+
+        async def fake_run_search(params, timeout_ms=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if params['search_term'] == 'broken':
+                raise RuntimeError("scrape failed")
+            return SearchOutcome(jobs=make_jobs(params['search_term']), cached=False, scraped_sites=['indeed'])
+
+        terms = ['a', 'b', 'cached', 'c', 'broken', 'd']
+        queries = service.plan([{'search_term': term} for term in terms])
+        with patch.object(JobService, 'cached_search', side_effect=fake_cached_search), \
+             patch.object(JobService, 'run_search', side_effect=fake_run_search) as run_search:
+            results = [result async for result in service.run(queries)]
+
+        assert results[0].query.params['search_term'] == 'cached'
+        assert run_search.call_count == 5
+        assert peak == 2
+        errors = {result.query.params['search_term']: result.error for result in results if result.error}
+        assert errors == {'broken': 'scrape failed'}
+
+    @pytest.mark.asyncio
+    async def test_consumer_stopping_early_saves_running_searches(self):
+        service = BatchSearchService(concurrency=1)
+        finished = asyncio.Event()
+
+        async def fake_run_search(params, timeout_ms=None):
+            if params['search_term'] == 'b':
+                await finished.wait()
+            return SearchOutcome(jobs=make_jobs(params['search_term']), cached=False, scraped_sites=['indeed'])
+
+        queries = service.plan([{'search_term': term} for term in ['a', 'b', 'c']])
+        with patch.object(JobService, 'cached_search', return_value=None), \
+             patch.object(JobService, 'run_search', side_effect=fake_run_search) as run_search, \
+             patch.object(ingest_queue, 'publish_sites', new_callable=AsyncMock) as save:
+            results = service.run(queries)
+            assert (await results.__anext__()).query.params['search_term'] == 'a'
+            await asyncio.sleep(0.01)
+            await results.aclose()
+
+            finished.set()
+            await asyncio.gather(*batch_module._late_saves)
+
+        # c was still waiting for the budget; a was never taken over by the consumer
+        assert [call.args[0]['search_term'] for call in run_search.call_args_list] == ['a', 'b']
+        assert sorted(call.args[1]['search_term'] for call in save.await_args_list) == ['a', 'b']
+
+
+@pytest.fixture
+def batch_client():
+    app = FastAPI()
+    app.include_router(api.router, prefix="/api/v1")
+    app.dependency_overrides[get_api_key] = lambda: None
+    app.dependency_overrides[get_db] = lambda: None
+
+    async def fake_run_search(params, timeout_ms=None):
+        return SearchOutcome(jobs=make_jobs(params['search_term']), cached=True, cached_sites=['indeed'])
+
+    with patch.object(JobService, 'cached_search', return_value=None), \
+         patch.object(JobService, 'run_search', side_effect=fake_run_search) as run_search:
+        client = TestClient(app)
+        client.run_search = run_search
+        yield client
+
+
+class TestBatchSearchAPI:
+    """Test cases for POST /api/v1/search_jobs/batch."""
+
+    def test_streams_one_frame_per_distinct_search(self, batch_client):
+        body = [
+            {'site_name': ['indeed'], 'search_term': 'python'},
+            {'site_name': ['indeed'], 'search_term': 'java'},
+            {'site_name': ['indeed'], 'search_term': 'python'},
+        ]
+
+        response = batch_client.post("/api/v1/search_jobs/batch", json=body)
+
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        frames = [json.loads(line) for line in response.text.splitlines()]
+        results = {frame['params']['search_term']: frame for frame in frames if frame['type'] == 'result'}
+        assert results['python']['indexes'] == [0, 2]
+        assert [job['title'] for job in results['java']['jobs']] == ['java 0', 'java 1']
+        assert frames[-1]['type'] == 'summary'
+        assert frames[-1]['searches'] == 3
+        assert frames[-1]['distinct_searches'] == 2
+        assert batch_client.run_search.call_count == 2
+
+    def test_invalid_search_reports_its_index(self, batch_client):
+        body = [{'site_name': ['indeed']}, {'site_name': ['indeed'], 'job_type': 'sometimes'}]
+
+        response = batch_client.post("/api/v1/search_jobs/batch", json=body)
+
+        assert response.status_code == 400
+        assert response.json()['detail']['index'] == 1
+
+    def test_too_many_searches(self, batch_client):
+        with patch.object(api.settings, 'BATCH_SEARCH_MAX_QUERIES', 1):
+            response = batch_client.post("/api/v1/search_jobs/batch", json=[{'search_term': 'a'}, {'search_term': 'b'}])
+
+        assert response.status_code == 400
@@ -0,0 +1,60 @@
+"""Tests for vectorized dedup similarity scoring."""
+from unittest.mock import patch
+
+import pytest
+
+from app.services import batch_similarity
+from app.services.batch_similarity import best_matches, pair_scores, paired_text_similarity
+from app.services.deduplication_service import JobDeduplicationService
+
+
+def features(title='backend engineer', company='acme', location='austin, tx', job_type='fulltime', **extra):
+    return {
+        'title': title,
+        'company': company,
+        'location': location,
+        'job_type': job_type,
+        'description_snippet': 'build apis in python.',
+        **extra,
+    }
+
+
+NEW = [features(), features(title='data analyst', company='initech', job_type='')]
+EXISTING = [
+    features(title='backend engineer ii'),
+    features(title='sales manager', company='globex', location='boston, ma'),
+    features(),
+    features(title='data analyst', company='initech', location='', job_type=''),
+]
+
+
+class TestPairScores:
+    """Batch scores equal the per-pair weighted similarity."""
+
+    @pytest.mark.parametrize('backend', ['rapidfuzz', 'difflib'])
+    def test_matches_feature_similarity(self, backend):
+        service = JobDeduplicationService()
+        rows = [0, 0, 0, 1, 1]
+        cols = [0, 1, 2, 1, 3]
+        with patch.object(batch_similarity, 'process', batch_similarity.process if backend == 'rapidfuzz' else None), \
+             patch.object(batch_similarity, 'fuzz', batch_similarity.fuzz if backend == 'rapidfuzz' else None):
+            scores = pair_scores(NEW, EXISTING, rows, cols)
+            expected = [service.feature_similarity(NEW[row], EXISTING[col]) for row, col in zip(rows, cols)]
+
+        assert scores.tolist() == pytest.approx(expected)
+
+    def test_empty_strings_do_not_match(self):
+        assert paired_text_similarity(['', 'acme', ''], ['acme', '', '']).tolist() == [0.0, 0.0, 0.0]
+
+
+class TestBestMatches:
+    """Matches above the threshold are returned per job, best first."""
+
+    def test_best_first_per_job(self):
+        matches = best_matches(NEW, EXISTING, [0, 0, 0, 1, 1], [0, 1, 2, 1, 3], threshold=0.85)
+
+        assert [[col for col, _ in job_matches] for job_matches in matches] == [[2, 0], [3]]
+        assert matches[0][0][1] == pytest.approx(1.0)
+
+    def test_jobs_without_candidates(self):
+        assert best_matches(NEW, [], [], [], threshold=0.85) == [[], []]
@@ -0,0 +1,305 @@
+"""Tests for set-based ingestion of scraped jobs."""
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.services import bulk_ingest_service as bulk_module
+from app.services.bulk_ingest_service import BulkIngestService, tracking_ingester
+from app.services.job_tracking_service import job_tracking_service
+from app.services.resolution_cache import ResolutionCache
+
+
+def make_job(title='Backend Engineer', company='Acme Inc', location='Austin, TX, USA', **extra):
+    return {
+        'title': title,
+        'company': company,
+        'location': location,
+        'job_type': 'fulltime',
+        'description': 'Build APIs in Python.',
+        'job_url': f'https://example.com/{title}/{location}',
+        'job_id': f'{title}-{location}',
+        **extra,
+    }
+
+
+class RecordingSession:
+    """Session stand-in that compiles executed statements for PostgreSQL and returns canned rows."""
+
+    def __init__(self, rows=None, stored=None):
+        self.sql = []
+        self.params = []
+        self.rows = rows or {}
+        self.stored = stored or {}
+        self.queried = []
+
+    def query(self, *columns):
+        table = columns[0].class_.__tablename__
+        self.queried.append(table)
+        query = MagicMock()
+        query.filter.return_value = self.stored.get(table, [])
+        return query
+
+    def execute(self, statement):
+        compiled = statement.compile(dialect=postgresql.dialect())
+        self.sql.append(str(compiled))
+        self.params.append(compiled.params)
+        result = MagicMock()
+        result.all.return_value = self.rows.get(statement.table.name, [])
+        return result
+
+
+class FakeRedisHashes:
+    """Minimal in-memory stand-in for the Redis hash commands used by the resolution cache."""
+
+    def __init__(self):
+        self.hashes = {}
+
+    def hmget(self, key, fields):
+        return [self.hashes.get(key, {}).get(field) for field in fields]
+
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update({field: str(value) for field, value in mapping.items()})
+
+    def delete(self, *keys):
+        for key in keys:
+            self.hashes.pop(key, None)
+
+
+@pytest.fixture
+def resolution_cache():
+    cache = ResolutionCache(prefix="test:resolve:", client=FakeRedisHashes())
+    cache._loaded_at = time.monotonic()
+    return cache
+
+
+@pytest.fixture
+def service(resolution_cache):
+    return BulkIngestService(resolution_cache=resolution_cache)
+
+
+class TestPrepareRows:
+    """Jobs are normalized once and unstorable ones are skipped."""
+
+    def test_unstorable_jobs_count_as_errors(self, service):
+        stats = {'errors': 0}
+        jobs = [
+            make_job(),
+            make_job(title='x' * 501),
+            make_job(title='Data Analyst', min_amount=150000, max_amount=90000),
+        ]
+
+        rows = service._prepare_rows(jobs, stats)
+
+        assert [row.posting['title'] for row in rows] == ['Backend Engineer']
+        assert stats['errors'] == 2
+        assert rows[0].job_hash == job_tracking_service.dedup_service.generate_job_hash(jobs[0])
+        assert rows[0].normalized_company == 'acme'
+
+
+class TestMatchWithinBatch:
+    """Repeats and near-duplicates inside a batch merge into the first occurrence."""
+
+    def test_repeats_and_near_duplicates(self, service):
+        jobs = [
+            make_job(),
+            make_job(),
+            make_job(location='Dallas, TX, USA'),
+            make_job(title='Sales Manager'),
+            make_job(company='Globex'),
+        ]
+        rows = service._prepare_rows(jobs, {'errors': 0})
+
+        service._match_within_batch(rows)
+
+        assert [row.primary for row in rows] == [None, rows[0], rows[0], None, None]
+        assert [row.is_new for row in rows] == [True, False, False, True, True]
+
+    def test_repeats_of_near_duplicates_follow_them(self, service):
+        rows = service._prepare_rows(
+            [make_job(), make_job(location='Dallas, TX, USA'), make_job(location='Dallas, TX, USA')], {'errors': 0}
+        )
+
+        service._match_within_batch(rows)
+
+        assert [row.primary for row in rows] == [None, rows[0], rows[0]]
+
+    def test_jobs_merged_into_stored_postings_are_left_alone(self, service):
+        rows = service._prepare_rows([make_job(), make_job()], {'errors': 0})
+        for row in rows:
+            row.posting_id, row.similarity_score = 42, 1.0
+
+        service._match_within_batch(rows)
+
+        assert [row.primary for row in rows] == [None, None]
+
+
+class TestUpserts:
+    """Each entity is written with one multi-row INSERT ... ON CONFLICT."""
+
+    def test_locations_and_categories(self, service):
+        rows = service._prepare_rows(
+            [make_job(), make_job(title='Data Analyst'), make_job(location='Remote')], {'errors': 0}
+        )
+        db = RecordingSession({
+            'locations': [('Austin', 'TX', 'USA', 7, True)],
+            'job_categories': [('Data Science', 2, True)],
+        }, stored={'job_categories': [('Engineering', 1)]})
+        created = {}
+
+        assert service._upsert_locations(rows, db, created) == {('Austin', 'TX', 'USA'): 7}
+        assert service._upsert_categories(rows, db, created) == {'Engineering': 1, 'Data Science': 2}
+        assert len(db.sql) == 2
+        assert 'ON CONFLICT ON CONSTRAINT uq_location DO UPDATE' in db.sql[0]
+        assert 'ON CONFLICT (name) DO UPDATE' in db.sql[1]
+        assert created == {'locations': {('Austin', 'TX', 'USA'): 7}, 'categories': {'Data Science': 2}}
+
+    def test_companies_upsert_on_normalized_name(self, service):
+        rows = service._prepare_rows([make_job(), make_job(company='Globex LLC')], {'errors': 0})
+        db = RecordingSession({'companies': [('globex', 5, True)]}, stored={'companies': [('acme', 3)]})
+        created = {}
+
+        assert service._upsert_companies(rows, db, created) == {'acme': 3, 'globex': 5}
+        assert 'ON CONFLICT (normalized_name) DO UPDATE' in db.sql[0]
+        assert created == {'companies': {'globex': 5}}
+
+    def test_postings_stored_by_another_worker_are_reported(self, service):
+        rows = service._prepare_rows([make_job(), make_job(title='Data Analyst')], {'errors': 0})
+        db = RecordingSession({'job_postings': [(10, rows[0].job_hash, True), (11, rows[1].job_hash, False)]})
+
+        raced = service._insert_postings(rows, {'acme': 3}, {('Austin', 'TX', 'USA'): 7}, {}, db)
+
+        assert raced == {11}
+        assert [row.posting_id for row in rows] == [10, 11]
+        assert 'ON CONFLICT (job_hash) DO UPDATE' in db.sql[0]
+
+    def test_metrics_add_every_sighting(self, service):
+        rows = service._prepare_rows([make_job(), make_job(), make_job(title='Data Analyst')], {'errors': 0})
+        rows[0].posting_id = rows[1].posting_id = 10
+        rows[2].posting_id = 11
+        db = RecordingSession()
+
+        service._upsert_metrics(rows, db)
+
+        assert 'job_metrics.total_seen_count + excluded.total_seen_count' in db.sql[0]
+        counts = {value for key, value in db.params[0].items() if key.startswith('total_seen_count')}
+        assert counts == {2, 1}
+
+    def test_external_ids_of_other_postings_are_dropped(self, service):
+        rows = service._prepare_rows([make_job(), make_job(title='Data Analyst')], {'errors': 0})
+        rows[0].posting_id, rows[1].posting_id = 10, 11
+        db = RecordingSession()
+        db.query = MagicMock()
+        db.query.return_value.filter.return_value = [(rows[1].job_data['job_id'], 99)]
+
+        service._upsert_sources(rows, 'indeed', db)
+
+        assert 'ON CONFLICT ON CONSTRAINT uq_job_source_site DO UPDATE' in db.sql[0]
+        external_ids = [value for key, value in db.params[0].items() if key.startswith('external_job_id')]
+        assert external_ids == [rows[0].job_data['job_id'], None]
+
+
+class TestProcessScrapedJobs:
+    """The batch is committed once, or rolled back as a whole."""
+
+    def test_failed_batch_is_rolled_back_and_raised(self, service):
+        db = MagicMock()
+        with patch.object(service, '_match_existing', side_effect=RuntimeError("database is down")):
+            with pytest.raises(RuntimeError):
+                service.process_scraped_jobs([make_job()], 'indeed', {}, db)
+
+        db.rollback.assert_called_once()
+        failed_run = db.add.call_args[0][0]
+        assert failed_run.status == 'failed'
+        assert failed_run.error_message == "database is down"
+
+    def test_one_commit_per_batch(self, service):
+        db = MagicMock()
+        jobs = [make_job(), make_job(), make_job(title='Data Analyst')]
+
+        def insert_postings(rows, company_ids, location_ids, category_ids, db):
+            for posting_id, row in enumerate(rows, start=1):
+                row.posting_id = posting_id
+            return set()
+
+        def upsert_companies(rows, db, created):
+            created['companies'] = {'acme': 1}
+            return {'acme': 1}
+
+        with patch.object(service, '_match_existing'), \
+             patch.object(service, '_upsert_companies', side_effect=upsert_companies), \
+             patch.object(service, '_upsert_locations', return_value={}), \
+             patch.object(service, '_upsert_categories', return_value={}), \
+             patch.object(service, '_insert_postings', side_effect=insert_postings), \
+             patch.object(service, '_upsert_sources'), \
+             patch.object(service, '_upsert_metrics'):
+            stats = service.process_scraped_jobs(jobs, 'indeed', {}, db)
+
+        assert stats['new_jobs'] == 2
+        assert stats['duplicate_jobs'] == 1
+        assert stats['new_companies'] == 1
+        assert [job['job_id'] for job in stats['processed_jobs']] == [1, 1, 2]
+        db.commit.assert_called_once()
+        assert db.add.call_args[0][0].status == 'completed'
+        # Created companies are cached only after the commit
+        assert service.resolution_cache.get_many('companies', ['acme']) == {'acme': 1}
+
+
+class TestResolutionCache:
+    """IDs are served from process memory, then from Redis, before the database."""
+
+    def test_ids_are_shared_between_workers(self, resolution_cache):
+        other_worker = ResolutionCache(prefix="test:resolve:", client=resolution_cache.client)
+
+        resolution_cache.remember('locations', {('Austin', 'TX', 'USA'): 7})
+
+        assert other_worker.get_many('locations', [('Austin', 'TX', 'USA'), ('Dallas', 'TX', 'USA')]) == {
+            ('Austin', 'TX', 'USA'): 7
+        }
+        assert other_worker.shared_hits == 1
+        assert other_worker.misses == 1
+        assert other_worker.get_many('locations', [('Austin', 'TX', 'USA')]) == {('Austin', 'TX', 'USA'): 7}
+        assert other_worker.hits == 1
+
+    def test_cached_ids_skip_the_database(self, service):
+        service.resolution_cache.remember('categories', {'Engineering': 1})
+        rows = service._prepare_rows([make_job()], {'errors': 0})
+        db = RecordingSession()
+
+        assert service._upsert_categories(rows, db, {}) == {'Engineering': 1}
+        assert db.queried == []
+        assert db.sql == []
+
+    def test_preload_and_invalidate(self, resolution_cache):
+        db = MagicMock()
+        db.query.return_value.filter.return_value.order_by.return_value.limit.return_value = [(3, 'acme')]
+        db.query.return_value.order_by.return_value.limit.return_value = [(7, 'Austin', 'TX', 'USA')]
+        db.query.return_value.__iter__.return_value = iter([(1, 'Engineering')])
+
+        resolution_cache.preload(db)
+        assert resolution_cache.stats()['entries'] == {'companies': 1, 'locations': 1, 'categories': 1}
+
+        resolution_cache.remember('companies', {'globex': 5})
+        resolution_cache.invalidate()
+        assert resolution_cache.get_many('companies', ['acme', 'globex']) == {}
+        assert resolution_cache.client.hashes == {}
+
+    def test_integrity_errors_invalidate_the_cache(self, service):
+        from sqlalchemy.exc import IntegrityError
+
+        service.resolution_cache.remember('companies', {'acme': 3})
+        error = IntegrityError("INSERT", {}, Exception("violates foreign key constraint"))
+        with patch.object(service, '_match_existing', side_effect=error):
+            with pytest.raises(IntegrityError):
+                service.process_scraped_jobs([make_job()], 'indeed', {}, MagicMock())
+
+        assert service.resolution_cache.get_many('companies', ['acme']) == {}
+
+
+def test_tracking_ingester_follows_setting():
+    with patch.object(settings, 'INGEST_BULK_ENABLED', True):
+        assert tracking_ingester() is bulk_module.bulk_ingest_service
+    with patch.object(settings, 'INGEST_BULK_ENABLED', False):
+        assert tracking_ingester() is job_tracking_service
@@ -0,0 +1,200 @@
+"""Unit tests for the job search cache."""
+import time
+
+import pandas as pd
+import pytest
+
+from app.cache import JobSearchCache
+
+
+def make_cache(expiry: int = 60, stale_ttl: int = 0) -> JobSearchCache:
+    search_cache = JobSearchCache()
+    search_cache.enabled = True
+    search_cache.expiry = expiry
+    search_cache.stale_ttl = stale_ttl
+    search_cache.l2 = None
+    return search_cache
+
+
+def age_entry(search_cache: JobSearchCache, key: str, seconds: float) -> None:
+    timestamp, data = search_cache.cache[key]
+    search_cache.cache[key] = (timestamp - seconds, data)
+
+
+class TestJobSearchCache:
+    """Test cases for JobSearchCache."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_is_not_stale(self):
+        search_cache = make_cache(stale_ttl=120)
+        await search_cache.set("key", pd.DataFrame({'title': ['Engineer']}))
+
+        data, is_stale = await search_cache.get_with_staleness("key")
+
+        assert not is_stale
+        assert len(data) == 1
+        assert await search_cache.get("key") is not None
+
+    @pytest.mark.asyncio
+    async def test_entry_between_soft_and_hard_ttl_is_stale(self):
+        """Past expiry, get() misses but get_with_staleness() serves the stale entry."""
+        search_cache = make_cache(expiry=60, stale_ttl=120)
+        await search_cache.set("key", pd.DataFrame({'title': ['Engineer']}))
+        age_entry(search_cache, "key", 90)
+
+        assert await search_cache.get("key") is None
+        data, is_stale = await search_cache.get_with_staleness("key")
+        assert is_stale
+        assert len(data) == 1
+
+    @pytest.mark.asyncio
+    async def test_entry_past_hard_ttl_is_dropped(self):
+        search_cache = make_cache(expiry=60, stale_ttl=120)
+        await search_cache.set("key", pd.DataFrame({'title': ['Engineer']}))
+        age_entry(search_cache, "key", 200)
+
+        assert await search_cache.get_with_staleness("key") is None
+        assert "key" not in search_cache.cache
+
+    @pytest.mark.asyncio
+    async def test_stale_window_disabled_by_default(self):
+        search_cache = make_cache(expiry=60)
+        await search_cache.set("key", pd.DataFrame({'title': ['Engineer']}))
+        age_entry(search_cache, "key", 90)
+
+        assert await search_cache.get_with_staleness("key") is None
+
+    def test_site_key_shared_across_site_selections(self):
+        """Site slices do not depend on which other sites were requested."""
+        search_cache = make_cache()
+        multi = {'site_name': ['indeed', 'linkedin'], 'search_term': 'python'}
+        single = {'site_name': ['indeed'], 'search_term': 'python'}
+
+        assert search_cache.site_key(multi, 'indeed') == search_cache.site_key(single, 'indeed')
+        assert search_cache.site_key(multi, 'indeed') != search_cache.site_key(multi, 'linkedin')
+
+
+class TestSupersetReuse:
+    """Test cases for answering searches from cached scrapes of larger result windows."""
+
+    @staticmethod
+    async def cache_slice(search_cache, params, site, data):
+        await search_cache.set(search_cache.site_key(params, site), data)
+        await search_cache.index_site_slice(params, site, data)
+
+    @staticmethod
+    def make_jobs(rows: int) -> pd.DataFrame:
+        return pd.DataFrame({'site': ['indeed'] * rows, 'title': [f'Job {i}' for i in range(rows)]})
+
+    @pytest.mark.asyncio
+    async def test_smaller_results_wanted_sliced_from_larger_scrape(self):
+        search_cache = make_cache()
+        base = {'site_name': ['indeed'], 'search_term': 'python'}
+        await self.cache_slice(search_cache, {**base, 'results_wanted': 100}, 'indeed', self.make_jobs(100))
+
+        data = await search_cache.get_covering_slice({**base, 'results_wanted': 20}, 'indeed')
+        assert list(data['title']) == [f'Job {i}' for i in range(20)]
+
+        data = await search_cache.get_covering_slice({**base, 'results_wanted': 20, 'offset': 30}, 'indeed')
+        assert data.iloc[0]['title'] == 'Job 30'
+
+    @pytest.mark.asyncio
+    async def test_larger_window_than_cached_is_not_covered(self):
+        search_cache = make_cache()
+        base = {'site_name': ['indeed'], 'search_term': 'python'}
+        await self.cache_slice(search_cache, {**base, 'results_wanted': 20}, 'indeed', self.make_jobs(20))
+
+        assert await search_cache.get_covering_slice({**base, 'results_wanted': 50}, 'indeed') is None
+        assert await search_cache.get_covering_slice({**base, 'search_term': 'java', 'results_wanted': 10}, 'indeed') is None
+
+    @pytest.mark.asyncio
+    async def test_exhausted_scrape_covers_any_window(self):
+        """A scrape that returned fewer rows than requested has no further results."""
+        search_cache = make_cache()
+        base = {'site_name': ['indeed'], 'search_term': 'niche role'}
+        await self.cache_slice(search_cache, {**base, 'results_wanted': 50}, 'indeed', self.make_jobs(5))
+
+        data = await search_cache.get_covering_slice({**base, 'results_wanted': 100}, 'indeed')
+        assert len(data) == 5
+
+    @pytest.mark.asyncio
+    async def test_narrower_hours_old_filters_by_date_posted(self):
+        search_cache = make_cache()
+        base = {'site_name': ['indeed'], 'search_term': 'python'}
+        today = pd.Timestamp.now().normalize()
+        jobs = pd.DataFrame({
+            'site': ['indeed'] * 3,
+            'title': ['New', 'Old', 'Older'],
+            'date_posted': [today.date(), (today - pd.Timedelta(days=5)).date(), (today - pd.Timedelta(days=9)).date()],
+        })
+        await self.cache_slice(search_cache, {**base, 'results_wanted': 3, 'hours_old': 240}, 'indeed', jobs)
+
+        data = await search_cache.get_covering_slice({**base, 'results_wanted': 1, 'hours_old': 24}, 'indeed')
+        assert list(data['title']) == ['New']
+
+        # The scrape was not exhausted, so later matches may exist beyond the cached rows
+        assert await search_cache.get_covering_slice({**base, 'results_wanted': 3, 'hours_old': 24}, 'indeed') is None
+
+        assert await search_cache.get_covering_slice({**base, 'results_wanted': 3, 'hours_old': 480}, 'indeed') is None
+
+
+class TestBoundedCache:
+    """Test cases for the cache's entry and memory limits."""
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_entry_evicted_at_entry_limit(self):
+        search_cache = make_cache()
+        search_cache.max_entries = 2
+        await search_cache.set("a", {"value": 1})
+        await search_cache.set("b", {"value": 2})
+        await search_cache.get("a")
+        await search_cache.set("c", {"value": 3})
+
+        assert list(search_cache.cache) == ["a", "c"]
+        assert search_cache.evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_byte_budget_accounts_dataframe_memory(self):
+        search_cache = make_cache()
+        jobs = pd.DataFrame({'description': ['x' * 1000] * 10})
+        frame_bytes = int(jobs.memory_usage(deep=True).sum())
+        search_cache.max_bytes = frame_bytes * 2 + frame_bytes // 2
+
+        for key in ("a", "b", "c"):
+            await search_cache.set(key, jobs)
+
+        assert list(search_cache.cache) == ["b", "c"]
+        assert search_cache.total_bytes == frame_bytes * 2
+        assert search_cache.stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_oversized_entry_is_not_cached(self):
+        search_cache = make_cache()
+        search_cache.max_bytes = 10
+        await search_cache.set("big", {"description": "x" * 100})
+
+        assert "big" not in search_cache.cache
+        assert search_cache.rejected == 1
+
+    @pytest.mark.asyncio
+    async def test_cleanup_expired_reclaims_memory(self):
+        search_cache = make_cache(expiry=60)
+        await search_cache.set("old", {"value": 1})
+        await search_cache.set("new", {"value": 2})
+        age_entry(search_cache, "old", 120)
+
+        search_cache.cleanup_expired()
+
+        assert list(search_cache.cache) == ["new"]
+        assert search_cache.total_bytes == search_cache.sizes["new"]
+        assert search_cache.expirations == 1
+
+    @pytest.mark.asyncio
+    async def test_explicit_expire_overrides_default_expiry(self):
+        search_cache = make_cache(expiry=60)
+        await search_cache.set("template", {"name": "saved"}, expire=3600)
+        age_entry(search_cache, "template", 120)
+
+        assert await search_cache.get("template") == {"name": "saved"}
+        assert await search_cache.delete("template")
+        assert search_cache.total_bytes == 0
@@ -0,0 +1,95 @@
+"""Unit tests for the binary cache codecs."""
+import json
+from datetime import date
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from app.core import cache_codecs
+from app.core.cache_codecs import (
+    COMPRESSED_ZSTD,
+    FORMAT_ARROW,
+    FORMAT_DATAFRAME_JSON,
+    FORMAT_MSGPACK,
+    FORMAT_PARQUET,
+    CacheCodec,
+    CodecError,
+)
+
+
+def make_jobs_df(rows: int = 50) -> pd.DataFrame:
+    return pd.DataFrame({
+        'site': ['indeed'] * rows,
+        'title': [f'Software Engineer {i}' for i in range(rows)],
+        'company': ['Tech Corp', None] * (rows // 2),
+        'date_posted': [date(2024, 1, 1 + i % 28) for i in range(rows)],
+        'min_amount': [100000.0, float('nan')] * (rows // 2),
+        'is_remote': [True, False] * (rows // 2),
+        'description': ['Build and maintain scalable APIs with Python and FastAPI. ' * 20] * rows,
+    })
+
+
+class TestCacheCodec:
+    """Test cases for CacheCodec."""
+
+    @pytest.mark.parametrize("dataframe_format,expected", [
+        ("arrow", FORMAT_ARROW),
+        ("parquet", FORMAT_PARQUET),
+        ("json", FORMAT_DATAFRAME_JSON),
+    ])
+    def test_dataframe_round_trip(self, dataframe_format, expected):
+        codec = CacheCodec(dataframe_format=dataframe_format, compression="none")
+        jobs = make_jobs_df()
+
+        encoded = codec.encode(jobs)
+        decoded = codec.decode(encoded)
+
+        assert encoded[0] == expected
+        assert list(decoded.columns) == list(jobs.columns)
+        assert list(decoded['title']) == list(jobs['title'])
+        assert decoded['company'].isna().sum() == jobs['company'].isna().sum()
+
+    def test_dict_round_trip_uses_msgpack(self):
+        codec = CacheCodec(compression="none")
+        value = {"name": "saved search", "sites": ["indeed"], "created": date(2024, 1, 1)}
+
+        encoded = codec.encode(value)
+
+        assert encoded[0] == FORMAT_MSGPACK
+        assert codec.decode(encoded) == {"name": "saved search", "sites": ["indeed"], "created": "2024-01-01"}
+
+    def test_zstd_compression_sets_header_flag_and_shrinks_payload(self):
+        jobs = make_jobs_df()
+        plain = CacheCodec(compression="none").encode(jobs)
+        compressed = CacheCodec(compression="zstd").encode(jobs)
+
+        assert compressed[0] == FORMAT_ARROW | COMPRESSED_ZSTD
+        assert len(compressed) < len(plain)
+        # Any codec configuration can decode it, since the header describes the format
+        assert len(CacheCodec(dataframe_format="json", compression="none").decode(compressed)) == 50
+
+    def test_binary_format_is_much_smaller_than_json(self):
+        jobs = make_jobs_df()
+        json_size = len(json.dumps(jobs.to_dict('records'), default=str))
+
+        assert len(CacheCodec(compression="zstd").encode(jobs)) * 5 < json_size
+
+    def test_small_payloads_are_not_compressed(self):
+        codec = CacheCodec(compression="zstd", min_compress_bytes=1024)
+        assert not codec.encode({"value": 1})[0] & COMPRESSED_ZSTD
+
+    def test_legacy_json_values_still_decode(self):
+        codec = CacheCodec()
+        assert codec.decode(b'{"value": 1}') == {"value": 1}
+
+    def test_unknown_format_is_rejected(self):
+        with pytest.raises(CodecError):
+            CacheCodec().decode(b'\x7e\x00\x01garbage')
+
+    def test_falls_back_to_json_without_pyarrow(self):
+        with patch.object(cache_codecs, 'pa', None), patch.object(cache_codecs, 'msgpack', None):
+            codec = CacheCodec(dataframe_format="arrow", compression="none")
+            encoded = codec.encode(make_jobs_df(rows=2))
+            assert encoded[0] == FORMAT_DATAFRAME_JSON
+            assert codec.decode(codec.encode({"value": 1})) == {"value": 1}
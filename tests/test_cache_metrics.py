@@ -0,0 +1,124 @@
+"""Tests for search cache metrics."""
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from app.cache import JobSearchCache
+from app.core.cache_metrics import CacheMetrics, LatencyHistogram, namespace_of
+from app.services import job_service
+from app.services.job_service import JobService
+
+
+def make_cache(expiry: int = 60, stale_ttl: int = 0) -> JobSearchCache:
+    search_cache = JobSearchCache()
+    search_cache.enabled = True
+    search_cache.expiry = expiry
+    search_cache.stale_ttl = stale_ttl
+    search_cache.l2 = None
+    return search_cache
+
+
+class TestLatencyHistogram:
+    """Tests for LatencyHistogram."""
+
+    def test_cumulative_buckets(self):
+        histogram = LatencyHistogram(buckets=(0.01, 0.1))
+        for seconds in (0.005, 0.05, 0.05, 5):
+            histogram.observe(seconds)
+
+        assert histogram.cumulative() == [(0.01, 1), (0.1, 3), (float("inf"), 4)]
+        assert histogram.count == 4
+        assert histogram.quantile(0.5) == 0.1
+
+    def test_namespace_of(self):
+        assert namespace_of("search:abc") == "search"
+        assert namespace_of("template:123") == "template"
+        assert namespace_of("template_keys") == "default"
+
+
+class TestCacheMetrics:
+    """Tests for the metrics recorded by JobSearchCache."""
+
+    @pytest.mark.asyncio
+    async def test_hits_and_misses_per_namespace(self):
+        search_cache = make_cache()
+        await search_cache.set("search:a", pd.DataFrame({"title": ["Engineer"]}))
+        await search_cache.get("search:a")
+        await search_cache.get("search:b")
+        await search_cache.get("job_search:c")
+
+        stats = search_cache.stats()["namespaces"]
+        assert stats["search"]["hits"] == 1
+        assert stats["search"]["misses"] == 1
+        assert stats["search"]["sets"] == 1
+        assert stats["search"]["entries"] == 1
+        assert stats["search"]["bytes_stored"] == search_cache.total_bytes
+        assert stats["search"]["get_latency"]["count"] == 2
+        assert stats["job_search"]["misses"] == 1
+        assert search_cache.metrics.hit_rate() == pytest.approx(1 / 3)
+
+    @pytest.mark.asyncio
+    async def test_stale_hits_counted(self):
+        search_cache = make_cache(stale_ttl=120)
+        await search_cache.set("search:a", {"jobs": []})
+        timestamp, data = search_cache.cache["search:a"]
+        search_cache.cache["search:a"] = (timestamp - 90, data)
+
+        await search_cache.get_with_staleness("search:a")
+
+        assert search_cache.stats()["namespaces"]["search"]["stale_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_slice_lookups_count_once(self):
+        search_cache = make_cache(stale_ttl=120)
+        base = {'site_name': ['indeed'], 'search_term': 'python'}
+        jobs = pd.DataFrame({'site': ['indeed'] * 50, 'title': [f'Job {i}' for i in range(50)]})
+        stale_params = {**base, 'search_term': 'java'}
+        await search_cache.set(search_cache.site_key(stale_params, 'indeed'), jobs)
+        timestamp, data = search_cache.cache[search_cache.site_key(stale_params, 'indeed')]
+        search_cache.cache[search_cache.site_key(stale_params, 'indeed')] = (timestamp - 90, data)
+        await search_cache.set(search_cache.site_key({**base, 'results_wanted': 50}, 'indeed'), jobs)
+        await search_cache.index_site_slice({**base, 'results_wanted': 50}, 'indeed', jobs)
+
+        with patch.object(job_service, 'cache', search_cache), \
+             patch.object(JobService, '_refresh_in_background'):
+            assert (await JobService._get_cached_slice(stale_params, 'indeed'))[1] is True
+            counters = search_cache.stats()["namespaces"]["search"]
+            assert (counters["hits"], counters["stale_hits"], counters["superset_hits"], counters["misses"]) == (0, 1, 0, 0)
+
+            assert len((await JobService._get_cached_slice({**base, 'results_wanted': 10}, 'indeed'))[0]) == 10
+            counters = search_cache.stats()["namespaces"]["search"]
+            assert (counters["hits"], counters["stale_hits"], counters["superset_hits"], counters["misses"]) == (0, 1, 1, 0)
+
+            assert await JobService._get_cached_slice({**base, 'search_term': 'go'}, 'indeed') is None
+            counters = search_cache.stats()["namespaces"]["search"]
+            assert (counters["hits"], counters["stale_hits"], counters["superset_hits"], counters["misses"]) == (0, 1, 1, 1)
+
+        assert search_cache.metrics.hit_rate() == pytest.approx(2 / 3)
+
+    @pytest.mark.asyncio
+    async def test_evictions_release_stored_bytes(self):
+        search_cache = make_cache()
+        search_cache.max_entries = 1
+        await search_cache.set("search:a", {"jobs": [1]})
+        await search_cache.set("search:b", {"jobs": [2]})
+
+        stats = search_cache.stats()["namespaces"]["search"]
+        assert stats["evictions"] == 1
+        assert stats["entries"] == 1
+        assert stats["bytes_stored"] == search_cache.total_bytes
+
+        search_cache.clear()
+        assert search_cache.stats()["namespaces"]["search"]["bytes_stored"] == 0
+
+    def test_prometheus_rendering(self):
+        metrics = CacheMetrics()
+        metrics.incr("search:a", "hits")
+        metrics.observe("search:a", "get", 0.002)
+
+        text = metrics.render_prometheus()
+
+        assert 'jobspy_cache_hits_total{namespace="search"} 1' in text
+        assert 'jobspy_cache_get_duration_seconds_bucket{namespace="search",le="+Inf"} 1' in text
+        assert 'jobspy_cache_get_duration_seconds_count{namespace="search"} 1' in text
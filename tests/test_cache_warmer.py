@@ -0,0 +1,101 @@
+"""Tests for the cache warmer."""
+import json
+from unittest.mock import AsyncMock, patch
+
+import pandas as pd
+import pytest
+
+from app.cache import JobSearchCache
+from app.pydantic_models import JobSearchParams
+from app.services.cache_warmer import CacheWarmer
+
+
+def make_cache() -> JobSearchCache:
+    search_cache = JobSearchCache()
+    search_cache.enabled = True
+    search_cache.expiry = 3600
+    search_cache.stale_ttl = 0
+    search_cache.l2 = None
+    return search_cache
+
+
+@pytest.fixture
+def warm_cache():
+    search_cache = make_cache()
+    with patch("app.services.cache_warmer.cache", search_cache), \
+         patch("app.services.job_service.cache", search_cache):
+        yield search_cache
+
+
+@pytest.fixture
+def searches_file(tmp_path):
+    path = tmp_path / "recurring_searches.json"
+    path.write_text(json.dumps([
+        {
+            "name": "Analyst Jobs (Daily)",
+            "search_term": "Analyst",
+            "location": "United States",
+            "site_names": ["indeed", "linkedin"],
+            "results_wanted": 50,
+            "recurring": True,
+            "recurring_interval": "daily",
+        }
+    ]))
+    return str(path)
+
+
+class TestCacheWarmer:
+    """Test cases for CacheWarmer."""
+
+    def test_search_params_match_search_endpoint(self):
+        params = CacheWarmer.to_search_params({
+            "name": "Analyst", "search_term": "Analyst", "site_names": ["indeed"], "recurring": True,
+        })
+
+        expected = JobSearchParams(search_term="Analyst", site_name=["indeed"]).dict(exclude_none=True)
+        assert params["site_name"] == ["indeed"]
+        assert params["search_term"] == expected["search_term"]
+        assert params["results_wanted"] == expected["results_wanted"]
+        assert "recurring" not in params
+
+    @pytest.mark.asyncio
+    async def test_plan_marks_uncached_and_expiring_slices(self, warm_cache, searches_file):
+        warmer = CacheWarmer(searches_file=searches_file, lead_time=120)
+        params = CacheWarmer.to_search_params(json.load(open(searches_file))[0])
+        await warm_cache.set(warm_cache.site_key(params, "linkedin"), pd.DataFrame({"title": ["Analyst"]}))
+
+        targets = await warmer.plan()
+
+        assert [t.site for t in targets] == ["indeed", "linkedin"]
+        assert targets[0].expires_in is None
+        assert targets[1].expires_in == pytest.approx(3600, abs=5)
+
+    @pytest.mark.asyncio
+    async def test_run_cycle_warms_due_slices_within_budget(self, warm_cache, searches_file):
+        warmer = CacheWarmer(searches_file=searches_file, lead_time=120, interval=300, max_scrapes_per_hour=1)
+        jobs = pd.DataFrame({"title": ["Analyst"], "site": ["indeed"]})
+
+        with patch("app.services.job_service.scrape_executor.scrape_site", AsyncMock(return_value=jobs)) as scrape, \
+             patch("app.services.cache_warmer.ingest_queue.publish", new_callable=AsyncMock) as save:
+            delay = await warmer.run_cycle()
+
+        assert scrape.await_count == 1
+        assert save.await_count == 1
+        assert save.await_args[0][1] == "indeed"
+        assert warmer.warmed == 1
+        assert warmer.deferred == 1
+        assert len(warm_cache.cache) == 1
+        assert 0 < delay <= 300
+
+    @pytest.mark.asyncio
+    async def test_fresh_slices_are_not_rescraped(self, warm_cache, searches_file):
+        warmer = CacheWarmer(searches_file=searches_file, lead_time=120, interval=300)
+        params = CacheWarmer.to_search_params(json.load(open(searches_file))[0])
+        for site in ("indeed", "linkedin"):
+            await warm_cache.set(warm_cache.site_key(params, site), pd.DataFrame({"title": ["Analyst"]}))
+
+        with patch("app.services.job_service.scrape_executor.scrape_site", AsyncMock()) as scrape:
+            delay = await warmer.run_cycle()
+
+        scrape.assert_not_awaited()
+        assert delay == 300
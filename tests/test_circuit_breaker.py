@@ -0,0 +1,101 @@
+"""Tests for the per-site scrape circuit breaker."""
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_api_key
+from app.db.database import get_db
+from app.routes import api
+from app.services.circuit_breaker import CircuitBreaker, CircuitState, SiteUnavailableError
+from app.services.job_service import JobService
+
+
+def make_breaker() -> CircuitBreaker:
+    return CircuitBreaker(enabled=True, window=60, min_requests=3, failure_rate=0.5, cooldown=30)
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker."""
+
+    def test_opens_after_failure_rate_reached(self):
+        breaker = make_breaker()
+        breaker.record_success("glassdoor")
+        breaker.record_failure("glassdoor", "403 Forbidden")
+        assert breaker.state("glassdoor") == CircuitState.CLOSED
+
+        breaker.record_failure("glassdoor", "403 Forbidden")
+
+        assert breaker.state("glassdoor") == CircuitState.OPEN
+        with pytest.raises(SiteUnavailableError) as exc_info:
+            breaker.before_scrape("glassdoor")
+        assert exc_info.value.site == "glassdoor"
+        assert 0 < exc_info.value.retry_after <= 30
+        # Other sites are unaffected
+        breaker.before_scrape("indeed")
+
+    def test_needs_minimum_requests(self):
+        breaker = make_breaker()
+        breaker.record_failure("zip_recruiter", "captcha")
+        breaker.record_failure("zip_recruiter", "captcha")
+
+        assert breaker.state("zip_recruiter") == CircuitState.CLOSED
+
+    def test_half_open_allows_single_probe(self):
+        breaker = make_breaker()
+        for _ in range(3):
+            breaker.record_failure("glassdoor", "403 Forbidden")
+        breaker._circuits["glassdoor"].opened_at = time.time() - 31
+
+        breaker.before_scrape("glassdoor")
+        assert breaker.state("glassdoor") == CircuitState.HALF_OPEN
+        with pytest.raises(SiteUnavailableError):
+            breaker.before_scrape("glassdoor")
+
+        breaker.record_success("glassdoor")
+        assert breaker.state("glassdoor") == CircuitState.CLOSED
+        breaker.before_scrape("glassdoor")
+
+    def test_failed_probe_reopens(self):
+        breaker = make_breaker()
+        for _ in range(3):
+            breaker.record_failure("glassdoor", "403 Forbidden")
+        breaker._circuits["glassdoor"].opened_at = time.time() - 31
+        breaker.before_scrape("glassdoor")
+
+        breaker.record_failure("glassdoor", "403 Forbidden")
+
+        assert breaker.state("glassdoor") == CircuitState.OPEN
+        assert breaker.stats()["glassdoor"]["times_opened"] == 2
+
+    def test_disabled_breaker_never_short_circuits(self):
+        breaker = CircuitBreaker(enabled=False, window=60, min_requests=1, failure_rate=0.5, cooldown=30)
+        breaker.record_failure("glassdoor", "403 Forbidden")
+
+        breaker.before_scrape("glassdoor")
+
+
+class TestSkippedSitesEndpoint:
+    """Test cases for how /search_jobs reports skipped sites."""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(api.router, prefix="/api/v1")
+        app.dependency_overrides[get_api_key] = lambda: None
+        app.dependency_overrides[get_db] = lambda: None
+        return TestClient(app)
+
+    def test_all_sites_skipped_returns_503(self, client):
+        error = SiteUnavailableError("glassdoor", "circuit open after repeated failures: 403", 42.5)
+        with patch.object(JobService, "run_search", side_effect=error):
+            response = client.get(
+                "/api/v1/search_jobs",
+                params={"site_name": ["glassdoor"], "search_term": "python", "country_indeed": "USA"},
+            )
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "42"
+        assert response.json()["detail"]["skipped_sites"] == {"glassdoor": error.reason}
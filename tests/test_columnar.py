@@ -0,0 +1,200 @@
+"""Tests for Arrow and Parquet output."""
+import io
+from datetime import date
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_api_key
+from app.db.database import get_db
+from app.routes import api
+from app.services.job_service import JobService, SearchOutcome
+from app.utils import columnar
+from app.utils.columnar import (
+    columnar_response, cursor_to_table, dataframe_to_table, encode_table, records_to_table, require_columnar
+)
+
+
+class FakeResult:
+    """Minimal stand-in for a SQLAlchemy result read with fetchmany."""
+
+    def __init__(self, names, rows):
+        self.names = names
+        self.rows = list(rows)
+        self.fetch_sizes = []
+
+    def keys(self):
+        return self.names
+
+    def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+
+def make_jobs(count):
+    return pd.DataFrame({
+        'id': [f"job-{i}" for i in range(count)],
+        'title': [f"Job {i}" for i in range(count)],
+        'min_amount': [np.nan if i % 2 else 100000.0 for i in range(count)],
+        'date_posted': [date(2025, 6, 1)] * count,
+        'emails': [['jobs@example.com'] if i % 2 else None for i in range(count)],
+    })
+
+
+class TestTables:
+    """Test cases for building Arrow tables."""
+
+    def test_dataframe_round_trip(self):
+        jobs = make_jobs(3)
+
+        table = dataframe_to_table(jobs)
+
+        assert table.num_rows == 3
+        assert table.column('min_amount').null_count == 1
+        assert table.to_pandas()['title'].tolist() == ['Job 0', 'Job 1', 'Job 2']
+
+    def test_mixed_object_column_falls_back_to_strings(self):
+        table = dataframe_to_table(pd.DataFrame({'salary_source': ['direct_data', 5]}))
+
+        assert table.column('salary_source').to_pylist() == ['direct_data', '5']
+
+    def test_records_with_nested_values(self):
+        """Nested dicts and lists, as in tracking search results, become struct and list columns."""
+        records = [
+            {'id': 1, 'sources': [{'site': 'indeed'}], 'metrics': None},
+            {'id': 2, 'sources': [], 'metrics': {'total_seen_count': 3}},
+        ]
+
+        table = records_to_table(records, batch_rows=1)
+
+        assert table.num_rows == 2
+        assert table.column('metrics').to_pylist() == [None, {'total_seen_count': 3}]
+        assert table.column('sources').to_pylist() == [[{'site': 'indeed'}], []]
+
+    def test_cursor_is_read_in_batches(self):
+        result = FakeResult(['id', 'salary_min'], [(i, None if i < 2 else i * 1000) for i in range(5)])
+
+        table = cursor_to_table(result, batch_rows=2)
+
+        assert result.fetch_sizes == [2, 2, 2, 2]
+        assert table.column('id').to_pylist() == [0, 1, 2, 3, 4]
+        # The all-null first batch is promoted to the type of the later ones
+        assert table.column('salary_min').type == pa.int64()
+
+    def test_empty_cursor_keeps_columns(self):
+        table = cursor_to_table(FakeResult(['id', 'title'], []))
+
+        assert table.num_rows == 0
+        assert table.column_names == ['id', 'title']
+
+
+class TestEncoding:
+    """Test cases for encoding tables and building responses."""
+
+    def test_arrow_stream_is_written_in_batches(self):
+        body = encode_table(dataframe_to_table(make_jobs(5)), "arrow", batch_rows=2)
+
+        reader = pa.ipc.open_stream(body)
+        batches = list(reader)
+
+        assert [batch.num_rows for batch in batches] == [2, 2, 1]
+
+    def test_parquet_row_groups(self):
+        body = encode_table(dataframe_to_table(make_jobs(5)), "parquet", batch_rows=2)
+
+        parquet_file = pq.ParquetFile(io.BytesIO(body))
+
+        assert parquet_file.metadata.num_row_groups == 3
+        assert parquet_file.read().num_rows == 5
+
+    def test_response_headers(self):
+        response = columnar_response(dataframe_to_table(make_jobs(1)), "parquet", "jobs")
+
+        assert response.media_type == "application/vnd.apache.parquet"
+        assert response.headers["content-disposition"] == "attachment; filename=jobs.parquet"
+
+    def test_missing_pyarrow_is_rejected(self):
+        with patch.object(columnar, 'pa', None):
+            with pytest.raises(HTTPException) as exc_info:
+                require_columnar("arrow")
+        assert exc_info.value.status_code == 501
+
+
+@pytest.fixture
+def search_client():
+    app = FastAPI()
+    app.include_router(api.router, prefix="/api/v1")
+    app.dependency_overrides[get_api_key] = lambda: None
+    app.dependency_overrides[get_db] = lambda: None
+
+    async def fake_run_search(params, timeout_ms=None):
+        return SearchOutcome(jobs=make_jobs(4), cached=True, cached_sites=['indeed'])
+
+    with patch.object(JobService, 'run_search', side_effect=fake_run_search):
+        yield TestClient(app)
+
+
+class TestSearchFormats:
+    """Test cases for format=arrow and format=parquet on /api/v1/search_jobs."""
+
+    def test_get_arrow(self, search_client):
+        response = search_client.get("/api/v1/search_jobs", params={'site_name': 'indeed', 'format': 'arrow'})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+        jobs = pa.ipc.open_stream(response.content).read_pandas()
+        assert jobs['title'].tolist() == ['Job 0', 'Job 1', 'Job 2', 'Job 3']
+
+    def test_post_parquet(self, search_client):
+        response = search_client.post("/api/v1/search_jobs?format=parquet", json={'site_name': ['indeed']})
+
+        assert response.status_code == 200
+        assert pq.read_table(io.BytesIO(response.content)).num_rows == 4
+
+
+class FakeSession:
+    """Session whose execute returns one canned result."""
+
+    def __init__(self, result):
+        self.result = result
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+        return self.result
+
+
+@pytest.fixture
+def export_client():
+    from app.routes import admin
+
+    session = FakeSession(FakeResult(['id', 'title', 'company_name'], [(1, 'Job 1', 'Acme'), (2, 'Job 2', None)]))
+    app = FastAPI()
+    app.include_router(admin.router, prefix="/admin")
+    app.dependency_overrides[get_api_key] = lambda: None
+    app.dependency_overrides[get_db] = lambda: session
+    return TestClient(app)
+
+
+class TestAdminExportFormats:
+    """Test cases for format=arrow and format=parquet on /admin/jobs/export."""
+
+    def test_arrow(self, export_client):
+        response = export_client.get("/admin/jobs/export", params={'format': 'arrow'})
+
+        assert response.status_code == 200
+        jobs = pa.ipc.open_stream(response.content).read_pandas()
+        assert jobs['title'].tolist() == ['Job 1', 'Job 2']
+
+    def test_parquet(self, export_client):
+        response = export_client.get("/admin/jobs/export", params={'format': 'parquet'})
+
+        assert response.status_code == 200
+        assert pq.read_table(io.BytesIO(response.content)).column('company_name').to_pylist() == ['Acme', None]
@@ -0,0 +1,128 @@
+"""Tests for the MinHash-LSH deduplication index."""
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.bulk_ingest_service import BulkIngestService
+from app.services.deduplication_service import JobDeduplicationService
+from app.services.dedup_index import MinHashLSHIndex
+
+
+def features(title='backend engineer', company='acme', location='austin, tx', **extra):
+    return {
+        'title': title,
+        'company': company,
+        'location': location,
+        'job_type': 'fulltime',
+        'description_snippet': 'build apis in python.',
+        **extra,
+    }
+
+
+def posting(posting_id, title='Backend Engineer', company='Acme Inc', city='Austin', state='TX'):
+    return SimpleNamespace(
+        id=posting_id,
+        title=title,
+        company=SimpleNamespace(name=company),
+        location=SimpleNamespace(city=city, state=state),
+        job_type='fulltime',
+        description='Build APIs in Python.',
+    )
+
+
+def session_with(bucket_rows, postings):
+    """Session whose bucket query returns bucket_rows and whose posting query returns postings."""
+    db = MagicMock()
+    db.query.return_value.join.return_value.filter.return_value = bucket_rows
+    db.query.return_value.options.return_value.filter.return_value = postings
+    return db
+
+
+@pytest.fixture
+def index():
+    return MinHashLSHIndex(num_perm=64, bands=16, max_candidates=2)
+
+
+class TestSignatures:
+    """Similar jobs land in the same buckets; the buckets do not depend on the process."""
+
+    def test_similar_jobs_share_buckets(self, index):
+        keys = set(index.band_keys(features()))
+        near = set(index.band_keys(features(title='backend engineer ii', location='austin, texas')))
+        other = set(index.band_keys(features(title='sales manager', company='globex', location='boston, ma')))
+
+        assert len(keys) == 16
+        assert len(keys & near) > 0
+        assert keys & other == set()
+
+    def test_buckets_are_stable(self, index):
+        assert index.band_keys(features()) == MinHashLSHIndex(num_perm=64, bands=16).band_keys(features())
+
+    def test_jobs_without_shingles_have_no_buckets(self, index):
+        assert index.band_keys(features(title='', company='', location='')) == []
+
+    def test_bands_must_divide_the_signature(self):
+        with pytest.raises(ValueError):
+            MinHashLSHIndex(num_perm=64, bands=10)
+
+
+class TestIndex:
+    """Postings are indexed with one INSERT and looked up with one query per batch."""
+
+    def test_add_ignores_indexed_postings(self, index):
+        db = MagicMock()
+
+        index.add(db, {10: features(), 11: features(title='', company='', location='')})
+
+        compiled = db.execute.call_args[0][0].compile(dialect=postgresql.dialect())
+        assert 'ON CONFLICT DO NOTHING' in str(compiled)
+        assert len([key for key in compiled.params if key.startswith('job_posting_id')]) == 16
+
+    def test_candidates_ranked_by_shared_bands(self, index):
+        keys = index.band_keys(features())
+        bucket_rows = [(*key, 1) for key in keys[:2]] + [(*key, 2) for key in keys] + [(*keys[0], 3)]
+        db = session_with(bucket_rows, [posting(1), posting(2), posting(3)])
+
+        [candidates] = index.candidates_many([features()], db)
+
+        assert [candidate.id for candidate in candidates] == [2, 1]
+
+    def test_jobs_without_buckets_skip_the_database(self, index):
+        db = MagicMock()
+
+        assert index.candidates_many([features(title='', company='', location='')], db) == [[]]
+        db.query.assert_not_called()
+
+
+class TestFindSimilarJobs:
+    """Candidates from the index are scored with the weighted feature similarity."""
+
+    def test_scores_candidates_of_each_job(self, index):
+        service = JobDeduplicationService(index=index)
+        stored = posting(1)
+        other = posting(2, title='Sales Manager', company='Globex')
+        jobs = [features(), features(title='data analyst', company='initech')]
+
+        with patch.object(index, 'candidates_many', return_value=[[other, stored], [stored]]) as candidates:
+            results = service.find_similar_jobs_many(jobs, MagicMock())
+
+        candidates.assert_called_once()
+        assert [[(match.id, round(score, 2)) for match, score in result] for result in results] == [[(1, 1.0)], []]
+
+    def test_bulk_ingest_queries_the_index_once_per_batch(self):
+        service = BulkIngestService(tracking_service=MagicMock(dedup_service=MagicMock()))
+        rows = [
+            SimpleNamespace(job_hash=job_hash, features=features(title=title), posting_id=None, similarity_score=None)
+            for job_hash, title in (('a', 'backend engineer'), ('a', 'backend engineer'), ('b', 'data analyst'))
+        ]
+        db = MagicMock()
+        db.query.return_value.filter.return_value = []
+        service.dedup_service.find_similar_jobs_many.return_value = [[(posting(7), 0.9)], []]
+
+        service._match_existing(rows, db)
+
+        service.dedup_service.find_similar_jobs_many.assert_called_once()
+        assert len(service.dedup_service.find_similar_jobs_many.call_args[0][0]) == 2
+        assert [(row.posting_id, row.similarity_score) for row in rows] == [(7, 0.9), (7, 1.0), (None, None)]
@@ -0,0 +1,86 @@
+"""Tests for canonical cache key fingerprints."""
+import subprocess
+import sys
+
+from app.core.fingerprint import canonicalize, fingerprint, search_fingerprint
+
+
+class TestFingerprint:
+    """Tests for canonicalize() and fingerprint()."""
+
+    def test_normalizes_case_and_whitespace(self):
+        a = search_fingerprint({"search_term": "Software  Engineer ", "location": "San Francisco"})
+        b = search_fingerprint({"search_term": "software engineer", "location": " san   francisco"})
+        assert a == b
+
+    def test_site_order_and_duplicates_ignored(self):
+        a = search_fingerprint({"search_term": "python", "site_name": ["linkedin", "indeed"]})
+        b = search_fingerprint({"search_term": "python", "site_name": ["indeed", "linkedin", "indeed"]})
+        assert a == b
+
+    def test_defaults_and_unset_values_dropped(self):
+        a = search_fingerprint({"search_term": "python"})
+        b = search_fingerprint({
+            "search_term": "python",
+            "distance": 50,
+            "offset": 0,
+            "is_remote": False,
+            "hours_old": None,
+            "verbose": 2,
+            "proxies": ["http://proxy:8080"],
+        })
+        assert a == b
+
+    def test_different_queries_differ(self):
+        assert search_fingerprint({"search_term": "python"}) != search_fingerprint({"search_term": "java"})
+        assert search_fingerprint({"search_term": "python", "results_wanted": 20}) != search_fingerprint(
+            {"search_term": "python"}
+        )
+
+    def test_namespace_prefix(self):
+        key = fingerprint({"search_term": "python"}, namespace="job_search")
+        namespace, digest = key.split(":")
+        assert namespace == "job_search"
+        assert len(digest) == 64
+        assert fingerprint({"search_term": "python"}) == digest
+
+    def test_canonical_form(self):
+        assert canonicalize({"b": " X ", "a": [3, 1, 3], "c": None, "d": 5}, defaults={"d": 5}) == {
+            "a": [1, 3],
+            "b": "x",
+        }
+
+    def test_stable_across_processes(self):
+        """Keys must not depend on per-process hash randomization."""
+        params = {"search_term": "python", "site_name": ["indeed", "linkedin"], "hours_old": 24}
+        code = (
+            "from app.core.fingerprint import search_fingerprint;"
+            f"print(search_fingerprint({params!r}))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={"PYTHONHASHSEED": "12345", "PATH": ""},
+        ).stdout.strip()
+        assert output == search_fingerprint(params)
+
+
+def test_hybrid_cache_key_uses_search_fingerprint():
+    """HybridJobService keys its cache by search fingerprint (worker modules stubbed: they connect to Redis)."""
+    import importlib
+    from unittest.mock import MagicMock, patch
+
+    stubs = {"app.workers.orchestrator": MagicMock(), "app.workers.message_protocol": MagicMock()}
+    with patch.dict(sys.modules, stubs):
+        sys.modules.pop("app.services.hybrid_job_service", None)
+        hybrid_job_service = importlib.import_module("app.services.hybrid_job_service")
+        sys.modules.pop("app.services.hybrid_job_service", None)
+
+    params = {"search_term": "python", "site_name": ["indeed", "linkedin"]}
+    key = hybrid_job_service.HybridJobService()._generate_cache_key(params)
+    assert key == search_fingerprint(params, namespace="hybrid_search")
+    assert key == hybrid_job_service.HybridJobService()._generate_cache_key(
+        {"search_term": "Python", "site_name": ["linkedin", "indeed"], "hours_old": None}
+    )
@@ -0,0 +1,195 @@
+"""Tests for the ingest queue and the data processor workers."""
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_api_key
+from app.db import database
+from app.routes import api
+from app.services import ingest_queue as ingest_module
+from app.services.ingest_queue import IngestQueue
+from app.services.job_service import JobService, SearchOutcome
+from app.workers import data_processor
+
+
+class FakeRedisClient:
+    """Minimal in-memory stand-in for the Redis stream commands used by the ingest queue."""
+
+    def __init__(self):
+        self.streams = {}
+        self.pending = {}
+        self.next_id = 0
+
+    def xadd(self, stream, fields, maxlen=None, approximate=True):
+        self.next_id += 1
+        entry_id = f"{self.next_id}-0".encode()
+        self.streams.setdefault(stream, {})[entry_id] = {key.encode(): value for key, value in fields.items()}
+        return entry_id
+
+    def xgroup_create(self, stream, group, id="0", mkstream=False):
+        self.streams.setdefault(stream, {})
+
+    def xautoclaim(self, stream, group, consumer, min_idle_time, start_id="0-0", count=None):
+        return [b"0-0", [], []]
+
+    def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        stream = next(iter(streams))
+        new = [(entry_id, fields) for entry_id, fields in self.streams[stream].items() if entry_id not in self.pending]
+        new = new[:count]
+        for entry_id, _ in new:
+            self.pending[entry_id] = consumer
+        return [[stream.encode(), new]] if new else []
+
+    def xlen(self, stream):
+        return len(self.streams.get(stream, {}))
+
+    def pipeline(self):
+        client = self
+
+        class Pipeline:
+            def xack(self, stream, group, *entry_ids):
+                for entry_id in entry_ids:
+                    client.pending.pop(entry_id.encode(), None)
+
+            def xdel(self, stream, *entry_ids):
+                for entry_id in entry_ids:
+                    client.streams[stream].pop(entry_id.encode(), None)
+
+            def execute(self):
+                return []
+
+        return Pipeline()
+
+
+def make_jobs(site='indeed', rows=3):
+    return pd.DataFrame({'site': [site] * rows, 'title': [f'Job {i}' for i in range(rows)]})
+
+
+@pytest.fixture
+def queue():
+    return IngestQueue(stream="test:ingest", group="test", client=FakeRedisClient())
+
+
+@pytest.fixture
+def fake_db():
+    session = MagicMock()
+    with patch.object(database, 'init_database'), patch.object(database, 'SessionLocal', return_value=session):
+        yield session
+
+
+class TestIngestQueue:
+    """Test cases for IngestQueue."""
+
+    @pytest.mark.asyncio
+    async def test_published_jobs_are_read_back(self, queue):
+        entry_id = await queue.publish(make_jobs(), 'indeed', {'search_term': 'python'})
+
+        batches = queue.read("worker-1", count=10)
+
+        assert [batch.entry_id for batch in batches] == [entry_id]
+        assert batches[0].source_site == 'indeed'
+        assert batches[0].search_params == {'search_term': 'python'}
+        pd.testing.assert_frame_equal(batches[0].jobs, make_jobs())
+        assert queue.read("worker-2", count=10) == []
+
+    @pytest.mark.asyncio
+    async def test_without_redis_jobs_are_saved_in_the_background(self, fake_db):
+        queue = IngestQueue(stream="test:ingest")
+        queue._client_failed = True
+
+        with patch.object(data_processor, 'save_batch') as save:
+            assert await queue.publish(make_jobs(), 'indeed', {'search_term': 'python'}) is None
+            await asyncio.gather(*ingest_module._local_saves)
+
+        batch, db = save.call_args[0]
+        assert batch.search_params == {'search_term': 'python', 'site_name': ['indeed']}
+        pd.testing.assert_frame_equal(batch.jobs, make_jobs())
+        assert db is fake_db
+        fake_db.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_result_sets_are_queued_per_site(self, queue):
+        jobs = pd.concat([make_jobs('indeed', 2), make_jobs('linkedin', 1), make_jobs('glassdoor', 1)])
+
+        entry_ids = await queue.publish_sites(jobs, {'search_term': 'python'}, ['indeed', 'linkedin', 'zip_recruiter'])
+
+        assert len(entry_ids) == 2
+        assert [(batch.source_site, len(batch.jobs)) for batch in queue.read("worker-1", count=10)] == [
+            ('indeed', 2), ('linkedin', 1)
+        ]
+        assert await queue.publish_sites(jobs.drop(columns='site'), {}) == []
+
+
+class TestDataProcessor:
+    """Test cases for draining the ingest queue."""
+
+    @pytest.mark.asyncio
+    async def test_drain_saves_and_acknowledges(self, queue, fake_db):
+        for site in ('indeed', 'linkedin'):
+            await queue.publish(make_jobs(site), site, {})
+
+        with patch.object(data_processor, 'save_batch', return_value={'new_jobs': 3}) as save_batch:
+            totals = data_processor.drain("worker-1", queue=queue)
+
+        assert totals == {'saved': 2, 'failed': 0, 'dead_letters': 0, 'new_jobs': 6}
+        assert [call.args[0].source_site for call in save_batch.call_args_list] == ['indeed', 'linkedin']
+        assert queue.client.xlen("test:ingest") == 0
+        fake_db.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_entries_stay_pending_until_the_last_attempt(self, queue, fake_db):
+        await queue.publish(make_jobs(), 'indeed', {})
+        await queue.publish(make_jobs(), 'glassdoor', {})
+
+        def fail_glassdoor(batch, db):
+            if batch.source_site == 'glassdoor':
+                raise RuntimeError("database is down")
+            return {'new_jobs': 3}
+
+        with patch.object(data_processor, 'save_batch', side_effect=fail_glassdoor):
+            totals = data_processor.drain("worker-1", queue=queue)
+        assert totals['failed'] == 1
+        assert list(queue.client.pending) == [b"2-0"]
+
+        # Redelivered on its last allowed attempt: moved to the dead-letter stream
+        queue.client.pending.clear()
+        with patch.object(data_processor.settings, 'INGEST_MAX_DELIVERIES', 1), \
+             patch.object(data_processor, 'save_batch', side_effect=fail_glassdoor):
+            totals = data_processor.drain("worker-1", queue=queue)
+        assert totals['dead_letters'] == 1
+        assert queue.client.xlen(queue.dead_letter_stream) == 1
+        assert queue.client.xlen("test:ingest") == 0
+
+    def test_scheduled_data_processor_tasks_exist(self):
+        scheduled = [entry['task'] for entry in data_processor.celery_app.conf.beat_schedule.values()
+                     if entry['task'].startswith('app.workers.data_processor.')]
+
+        assert scheduled == ['app.workers.data_processor.drain_ingest_queue']
+        assert all(task in data_processor.celery_app.tasks for task in scheduled)
+
+
+class TestSearchQueuesIngestion:
+    """The search endpoint queues scraped jobs instead of saving them itself."""
+
+    def test_scraped_sites_are_queued(self):
+        app = FastAPI()
+        app.include_router(api.router, prefix="/api/v1")
+        app.dependency_overrides[get_api_key] = lambda: None
+
+        async def fake_run_search(params, timeout_ms=None):
+            jobs = pd.concat([make_jobs('indeed'), make_jobs('linkedin')], ignore_index=True)
+            return SearchOutcome(jobs=jobs, cached=False, cached_sites=['linkedin'], scraped_sites=['indeed'])
+
+        with patch.object(JobService, 'run_search', side_effect=fake_run_search), \
+             patch.object(api.ingest_queue, 'publish') as publish:
+            response = TestClient(app).get("/api/v1/search_jobs", params={'site_name': ['indeed', 'linkedin']})
+
+        assert response.json()['count'] == 6
+        publish.assert_called_once()
+        jobs_df, site, _ = publish.call_args[0]
+        assert site == 'indeed'
+        assert len(jobs_df) == 3
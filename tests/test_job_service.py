@@ -7,6 +7,7 @@ from typing import Dict, Any
 from app.services.job_service import JobService
 from app.core.config import settings
 from app.cache import cache
+from app.services.ingest_queue import ingest_queue
 
 
 class TestJobService:
@@ -345,4 +346,127 @@ class TestJobService:
         
         # Should only return the job with non-null company that matches
         assert len(result) == 1
-        assert result.iloc[0]['COMPANY'] == 'Company 1'
\ No newline at end of file
+        assert result.iloc[0]['COMPANY'] == 'Company 1'
+    @pytest.mark.asyncio
+    async def test_run_search_reuses_cached_site_slices(self):
+        """A multi-site search scrapes only the sites without a cached slice."""
+        params = {'site_name': ['indeed', 'linkedin'], 'search_term': 'python developer'}
+        indeed_df = pd.DataFrame({'site': ['indeed'], 'title': ['Cached Job']})
+        linkedin_df = pd.DataFrame({'site': ['linkedin'], 'title': ['Fresh Job']})
+        
+        async def fake_lookup(key, record=True):
+            # run_search applies defaults to params before building slice keys
+            return (indeed_df, False) if key == cache.site_key(params, 'indeed') else None
+        
+        with patch('app.services.job_service.scrape_jobs', return_value=linkedin_df) as mock_scrape, \
+             patch.object(cache, 'get_with_staleness', side_effect=fake_lookup), \
+             patch.object(cache, 'set') as mock_cache_set:
+            
+            outcome = await JobService.run_search(params)
+            
+            mock_scrape.assert_called_once()
+            assert mock_scrape.call_args[1]['site_name'] == ['linkedin']
+            mock_cache_set.assert_called_once()
+            assert mock_cache_set.call_args[0][0] == cache.site_key(params, 'linkedin')
+            
+            assert list(outcome.jobs['title']) == ['Cached Job', 'Fresh Job']
+            assert outcome.cached_sites == ['indeed']
+            assert outcome.scraped_sites == ['linkedin']
+            assert not outcome.cached
+
+    @pytest.mark.asyncio
+    async def test_run_search_serves_stale_slice_and_refreshes_once(self):
+        """Stale slices are returned immediately and refreshed once in the background."""
+        import asyncio
+        from app.services import job_service
+        
+        params = {'site_name': ['indeed'], 'search_term': 'python developer'}
+        stale_df = pd.DataFrame({'site': ['indeed'], 'title': ['Stale Job']})
+        fresh_df = pd.DataFrame({'site': ['indeed'], 'title': ['Fresh Job']})
+        
+        with patch('app.services.job_service.scrape_jobs', return_value=fresh_df) as mock_scrape, \
+             patch.object(cache, 'get', return_value=None), \
+             patch.object(cache, 'get_with_staleness', return_value=(stale_df, True)), \
+             patch.object(cache, 'stale_ttl', 600), \
+             patch.object(cache, 'set') as mock_cache_set, \
+             patch.object(ingest_queue, 'publish', new_callable=AsyncMock) as mock_save:
+            
+            first, second = await asyncio.gather(
+                JobService.run_search(dict(params)), JobService.run_search(dict(params))
+            )
+            await asyncio.gather(*job_service._refresh_tasks.values())
+            
+            assert list(first.jobs['title']) == ['Stale Job']
+            assert first.cached and first.stale
+            assert first.stale_sites == ['indeed']
+            assert second.stale
+            mock_scrape.assert_called_once()
+            mock_cache_set.assert_called_once()
+            mock_save.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stale_refresh_saves_scraped_jobs(self):
+        """A background refresh's jobs reach the tracking database (saved locally without Redis)."""
+        import asyncio
+        from app.db import database
+        from app.services import ingest_queue as ingest_module
+        from app.services import job_service
+        
+        params = {'site_name': ['indeed'], 'search_term': 'python developer'}
+        stale_df = pd.DataFrame({'site': ['indeed'], 'title': ['Stale Job']})
+        fresh_df = pd.DataFrame({'site': ['indeed'], 'title': ['Fresh Job']})
+        ingester = MagicMock()
+        ingester.process_scraped_jobs.return_value = {'new_jobs': 1, 'updated_jobs': 0}
+        
+        with patch('app.services.job_service.scrape_jobs', return_value=fresh_df), \
+             patch.object(cache, 'get', return_value=None), \
+             patch.object(cache, 'get_with_staleness', return_value=(stale_df, True)), \
+             patch.object(cache, 'stale_ttl', 600), \
+             patch.object(cache, 'set'), \
+             patch.object(database, 'init_database'), \
+             patch.object(database, 'SessionLocal', create=True) as session_factory, \
+             patch.object(ingest_queue, '_client', None), \
+             patch.object(ingest_queue, '_client_failed', True), \
+             patch('app.services.bulk_ingest_service.tracking_ingester', return_value=ingester):
+            
+            await JobService.run_search(dict(params))
+            await asyncio.gather(*job_service._refresh_tasks.values())
+            await asyncio.gather(*ingest_module._local_saves)
+            
+            saved = ingester.process_scraped_jobs.call_args[1]
+            assert [job['title'] for job in saved['jobs_data']] == ['Fresh Job']
+            assert saved['source_site'] == 'indeed'
+            assert saved['db'] is session_factory.return_value
+            session_factory.return_value.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_run_search_skips_failing_sites(self):
+        """Failing and short-circuited sites are reported as skipped, healthy sites still return."""
+        from app.services.circuit_breaker import circuit_breaker
+        
+        params = {'site_name': ['indeed', 'glassdoor', 'zip_recruiter'], 'search_term': 'python developer'}
+        indeed_df = pd.DataFrame({'site': ['indeed'], 'title': ['Healthy Job']})
+        
+        def fake_scrape(**kwargs):
+            if kwargs['site_name'] == ['glassdoor']:
+                raise Exception("403 Forbidden")
+            return indeed_df
+        
+        circuit_breaker.reset()
+        with patch('app.services.job_service.scrape_jobs', side_effect=fake_scrape) as mock_scrape, \
+             patch.object(cache, 'get', return_value=None), \
+             patch.object(cache, 'set'), \
+             patch.object(circuit_breaker, 'enabled', True), \
+             patch.object(circuit_breaker, '_circuits', {}):
+            # zip_recruiter has been failing, so its circuit is open
+            for _ in range(circuit_breaker.min_requests):
+                circuit_breaker.record_failure('zip_recruiter', 'captcha')
+            
+            outcome = await JobService.run_search(params)
+            
+            assert list(outcome.jobs['title']) == ['Healthy Job']
+            assert outcome.scraped_sites == ['indeed']
+            assert outcome.skipped_sites['glassdoor'] == '403 Forbidden'
+            assert 'circuit open' in outcome.skipped_sites['zip_recruiter']
+            assert mock_scrape.call_count == 2
+
@@ -0,0 +1,158 @@
+"""Tests for refining stored search results."""
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_api_key
+from app.db.database import get_db
+from app.routes import api
+from app.services import refinement_service as refinement_module
+from app.services.job_service import JobService
+from app.services.refinement_service import RefinementService
+from app.services.search_job_store import SearchJobStore
+
+
+def make_jobs() -> pd.DataFrame:
+    """Results shaped like JobSpy's output, with lower-case columns and a combined location."""
+    return pd.DataFrame({
+        'site': ['indeed', 'linkedin', 'indeed', 'glassdoor'],
+        'title': ['Senior Python Engineer', 'Data Scientist', 'Frontend Engineer', 'Python Developer'],
+        'company': ['TechCorp', 'Data Inc', 'techcorp labs', None],
+        'location': ['San Francisco, CA, US', 'New York, NY, US', 'Austin, TX, US', 'Remote'],
+        'job_type': ['fulltime', 'fulltime', 'contract', 'FULLTIME'],
+        'min_amount': [140000.0, 120000.0, np.nan, 90000.0],
+        'max_amount': [180000.0, 160000.0, np.nan, 110000.0],
+        'description': ['Django and Postgres', 'Python, statistics', 'React', 'Flask APIs'],
+    })
+
+
+def make_memory_store() -> SearchJobStore:
+    store = SearchJobStore(prefix="test:", chunk_rows=3)
+    store._client_failed = True
+    return store
+
+
+class TestFilterJobs:
+    """Test cases for JobService.filter_jobs and sort_jobs on JobSpy results."""
+
+    @pytest.mark.parametrize("prepared", [False, True])
+    def test_filters_match_prepared_and_raw_results(self, prepared):
+        jobs = make_jobs()
+        if prepared:
+            jobs = JobService.prepare_jobs(jobs)
+
+        def titles(filters):
+            return JobService.filter_jobs(jobs, filters)['title'].tolist()
+
+        assert titles({'company': 'TECHCORP'}) == ['Senior Python Engineer', 'Frontend Engineer']
+        assert titles({'job_type': 'fulltime'}) == ['Senior Python Engineer', 'Data Scientist', 'Python Developer']
+        assert titles({'city': 'san fran'}) == ['Senior Python Engineer']
+        assert titles({'state': 'ny'}) == ['Data Scientist']
+        assert titles({'keyword': 'python'}) == ['Senior Python Engineer', 'Data Scientist', 'Python Developer']
+        assert titles({'min_salary': 100000, 'max_salary': 170000}) == ['Data Scientist']
+
+    def test_filter_text_is_not_a_pattern(self):
+        """Filter values are matched literally, so user input cannot break the filter."""
+        assert JobService.filter_jobs(make_jobs(), {'company': '(['}).empty
+
+    def test_missing_field_matches_nothing(self):
+        assert JobService.filter_jobs(pd.DataFrame({'title': ['Job']}), {'min_salary': 1}).empty
+
+    def test_prepared_columns_are_dropped(self):
+        prepared = JobService.prepare_jobs(make_jobs())
+
+        assert list(JobService.public_columns(prepared).columns) == list(make_jobs().columns)
+
+    def test_sort_is_numeric_and_case_insensitive(self):
+        jobs = make_jobs()
+
+        by_salary = JobService.sort_jobs(jobs, 'min_amount', 'desc')
+        # Jobs without a salary come last
+        assert by_salary['min_amount'].tolist()[:3] == [140000.0, 120000.0, 90000.0]
+        assert np.isnan(by_salary['min_amount'].iloc[-1])
+
+        by_company = JobService.sort_jobs(jobs, 'company', 'asc')
+        assert by_company['company'].tolist()[:3] == ['Data Inc', 'TechCorp', 'techcorp labs']
+
+
+class TestRefinementService:
+    """Test cases for RefinementService."""
+
+    @pytest.mark.asyncio
+    async def test_results_are_loaded_once(self):
+        store = make_memory_store()
+        record = await store.save_search({'search_term': 'python'}, make_jobs())
+        service = RefinementService(max_results=1)
+
+        with patch.object(refinement_module, 'search_job_store', store), \
+             patch.object(store, 'get_page', wraps=store.get_page) as get_page:
+            first = await service.load(record)
+            second = await service.load(record)
+
+        assert first is second
+        assert get_page.call_count == 1
+        assert service.refine(first, {'state': 'ca'})['title'].tolist() == ['Senior Python Engineer']
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_results_are_dropped(self):
+        store = make_memory_store()
+        service = RefinementService(max_results=1)
+
+        with patch.object(refinement_module, 'search_job_store', store):
+            for params in ({'search_term': 'a'}, {'search_term': 'b'}):
+                await service.load(await store.save_search(params, make_jobs()))
+
+        assert len(service._results) == 1
+
+
+@pytest.fixture
+def refine_client():
+    store = make_memory_store()
+    app = FastAPI()
+    app.include_router(api.router, prefix="/api/v1")
+    app.dependency_overrides[get_api_key] = lambda: None
+    app.dependency_overrides[get_db] = lambda: None
+
+    with patch.object(api, 'search_job_store', store), \
+         patch.object(refinement_module, 'search_job_store', store), \
+         patch.object(api, 'refinement_service', RefinementService()), \
+         patch.object(JobService, 'run_search') as run_search:
+        client = TestClient(app)
+        client.store = store
+        client.run_search = run_search
+        yield client
+
+
+class TestRefineAPI:
+    """Test cases for GET /api/v1/search_jobs/refine."""
+
+    @pytest.mark.asyncio
+    async def test_refines_stored_result(self, refine_client):
+        record = await refine_client.store.save_search({'search_term': 'engineer'}, make_jobs())
+
+        body = refine_client.get("/api/v1/search_jobs/refine", params={
+            'result_id': record['id'], 'keyword': 'python', 'sort_by': 'min_amount', 'sort_order': 'asc', 'page_size': 2,
+        }).json()
+
+        assert body['count'] == 3
+        assert [job['title'] for job in body['jobs']] == ['Python Developer', 'Data Scientist']
+        assert 'keyword=python' in body['next_page']
+        assert not any(key.startswith('_refine_') for key in body['jobs'][0])
+        refine_client.run_search.assert_not_called()
+
+    def test_unknown_result(self, refine_client):
+        response = refine_client.get("/api/v1/search_jobs/refine", params={'result_id': 'missing'})
+
+        assert response.status_code == 410
+
+    @pytest.mark.asyncio
+    async def test_invalid_sort_order(self, refine_client):
+        record = await refine_client.store.save_search({}, make_jobs())
+
+        response = refine_client.get("/api/v1/search_jobs/refine", params={'result_id': record['id'], 'sort_order': 'up'})
+
+        assert response.status_code == 400
@@ -0,0 +1,121 @@
+"""Unit tests for the per-site scrape executor."""
+import asyncio
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from app.services.scrape_executor import ScrapeExecutor
+
+
+def make_site_df(site: str, rows: int = 2) -> pd.DataFrame:
+    return pd.DataFrame({
+        'site': [site] * rows,
+        'title': [f'{site} job {i}' for i in range(rows)],
+        'company': [f'{site} company {i}' for i in range(rows)],
+    })
+
+
+class TestScrapeExecutor:
+    """Test cases for ScrapeExecutor."""
+
+    @pytest.mark.asyncio
+    async def test_scrape_fans_out_one_call_per_site(self):
+        """Each site gets its own scrape call and results are merged in site order."""
+        calls = []
+
+        def fake_scrape(**kwargs):
+            calls.append(kwargs['site_name'])
+            return make_site_df(kwargs['site_name'][0])
+
+        executor = ScrapeExecutor(executor_type="thread", max_workers=4, site_concurrency=1)
+        try:
+            result = await executor.scrape(
+                {'site_name': ['indeed', 'linkedin'], 'search_term': 'python'},
+                fake_scrape,
+            )
+        finally:
+            executor.shutdown()
+
+        assert sorted(calls) == [['indeed'], ['linkedin']]
+        assert len(result) == 4
+        assert list(result['site']) == ['indeed', 'indeed', 'linkedin', 'linkedin']
+
+    @pytest.mark.asyncio
+    async def test_per_site_concurrency_limit(self):
+        """Concurrent scrapes of the same site never exceed the site limit."""
+        lock = threading.Lock()
+        active = {'count': 0, 'peak': 0}
+
+        def slow_scrape(**kwargs):
+            with lock:
+                active['count'] += 1
+                active['peak'] = max(active['peak'], active['count'])
+            time.sleep(0.05)
+            with lock:
+                active['count'] -= 1
+            return make_site_df(kwargs['site_name'][0], rows=1)
+
+        executor = ScrapeExecutor(
+            executor_type="thread",
+            max_workers=8,
+            site_concurrency=4,
+            site_overrides={'linkedin': 1},
+        )
+        try:
+            await asyncio.gather(*(
+                executor.scrape({'site_name': ['linkedin']}, slow_scrape)
+                for _ in range(4)
+            ))
+        finally:
+            executor.shutdown()
+
+        assert active['peak'] == 1
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self):
+        """A blocking scrape does not block other coroutines."""
+        def blocking_scrape(**kwargs):
+            time.sleep(0.3)
+            return make_site_df(kwargs['site_name'][0])
+
+        executor = ScrapeExecutor(executor_type="thread", max_workers=2)
+        try:
+            scrape_task = asyncio.create_task(
+                executor.scrape({'site_name': ['indeed']}, blocking_scrape)
+            )
+            start = time.time()
+            await asyncio.sleep(0.01)
+            elapsed = time.time() - start
+            await scrape_task
+        finally:
+            executor.shutdown()
+
+        assert elapsed < 0.2
+
+    @pytest.mark.asyncio
+    async def test_scrape_propagates_site_errors(self):
+        """Errors raised by a site scrape are propagated to the caller."""
+        def failing_scrape(**kwargs):
+            raise Exception("Scraping failed")
+
+        executor = ScrapeExecutor(executor_type="thread", max_workers=2)
+        try:
+            with pytest.raises(Exception, match="Scraping failed"):
+                await executor.scrape({'site_name': ['indeed']}, failing_scrape)
+        finally:
+            executor.shutdown()
+
+    def test_merge_skips_empty_frames(self):
+        """Empty or missing site results are dropped before merging."""
+        merged = ScrapeExecutor.merge([pd.DataFrame(), make_site_df('indeed'), None])
+        assert len(merged) == 2
+
+        assert ScrapeExecutor.merge([pd.DataFrame()]).empty
+
+    def test_site_limit_uses_overrides(self):
+        """Per-site overrides take precedence over the default limit."""
+        executor = ScrapeExecutor(site_concurrency=3, site_overrides={'glassdoor': 1})
+        assert executor.site_limit('Glassdoor') == 1
+        assert executor.site_limit('indeed') == 3
@@ -0,0 +1,180 @@
+"""Unit tests for single-flight search coalescing."""
+import asyncio
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.search_coalescer import LOCK_PREFIX, RESULT_PREFIX, SearchCoalescer
+
+
+class FakeRedisClient:
+    """Minimal Redis client supporting the lock operations used by the coalescer."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+        return True
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def eval(self, script, numkeys, key, token):
+        if self.store.get(key) == token:
+            del self.store[key]
+            return 1
+        return 0
+
+
+class FakeBackend:
+    """Redis-compatible backend storing values in a dict."""
+
+    def __init__(self):
+        self.store = {}
+        self.client = FakeRedisClient(self.store)
+
+    def exists(self, key):
+        return key in self.store
+
+
+def make_jobs_df() -> pd.DataFrame:
+    return pd.DataFrame({'site': ['indeed', 'indeed'], 'title': ['Engineer', 'Analyst']})
+
+
+class TestSearchCoalescer:
+    """Test cases for SearchCoalescer."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_searches_share_one_scrape(self):
+        """Only the first of several concurrent identical searches scrapes."""
+        calls = []
+
+        async def producer():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return make_jobs_df()
+
+        coalescer = SearchCoalescer(enabled=True, distributed=False)
+        results = await asyncio.gather(*(coalescer.run("same-key", producer) for _ in range(5)))
+
+        assert len(calls) == 1
+        assert [coalesced for _, coalesced in results].count(False) == 1
+        assert all(len(df) == 2 for df, _ in results)
+        assert coalescer.inflight_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_scrape_independently(self):
+        """Searches with different fingerprints are not coalesced."""
+        calls = []
+
+        async def producer():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return make_jobs_df()
+
+        coalescer = SearchCoalescer(enabled=True, distributed=False)
+        await asyncio.gather(coalescer.run("key-a", producer), coalescer.run("key-b", producer))
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_all_waiters(self):
+        """A failed scrape fails every coalesced caller and is not remembered."""
+        async def failing_producer():
+            await asyncio.sleep(0.01)
+            raise Exception("Scraping failed")
+
+        coalescer = SearchCoalescer(enabled=True, distributed=False)
+        results = await asyncio.gather(
+            coalescer.run("key", failing_producer),
+            coalescer.run("key", failing_producer),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, Exception) for result in results)
+        assert coalescer.inflight_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_coalescer_always_scrapes(self):
+        """Disabling coalescing runs the producer for every call."""
+        calls = []
+
+        async def producer():
+            calls.append(1)
+            return make_jobs_df()
+
+        coalescer = SearchCoalescer(enabled=False)
+        await asyncio.gather(coalescer.run("key", producer), coalescer.run("key", producer))
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_follower_worker_uses_published_result(self):
+        """A worker that loses the Redis lock waits for the leader's published result."""
+        backend = FakeBackend()
+        backend.store[f"{LOCK_PREFIX}key"] = "other-worker"
+
+        async def producer():
+            raise AssertionError("follower should not scrape")
+
+        coalescer = SearchCoalescer(enabled=True, distributed=True, backend=backend, poll_interval=0.01)
+
+        async def publish_later():
+            await asyncio.sleep(0.03)
+            coalescer._publish_result(backend, f"{RESULT_PREFIX}key", make_jobs_df())
+            del backend.store[f"{LOCK_PREFIX}key"]
+
+        publisher = asyncio.create_task(publish_later())
+        result, coalesced = await coalescer.run("key", producer)
+        await publisher
+
+        assert coalesced is True
+        assert list(result['title']) == ['Engineer', 'Analyst']
+
+    @pytest.mark.asyncio
+    async def test_leader_publishes_result_and_releases_lock(self):
+        """The lock holder publishes its result and releases the lock."""
+        backend = FakeBackend()
+
+        async def producer():
+            return make_jobs_df()
+
+        coalescer = SearchCoalescer(enabled=True, distributed=True, backend=backend)
+        result, coalesced = await coalescer.run("key", producer)
+
+        assert coalesced is False
+        assert f"{LOCK_PREFIX}key" not in backend.store
+        assert f"{RESULT_PREFIX}key" in backend.store
+
+    @pytest.mark.asyncio
+    async def test_follower_gets_leader_dtypes(self):
+        """A follower in another worker decodes the leader's result with the same dtypes."""
+        backend = FakeBackend()
+        jobs = pd.DataFrame({
+            'site': ['indeed', 'linkedin'],
+            'title': ['Engineer', 'Analyst'],
+            'date_posted': [date(2026, 10, 1), None],
+            'min_amount': [90000.0, np.nan],
+            'is_remote': [True, False],
+        })
+
+        async def producer():
+            return jobs
+
+        leader = SearchCoalescer(enabled=True, distributed=True, backend=backend)
+        await leader.run("key", producer)
+        follower = SearchCoalescer(enabled=True, distributed=True, backend=backend)
+        result = follower._read_result(backend, f"{RESULT_PREFIX}key")
+
+        pd.testing.assert_series_equal(result.dtypes, jobs.dtypes)
+        assert result['date_posted'].iloc[0] == date(2026, 10, 1)
+        assert result['date_posted'].iloc[1] is None
@@ -0,0 +1,251 @@
+"""Tests for asynchronous search jobs and paginated result handles."""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_api_key
+from app.db.database import get_db
+from app.routes import api, searches
+from app.services import background_service as background_module
+from app.services.background_service import BackgroundService
+from app.services.ingest_queue import ingest_queue
+from app.services.job_service import JobService, SearchOutcome
+from app.services.search_job_store import SearchJobStatus, SearchJobStore
+
+
+class FakeRedisClient:
+    """Minimal in-memory stand-in for the Redis commands used by the search job store."""
+
+    def __init__(self):
+        self.store = {}
+
+    def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self):
+        client = self
+
+        class Pipeline:
+            def __init__(self):
+                self.writes = []
+
+            def set(self, key, value, ex=None):
+                self.writes.append((key, value))
+
+            def execute(self):
+                client.store.update(self.writes)
+
+        return Pipeline()
+
+
+def make_jobs(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({'site': ['indeed'] * rows, 'title': [f'Job {i}' for i in range(rows)]})
+
+
+def make_memory_store() -> SearchJobStore:
+    store = SearchJobStore(prefix="test:", chunk_rows=4, poll_interval=0.05)
+    store._client_failed = True
+    return store
+
+
+class TestSearchJobStore:
+    """Test cases for SearchJobStore."""
+
+    @pytest.mark.asyncio
+    async def test_records_are_shared_through_redis(self):
+        """A job created by one worker's store is visible to another's."""
+        client = FakeRedisClient()
+        store_a = SearchJobStore(prefix="test:", client=client)
+        store_b = SearchJobStore(prefix="test:", client=client)
+
+        record = await store_a.create({'search_term': 'python'})
+        await store_a.transition(record["id"], SearchJobStatus.RUNNING)
+
+        shared = await store_b.get(record["id"])
+        assert shared["status"] == "running"
+        assert shared["version"] == 1
+        assert shared["params"] == {'search_term': 'python'}
+
+    @pytest.mark.asyncio
+    async def test_pages_read_only_overlapping_chunks(self):
+        """Results are stored in chunks and a page fetches just the chunks it spans."""
+        client = FakeRedisClient()
+        store = SearchJobStore(prefix="test:", chunk_rows=4, client=client)
+        record = await store.create({})
+
+        assert await store.save_results(record["id"], make_jobs(10)) == 10
+        assert sorted(key for key in client.store if ":chunk:" in key) == [
+            f"test:{record['id']}:chunk:{i}" for i in range(3)
+        ]
+        record = await store.transition(record["id"], SearchJobStatus.COMPLETED, count=10)
+
+        with patch.object(client, 'mget', wraps=client.mget) as mget:
+            page = await store.get_page(record, 3, 3)
+        assert list(page['title']) == ['Job 3', 'Job 4', 'Job 5']
+        assert mget.call_args[0][0] == [f"test:{record['id']}:chunk:0", f"test:{record['id']}:chunk:1"]
+
+        last = await store.get_page(record, 8, 5)
+        assert list(last['title']) == ['Job 8', 'Job 9']
+
+    @pytest.mark.asyncio
+    async def test_finished_jobs_keep_their_status(self):
+        """A search that completes after it was cancelled stays cancelled."""
+        store = make_memory_store()
+        record = await store.create({})
+
+        await store.transition(record["id"], SearchJobStatus.CANCELLED)
+        assert await store.transition(record["id"], SearchJobStatus.COMPLETED, count=1) is None
+        assert (await store.get(record["id"]))["status"] == "cancelled"
+
+    @pytest.mark.asyncio
+    async def test_wait_wakes_on_update(self):
+        """A long-poll returns as soon as the job changes."""
+        store = make_memory_store()
+        record = await store.create({})
+
+        waiter = asyncio.create_task(store.wait(record["id"], 0, timeout=5))
+        await asyncio.sleep(0.01)
+        await store.transition(record["id"], SearchJobStatus.RUNNING)
+
+        updated = await asyncio.wait_for(waiter, 1)
+        assert updated["status"] == "running"
+
+    @pytest.mark.asyncio
+    async def test_wait_times_out_unchanged(self):
+        """A long-poll returns the unchanged record when nothing happens."""
+        store = make_memory_store()
+        record = await store.create({})
+
+        unchanged = await store.wait(record["id"], 0, timeout=0.1)
+        assert unchanged["version"] == 0
+
+
+@pytest.fixture
+def jobs_client():
+    store = make_memory_store()
+    service = BackgroundService()
+
+    async def fake_run_search(params, timeout_ms=None):
+        await asyncio.sleep(0.05)
+        return SearchOutcome(jobs=make_jobs(5), cached=False, scraped_sites=['indeed'])
+
+    app = FastAPI()
+    app.include_router(searches.router, prefix="/api/v1/searches")
+    app.dependency_overrides[get_api_key] = lambda: None
+
+    with patch.object(background_module, 'search_job_store', store), \
+         patch.object(searches, 'search_job_store', store), \
+         patch.object(searches, 'background_service', service), \
+         patch.object(JobService, 'run_search', side_effect=fake_run_search), \
+         patch.object(ingest_queue, 'publish', new_callable=AsyncMock) as save, \
+         TestClient(app) as client:
+        client.save = save
+        yield client
+
+
+class TestSearchJobsAPI:
+    """Test cases for the /api/v1/searches endpoints."""
+
+    def test_submit_long_poll_and_page_results(self, jobs_client):
+        """A search returns its ID at once and its results are paged after it completes."""
+        response = jobs_client.post("/api/v1/searches", json={'site_name': ['indeed'], 'search_term': 'python'})
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "pending"
+        assert job["results_url"].endswith(f"/api/v1/searches/{job['id']}/results")
+
+        status = jobs_client.get(f"/api/v1/searches/{job['id']}", params={'wait': 5, 'since': 1}).json()
+        assert status["status"] == "completed"
+        assert status["count"] == 5
+
+        page = jobs_client.get(f"/api/v1/searches/{job['id']}/results", params={'page': 2, 'page_size': 2}).json()
+        assert [j['title'] for j in page['jobs']] == ['Job 2', 'Job 3']
+        assert page['total_pages'] == 3
+        assert 'page=3' in page['next_page'] and 'page=1' in page['previous_page']
+        jobs_client.save.assert_awaited_once()
+        assert jobs_client.save.await_args[0][1] == 'indeed'
+
+    def test_results_conflict_until_completed(self, jobs_client):
+        """Results are not served for a search that is still running."""
+        job = jobs_client.post("/api/v1/searches", json={'site_name': ['indeed']}).json()
+
+        response = jobs_client.get(f"/api/v1/searches/{job['id']}/results")
+        assert response.status_code == 409
+
+    def test_cancel_search(self, jobs_client):
+        """A cancelled search stays cancelled and cannot be cancelled again."""
+        job = jobs_client.post("/api/v1/searches", json={'site_name': ['indeed']}).json()
+
+        response = jobs_client.delete(f"/api/v1/searches/{job['id']}")
+        assert response.status_code == 200
+        assert response.json()["status"] == "cancelled"
+
+        status = jobs_client.get(f"/api/v1/searches/{job['id']}", params={'wait': 0.2}).json()
+        assert status["status"] == "cancelled"
+        assert jobs_client.delete(f"/api/v1/searches/{job['id']}").status_code == 409
+
+    def test_events_stream_until_finished(self, jobs_client):
+        """The events stream sends each status change and closes when the search finishes."""
+        job = jobs_client.post("/api/v1/searches", json={'site_name': ['indeed']}).json()
+
+        body = jobs_client.get(f"/api/v1/searches/{job['id']}/events").text
+        events = [line for line in body.splitlines() if line.startswith("event: ")]
+        assert events[-1] == "event: status"
+        assert '"status": "completed"' in body.split("event: status")[-1]
+
+    def test_unknown_search(self, jobs_client):
+        assert jobs_client.get("/api/v1/searches/missing").status_code == 404
+
+
+@pytest.fixture
+def paginated_client():
+    store = make_memory_store()
+    app = FastAPI()
+    app.include_router(api.router, prefix="/api/v1")
+    app.dependency_overrides[get_api_key] = lambda: None
+    app.dependency_overrides[get_db] = lambda: None
+
+    async def fake_run_search(params, timeout_ms=None):
+        return SearchOutcome(jobs=make_jobs(7), cached=True, cached_sites=['indeed'])
+
+    with patch.object(api, 'search_job_store', store), \
+         patch.object(JobService, 'run_search', side_effect=fake_run_search) as run_search:
+        client = TestClient(app)
+        client.run_search = run_search
+        yield client
+
+
+class TestPaginatedResultHandles:
+    """Test cases for paginate=true result handles on GET /api/v1/search_jobs."""
+
+    def test_pages_are_read_by_handle(self, paginated_client):
+        """The first page returns a result_id and later pages are served without searching again."""
+        first = paginated_client.get(
+            "/api/v1/search_jobs",
+            params={'paginate': 'true', 'page_size': 3, 'site_name': 'indeed', 'search_term': 'python'},
+        ).json()
+        assert first['result_id']
+        assert [j['title'] for j in first['jobs']] == ['Job 0', 'Job 1', 'Job 2']
+        assert first['total_pages'] == 3
+        assert 'search_term' not in first['next_page']
+        assert f"result_id={first['result_id']}" in first['next_page']
+
+        second = paginated_client.get(first['next_page']).json()
+        assert [j['title'] for j in second['jobs']] == ['Job 3', 'Job 4', 'Job 5']
+        assert second['cached'] is True
+        assert 'page=1' in second['previous_page']
+        assert paginated_client.run_search.call_count == 1
+
+    def test_page_past_the_end(self, paginated_client):
+        response = paginated_client.get("/api/v1/search_jobs", params={'paginate': 'true', 'page': 9, 'site_name': 'indeed'})
+        assert response.status_code == 404
+
+    def test_unknown_handle(self, paginated_client):
+        """An expired or unknown handle asks the client to search again."""
+        response = paginated_client.get("/api/v1/search_jobs", params={'paginate': 'true', 'result_id': 'missing'})
+        assert response.status_code == 410
+        paginated_client.run_search.assert_not_called()
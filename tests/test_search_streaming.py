@@ -0,0 +1,185 @@
+"""Tests for streaming job search results per site."""
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_api_key
+from app.cache import cache
+from app.db.database import get_db
+from app.routes import api
+from app.services.ingest_queue import ingest_queue
+from app.services.job_service import JobService, SiteResult
+
+
+def make_site_df(site: str, rows: int = 1) -> pd.DataFrame:
+    return pd.DataFrame({'site': [site] * rows, 'title': [f'{site} job {i}' for i in range(rows)]})
+
+
+@pytest.fixture
+def stream_client():
+    app = FastAPI()
+    app.include_router(api.router, prefix="/api/v1")
+    app.dependency_overrides[get_api_key] = lambda: None
+    app.dependency_overrides[get_db] = lambda: None
+    return TestClient(app)
+
+
+class TestStreamSearch:
+    """Test cases for JobService.stream_search."""
+
+    @pytest.mark.asyncio
+    async def test_yields_cached_slices_then_sites_in_completion_order(self):
+        """Cached slices come first, then scraped sites as soon as each finishes."""
+        params = {'site_name': ['glassdoor', 'indeed', 'linkedin'], 'search_term': 'python'}
+
+        async def fake_lookup(key, record=True):
+            return (make_site_df('indeed'), False) if key == cache.site_key(params, 'indeed') else None
+
+        async def fake_scrape_slice(params, site):
+            await asyncio.sleep(0.05 if site == 'glassdoor' else 0.01)
+            return make_site_df(site), False
+
+        with patch.object(cache, 'get_with_staleness', side_effect=fake_lookup), \
+             patch.object(JobService, '_scrape_site_slice', side_effect=fake_scrape_slice):
+            results = [result async for result in JobService.stream_search(params)]
+
+        assert [result.site for result in results] == ['indeed', 'linkedin', 'glassdoor']
+        assert [result.cached for result in results] == [True, False, False]
+
+    @pytest.mark.asyncio
+    async def test_site_errors_do_not_abort_stream(self):
+        """A failing site yields an error result while other sites still stream."""
+        params = {'site_name': ['indeed', 'linkedin'], 'search_term': 'python'}
+
+        async def fake_scrape_slice(params, site):
+            if site == 'linkedin':
+                raise Exception("Blocked by captcha")
+            return make_site_df(site), False
+
+        with patch.object(cache, 'get', return_value=None), \
+             patch.object(JobService, '_scrape_site_slice', side_effect=fake_scrape_slice):
+            results = {result.site: result async for result in JobService.stream_search(params)}
+
+        assert results['indeed'].error is None
+        assert results['linkedin'].error == "Blocked by captcha"
+
+
+    @pytest.mark.asyncio
+    async def test_consumer_stopping_early_keeps_remaining_scrapes(self):
+        """Sites not yet handed to a consumer that stops are scraped and queued anyway."""
+        from app.services import job_service
+        params = {'site_name': ['indeed', 'glassdoor'], 'search_term': 'python'}
+        finished = asyncio.Event()
+
+        async def fake_scrape_slice(params, site):
+            if site == 'glassdoor':
+                await finished.wait()
+            return make_site_df(site), False
+
+        with patch.object(cache, 'get_with_staleness', return_value=None), \
+             patch.object(JobService, '_scrape_site_slice', side_effect=fake_scrape_slice), \
+             patch.object(ingest_queue, 'publish', new_callable=AsyncMock) as save:
+            stream = JobService.stream_search(params)
+            assert (await stream.__anext__()).site == 'indeed'
+            await stream.aclose()
+
+            finished.set()
+            await asyncio.gather(*job_service._late_tasks)
+
+        # The consumer never asked past indeed, so its jobs are queued here too
+        assert sorted(call.args[1] for call in save.await_args_list) == ['glassdoor', 'indeed']
+
+
+class TestStreamingEndpoint:
+    """Test cases for format=ndjson and format=sse on /search_jobs."""
+
+    @staticmethod
+    async def fake_stream(params, timeout_ms=None):
+        yield SiteResult(site='indeed', jobs=make_site_df('indeed', rows=2), cached=True)
+        yield SiteResult(site='linkedin', jobs=pd.DataFrame(), cached=False, error="Timed out")
+
+    def test_ndjson_emits_site_frames_then_summary(self, stream_client):
+        with patch.object(JobService, 'stream_search', side_effect=self.fake_stream):
+            response = stream_client.get(
+                "/api/v1/search_jobs",
+                params={"site_name": ["indeed", "linkedin"], "search_term": "python", "format": "ndjson"},
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        frames = [json.loads(line) for line in response.text.splitlines()]
+        assert [frame["type"] for frame in frames] == ["site", "error", "summary"]
+        assert frames[0]["count"] == 2 and len(frames[0]["jobs"]) == 2
+        assert frames[-1]["count"] == 2
+        assert frames[-1]["failed_sites"] == {"linkedin": "Timed out"}
+
+    def test_sse_wraps_frames_as_events(self, stream_client):
+        with patch.object(JobService, 'stream_search', side_effect=self.fake_stream):
+            response = stream_client.post(
+                "/api/v1/search_jobs?format=sse",
+                json={"site_name": ["indeed", "linkedin"], "search_term": "python", "country_indeed": "USA"},
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [line.split(": ", 1)[1] for line in response.text.splitlines() if line.startswith("event: ")]
+        assert events == ["site", "error", "summary"]
+
+    def test_invalid_format_rejected(self, stream_client):
+        response = stream_client.get("/api/v1/search_jobs", params={"format": "xml"})
+        assert response.status_code == 400
+
+
+class TestSearchDeadline:
+    """Test cases for timeout_ms deadlines."""
+
+    @pytest.mark.asyncio
+    async def test_run_search_returns_partial_results_at_deadline(self):
+        """Sites still scraping at the deadline are reported and saved once they finish."""
+        params = {'site_name': ['indeed', 'glassdoor'], 'search_term': 'python'}
+        finished = asyncio.Event()
+
+        async def fake_scrape_slice(params, site):
+            if site == 'glassdoor':
+                await finished.wait()
+            return make_site_df(site), False
+
+        with patch.object(cache, 'get', return_value=None), \
+             patch.object(JobService, '_scrape_site_slice', side_effect=fake_scrape_slice), \
+             patch.object(ingest_queue, 'publish', new_callable=AsyncMock) as mock_save:
+            outcome = await JobService.run_search(params, timeout_ms=50)
+
+            assert outcome.partial
+            assert outcome.timed_out_sites == ['glassdoor']
+            assert outcome.scraped_sites == ['indeed']
+            assert list(outcome.jobs['site']) == ['indeed']
+            mock_save.assert_not_called()
+
+            finished.set()
+            from app.services import job_service
+            await asyncio.gather(*job_service._late_tasks)
+            mock_save.assert_awaited_once()
+            assert mock_save.await_args[0][1] == 'glassdoor'
+            assert mock_save.await_args[0][2]['site_name'] == ['glassdoor']
+
+    @pytest.mark.asyncio
+    async def test_stream_search_reports_timed_out_sites(self):
+        params = {'site_name': ['indeed', 'glassdoor'], 'search_term': 'python'}
+
+        async def fake_scrape_slice(params, site):
+            await asyncio.sleep(5 if site == 'glassdoor' else 0)
+            return make_site_df(site), False
+
+        with patch.object(cache, 'get', return_value=None), \
+             patch.object(JobService, '_scrape_site_slice', side_effect=fake_scrape_slice), \
+             patch.object(JobService, '_save_when_done') as mock_save_later:
+            results = [result async for result in JobService.stream_search(params, timeout_ms=50)]
+
+        assert [(result.site, result.timed_out) for result in results] == [('indeed', False), ('glassdoor', True)]
+        mock_save_later.assert_called_once()
+        mock_save_later.call_args[0][1].cancel()
@@ -0,0 +1,116 @@
+"""Unit tests for the shared Redis tier of the search cache."""
+import time
+
+import pandas as pd
+import pytest
+
+from app.cache import JobSearchCache
+from app.core.shared_cache import SharedCacheTier
+
+
+class FakeRedisClient:
+    """Minimal in-memory stand-in for the Redis commands used by the shared tier."""
+
+    def __init__(self):
+        self.store = {}
+        self.hashes = {}
+        self.published = []
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+        return True
+
+    def delete(self, key):
+        return 1 if self.store.pop(key, None) is not None else 0
+
+    def hset(self, key, field, value):
+        # Binary clients return bytes
+        self.hashes.setdefault(key, {})[field.encode()] = value.encode()
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def expire(self, key, ttl):
+        return True
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+def make_worker(client: FakeRedisClient) -> JobSearchCache:
+    """Create a worker-local cache sharing the given Redis client."""
+    search_cache = JobSearchCache()
+    search_cache.enabled = True
+    search_cache.expiry = 60
+    search_cache.stale_ttl = 0
+    search_cache.l2 = SharedCacheTier(prefix="test:", channel="test:invalidate", client=client)
+    return search_cache
+
+
+class TestSharedCacheTier:
+    """Test cases for the two-tier cache."""
+
+    @pytest.mark.asyncio
+    async def test_write_through_and_read_through_between_workers(self):
+        """A result cached by one worker is served to another via Redis."""
+        client = FakeRedisClient()
+        worker_a, worker_b = make_worker(client), make_worker(client)
+        jobs = pd.DataFrame({'site': ['indeed'], 'title': ['Engineer']})
+
+        await worker_a.set("key", jobs)
+        assert "test:key" in client.store
+
+        cached = await worker_b.get("key")
+        assert list(cached['title']) == ['Engineer']
+        assert "key" in worker_b.cache
+
+    @pytest.mark.asyncio
+    async def test_read_through_keeps_original_timestamp(self):
+        """Entries read from Redis expire based on when they were first cached."""
+        client = FakeRedisClient()
+        worker_a, worker_b = make_worker(client), make_worker(client)
+        await worker_a.set("key", {"value": 1})
+        client.store["test:key"] = worker_a.l2._encode(time.time() - 120, {"value": 1}, None)
+
+        assert await worker_b.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_writes_publish_invalidations(self):
+        client = FakeRedisClient()
+        worker = make_worker(client)
+
+        await worker.set("key", {"value": 1})
+        await worker.delete("key")
+
+        assert [channel for channel, _ in client.published] == ["test:invalidate", "test:invalidate"]
+        assert "test:key" not in client.store
+
+    @pytest.mark.asyncio
+    async def test_invalidation_drops_local_copy(self):
+        """After another worker updates an entry, the next read fetches the new value."""
+        client = FakeRedisClient()
+        worker_a, worker_b = make_worker(client), make_worker(client)
+        await worker_a.set("key", {"value": 1})
+        assert await worker_b.get("key") == {"value": 1}
+
+        await worker_a.set("key", {"value": 2})
+        worker_b.invalidate_local("key")
+
+        assert await worker_b.get("key") == {"value": 2}
+        assert worker_b.invalidations == 1
+
+    @pytest.mark.asyncio
+    async def test_superset_found_in_another_workers_scrape(self):
+        client = FakeRedisClient()
+        worker_a, worker_b = make_worker(client), make_worker(client)
+        params = {'site_name': ['indeed'], 'search_term': 'python', 'results_wanted': 50}
+        jobs = pd.DataFrame({'site': ['indeed'] * 50, 'title': [f'Job {i}' for i in range(50)]})
+
+        await worker_a.set(worker_a.site_key(params, 'indeed'), jobs)
+        await worker_a.index_site_slice(params, 'indeed', jobs)
+
+        data = await worker_b.get_covering_slice({**params, 'results_wanted': 10}, 'indeed')
+        assert len(data) == 10